@@ -0,0 +1,305 @@
+"""
+Speicheranlage im Spielablauf prüfen (Host-Werkzeug)
+====================================================
+
+MicroPython startet den GC nur, wenn eine Speicheranlage keinen Platz
+findet. Legt der Spielablauf nach dem Aufräumen in WAITING nichts mehr an,
+kann der GC nie in READY oder GO anspringen - egal wie viel Müll liegt.
+
+Mit tracemalloc lässt sich das am PC nicht zählen: in CPython sind schon
+Ganzzahlen über 256 Heap-Objekte, Floats und Tupel kommen aus Freilisten,
+und tracemalloc sieht nur, was noch lebt. Dieses Werkzeug spielt die
+Firmware deshalb im Simulator (mit Display) gegen den virtuellen Spieler
+aus replay.py und prüft jede ausgeführte Zeile der Firmware mit
+sys.settrace gegen die Regeln, nach denen MicroPython Speicher anlegt:
+
+- f-Strings, Strings verketten/vervielfachen, %-Formatierung
+- Float-Rechnung: `/`, Float-Literale in Rechnungen, math.*
+- Listen, Dicts, Sets, Comprehensions, Tupel mit variablen Elementen
+- Slices, Klassen aufrufen (neues Objekt), lambda, *args/**kwargs beim Aufruf
+- str(), bytes(), .format(), .join(), .append(), struct.pack() usw.
+
+Nichts an legen (und werden nicht gemeldet): kleine Ganzzahlen (bis 2^30,
+ticks_* laufen vorher über), Methodenaufrufe obj.m(...), for-Schleifen über
+Listen/Tupel/range (Iterator auf dem VM-Stack), konstante Tupel,
+Schlüsselwort-Argumente, print() von Konstanten und Zahlen,
+struct.pack_into() und Zugriffe auf array/bytearray.
+
+Gezählt wird pro Tick (ab tick_start_us in main()) und Zustand; ein Tick
+mit Zustandswechsel zählt für den Wechsel. Erlaubt sind:
+- Wechsel nach WAITING: Sitzung speichern (recorder.end_session()),
+  Statistik ausgeben - danach räumt tracer.collect() selbst auf
+- display.flush(): nur in WAITING/RESULT und nur mit geänderten Seiten
+  (memoryview-Ausschnitte für die I2C-Übertragung)
+Jede andere Speicheranlage wird mit Datei, Zeile und Regel gemeldet, das
+Programm endet dann mit Exit-Code 1.
+
+Nicht geprüft: was in C passiert (z.B. Ausnahmen beim WLAN-Polling in
+stats_http.py, im Simulator ohne Netzwerk). Auf dem Board zählt
+ALLOC_CHECK = True in der Firmware die echten gc.mem_alloc()-Differenzen.
+
+Aufruf:
+    python alloc_check.py
+    python alloc_check.py step6_context_game --minuten 30 --alle
+"""
+
+import argparse
+import ast
+import os
+import random
+import sys
+from collections import Counter
+
+from replay import VirtualPlayer
+from sim_hardware import Board, HERE, run_main
+
+STEPS = ("step6_complete_game", "step6_context_game")
+STATE_NAMES = ("WAITING", "READY", "GO", "RESULT")
+STATE_WAITING = 0
+
+ALLOCATING_CALLS = {"str", "bytes", "bytearray", "list", "dict", "set", "tuple", "memoryview",
+                    "float", "repr", "sorted", "enumerate", "zip", "map", "filter"}
+ALLOCATING_METHODS = {"format", "encode", "decode", "join", "split", "strip", "replace",
+                      "pack", "copy", "items", "keys", "values", "append", "extend"}
+CONTAINERS = {ast.List: "Liste", ast.Dict: "Dict", ast.Set: "Set", ast.ListComp: "Liste",
+              ast.DictComp: "Dict", ast.SetComp: "Set", ast.GeneratorExp: "Generator"}
+
+
+def firmware_files():
+    """Pfade der Firmware-Dateien (ohne Host-Werkzeuge und Simulator)"""
+    paths = set()
+    for name in os.listdir(HERE):
+        if not name.endswith(".py") or name == "sim_hardware.py":
+            continue
+        path = os.path.join(HERE, name)
+        with open(path, encoding="utf-8") as f:
+            if "(Host-Werkzeug)" not in f.read(400):
+                paths.add(path)
+    return paths
+
+
+def is_float(node):
+    """Liefert der Ausdruck sicher einen Float?"""
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, float)
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        return node.value.id == "math"
+    if isinstance(node, ast.BinOp):
+        return isinstance(node.op, ast.Div) or is_float(node.left) or is_float(node.right)
+    return False
+
+
+def is_str(node):
+    return isinstance(node, ast.JoinedStr) or (isinstance(node, ast.Constant) and isinstance(node.value, str))
+
+
+def allocations(node):
+    """Regeln, nach denen ein Ausdruck in MicroPython Speicher anlegt"""
+    found = []
+    for sub in ast.walk(node):
+        kind = type(sub)
+        if kind is ast.JoinedStr:
+            found.append("f-String")
+        elif kind in CONTAINERS:
+            found.append(CONTAINERS[kind])
+        elif kind is ast.Tuple and isinstance(sub.ctx, ast.Load) and \
+                not all(isinstance(e, ast.Constant) for e in sub.elts):
+            found.append("Tupel")
+        elif kind is ast.Slice:
+            found.append("Slice")
+        elif kind is ast.Lambda:
+            found.append("lambda")
+        elif kind is ast.BinOp:
+            if is_str(sub.left) or is_str(sub.right):
+                found.append("String")
+            elif is_float(sub):
+                found.append("Float")
+        elif kind is ast.AugAssign and (isinstance(sub.op, ast.Div) or is_float(sub.value)):
+            found.append("Float")
+        elif kind is ast.Call:
+            func = sub.func
+            if any(isinstance(a, ast.Starred) for a in sub.args) or \
+                    any(k.arg is None for k in sub.keywords):
+                found.append("*args")
+            if isinstance(func, ast.Name):
+                if func.id in ALLOCATING_CALLS:
+                    found.append(f"{func.id}()")
+                elif func.id[:1].isupper():
+                    found.append(f"Objekt {func.id}()")
+            elif isinstance(func, ast.Attribute):
+                if isinstance(func.value, ast.Name) and func.value.id == "math":
+                    found.append("Float")
+                elif func.attr in ALLOCATING_METHODS:
+                    found.append(f".{func.attr}()")
+                elif func.attr[:1].isupper():
+                    found.append(f"Objekt {func.attr}()")
+    return found
+
+
+def header_exprs(stmt):
+    """Ausdrücke einer Anweisung, die beim Erreichen ihrer ersten Zeile laufen"""
+    if isinstance(stmt, (ast.If, ast.While)):
+        return [stmt.test]
+    if isinstance(stmt, ast.For):
+        return [stmt.iter]
+    if isinstance(stmt, ast.With):
+        return [item.context_expr for item in stmt.items]
+    if isinstance(stmt, (ast.Try, ast.FunctionDef, ast.ClassDef)):
+        return []
+    return [stmt]
+
+
+def analyse(path):
+    """Zeile -> (erste Zeile der Anweisung, Regeln) für eine Firmware-Datei"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    lines = {}
+    for stmt in ast.walk(tree):
+        if not isinstance(stmt, ast.stmt):
+            continue
+        exprs = header_exprs(stmt)
+        found = []
+        for expr in exprs:
+            found.extend(allocations(expr))
+        if isinstance(stmt, (ast.FunctionDef, ast.Lambda)) and stmt.col_offset > 0:
+            found.append("Closure")
+        end = max((e.end_lineno for e in exprs), default=stmt.lineno)
+        for line in range(stmt.lineno, end + 1):
+            lines[line] = (stmt.lineno, found)
+    return lines
+
+
+def tick_line(path):
+    """Zeile von `tick_start_us = ...` in main() - dort beginnt jeder Tick"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name == "main":
+            for sub in ast.walk(node):
+                if isinstance(sub, ast.Assign) and getattr(sub.targets[0], "id", "") == "tick_start_us":
+                    return sub.lineno
+    raise ValueError(f"{path}: kein tick_start_us in main()")
+
+
+class AllocTracer:
+    """sys.settrace-Hook: Regelverstöße der ausgeführten Firmware-Zeilen pro Tick"""
+
+    def __init__(self, state, main_path):
+        self.state = state
+        self.paths = firmware_files()
+        self.main_path = main_path
+        self.main_line = tick_line(main_path)
+        self.maps = {}
+        self.tick_state = None
+        self.tick_found = []         # (Pfad, Zeile, Regel, erlaubt) im laufenden Tick
+        self.ticks = Counter()       # Bezeichnung -> Ticks
+        self.alloc_ticks = Counter()  # Bezeichnung -> Ticks mit unerlaubter Anlage
+        self.allowed_ticks = Counter()
+        self.found = Counter()       # (Bezeichnung, Pfad, Zeile, Regel, erlaubt) -> Anzahl
+
+    def global_trace(self, frame, event, arg):
+        path = frame.f_code.co_filename
+        if path not in self.paths:
+            return None
+        lines = self.maps.get(path)
+        if lines is None:
+            lines = self.maps[path] = analyse(path)
+        in_flush = frame.f_code.co_name == "flush" and path.endswith("display.py")
+        is_main = path == self.main_path and frame.f_code.co_name == "main"
+        last = [None]
+
+        def local_trace(frame, event, arg):
+            if event != "line":
+                return local_trace
+            line = frame.f_lineno
+            if is_main and line == self.main_line:
+                self.end_tick()
+            start, found = lines.get(line, (None, ()))
+            if start is not None and start != last[0]:
+                last[0] = start
+                for rule in found:
+                    self.tick_found.append((path, start, rule, in_flush))
+            return local_trace
+
+        return local_trace
+
+    def end_tick(self):
+        """Vorigen Tick abschließen und dem Zustand bzw. Wechsel zurechnen"""
+        now = self.state.current_state
+        before = self.tick_state
+        self.tick_state = now
+        found = self.tick_found
+        self.tick_found = []
+        if before is None:
+            return
+        label = STATE_NAMES[before] if before == now else f"{STATE_NAMES[before]}→{STATE_NAMES[now]}"
+        into_waiting = now == STATE_WAITING and before != STATE_WAITING
+        self.ticks[label] += 1
+        bad = allowed = False
+        for path, line, rule, in_flush in found:
+            ok = into_waiting or in_flush
+            self.found[(label, path, line, rule, ok)] += 1
+            bad = bad or not ok
+            allowed = allowed or ok
+        if bad:
+            self.alloc_ticks[label] += 1
+        elif allowed:
+            self.allowed_ticks[label] += 1
+
+
+def check_step(step, args):
+    board = Board(seed=args.seed, display=True)
+    game = board.load(step)
+    game.recorder.capture_path = None
+    game.histogram.hist_path = None
+    game.latency_cal.cal_path = None
+    game.DISPLAY_PINS = (22, 21)    # In der Firmware aus, hier mitprüfen
+    game.CPU_MHZ = (80, 80, 240, 80)
+    state = getattr(game, "game", game)
+    board.set_button_source(VirtualPlayer(state, random.Random(args.seed)))
+    board.clock.stop_at_ms = board.clock.now_ms() + int(args.minuten * 60000)
+
+    tracer = AllocTracer(state, os.path.abspath(game.__file__))
+    sys.settrace(tracer.global_trace)
+    try:
+        run_main(game)
+    finally:
+        sys.settrace(None)
+
+    print(f"▶ {step}: {state.games_played} Spiele, {sum(tracer.ticks.values())} Ticks")
+    order = [name for name in STATE_NAMES] + sorted(l for l in tracer.ticks if "→" in l)
+    for label in order:
+        if label not in tracer.ticks:
+            continue
+        bad = tracer.alloc_ticks[label]
+        note = f", {tracer.allowed_ticks[label]} erlaubt" if tracer.allowed_ticks[label] else ""
+        print(f"   {label:<16} {tracer.ticks[label]:>6} Ticks, {bad:>4} mit Speicheranlage{note} "
+              f"{'❌' if bad else '✅'}")
+
+    problems = sorted((key for key in tracer.found if not key[4]), key=lambda k: (k[1], k[2]))
+    shown = problems + (sorted((k for k in tracer.found if k[4]), key=lambda k: (k[1], k[2]))
+                        if args.alle else [])
+    for label, path, line, rule, ok in shown:
+        mark = "erlaubt" if ok else "❌"
+        print(f"   {mark} {os.path.basename(path)}:{line} {rule} ({tracer.found[(label, path, line, rule, ok)]}x "
+              f"in {label})")
+    return not problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Speicheranlage im Spielablauf prüfen")
+    parser.add_argument("schritte", nargs="*", default=list(STEPS), help="Firmware (Standard: beide Varianten)")
+    parser.add_argument("--minuten", type=float, default=10.0, help="Simulierte Spielzeit pro Variante")
+    parser.add_argument("--alle", action="store_true", help="Auch erlaubte Speicheranlagen zeigen")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    ok = True
+    for step in args.schritte:
+        ok = check_step(step, args) and ok
+    print("✅ Keine Speicheranlage im Spielablauf" if ok else "❌ Speicheranlage gefunden")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Build-Profile: Debug-Zweige zur Übersetzungszeit entfernen (Host-Werkzeug)
+==========================================================================
+
+Die Schritt-Dateien haben Schalter als micropython.const():
+
+    _DEBUG = const(1)        # Debug-Ausgaben pro Tick
+    _BENCHMARK = const(0)    # Rechenzeit pro Tick messen
+    _DEBOUNCE_MS = const(50)
+
+MicroPython setzt const-Werte beim Übersetzen ein und lässt `if 0:`-Zweige
+ganz weg - samt ihrer Strings. Namen mit Unterstrich belegen zusätzlich
+keinen Platz in den Modul-Globals. Dieses Werkzeug baut pro Profil eine
+Kopie der Dateien:
+
+- debug:      Quelltext-Stand, Debug-Ausgaben an
+- production: keine Debug-Ausgaben, keine Tick-Messung
+- benchmark:  keine Debug-Ausgaben, Tick-Messung an
+
+Beim Bauen werden die const-Namen eingesetzt und abgeschaltete Zweige
+entfernt (build/<profil>/*.py), so wie es der MicroPython-Compiler tut.
+Ist mpy-cross installiert (pip install mpy-cross), entstehen auch .mpy-
+Dateien zum Kopieren aufs Board.
+
+Verglichen werden:
+- Codegröße: .mpy (mit mpy-cross), sonst CPython-Bytecode (marshal)
+- Ob die Debug-Strings im production-Build noch vorkommen
+- Rechenzeit pro Tick im Simulator (CPython, zeigt die Richtung)
+- Gleiches Verhalten: Pin-Schreibzugriffe identisch, Konsole bis auf die
+  Debug- und Tick-Zeilen identisch
+
+Aufruf:
+    python build_profiles.py
+    python build_profiles.py step3_button_debounce --minuten 10 --ausgabe build
+"""
+
+import argparse
+import ast
+import marshal
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from sim_hardware import Board, HERE, run_main
+
+PROFILES = {
+    "debug": {"_DEBUG": 1, "_BENCHMARK": 0},
+    "production": {"_DEBUG": 0, "_BENCHMARK": 0},
+    "benchmark": {"_DEBUG": 0, "_BENCHMARK": 1},
+}
+FILES = ("step2_led_control", "step3_button_debounce", "step3_button_debounce_functional")
+DEBUG_MARKERS = ("Button gedrückt (entprellt)", "LED-Modus: ")   # Zeilen nur im Profil debug
+BENCHMARK_MARKER = "Tick: "
+
+
+def const_value(node):
+    """Wert aus `NAME = const(<Zahl>)`, sonst None"""
+    if (isinstance(node, ast.Assign) and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Name)
+            and node.value.func.id == "const" and len(node.value.args) == 1
+            and isinstance(node.value.args[0], ast.Constant)):
+        return node.value.args[0].value
+    return None
+
+
+class ConstFolder(ast.NodeTransformer):
+    """const-Namen einsetzen und Zweige mit festem Ergebnis auflösen"""
+
+    def __init__(self, overrides):
+        self.overrides = overrides
+        self.values = {}
+
+    def visit_Module(self, node):
+        for statement in node.body:
+            value = const_value(statement)
+            if value is not None:
+                name = statement.targets[0].id
+                self.values[name] = self.overrides.get(name, value)
+                statement.value.args[0].value = self.values[name]
+        # Unterstrich-Namen verschwinden ganz (wie bei MicroPython)
+        node.body = [s for s in node.body
+                     if const_value(s) is None or not s.targets[0].id.startswith("_")]
+        self.generic_visit(node)
+        return node
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load) and node.id in self.values:
+            return ast.copy_location(ast.Constant(self.values[node.id]), node)
+        return node
+
+    def visit_If(self, node):
+        self.generic_visit(node)
+        test = node.test
+        if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not) \
+                and isinstance(test.operand, ast.Constant):
+            test = ast.Constant(not test.operand.value)
+        if isinstance(test, ast.Constant):
+            return node.body if test.value else node.orelse
+        return node
+
+
+def fill_empty_bodies(tree):
+    """Nach dem Entfernen leerer Blöcke ein pass einsetzen"""
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            block = getattr(node, field, None)
+            if isinstance(block, list) and not block and field == "body":
+                setattr(node, field, [ast.Pass()])
+
+
+def build_source(source, overrides):
+    """Quelltext für ein Profil: const eingesetzt, tote Zweige entfernt"""
+    tree = ast.parse(source)
+    tree = ConstFolder(overrides).visit(tree)
+    fill_empty_bodies(tree)
+    ast.fix_missing_locations(tree)
+    return ast.unparse(tree) + "\n"
+
+
+def code_size(path):
+    """(Bytes, Art): .mpy mit mpy-cross, sonst marshal des CPython-Bytecodes"""
+    if shutil.which("mpy-cross"):
+        mpy = os.path.splitext(path)[0] + ".mpy"
+        subprocess.run(["mpy-cross", "-o", mpy, path], check=True)
+        return os.path.getsize(mpy), ".mpy"
+    with open(path, encoding="utf-8") as f:
+        return len(marshal.dumps(compile(f.read(), path, "exec"))), "marshal"
+
+
+def build(files, output):
+    """Alle Profile bauen; liefert {Profil: {Datei: Pfad}}"""
+    built = {}
+    for profile, overrides in PROFILES.items():
+        folder = os.path.join(output, profile)
+        os.makedirs(folder, exist_ok=True)
+        built[profile] = {}
+        for name in files:
+            with open(os.path.join(HERE, name + ".py"), encoding="utf-8") as f:
+                source = f.read()
+            path = os.path.join(folder, name + ".py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(build_source(source, overrides))
+            built[profile][name] = path
+    return built
+
+
+def run_profile(name, path, minutes, seed):
+    """Gebaute Datei im Simulator spielen lassen; liefert (Konsole, Schreibzugriffe, Ticks, Sekunden)"""
+    board = Board(seed=seed)
+    # Button: alle 1,3s kurz drücken (Starts, Reaktionen und Falschstarts)
+    edges = []
+    for t in range(1000, int(minutes * 60000), 1300):
+        edges += [(t, 0), (t + 80, 1)]
+    board.set_button_timeline(1, edges)
+    ticks = [0]
+
+    def count_ticks(clock, ms):
+        ticks[0] += 1
+        clock.advance_us(ms * 1000)
+
+    board.clock.sleep_hook = count_ticks
+    board.clock.stop_at_ms = int(minutes * 60000)
+    module = board.load(name, path)
+    start = time.perf_counter()
+    run_main(module)
+    return board.console, board.writes, ticks[0], time.perf_counter() - start
+
+
+def without(lines, markers):
+    return [line for line in lines if not line.startswith(markers)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build-Profile bauen und vergleichen")
+    parser.add_argument("dateien", nargs="*", default=list(FILES), help="Schritt-Dateien (ohne .py)")
+    parser.add_argument("--ausgabe", default=os.path.join(HERE, "build"), help="Zielordner")
+    parser.add_argument("--minuten", type=float, default=5.0, help="Simulierte Spielzeit pro Lauf")
+    parser.add_argument("--wiederholungen", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    built = build(args.dateien, args.ausgabe)
+    if not shutil.which("mpy-cross"):
+        print("ℹ️ mpy-cross nicht gefunden: Größe als CPython-Bytecode (pip install mpy-cross für .mpy)")
+    ok = True
+    for name in args.dateien:
+        print(f"▶ {name}")
+        results = {}
+        for profile, paths in built.items():
+            size, kind = code_size(paths[name])
+            with open(paths[name], encoding="utf-8") as f:
+                text = f.read()
+            leftovers = [m for m in DEBUG_MARKERS if m in text]
+            runs = [run_profile(name, paths[name], args.minuten, args.seed)
+                    for _ in range(args.wiederholungen)]
+            console, writes, ticks, _ = runs[0]
+            per_tick = min(r[3] for r in runs) / max(ticks, 1) * 1e6
+            results[profile] = (console, writes)
+            print(f"   {profile:<11} {size:>6} B {kind:<7} {per_tick:6.2f}µs pro Tick  "
+                  f"Debug-Strings: {', '.join(leftovers) if leftovers else '-'}")
+            if profile != "debug" and leftovers:
+                ok = False
+
+        # Gleiches Verhalten wie debug (ohne Debug- und Tick-Zeilen)
+        reference_console, reference_writes = results["debug"]
+        reference = without(reference_console, DEBUG_MARKERS + (BENCHMARK_MARKER,))
+        for profile, (console, writes) in results.items():
+            same = writes == reference_writes and \
+                without(console, DEBUG_MARKERS + (BENCHMARK_MARKER,)) == reference
+            ok = ok and same
+            if not same:
+                print(f"   ❌ {profile}: anderes Verhalten als debug")
+        debug_lines = len(reference_console) - len(reference)
+        print(f"   debug gibt {debug_lines} Zeilen mehr aus; Pins und übrige Ausgaben gleich")
+
+    print(f"✅ Profile in {args.ausgabe}" if ok else "❌ Fehler gefunden")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Gemeinsame Zeitbasis für mehrere Stationen
+==========================================
+
+Jede Station misst mit ihrer eigenen Uhr (ticks_us). Für ein Rennen
+zwischen zwei Stationen braucht es eine gemeinsame Zeit: die Uhr einer
+Schiedsrichter-Station (Server). Die anderen Stationen (Sync) schätzen
+Versatz und Gang ihrer Uhr dagegen, wie bei NTP:
+
+    Station                  Server
+    t1 --- Anfrage ------->  t2
+    t4 <------ Antwort ----  t3
+
+    Versatz  = ((t2 - t1) + (t3 - t4)) / 2
+    Laufzeit = (t4 - t1) - (t3 - t2)
+
+Ein Austausch ist höchstens um die halbe Laufzeit falsch (unsymmetrische
+Wege). Deshalb zählen aus den letzten WINDOW Austauschen nur die
+FIT_SAMPLES mit der kürzesten Laufzeit: bei ihnen kam auf keinem der Wege
+viel Wartezeit dazu. Durch sie wird eine Gerade gelegt: Versatz zum
+Zeitpunkt + Gang (Drift in ppm).
+
+error_us() schätzt den verbleibenden Fehler zu einem Zeitpunkt: die
+Unsicherheit der Geraden dort (COVERAGE-fache Streuung der Vorhersage,
+wächst mit dem Abstand zu den Austauschen) plus die halbe feste
+Unsymmetrie der Wege. Die ist aus den Austauschen grundsätzlich nicht
+messbar und wird angegeben (asymmetry_us). Dazu gehört auch das Warten
+auf poll(): t4 ist der Zeitpunkt, an dem poll() die Antwort liest, nicht
+ihre Ankunft. Wer poll() alle 10ms aufruft, gibt also bis zu 10000 an;
+über UART mit eigenem Empfangs-Interrupt gilt 0.
+
+Verbindung: alles, was Pakete verschicken kann
+- UdpLink: WLAN oder zum Testen 127.0.0.1
+- UartLink: serielle Leitung, Rahmen mit Startbyte
+
+Verwendung (Rennen):
+    sync = clock_sync.Sync(clock_sync.UdpLink(sock, ("192.168.4.1", 5556)),
+                           asymmetry_us=10000)  # poll() im 10ms-Takt
+    sync.poll()                              # in der Hauptschleife
+    go_local = sync.to_local(go_shared_us)   # GO gleichzeitig auf allen Stationen
+    press_shared = sync.to_shared(press_local_us)
+
+Im Simulator prüfen:
+    python clock_sync_sim.py
+"""
+
+import utime
+import struct
+
+PORT = 5556
+PACKET = "<Bqqq"                # Typ, t1, t2, t3
+PACKET_SIZE = struct.calcsize(PACKET)
+MSG_REQUEST = 1
+MSG_REPLY = 2
+UART_START = 0xA5
+
+WINDOW = 128          # Letzte Austausche, aus denen gewählt wird (128 * 0,5s = 64s)
+FIT_SAMPLES = 32      # Die schnellsten davon tragen die Gerade
+COVERAGE = 3          # Restfehler als Vielfaches der Streuung der Vorhersage
+SYNC_INTERVAL_MS = 500
+
+# Lokale Zeit ohne Überlauf (ticks_us läuft nach ~18 Minuten über)
+_last_ticks = utime.ticks_us()
+_local_us = 0
+
+
+def local_us():
+    """Lokale Zeit in µs seit dem Start, läuft nicht über"""
+    global _last_ticks, _local_us
+    now = utime.ticks_us()
+    _local_us += utime.ticks_diff(now, _last_ticks)
+    _last_ticks = now
+    return _local_us
+
+
+class UdpLink:
+    """Pakete über UDP (nicht blockierend)"""
+
+    def __init__(self, sock, peer=None):
+        self.sock = sock
+        self.peer = peer
+        sock.setblocking(False)
+
+    def send(self, data, addr=None):
+        self.sock.sendto(data, addr or self.peer)
+
+    def recv(self):
+        """(Daten, Absender) oder None"""
+        try:
+            return self.sock.recvfrom(64)
+        except OSError:
+            return None
+
+
+class UartLink:
+    """Pakete über eine serielle Leitung: Startbyte + feste Länge"""
+
+    def __init__(self, uart):
+        self.uart = uart
+        self.frame = bytearray(PACKET_SIZE)
+        self.fill = -1          # -1 = warte auf Startbyte
+
+    def send(self, data, addr=None):
+        self.uart.write(bytes((UART_START,)) + data)
+
+    def recv(self):
+        while self.uart.any():
+            byte = self.uart.read(1)[0]
+            if self.fill < 0:
+                if byte == UART_START:
+                    self.fill = 0
+                continue
+            self.frame[self.fill] = byte
+            self.fill += 1
+            if self.fill == PACKET_SIZE:
+                self.fill = -1
+                return bytes(self.frame), None
+        return None
+
+
+class Server:
+    """Schiedsrichter: beantwortet Zeitanfragen, seine Uhr ist die gemeinsame Zeit"""
+
+    def __init__(self, link):
+        self.link = link
+        self.answered = 0
+
+    def poll(self):
+        """Alle wartenden Anfragen beantworten"""
+        while True:
+            packet = self.link.recv()
+            if packet is None:
+                return
+            t2 = local_us()
+            data, addr = packet
+            if len(data) != PACKET_SIZE or data[0] != MSG_REQUEST:
+                continue
+            t1 = struct.unpack(PACKET, data)[1]
+            self.link.send(struct.pack(PACKET, MSG_REPLY, t1, t2, local_us()), addr)
+            self.answered += 1
+
+
+class Sync:
+    """Schätzt Versatz und Gang der eigenen Uhr gegen den Server"""
+
+    def __init__(self, link, interval_ms=SYNC_INTERVAL_MS, asymmetry_us=0):
+        self.link = link
+        self.interval_ms = interval_ms
+        self.asymmetry_us = asymmetry_us  # Größter Unterschied Hin-/Rückweg (angenommen)
+        self.last_request = None
+        self.samples = []        # Letzte Austausche: (lokale Mitte, Versatz, Laufzeit)
+        self.fit_count = 0       # Austausche in der Geraden
+        self.offset_us = 0.0     # Versatz am Bezugspunkt
+        self.drift = 0.0         # µs Versatz-Änderung pro µs lokal
+        self.ref_us = 0          # Lokaler Bezugspunkt der Geraden
+        self.sxx = 0.0           # Streuung der Zeitpunkte (für die Unsicherheit des Gangs)
+        self.residual_us = 0.0   # Streuung der besten Austausche um die Gerade
+        self.min_delay_us = 0
+        self.exchanges = 0
+
+    def request(self):
+        """Zeitanfrage senden"""
+        self.link.send(struct.pack(PACKET, MSG_REQUEST, local_us(), 0, 0))
+        self.last_request = utime.ticks_ms()
+
+    def poll(self):
+        """Antworten auswerten, bei Bedarf neue Anfrage senden"""
+        while True:
+            packet = self.link.recv()
+            if packet is None:
+                break
+            t4 = local_us()
+            data = packet[0]
+            if len(data) != PACKET_SIZE or data[0] != MSG_REPLY:
+                continue
+            _, t1, t2, t3 = struct.unpack(PACKET, data)
+            self.add_sample(t1, t2, t3, t4)
+
+        if (self.last_request is None
+                or utime.ticks_diff(utime.ticks_ms(), self.last_request) >= self.interval_ms):
+            self.request()
+
+    def add_sample(self, t1, t2, t3, t4):
+        """Einen Austausch aufnehmen und die Schätzung erneuern"""
+        offset = ((t2 - t1) + (t3 - t4)) / 2
+        delay = (t4 - t1) - (t3 - t2)
+        self.samples.append(((t1 + t4) // 2, offset, delay))
+        if len(self.samples) > WINDOW:
+            self.samples.pop(0)
+        self.exchanges += 1
+        self.estimate()
+
+    def estimate(self):
+        """Gerade durch die schnellsten Austausche im Fenster"""
+        best = sorted(self.samples, key=lambda s: s[2])[:FIT_SAMPLES]
+        n = len(best)
+        self.min_delay_us = best[0][2]
+        ref = sum(s[0] for s in best) / n
+        mean = sum(s[1] for s in best) / n
+        sxx = sum((s[0] - ref) ** 2 for s in best)
+        if n >= 3 and sxx > 0:
+            drift = sum((s[0] - ref) * (s[1] - mean) for s in best) / sxx
+            # Zwei Freiheitsgrade stecken in der Geraden selbst
+            residual = (sum((s[1] - mean - drift * (s[0] - ref)) ** 2 for s in best) / (n - 2)) ** 0.5
+        else:
+            drift = self.drift
+            residual = 0.0
+        self.fit_count = n
+        self.ref_us = ref
+        self.offset_us = mean
+        self.drift = drift
+        self.sxx = sxx
+        self.residual_us = residual
+
+    def synced(self):
+        """Genug Austausche für eine Gerade?"""
+        return len(self.samples) >= FIT_SAMPLES
+
+    def to_shared(self, local):
+        """Lokale Zeit (µs, local_us()) in gemeinsame Zeit umrechnen"""
+        return int(local + self.offset_us + self.drift * (local - self.ref_us))
+
+    def to_local(self, shared):
+        """Gemeinsame Zeit in lokale Zeit umrechnen (z.B. für den GO-Zeitpunkt)"""
+        return int((shared - self.offset_us + self.drift * self.ref_us) / (1 + self.drift))
+
+    def error_us(self, local=None):
+        """Geschätzter Restfehler von to_shared(local) in µs (ohne local: jetzt)
+
+        Vor der ersten Geraden bleibt nur die sichere Grenze: halbe kürzeste
+        Laufzeit (so unsymmetrisch können die Wege höchstens sein).
+        """
+        if self.fit_count < 3 or self.sxx <= 0:
+            return int(self.min_delay_us / 2 + self.residual_us)
+        if local is None:
+            local = local_us()
+        spread = (1 / self.fit_count + (local - self.ref_us) ** 2 / self.sxx) ** 0.5
+        return int(COVERAGE * self.residual_us * spread + self.asymmetry_us / 2)
+
+    def print_statistics(self):
+        print(f"Zeit-Sync: Versatz {self.offset_us:.0f}µs, Gang {self.drift * 1e6:+.1f}ppm, "
+              f"Restfehler ±{self.error_us()}µs ({self.exchanges} Austausche)")
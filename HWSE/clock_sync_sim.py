@@ -0,0 +1,253 @@
+"""
+Zeitabgleich zwischen Stationen prüfen (Host-Werkzeug)
+======================================================
+
+Prüft clock_sync.py auf zwei Arten:
+
+1. virtuell: ein Schiedsrichter und zwei Stationen im Simulator. Jede Uhr
+   hat einen eigenen Startwert und geht etwas falsch (Drift in ppm), die
+   Pakete brauchen unterschiedlich lang (Grundlaufzeit + Zufall, hin und
+   zurück verschieden). Weil die echte Zeit bekannt ist, lässt sich
+   nachrechnen:
+   - Fehler von to_shared() (Umrechnung eines Drucks in gemeinsame Zeit)
+   - GO-Versatz: wie weit die beiden Stationen beim gemeinsamen
+     GO-Zeitpunkt auseinanderliegen
+   - ob error_us() (Schätzung der Firmware) den echten Fehler abdeckt und
+     dabei nicht mehr als BOUND_FACTOR-mal so groß ist (Fehler unter dem
+     Simulationsraster zählen als Rasterweite: kleiner ist Zufall)
+2. udp: Schiedsrichter und Station über UDP auf 127.0.0.1 in Echtzeit
+   (Stellvertreter für das WLAN); verglichen wird mit der lokalen Zeit des
+   Schiedsrichters im selben Augenblick, ebenfalls auf Abdeckung und
+   BOUND_FACTOR.
+
+Aufruf:
+    python clock_sync_sim.py
+    python clock_sync_sim.py --drift 80 --laufzeit 5 --jitter 3 --sekunden 120
+"""
+
+import argparse
+import heapq
+import random
+import socket
+import sys
+import threading
+import time
+
+from sim_hardware import Board
+
+STEP_US = 500       # Simulationsraster: so genau sind Sende- und Empfangszeitpunkte
+BOUND_FACTOR = 3    # error_us() darf höchstens so viel größer sein als der echte Fehler
+UDP_POLL_US = 1000  # Abstand der poll()-Aufrufe der Station im UDP-Test
+UDP_SLACK_US = 200  # Zwischen den beiden local_us()-Aufrufen vergehen selbst ein paar µs
+
+
+class SimLink:
+    """Paket-Verbindung im Simulator, Zustellung nach (echter) Laufzeit"""
+
+    def __init__(self, net, name):
+        self.net = net
+        self.name = name
+        self.inbox = []
+        self.peer = None
+
+    def send(self, data, addr=None):
+        self.net.send(self.name, addr or self.peer, data)
+
+    def recv(self):
+        if self.inbox:
+            return self.inbox.pop(0)
+        return None
+
+
+class SimNet:
+    """Alle Pakete mit Zustellzeitpunkt in echter Zeit"""
+
+    def __init__(self, rng, base_us, jitter_us, asymmetry_us):
+        self.rng = rng
+        self.base_us = base_us
+        self.jitter_us = jitter_us
+        self.asymmetry_us = asymmetry_us
+        self.links = {}
+        self.pending = []   # (Zustellzeit, Nummer, Ziel, Daten, Absender)
+        self.sent = 0
+        self.now_us = 0
+
+    def link(self, name):
+        self.links[name] = SimLink(self, name)
+        return self.links[name]
+
+    def send(self, source, target, data):
+        delay = self.base_us + self.rng.expovariate(1 / self.jitter_us) if self.jitter_us else self.base_us
+        if target == "server":
+            delay += self.asymmetry_us   # Hinweg langsamer als Rückweg
+        self.sent += 1
+        heapq.heappush(self.pending, (self.now_us + delay, self.sent, target, bytes(data), source))
+
+    def deliver(self, now_us):
+        self.now_us = now_us
+        while self.pending and self.pending[0][0] <= now_us:
+            _, _, target, data, source = heapq.heappop(self.pending)
+            self.links[target].inbox.append((data, source))
+
+
+class SimStation:
+    """Board mit eigener Uhr: lokale Zeit = Start + echte Zeit * (1 + Drift)"""
+
+    def __init__(self, name, net, start_us, drift_ppm):
+        self.name = name
+        self.board = Board()
+        self.module = self.board.load("clock_sync")
+        self.module._local_us = start_us   # Station lief schon vorher
+        self.start_us = start_us
+        self.rate = 1 + drift_ppm * 1e-6
+        self.link = net.link(name)
+        self.link.peer = "server"
+
+    def set_time(self, true_us):
+        """Board-Uhr auf die echte Zeit stellen (mit Drift)"""
+        self.board.clock.now_us = int(true_us * self.rate)
+
+    def local_at(self, true_us):
+        """Wahre lokale Zeit (local_us()) zu einer echten Zeit"""
+        return self.start_us + int(true_us * self.rate)
+
+    def true_at(self, local):
+        """Echte Zeit, zu der die lokale Uhr local zeigt"""
+        return (local - self.start_us) / self.rate
+
+
+def run_virtual(args, rng):
+    net = SimNet(rng, args.laufzeit * 1000, args.jitter * 1000, args.asymmetrie * 1000)
+    server = SimStation("server", net, rng.randint(0, 10**9), rng.uniform(-args.drift, args.drift))
+    stations = [SimStation(name, net, rng.randint(0, 10**9), rng.uniform(-args.drift, args.drift))
+                for name in ("A", "B")]
+    referee = server.module.Server(server.link)
+    # Die Unsymmetrie kann keine Station messen; sie wird wie auf dem Board angegeben
+    syncs = [s.module.Sync(s.link, interval_ms=args.intervall,
+                           asymmetry_us=args.asymmetrie * 1000) for s in stations]
+
+    end_us = int(args.sekunden * 1000000)
+    for true_us in range(0, end_us, STEP_US):
+        net.deliver(true_us)
+        server.set_time(true_us)
+        referee.poll()
+        for station, sync in zip(stations, syncs):
+            station.set_time(true_us)
+            sync.poll()
+
+    # Umrechnung von Drücken in gemeinsame Zeit (nach der Messzeit)
+    print("▶ virtuell: Schiedsrichter + 2 Stationen, "
+          f"Drift bis ±{args.drift}ppm, Laufzeit {args.laufzeit}ms + Zufall {args.jitter}ms, "
+          f"Asymmetrie {args.asymmetrie}ms")
+    ok = True
+    for station, sync in zip(stations, syncs):
+        worst = bound = 0
+        covered = True
+        for _ in range(1000):
+            press_true = end_us + rng.randint(0, 10 * 1000000)
+            local = station.local_at(press_true)
+            error = abs(sync.to_shared(local) - server.local_at(press_true))
+            covered = covered and error <= sync.error_us(local)
+            worst = max(worst, error)
+            bound = max(bound, sync.error_us(local))
+        tight = bound <= BOUND_FACTOR * max(worst, STEP_US)
+        ok = ok and covered and tight
+        print(f"   Station {station.name}: Gang echt {(server.rate / station.rate - 1) * 1e6:+.1f}ppm, "
+              f"geschätzt {sync.drift * 1e6:+.1f}ppm; Druck-Fehler max {worst}µs, "
+              f"Firmware schätzt bis ±{bound}µs {'✅' if covered and tight else '❌'}"
+              f"{'' if covered else ' (nicht abgedeckt)'}{'' if tight else ' (zu grob)'}")
+
+    # Gemeinsamer GO-Zeitpunkt
+    skews = []
+    bound = 0
+    covered = True
+    for _ in range(1000):
+        go_shared = server.local_at(end_us + rng.randint(0, 10 * 1000000))
+        locals_ = [sy.to_local(go_shared) for sy in syncs]
+        a, b = (st.true_at(local) for st, local in zip(stations, locals_))
+        go_bound = sum(sy.error_us(local) for sy, local in zip(syncs, locals_))
+        skews.append(abs(a - b))
+        covered = covered and abs(a - b) <= go_bound
+        bound = max(bound, go_bound)
+    # Jede der beiden Stationen ist auf STEP_US genau
+    tight = bound <= BOUND_FACTOR * max(max(skews), 2 * STEP_US)
+    print(f"   GO-Versatz A↔B: max {max(skews):.0f}µs, Ø {sum(skews) / len(skews):.0f}µs "
+          f"(Schätzung bis ±{bound}µs) {'✅' if covered and tight else '❌'}")
+    print(f"   {net.sent} Pakete")
+    return ok and covered and tight
+
+
+def run_udp(args):
+    """Schiedsrichter und Station über UDP auf 127.0.0.1 in Echtzeit"""
+    server_board = Board(realtime=True, network=True)
+    station_board = Board(realtime=True, network=True, start_ms=123456)
+    server_mod = server_board.load("clock_sync")
+    station_mod = station_board.load("clock_sync")
+    station_mod._local_us = 987654321
+
+    server_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server_sock.bind(("127.0.0.1", 0))
+    station_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    referee = server_mod.Server(server_mod.UdpLink(server_sock))
+    # Die Station liest nur jede Millisekunde (poll() unten): so lange kann
+    # eine Antwort warten, die Anfrage beim Schiedsrichter kaum
+    sync = station_mod.Sync(station_mod.UdpLink(station_sock, server_sock.getsockname()),
+                            interval_ms=50, asymmetry_us=UDP_POLL_US)
+
+    running = [True]
+
+    def serve():
+        while running[0]:
+            referee.poll()
+            time.sleep(0.0002)
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    end = time.perf_counter() + args.udp_sekunden
+    while time.perf_counter() < end:
+        sync.poll()
+        time.sleep(UDP_POLL_US / 1000000)
+
+    errors = []
+    for _ in range(200):
+        local = station_mod.local_us()
+        shared_true = server_mod.local_us()
+        errors.append(abs(sync.to_shared(local) - shared_true))
+        time.sleep(0.001)
+    running[0] = False
+    thread.join()
+    server_sock.close()
+    station_sock.close()
+
+    worst = max(errors)
+    print(f"\n▶ udp: 127.0.0.1, {args.udp_sekunden}s, {sync.exchanges} Austausche, "
+          f"kürzeste Laufzeit {sync.min_delay_us}µs")
+    bound = sync.error_us()
+    covered = worst <= bound + UDP_SLACK_US
+    tight = bound <= BOUND_FACTOR * max(worst, UDP_SLACK_US)
+    print(f"   Fehler max {worst}µs, Ø {sum(errors) / len(errors):.0f}µs, "
+          f"Firmware schätzt ±{bound}µs {'✅' if covered and tight else '❌'}"
+          f"{'' if covered else ' (nicht abgedeckt)'}{'' if tight else ' (zu grob)'}")
+    return covered and tight
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Zeitabgleich zwischen Stationen prüfen")
+    parser.add_argument("--drift", type=float, default=50.0, help="Maximale Uhren-Drift in ppm")
+    parser.add_argument("--laufzeit", type=float, default=2.0, help="Grundlaufzeit eines Pakets in ms")
+    parser.add_argument("--jitter", type=float, default=1.0, help="Mittlere Zusatzlaufzeit in ms")
+    parser.add_argument("--asymmetrie", type=float, default=0.2, help="Hinweg langsamer als Rückweg (ms)")
+    parser.add_argument("--intervall", type=int, default=500, help="Abstand der Anfragen in ms")
+    parser.add_argument("--sekunden", type=float, default=60.0, help="Simulierte Zeit")
+    parser.add_argument("--udp-sekunden", type=float, default=3.0, help="Echtzeit-Test über UDP")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    ok = run_virtual(args, random.Random(args.seed))
+    ok = run_udp(args) and ok
+    print("✅ Zeitabgleich in Ordnung" if ok else "❌ Fehler größer als geschätzt")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Globals gegen Spielkontext: Gleichheit und Geschwindigkeit (Host-Werkzeug)
+==========================================================================
+
+Vergleicht step6_complete_game.py (Modul-Globals) mit step6_context_game.py
+(GameContext mit __slots__, heiße Methoden als lokale Variablen):
+- Gleichheit: beide Varianten spielen dieselben simulierten Sitzungen
+  (gleicher Seed, virtueller Spieler aus replay.py); Konsolen-Ausgabe und
+  Aufzeichnung (recorder.py) müssen Byte für Byte übereinstimmen
+- Geschwindigkeit: Rechenzeit pro Schleifen-Tick im Simulator
+
+Die Zeiten sind CPython-Zeiten inklusive Simulator. Sie zeigen die
+Richtung; auf dem Board zählt die loop_max_us-Statistik der Firmware.
+
+Aufruf:
+    python context_bench.py
+    python context_bench.py --minuten 60 --wiederholungen 5
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from replay import VirtualPlayer
+from sim_hardware import Board, run_main
+
+GLOBALS_STEP = "step6_complete_game"
+CONTEXT_STEP = "step6_context_game"
+
+
+def run(step, minutes, seed):
+    """Variante spielen lassen; liefert (Ausgabe, Sitzungen, Ticks, Sekunden)"""
+    board = Board(seed=seed)
+    module = board.load(step)
+    state = getattr(module, "game", module)   # Kontext-Objekt oder Modul
+    module.recorder.capture_path = None
+    module.histogram.hist_path = None
+    board.set_button_source(VirtualPlayer(state, random.Random(seed)))
+
+    sessions = []
+    end_session = module.recorder.end_session
+
+    def capture():
+        end_session()
+        sessions.append(module.recorder.last_session)
+
+    module.recorder.end_session = capture
+    board.clock.stop_at_ms = board.clock.now_ms() + int(minutes * 60000)
+
+    start = time.perf_counter()
+    run_main(module)
+    seconds = time.perf_counter() - start
+    return board.console, sessions, state.loop_ticks, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Globals- und Kontext-Variante vergleichen")
+    parser.add_argument("--minuten", type=float, default=30.0, help="Simulierte Spielzeit pro Lauf")
+    parser.add_argument("--wiederholungen", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    best = {GLOBALS_STEP: None, CONTEXT_STEP: None}
+    reference = None
+    equal = True
+    for i in range(args.wiederholungen):
+        for step in (GLOBALS_STEP, CONTEXT_STEP):   # abwechselnd, gegen Drift
+            console, sessions, ticks, seconds = run(step, args.minuten, args.seed + i)
+            us_per_tick = 1e6 * seconds / ticks
+            if best[step] is None or us_per_tick < best[step][0]:
+                best[step] = (us_per_tick, ticks)
+            if step == GLOBALS_STEP:
+                reference = (console, sessions)
+            elif (console, sessions) != reference:
+                equal = False
+                print(f"❌ Seed {args.seed + i}: Ausgabe oder Aufzeichnung weicht ab")
+
+    for step, (us_per_tick, ticks) in best.items():
+        print(f"{step:<22} {us_per_tick:7.2f}µs pro Tick (bester Lauf, {ticks} Ticks)")
+    gain = 100 * (1 - best[CONTEXT_STEP][0] / best[GLOBALS_STEP][0])
+    print(f"Kontext-Variante: {gain:+.1f}% weniger Rechenzeit pro Tick")
+    print("✅ Gleiches Verhalten" if equal else "❌ Verhalten unterschiedlich")
+    return 0 if equal else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Adaptive Entprellung pro Schalter
+=================================
+
+Ein fester debounce_ms = 50 passt nicht zu jedem Schalter: ein neuer
+Taster prellt 1-2ms, ein abgenutzter 20ms und mehr (debounce_eval.py).
+AdaptiveDebounce entprellt wie Schritt 3 (Flanke + Sperrfenster: ein
+Pegelwechsel zählt sofort, danach wird window_ms lang kein Wechsel
+übernommen) und misst dabei das Prellen des eigenen Schalters:
+
+- Ein Schub sind abgetastete Pegelwechsel, die höchstens GAP_MS
+  auseinander liegen. Seine Dauer (erster bis letzter Wechsel) ist eine
+  Messung - bei einem sauberen Schalter 0ms.
+- Die Abtastung sieht längst nicht jedes Prellen (oft nur einen Wechsel),
+  der Mittelwert wäre viel zu klein. Geschätzt wird deshalb das längste
+  Prellen der letzten Zeit: eine längere Messung übernimmt sofort, jede
+  kürzere lässt den Wert um 1/256 sinken (Ganzzahlen, Schiebeoperationen).
+- Sperrfenster = längstes Prellen + ein Tick (so weit kann das echte
+  Prellen über die Abtastung hinausgehen) + MARGIN_MS, begrenzt auf
+  min_ms..max_ms. Ohne sichtbares Prellen gilt min_ms.
+
+Bis WARMUP Schübe gemessen sind, gilt das Startfenster (50ms wie bisher).
+Ein übernommener Druck mitten in einem laufenden Schub ist ein
+Phantom-Druck; er wird gezählt, und der lange Schub vergrößert das Fenster.
+
+Ein neu berechnetes Fenster gilt erst nach settle(); die Firmware ruft es
+beim Wechsel nach WAITING auf. So bleibt das Fenster während eines Spiels
+gleich, und recorder.py kann es für ein exaktes Replay aufzeichnen.
+
+Kommt ein Wechsel erst nach dem Sperrfenster an die Reihe (der Pegel lag
+schon darin an), beginnt das neue Fenster beim zuletzt abgetasteten
+Wechsel, nicht erst jetzt. Sonst verschluckt es das Loslassen zwischen
+zwei schnellen Drücken.
+
+Zwischen pause() und resume() wird weiter entprellt, aber nichts gelernt
+oder gezählt - z.B. die sauberen Flanken der Kalibrier-Drahtschleife
+(step6_common.calibrate()), die das geschätzte Prellen verfälschen würden.
+
+Das Fenster verzögert keinen Druck (die Flanke zählt sofort). Ein kleines
+Fenster übernimmt das Loslassen und den nächsten Druck früher, ein großes
+verhindert Phantom-Drücke bei abgenutzten Tastern. Wer den Button länger
+hält als das Fenster, löst keinen zweiten Druck aus.
+
+Abgetastet wird im Takt der Hauptschleife: Prellen kürzer als ein Tick ist
+meist unsichtbar - und braucht dann auch kein Fenster.
+
+Verwendung (siehe step6_complete_game.py, multi_station.py):
+    debouncer = debounce.AdaptiveDebounce("Button")
+    if debouncer.update(button.value(), utime.ticks_ms()):
+        ...                              # Neuer Druck
+    debouncer.settle()                   # In WAITING: neues Fenster übernehmen
+    debouncer.print_statistics()
+"""
+
+import utime
+
+START_MS = 50       # Fenster bis genug gemessen ist (wie debounce_ms bisher)
+MIN_MS = 10         # Nicht unter einen Tick der Hauptschleife
+TICK_MS = 10        # Takt der Hauptschleife (Abtastung)
+MAX_MS = 80         # Darüber würde schnelles Drücken verschluckt
+GAP_MS = 25         # Wechsel mit kleinerem Abstand gehören zum selben Schub
+MARGIN_MS = 2
+WARMUP = 8          # So viele Schübe, bevor das Fenster angepasst wird
+DECAY_SHIFT = 8     # Längstes Prellen sinkt pro kürzerem Schub um 1/256
+
+
+class AdaptiveDebounce:
+    """Entprellung eines Schalters mit gemessenem Sperrfenster"""
+
+    __slots__ = (
+        "name", "min_ms", "max_ms", "window_ms", "estimate_ms",
+        "level", "raw", "accepted_ms",
+        "in_burst", "burst_ms", "change_ms", "burst_accepts",
+        "mean_x8", "peak_x8", "bursts", "presses", "phantoms", "learning",
+    )
+
+    def __init__(self, name, min_ms=MIN_MS, max_ms=MAX_MS, start_ms=START_MS):
+        self.name = name
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.window_ms = min(max(start_ms, min_ms), max_ms)
+        self.estimate_ms = self.window_ms   # Gilt ab dem nächsten settle()
+
+        self.level = 1            # Entprellter Pegel (Pull-up: 1 = losgelassen)
+        self.raw = 1              # Zuletzt abgetasteter Pegel
+        self.accepted_ms = 0      # Letzter übernommener Wechsel
+
+        self.in_burst = False
+        self.burst_ms = 0         # Erster Wechsel des laufenden Schubs
+        self.change_ms = 0        # Letzter Wechsel des laufenden Schubs
+        self.burst_accepts = 0    # Im laufenden Schub übernommene Wechsel
+
+        self.mean_x8 = 0          # Mittlere gemessene Prelldauer, mal 8 (nur Statistik)
+        self.peak_x8 = 0          # Längstes Prellen der letzten Zeit, mal 8
+        self.bursts = 0
+        self.presses = 0
+        self.phantoms = 0
+        self.learning = True      # False zwischen pause() und resume()
+
+    def update(self, level, now_ms):
+        """Abgetasteten Pegel verarbeiten; True bei einem neuen Druck"""
+        if self.in_burst and utime.ticks_diff(now_ms, self.change_ms) > GAP_MS:
+            self.in_burst = False
+            if self.learning:
+                self.learn(utime.ticks_diff(self.change_ms, self.burst_ms))
+
+        if level != self.raw:
+            self.raw = level
+            if not self.in_burst:
+                self.in_burst = True
+                self.burst_ms = now_ms
+                self.burst_accepts = 0
+            self.change_ms = now_ms
+
+        if level == self.level or utime.ticks_diff(now_ms, self.accepted_ms) <= self.window_ms:
+            return False
+
+        self.level = level
+        self.accepted_ms = self.change_ms   # Wechsel zu level zuletzt abgetastet
+        if self.in_burst:
+            self.burst_accepts += 1
+        if level:
+            return False
+        if self.learning:
+            self.presses += 1
+            if self.burst_accepts > 1:
+                self.phantoms += 1
+        return True
+
+    def learn(self, duration_ms):
+        """Dauer eines Schubs in die Schätzung aufnehmen"""
+        self.bursts += 1
+        self.mean_x8 += duration_ms - (self.mean_x8 >> 3)
+        if duration_ms << 3 >= self.peak_x8:
+            self.peak_x8 = duration_ms << 3
+        else:
+            self.peak_x8 -= (self.peak_x8 >> DECAY_SHIFT) or 1
+        if self.bursts >= WARMUP:
+            peak = self.peak_x8 >> 3
+            window = peak + TICK_MS + MARGIN_MS if peak else self.min_ms
+            self.estimate_ms = min(max(window, self.min_ms), self.max_ms)
+
+    def pause(self):
+        """Weiter entprellen, aber kein Prellen lernen und nichts zählen"""
+        self.learning = False
+
+    def resume(self):
+        """Wieder lernen; ein noch offener Schub gehört zur Pause und wird verworfen"""
+        self.learning = True
+        self.in_burst = False
+
+    def settle(self):
+        """Geschätztes Fenster übernehmen; True wenn es sich geändert hat"""
+        if self.estimate_ms == self.window_ms:
+            return False
+        self.window_ms = self.estimate_ms
+        return True
+
+    def print_statistics(self):
+        """Gewähltes Fenster und gemessenes Prellen ausgeben"""
+        state = "gemessen" if self.bursts >= WARMUP else f"Start, {self.bursts}/{WARMUP} Schübe"
+        print(f"Entprellung {self.name}: {self.window_ms}ms ({state}; Prellen "
+              f"Ø {self.mean_x8 >> 3}ms, max {self.peak_x8 >> 3}ms, {self.presses} Drücke, "
+              f"{self.phantoms} Phantom)")
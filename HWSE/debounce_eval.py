@@ -0,0 +1,283 @@
+"""
+Monte-Carlo-Bewertung der Entprell-Varianten (Host-Werkzeug)
+============================================================
+
+Im Projekt gibt es drei Entprell-Varianten, alle mit debounce_ms = 50:
+- "sperre":  button_pressed() aus Schritt 1/2/6 (Sperrzeit nach jedem Druck)
+- "flanke":  update_button_debounced() aus Schritt 3-5 (Flanke + Zeitfenster)
+- "klasse":  DebouncedButton aus step3_button_debounce_old.py; die Klasse selbst
+             fehlt in der Datei, ihre funktionale Portierung ist
+             step3_button_debounce_functional.py -> gleiche Logik wie "flanke",
+             aber mit der 10ms-Schleife der Klassenversion
+Zum Vergleich kommt "stabil" dazu (Pegel muss debounce_ms lang stabil sein).
+
+Das Werkzeug erzeugt große Stapel prellender Tastendrücke (NumPy, 1ms-Raster),
+tastet sie wie die Hauptschleife ab und zählt pro Variante:
+- verpasste Drücke
+- Phantom-Drücke (mehr als ein Ereignis pro Druck)
+- zusätzliche Latenz vom echten Drücken bis zur Erkennung
+
+Aufgezeichnete Prellverläufe (z.B. vom Logikanalysator) können als CSV
+eingelesen werden: eine Zeile pro Flanke "schalter,druck,t_us,pegel".
+Für jeden Schalter wird dann ein debounce_ms empfohlen.
+
+Empfohlen wird der kleinste debounce_ms, bei dem verpasste und
+Phantom-Drücke unter einer Grenze bleiben (--max-verpasst/--max-phantom,
+Standard je 0.1%). Das ist eine Toleranz, kein "fehlerfrei": bei 20000
+Drücken sind 0.1% noch 20 Fehldrücke. Wer 0/0 verlangt, setzt beide Grenzen
+auf 0 (je mehr Drücke, desto strenger).
+
+Benötigt NumPy.
+
+Aufruf:
+    python debounce_eval.py                      # Synthetische Profile
+    python debounce_eval.py --debounce 20 50 80
+    python debounce_eval.py --aufnahme schalter.csv
+"""
+
+import argparse
+import csv
+import sys
+import time
+
+import numpy as np
+
+WINDOW_MS = 800        # Länge eines simulierten Verlaufs
+PRESS_OFFSET_MS = 100  # Drücken beginnt hier (bei Aufnahmen)
+
+# (Algorithmus, Schleifenperiode in ms) wie in den Schritt-Dateien
+STRATEGIES = {
+    "sperre@10": ("sperre", 10),   # Schritt 1 und 6
+    "sperre@20": ("sperre", 20),   # Schritt 2
+    "flanke@20": ("flanke", 20),   # Schritt 3-5
+    "klasse@10": ("flanke", 10),   # Klassenversion (step3_button_debounce_old.py)
+    "stabil@10": ("stabil", 10),
+}
+
+# Synthetische Schalterprofile: mittlere Prelldauer beim Drücken/Loslassen (ms)
+PROFILES = {
+    "neu": (1.5, 1.0),
+    "normal": (5.0, 3.0),
+    "abgenutzt": (20.0, 10.0),
+}
+
+
+def generate_presses(rng, n, bounce_press_ms, bounce_release_ms,
+                     hold_ms=(60, 250), glitch_per_ms=0.0):
+    """n prellende Tastendrücke als (n, WINDOW_MS)-Array erzeugen (1 = losgelassen)"""
+    t = np.arange(WINDOW_MS)[None, :]
+    press_t = rng.integers(100, 200, n)[:, None]
+    release_t = press_t + rng.integers(hold_ms[0], hold_ms[1], n)[:, None]
+
+    # Prelldauer pro Druck (lognormal um den Profilwert)
+    bp = np.maximum(bounce_press_ms * rng.lognormal(0.0, 0.5, n), 0.5)[:, None]
+    br = np.maximum(bounce_release_ms * rng.lognormal(0.0, 0.5, n), 0.5)[:, None]
+
+    pressed = (t >= press_t) & (t < release_t)
+    u = rng.random((n, WINDOW_MS))
+
+    # Beim Drücken: Kontakt schließt mit steigender Wahrscheinlichkeit
+    in_press_bounce = (t >= press_t) & (t < press_t + bp)
+    frac = (t - press_t) / bp
+    pressed &= ~in_press_bounce | (u < 0.3 + 0.7 * frac)
+
+    # Beim Loslassen: Kontakt öffnet mit steigender Wahrscheinlichkeit
+    in_release_bounce = (t >= release_t) & (t < release_t + br)
+    frac = (t - release_t) / br
+    pressed |= in_release_bounce & (u >= 0.3 + 0.7 * frac)
+
+    # Störimpulse (1ms lang) im Ruhezustand
+    if glitch_per_ms > 0:
+        pressed |= rng.random((n, WINDOW_MS)) < glitch_per_ms
+
+    level = np.where(pressed, 0, 1).astype(np.int8)
+    return level, press_t[:, 0]
+
+
+def sample(level, period_ms, rng):
+    """Abtasten wie die Hauptschleife: alle period_ms mit zufälliger Phase"""
+    n = level.shape[0]
+    k = WINDOW_MS // period_ms
+    phase = rng.integers(0, period_ms, n)[:, None]
+    # Zeitpunkte weit weg von 0, damit die Startwerte (last_* = 0) nicht stören
+    idx = np.minimum(phase + period_ms * np.arange(k)[None, :], WINDOW_MS - 1)
+    return level[np.arange(n)[:, None], idx], idx + 10000
+
+
+def run_strategy(algorithm, samples, times, debounce_ms):
+    """Entprell-Algorithmus spaltenweise (über alle Drücke gleichzeitig) ausführen"""
+    n, k = samples.shape
+    count = np.zeros(n, dtype=np.int32)
+    first = np.full(n, -1, dtype=np.int64)
+
+    if algorithm == "sperre":
+        last = np.zeros(n, dtype=np.int64)
+        for i in range(k):
+            s, t = samples[:, i], times[:, i]
+            fire = (s == 0) & (t - last > debounce_ms)
+            last = np.where(fire, t, last)
+            first = np.where(fire & (first < 0), t, first)
+            count += fire
+
+    elif algorithm == "flanke":
+        last_state = np.ones(n, dtype=np.int8)
+        last_change = np.zeros(n, dtype=np.int64)
+        for i in range(k):
+            s, t = samples[:, i], times[:, i]
+            accept = (s != last_state) & (t - last_change > debounce_ms)
+            last_change = np.where(accept, t, last_change)
+            last_state = np.where(accept, s, last_state)
+            fire = accept & (s == 0)
+            first = np.where(fire & (first < 0), t, first)
+            count += fire
+
+    elif algorithm == "stabil":
+        stable = np.ones(n, dtype=np.int8)
+        candidate = np.ones(n, dtype=np.int8)
+        since = np.zeros(n, dtype=np.int64)
+        for i in range(k):
+            s, t = samples[:, i], times[:, i]
+            changed = s != candidate
+            candidate = np.where(changed, s, candidate)
+            since = np.where(changed, t, since)
+            accept = ~changed & (candidate != stable) & (t - since >= debounce_ms)
+            stable = np.where(accept, candidate, stable)
+            fire = accept & (stable == 0)
+            first = np.where(fire & (first < 0), t, first)
+            count += fire
+
+    else:
+        raise ValueError(f"Unbekannter Algorithmus: {algorithm}")
+
+    return count, first
+
+
+class Score:
+    """Kennzahlen einer Variante bei einem debounce_ms"""
+
+    def __init__(self, strategy, debounce_ms, count, first, press_t):
+        detected = first >= 0
+        latency = (first - 10000 - press_t)[detected]
+        n = len(count)
+        self.strategy = strategy
+        self.debounce_ms = debounce_ms
+        self.missed = float(np.mean(count == 0))
+        self.phantom = float(np.sum(np.maximum(count - 1, 0))) / n
+        self.latency_mean = float(latency.mean()) if latency.size else float("nan")
+        self.latency_p95 = float(np.percentile(latency, 95)) if latency.size else float("nan")
+
+    def row(self):
+        return (f"   {self.strategy:<10} {self.debounce_ms:>4}ms  verpasst {100 * self.missed:6.2f}%  "
+                f"Phantom {100 * self.phantom:6.2f}%  Latenz Ø {self.latency_mean:5.1f}ms "
+                f"P95 {self.latency_p95:5.1f}ms")
+
+
+def evaluate(level, press_t, strategies, debounce_values, rng):
+    """Alle Varianten für alle debounce_ms auf denselben Verläufen bewerten"""
+    scores = []
+    for name in strategies:
+        algorithm, period = STRATEGIES[name]
+        samples, times = sample(level, period, rng)
+        for d in debounce_values:
+            count, first = run_strategy(algorithm, samples, times, d)
+            scores.append(Score(name, d, count, first, press_t))
+    return scores
+
+
+def recommend(scores, max_missed=0.001, max_phantom=0.001):
+    """Pro Variante den kleinsten debounce_ms innerhalb der Grenzen wählen"""
+    best = {}
+    for score in sorted(scores, key=lambda s: s.debounce_ms):
+        if score.strategy in best:
+            continue
+        if score.missed <= max_missed and score.phantom <= max_phantom:
+            best[score.strategy] = score
+    return best
+
+
+def load_captures(path):
+    """CSV-Aufnahme "schalter,druck,t_us,pegel" in Verläufe pro Schalter umwandeln"""
+    edges = {}
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith("#") or row[0] == "schalter":
+                continue
+            switch, press, t_us, level = row[0], row[1], int(row[2]), int(row[3])
+            edges.setdefault(switch, {}).setdefault(press, []).append((t_us, level))
+
+    captures = {}
+    for switch, presses in edges.items():
+        level = np.ones((len(presses), WINDOW_MS), dtype=np.int8)
+        for row, press_edges in enumerate(presses.values()):
+            press_edges.sort()
+            t0 = press_edges[0][0]
+            for (t_us, lv), nxt in zip(press_edges, press_edges[1:] + [(None, None)]):
+                start = PRESS_OFFSET_MS + (t_us - t0) // 1000
+                end = WINDOW_MS if nxt[0] is None else PRESS_OFFSET_MS + (nxt[0] - t0) // 1000
+                level[row, min(start, WINDOW_MS):min(max(end, start + 1), WINDOW_MS)] = lv
+        captures[switch] = (level, np.full(len(presses), PRESS_OFFSET_MS))
+    return captures
+
+
+def report(title, scores, best, show_all, max_missed, max_phantom):
+    print(f"\n▶ {title}")
+    if show_all:
+        for score in scores:
+            print(score.row())
+    print(f"   Empfehlung (kleinster debounce_ms mit höchstens {100 * max_missed:.2f}% verpasst "
+          f"und {100 * max_phantom:.2f}% Phantom):")
+    for name in STRATEGIES:
+        if name in best:
+            print(best[name].row())
+        elif any(s.strategy == name for s in scores):
+            hint = ""
+            if STRATEGIES[name][0] == "sperre":
+                hint = " (Sperre < Haltedauer -> Wiederholung solange gedrückt)"
+            print(f"   {name:<10} kein Wert innerhalb der Grenzen im Suchbereich{hint}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Entprell-Varianten bewerten")
+    parser.add_argument("--drucke", type=int, default=20000, help="Drücke pro Profil/Wiederholung")
+    parser.add_argument("--debounce", type=int, nargs="+", help="Nur diese Werte ausgeben")
+    parser.add_argument("--suche", type=int, nargs=3, default=(0, 101, 2),
+                        metavar=("VON", "BIS", "SCHRITT"), help="Suchbereich für Empfehlungen")
+    parser.add_argument("--aufnahme", help="CSV mit aufgezeichneten Prellverläufen")
+    parser.add_argument("--wiederholungen", type=int, default=50,
+                        help="Abtastphasen pro aufgezeichnetem Druck")
+    parser.add_argument("--stoerungen", type=float, default=0.0, help="Störimpulse pro ms")
+    parser.add_argument("--max-phantom", type=float, default=0.001,
+                        help="Erlaubter Anteil Phantom-Drücke (0 = keiner)")
+    parser.add_argument("--max-verpasst", type=float, default=0.001,
+                        help="Erlaubter Anteil verpasster Drücke (0 = keiner)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    debounce_values = args.debounce or list(range(*args.suche))
+    start = time.perf_counter()
+
+    if args.aufnahme:
+        sources = {}
+        for switch, (level, press_t) in load_captures(args.aufnahme).items():
+            reps = args.wiederholungen
+            sources[f"Schalter {switch} ({len(level)} Drücke)"] = (
+                np.repeat(level, reps, axis=0), np.repeat(press_t, reps))
+    else:
+        sources = {}
+        for name, (bp, br) in PROFILES.items():
+            level, press_t = generate_presses(rng, args.drucke, bp, br,
+                                              glitch_per_ms=args.stoerungen)
+            sources[f"Profil '{name}' (Prellen ~{bp}ms/{br}ms)"] = (level, press_t)
+
+    for title, (level, press_t) in sources.items():
+        scores = evaluate(level, press_t, STRATEGIES, debounce_values, rng)
+        best = recommend(scores, args.max_verpasst, args.max_phantom)
+        report(title, scores, best, bool(args.debounce), args.max_verpasst, args.max_phantom)
+
+    print(f"\nFertig in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Adaptive Entprellung im Simulator prüfen (Host-Werkzeug)
+========================================================
+
+Schickt prellende Tastendrücke durch debounce.py (im Simulator geladen),
+abgetastet wie die Hauptschleife alle 10ms mit zufälliger Phase. Die
+Profile entsprechen debounce_eval.py (neu, normal, abgenutzt), dazu ein
+kaputter Taster, der länger prellt als die festen 50ms. Gedrückt wird in
+zufälligen Abständen, auch schnell hintereinander; nach jedem Druck ruft
+das Werkzeug settle() auf wie die Firmware in WAITING.
+
+Verglichen werden das feste Fenster (50ms wie bisher) und das adaptive:
+- gewähltes Fenster (muss zwischen MIN_MS und MAX_MS liegen)
+- verpasste Drücke und Phantom-Drücke (mehr als ein Druck erkannt)
+- Verzögerung vom echten Drücken bis zur Erkennung
+
+Geprüft wird:
+- Das adaptive Fenster ist bei neuen Tastern kleiner und schneller
+- Nirgends mehr Phantom-Drücke als mit dem festen Fenster, beim kaputten
+  Taster höchstens halb so viele (TOLERANCE: Zufall bei 2000 Drücken)
+- Nicht mehr verpasste Drücke als mit dem festen Fenster auf derselben
+  Zeitleiste. Mehr nur, wenn das größere Fenster dafür insgesamt weniger
+  Fehler macht (verpasst + Phantom, kaputter Taster); das steht dann mit
+  beiden Werten in der Ausgabe.
+
+Aufruf:
+    python debounce_sim.py
+    python debounce_sim.py --druecke 5000 --seed 3
+"""
+
+import argparse
+import bisect
+import random
+import sys
+
+from sim_hardware import Board
+
+PERIOD_US = 10000       # Takt der Hauptschleife
+TOLERANCE = 0.003       # Zufallsschwankung beim Vergleich fest/adaptiv
+
+# Mittlere Prelldauer beim Drücken/Loslassen in ms (wie debounce_eval.py)
+PROFILES = {
+    "neu": (1.5, 1.0),
+    "normal": (5.0, 3.0),
+    "abgenutzt": (20.0, 10.0),
+    "kaputt": (45.0, 25.0),
+}
+
+
+def bounce(rng, edges, t_us, final, mean_ms):
+    """Prellen ab t_us: kurze Wechsel, bis der Kontakt auf final bleibt"""
+    end_us = t_us + int(max(mean_ms * rng.lognormvariate(0.0, 0.5), 0.5) * 1000)
+    level = final
+    while t_us < end_us:
+        edges.append((t_us, level))
+        level ^= 1
+        t_us += rng.randint(100, 2000)
+    edges.append((max(t_us, end_us), final))
+
+
+def generate(rng, presses, profile):
+    """Flanken-Zeitleiste (t_us, Pegel) und die echten Druck-Zeitpunkte"""
+    press_ms, release_ms = PROFILES[profile]
+    edges = []
+    press_us = []
+    t_us = 100000
+    for _ in range(presses):
+        press_us.append(t_us)
+        bounce(rng, edges, t_us, 0, press_ms)
+        t_us += rng.randint(60000, 250000)          # Haltedauer
+        bounce(rng, edges, t_us, 1, release_ms)
+        t_us += rng.choice((rng.randint(40000, 120000), rng.randint(300000, 900000)))
+    return edges, press_us
+
+
+def run(debounce, edges, press_us, fixed):
+    """Zeitleiste abtasten; liefert (Entpreller, Erkennungen pro Druck, Verzögerungen in µs)"""
+    if fixed:
+        debouncer = debounce.AdaptiveDebounce("fest", debounce.START_MS, debounce.START_MS)
+    else:
+        debouncer = debounce.AdaptiveDebounce("adaptiv")
+    times = [t for t, _ in edges]
+    end_us = edges[-1][0] + 1000000
+    phase_us = 3717
+    counts = [0] * len(press_us)
+    delays = []
+    current = -1
+    for t_us in range(phase_us, end_us, PERIOD_US):
+        i = bisect.bisect_right(times, t_us)
+        level = edges[i - 1][1] if i else 1
+        while current + 1 < len(press_us) and press_us[current + 1] <= t_us:
+            current += 1
+            debouncer.settle()      # Wie die Firmware in WAITING, zwischen zwei Drücken
+        if debouncer.update(level, t_us // 1000) and current >= 0:
+            if counts[current] == 0:
+                delays.append(t_us - press_us[current])
+            counts[current] += 1
+    return debouncer, counts, delays
+
+
+class Score:
+    """Kennzahlen eines Entprellers auf einer Zeitleiste"""
+
+    def __init__(self, debouncer, counts, delays):
+        n = len(counts)
+        self.window_ms = debouncer.window_ms
+        self.missed = sum(1 for c in counts if c == 0) / n
+        self.phantom = sum(c - 1 for c in counts if c > 1) / n
+        ordered = sorted(delays)
+        self.delay_ms = sum(ordered) / len(ordered) / 1000 if ordered else float("nan")
+        self.p99_ms = ordered[min(len(ordered) * 99 // 100, len(ordered) - 1)] / 1000 if ordered else float("nan")
+
+    def row(self, name):
+        return (f"   {name:<8} {self.window_ms:>3}ms  verpasst {100 * self.missed:5.2f}%  "
+                f"Phantom {100 * self.phantom:5.2f}%  Verzögerung Ø {self.delay_ms:5.1f}ms "
+                f"P99 {self.p99_ms:5.1f}ms")
+
+
+def check_profile(debounce, profile, args):
+    rng = random.Random(f"{args.seed}-{profile}")
+    edges, press_us = generate(rng, args.druecke, profile)
+    fixed = Score(*run(debounce, edges, press_us, True))
+    debouncer, counts, delays = run(debounce, edges, press_us, False)
+    adaptive = Score(debouncer, counts, delays)
+
+    print(f"\n▶ Profil '{profile}' (Prellen ~{PROFILES[profile][0]}ms/{PROFILES[profile][1]}ms, "
+          f"{args.druecke} Drücke)")
+    print(fixed.row("fest"))
+    print(adaptive.row("adaptiv"))
+    debouncer.print_statistics()
+
+    in_limits = debounce.MIN_MS <= adaptive.window_ms <= debounce.MAX_MS
+    no_phantoms = adaptive.phantom <= fixed.phantom + TOLERANCE
+    more_missed = adaptive.missed > fixed.missed
+    # Mehr verpasste Drücke nur gegen insgesamt weniger Fehler
+    no_missed = not more_missed or \
+        adaptive.missed + adaptive.phantom < fixed.missed + fixed.phantom
+    trade = (f", dafür Fehler gesamt {100 * (adaptive.missed + adaptive.phantom):.2f}% statt "
+             f"{100 * (fixed.missed + fixed.phantom):.2f}%") if more_missed else ""
+    ok = in_limits and no_phantoms and no_missed
+    print(f"   Fenster in {debounce.MIN_MS}-{debounce.MAX_MS}ms: {'✅' if in_limits else '❌'}, "
+          f"nicht mehr Phantom als fest: {'✅' if no_phantoms else '❌'}, "
+          f"verpasst {100 * adaptive.missed:.2f}% (fest {100 * fixed.missed:.2f}%{trade}): "
+          f"{'✅' if no_missed else '❌'}")
+    return ok, fixed, adaptive
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Adaptive Entprellung im Simulator prüfen")
+    parser.add_argument("profile", nargs="*", default=list(PROFILES), help="Schalterprofile")
+    parser.add_argument("--druecke", type=int, default=2000, help="Drücke pro Profil")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    debounce = Board(quiet=False).load("debounce")
+    ok = True
+    results = {}
+    for profile in args.profile:
+        good, fixed, adaptive = check_profile(debounce, profile, args)
+        ok = ok and good
+        results[profile] = (fixed, adaptive)
+
+    if "neu" in results:
+        fixed, adaptive = results["neu"]
+        faster = adaptive.window_ms < fixed.window_ms and adaptive.delay_ms <= fixed.delay_ms
+        ok = ok and faster
+        print(f"\nNeuer Taster: Fenster {adaptive.window_ms}ms statt {fixed.window_ms}ms, "
+              f"Verzögerung Ø {adaptive.delay_ms:.1f}ms statt {fixed.delay_ms:.1f}ms "
+              f"{'✅' if faster else '❌'}")
+    if "kaputt" in results:
+        fixed, adaptive = results["kaputt"]
+        fewer = adaptive.phantom < fixed.phantom / 2
+        ok = ok and fewer
+        print(f"Kaputter Taster: Fenster {adaptive.window_ms}ms statt {fixed.window_ms}ms, "
+              f"Phantom {100 * adaptive.phantom:.2f}% statt {100 * fixed.phantom:.2f}% "
+              f"{'✅' if fewer else '❌'}")
+    print("✅ Entprellung in Ordnung" if ok else "❌ Fehler gefunden")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
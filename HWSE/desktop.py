@@ -0,0 +1,388 @@
+"""
+Reaktionsspiel am Linux-PC, Tastatur als Button (Host-Werkzeug)
+===============================================================
+
+Übungsstationen auf alten Linux-Rechnern: die Schritt-Dateien laufen
+unverändert unter CPython. Pin, PWM und utime kommen aus sim_hardware.py,
+die Uhr läuft in Echtzeit (CLOCK_MONOTONIC). Eine Taste ist der Button,
+LED und Buzzer erscheinen als Statuszeile im Terminal.
+
+Eingabe, ohne Abfrage-Schleife:
+- evdev (--geraet /dev/input/eventN): Drücken und Loslassen mit dem
+  Zeitstempel des Kernels (auf CLOCK_MONOTONIC umgestellt). Lesen darf
+  die Gruppe "input"; mit --exklusiv landen die Tasten nicht im Terminal.
+- Terminal (ohne --geraet): Rohmodus, jede Taste ist ein kurzer Druck
+  (Terminals melden kein Loslassen). Zeitpunkt ist das Aufwachen, einen
+  Kernel-Zeitstempel gibt es hier nicht.
+
+utime.sleep_ms() der Firmware schläft in select() auf der Eingabe und
+wacht beim ersten Ereignis auf. Die Uhr der Firmware springt dabei auf den
+Zeitstempel des Ereignisses zurück (nie hinter den Beginn des Schlafs):
+der Tick, der das Drücken sieht, läuft für die Firmware genau zum
+Kernel-Zeitstempel. Die Uhr läuft danach um die Aufwach-Verzögerungen
+hinter der echten Zeit her; Zeitabstände bleiben richtig. Kommt ein
+Ereignis erst an, nachdem der Schlaf, in den es fiel, schon vorbei war,
+zählt der Beginn des nächsten Schlafs - der Fehler ist dann höchstens die
+Zustell-Verzögerung.
+
+Ohne Tastatur-Gerät: --selbsttest schreibt evdev-Ereignisse mit bekannten
+Zeitstempeln in eine Pipe, absichtlich 3ms zu spät. Die gemessenen
+Reaktionszeiten müssen trotzdem zu den Zeitstempeln passen.
+
+Aufruf:
+    python desktop.py                                  # Terminal, beliebige Taste
+    python desktop.py --geraet /dev/input/event3 --taste 57 --exklusiv
+    python desktop.py step4_random_timing
+    python desktop.py --selbsttest --spiele 3
+"""
+
+import argparse
+import fcntl
+import os
+import select
+import struct
+import sys
+import termios
+import threading
+import time
+import tty
+
+from sim_hardware import Board, VirtualClock, StopSimulation, run_main
+
+EVENT_FORMAT = "llHHi"                  # struct input_event (64 Bit): Zeit, Typ, Code, Wert
+EVENT_SIZE = struct.calcsize(EVENT_FORMAT)
+EV_KEY = 1
+KEY_SPACE = 57
+EVIOCGRAB = 0x40044590
+EVIOCSCLOCKID = 0x400445A0
+TERMINAL_HOLD_US = 100000               # Terminal: so lange gilt eine Taste als gedrückt
+PRESS_US = 100000                       # Selbsttest: Dauer eines Drucks
+LED_PIN = 2
+BUZZER_PIN = 4
+REDRAW_US = 40000                       # Statuszeile höchstens 25x pro Sekunde (außer an/aus)
+
+
+def monotonic_ns():
+    return time.clock_gettime_ns(time.CLOCK_MONOTONIC)
+
+
+class EvdevInput:
+    """Tastatur über /dev/input/eventN: (Pegel, Zeitstempel ns) pro Druck/Loslassen"""
+
+    def __init__(self, path=None, key=KEY_SPACE, grab=False, fd=None):
+        self.key = key
+        self.fd = fd if fd is not None else os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        self.grabbed = False
+        if fd is None:
+            # Zeitstempel auf CLOCK_MONOTONIC (Standard wäre die Uhrzeit)
+            fcntl.ioctl(self.fd, EVIOCSCLOCKID, struct.pack("i", time.CLOCK_MONOTONIC))
+            if grab:
+                fcntl.ioctl(self.fd, EVIOCGRAB, 1)
+                self.grabbed = True
+        self.pending = b""
+
+    def fileno(self):
+        return self.fd
+
+    def read(self, now_ns):
+        """Lesbare Ereignisse; Autorepeat (Wert 2) und andere Tasten zählen nicht"""
+        try:
+            self.pending += os.read(self.fd, EVENT_SIZE * 64)
+        except BlockingIOError:
+            return []
+        events = []
+        usable = len(self.pending) - len(self.pending) % EVENT_SIZE
+        for offset in range(0, usable, EVENT_SIZE):
+            sec, usec, kind, code, value = struct.unpack_from(EVENT_FORMAT, self.pending, offset)
+            if kind == EV_KEY and code == self.key and value in (0, 1):
+                # Button mit Pull-up: gedrückt = 0
+                events.append((0 if value else 1, sec * 1000000000 + usec * 1000))
+        self.pending = self.pending[usable:]
+        return events
+
+    def close(self):
+        if self.grabbed:
+            fcntl.ioctl(self.fd, EVIOCGRAB, 0)
+        os.close(self.fd)
+
+
+class TerminalInput:
+    """Terminal im Rohmodus: jede Taste ist ein kurzer Druck zum Zeitpunkt des Aufwachens"""
+
+    def __init__(self, stream=sys.stdin):
+        self.fd = stream.fileno()
+        self.saved = termios.tcgetattr(self.fd)
+        tty.setcbreak(self.fd)   # Strg+C bleibt ein KeyboardInterrupt
+
+    def fileno(self):
+        return self.fd
+
+    def read(self, now_ns):
+        if not os.read(self.fd, 64):
+            return []
+        return [(0, now_ns)]     # Loslassen setzt DesktopClock nach TERMINAL_HOLD_US
+
+    def close(self):
+        termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved)
+
+
+class DesktopClock(VirtualClock):
+    """Echtzeit-Uhr, deren sleep in select() auf die Eingabe wartet"""
+
+    def __init__(self, source, release_after_us=None):
+        VirtualClock.__init__(self, 0)
+        self.source = source
+        self.release_after_us = release_after_us   # Nur Terminal: kein Loslassen gemeldet
+        self.level = 1
+        self.release_at_us = None
+        self.wake_lags_us = []      # Aufwachen minus Zeitstempel, pro Ereignis
+        self.late = 0               # Ereignisse erst nach ihrem Schlaf zugestellt
+
+    @property
+    def now_us(self):
+        return (monotonic_ns() - self._offset_ns) // 1000
+
+    @now_us.setter
+    def now_us(self, value):
+        self._offset_ns = monotonic_ns() - value * 1000
+
+    def button(self, now_ms):
+        """Pegel für board.set_button_source()"""
+        if self.release_at_us is not None and self.now_us >= self.release_at_us:
+            self.release_at_us = None
+            self.level = 1
+        return self.level
+
+    def advance_us(self, us):
+        start_us = self.now_us
+        deadline_us = start_us + us
+        while True:
+            remaining_us = deadline_us - self.now_us
+            if remaining_us <= 0:
+                break
+            ready, _, _ = select.select([self.source], [], [], remaining_us / 1000000)
+            if not ready:
+                break
+            now_ns = monotonic_ns()
+            events = self.source.read(now_ns)
+            if not events:
+                continue
+            for level, _ in events:
+                self.level = level
+            # Die Firmware wacht "zum Zeitstempel" des ersten Ereignisses auf
+            event_us = (events[0][1] - self._offset_ns) // 1000
+            if event_us < start_us:
+                event_us = start_us     # Nie vor Werte, die die Firmware schon gelesen hat
+                self.late += 1
+            self.wake_lags_us.append((now_ns - self._offset_ns) // 1000 - event_us)
+            self.now_us = event_us
+            if self.release_after_us is not None and self.level == 0:
+                self.release_at_us = event_us + self.release_after_us
+            break
+        if self.timers:
+            self.run_timers(self.now_us)
+        if self.stop_at_ms is not None and self.now_us >= self.stop_at_ms * 1000:
+            raise StopSimulation()
+
+
+class StatusLine:
+    """Ausgaben der Firmware im Terminal, darunter eine Statuszeile für LED, Buzzer, Button"""
+
+    def __init__(self, board, out=sys.stdout):
+        self.board = board
+        self.out = out
+        self.led = 0
+        self.buzzer_freq = 0
+        self.buzzer_on = False
+        self.drawn = None
+        self.drawn_us = 0
+
+    def log_write(self, pin_id, kind, value):
+        if pin_id == LED_PIN:
+            self.led = value * 1023 if kind == "value" else value if kind == "duty" else self.led
+        elif pin_id == BUZZER_PIN:
+            if kind == "freq":
+                self.buzzer_freq = value
+            elif kind == "duty":
+                self.buzzer_on = value > 0
+        self.draw()
+
+    def status(self):
+        led = "●" if self.led >= 1000 else "◐" if self.led > 0 else "○"
+        bar = "█" * (self.led * 10 // 1023)
+        buzzer = f"♪ {self.buzzer_freq}Hz" if self.buzzer_on else "-"
+        button = "▼" if self.board.clock.level == 0 else "▲"
+        return f"LED {led} {bar:<10} | Buzzer {buzzer:<9} | Button {button}"
+
+    def draw(self, force=False):
+        text = self.status()
+        now_us = self.board.clock.now_us
+        # An/Aus sofort zeigen (GO-Reiz!), Helligkeitsstufen gedrosselt
+        changed = self.drawn is None or text[:5] != self.drawn[:5] or text[17:] != self.drawn[17:]
+        if force or changed or (text != self.drawn and now_us - self.drawn_us >= REDRAW_US):
+            self.out.write("\r\033[K" + text)
+            self.out.flush()
+            self.drawn = text
+            self.drawn_us = now_us
+
+    def print(self, line):
+        self.out.write("\r\033[K" + line + "\n")
+        self.draw(force=True)
+
+
+def make_board(step, source, release_after_us=None, out=sys.stdout):
+    """Board mit DesktopClock und Terminal-Ausgabe; liefert (Board, Modul, StatusLine)"""
+    clock = DesktopClock(source, release_after_us)
+    board = Board(network=True, clock=clock)
+    status = StatusLine(board, out)
+    board_log_write = board.log_write
+    board_print = board.print
+
+    def log_write(pin_id, kind, value):
+        board_log_write(pin_id, kind, value)
+        status.log_write(pin_id, kind, value)
+
+    def print_hook(*args, **kwargs):
+        board_print(*args, **kwargs)
+        status.print(board.console[-1])
+
+    board.log_write = log_write
+    board.print = print_hook
+    board.set_button_source(clock.button)
+    game = board.load(step)
+    if hasattr(game, "SLEEP_AFTER_MS"):
+        game.SLEEP_AFTER_MS = None   # Am PC kein Tiefschlaf
+    return board, game, status
+
+
+def print_wake_lags(clock):
+    lags = sorted(clock.wake_lags_us)
+    if lags:
+        print(f"\nAufwachen nach dem Zeitstempel: Ø {sum(lags) // len(lags)}µs, "
+              f"max {lags[-1]}µs ({len(lags)} Ereignisse, von der Firmware-Uhr abgezogen, "
+              f"{clock.late} erst nach ihrem Schlaf zugestellt)")
+
+
+def self_test(step, games, delay_ms, seed):
+    """evdev-Ereignisse über eine Pipe, absichtlich verspätet zugestellt"""
+    import random
+
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    source = EvdevInput(fd=read_fd)
+    devnull = open(os.devnull, "w")
+    board, game, status = make_board(step, source, out=devnull)
+    state = getattr(game, "game", game)
+    game.recorder.capture_path = None
+    if hasattr(game, "histogram"):
+        game.histogram.hist_path = None
+    if hasattr(game, "latency_cal"):
+        game.latency_cal.cal_path = None
+        game.latency_cal.correction_us = 0
+    stimulus = threading.Event()
+    stimulus_ns = [0]
+    expected_us = []
+    rng = random.Random(seed)
+
+    status_log_write = status.log_write
+
+    def log_write(pin_id, kind, value):
+        status_log_write(pin_id, kind, value)
+        if pin_id == LED_PIN and kind == "value" and value:
+            stimulus_ns[0] = monotonic_ns()
+            stimulus.set()
+
+    status.log_write = log_write
+
+    def send(level, t_ns):
+        sec, rest = divmod(t_ns, 1000000000)
+        os.write(write_fd, struct.pack(EVENT_FORMAT, sec, rest // 1000, EV_KEY, KEY_SPACE,
+                                       0 if level else 1))
+
+    def press(t_ns):
+        """Drücken zum Zeitpunkt t_ns, aber erst delay_ms später zustellen"""
+        time.sleep(delay_ms / 1000)
+        send(0, t_ns)
+        time.sleep(PRESS_US / 1000000)
+        send(1, monotonic_ns())
+
+    def player():
+        try:
+            for _ in range(games):
+                while state.current_state != state.STATE_WAITING:
+                    time.sleep(0.005)
+                time.sleep(0.3)
+                stimulus.clear()
+                press(monotonic_ns())                       # Spiel starten
+                if not stimulus.wait(10):
+                    break
+                time.sleep(rng.uniform(0.15, 0.5))
+                pressed_ns = monotonic_ns()
+                expected_us.append((pressed_ns - stimulus_ns[0]) // 1000)
+                press(pressed_ns)
+            while state.current_state != state.STATE_WAITING:
+                time.sleep(0.005)
+        finally:
+            board.clock.stop_at_ms = 0   # Nächster sleep beendet die Firmware
+
+    thread = threading.Thread(target=player, daemon=True)
+    thread.start()
+    run_main(game)
+    thread.join()
+    devnull.close()
+    os.close(write_fd)
+    source.close()
+
+    measured = [int(line.split(":")[1].strip().rstrip("ms")) for line in board.console
+                if line.startswith("⚡ Reaktionszeit:")]
+    print(f"Selbsttest {step}: {len(measured)} Spiele, Ereignisse {delay_ms}ms verspätet zugestellt")
+    ok = len(measured) == len(expected_us) == games
+    for real_us, got_ms in zip(expected_us, measured):
+        error_ms = got_ms - real_us / 1000
+        # Firmware rundet auf ganze ms ab; zu spät zugestellt: bis delay_ms mehr
+        good = -1.5 <= error_ms <= 0.5 + delay_ms
+        ok = ok and good
+        print(f"   echt {real_us / 1000:7.2f}ms  gemessen {got_ms:4d}ms  "
+              f"Fehler {error_ms:+5.2f}ms {'✅' if good else '❌'}")
+    print_wake_lags(board.clock)
+    print("✅ Kernel-Zeitstempel werden genutzt" if ok else "❌ Fehler gefunden")
+    return 0 if ok else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reaktionsspiel am Linux-PC mit Tastatur")
+    parser.add_argument("schritt", nargs="?", default="step6_complete_game", help="Firmware")
+    parser.add_argument("--geraet", help="evdev-Gerät, z.B. /dev/input/event3 (sonst Terminal)")
+    parser.add_argument("--taste", type=int, default=KEY_SPACE, help="Tastencode (57 = Leertaste)")
+    parser.add_argument("--exklusiv", action="store_true", help="Tastatur für andere Programme sperren")
+    parser.add_argument("--selbsttest", action="store_true", help="Mit Ereignissen aus einer Pipe prüfen")
+    parser.add_argument("--spiele", type=int, default=3, help="Spiele im Selbsttest")
+    parser.add_argument("--verspaetung", type=float, default=3.0, help="Zustell-Verzögerung im Selbsttest (ms)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.selbsttest:
+        return self_test(args.schritt, args.spiele, args.verspaetung, args.seed)
+
+    if args.geraet:
+        try:
+            source = EvdevInput(args.geraet, args.taste, args.exklusiv)
+        except OSError as error:
+            print(f"❌ {args.geraet}: {error} (Gruppe 'input'?)")
+            return 1
+        release_after_us = None
+    else:
+        source = TerminalInput()
+        release_after_us = TERMINAL_HOLD_US
+        print("Beliebige Taste = Button, Strg+C beendet")
+    try:
+        board, game, status = make_board(args.schritt, source, release_after_us)
+        run_main(game)
+    finally:
+        source.close()
+    print_wake_lags(board.clock)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
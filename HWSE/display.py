@@ -0,0 +1,169 @@
+"""
+OLED-Anzeige (SSD1306, 128x64) mit Teil-Aktualisierung
+=======================================================
+
+Ohne Laptop am USB-Kabel sieht der Spieler seine Zeit nicht. Die Anzeige
+zeigt Zustand, Reaktionszeit und Statistik - 8 Textzeilen zu 16 Zeichen,
+eine Zeile pro Display-Seite (8 Pixel hoch).
+
+Gezeichnet wird mit framebuf in ein Bild im RAM (1024 Bytes). Ein ganzes
+Bild über I2C zu schicken dauert bei 400kHz gut 23ms - länger als ein Tick
+der Hauptschleife. Deshalb:
+
+- line() merkt sich, welche Seiten sich geändert haben (Bitmaske)
+- flush() vergleicht eine geänderte Seite mit dem Schattenbild (was das
+  Display gerade zeigt) und schickt nur die Spalten von der ersten bis zur
+  letzten Änderung, höchstens max_pages Seiten pro Aufruf
+- Die Firmware ruft flush() nur in WAITING/RESULT auf, nie in READY/GO
+
+number() zeichnet Zahlen Ziffer für Ziffer ins Bild, ohne einen String
+anzulegen - so belegt das Ergebnis nach GO keinen Speicher.
+
+Ist kein Display angeschlossen (kein ACK an I2C-Adresse 0x3C), zeichnen
+line() und number() nichts und flush() schickt nichts.
+
+Verwendung (siehe step6_complete_game.py):
+    display.begin(I2C(0, scl=Pin(22), sda=Pin(21), freq=400000))
+    display.line(2, "Beste:")      # Nur im RAM
+    display.number(2, 7, 234, "ms")  # Ab Zeichen 7: "Beste: 234ms"
+    display.flush(1)               # Eine geänderte Seite senden
+"""
+
+import framebuf
+
+WIDTH = 128
+HEIGHT = 64
+PAGES = HEIGHT // 8
+LINE_CHARS = WIDTH // 8
+ADDRESS = 0x3C
+ALL_PAGES = (1 << PAGES) - 1
+
+# Einschalt-Sequenz: Takt, Multiplex 64, Ladungspumpe an, horizontale
+# Adressierung, gespiegelt (Anschlüsse oben), Kontrast, Display an
+_INIT = bytes((0x00, 0xAE, 0xD5, 0x80, 0xA8, 0x3F, 0xD3, 0x00, 0x40, 0x8D, 0x14,
+               0x20, 0x00, 0xA1, 0xC8, 0xDA, 0x12, 0x81, 0xCF, 0xD9, 0xF1, 0xDB, 0x40,
+               0xA4, 0xA6, 0xAF))
+_OFF = b"\x00\xae"
+_DATA = b"\x40"
+
+i2c = None
+address = ADDRESS
+buffer = bytearray(WIDTH * PAGES)       # Bild im RAM
+frame = framebuf.FrameBuffer(buffer, WIDTH, HEIGHT, framebuf.MONO_VLSB)
+shadow = bytearray(WIDTH * PAGES)       # Was das Display gerade zeigt
+dirty = 0                               # Seiten mit Änderungen (Bit pro Seite)
+stale = 0                               # Seiten mit unbekanntem Inhalt (ganz senden)
+_window = bytearray((0x00, 0x21, 0, WIDTH - 1, 0x22, 0, 0))   # Spalten, Seite
+_DIGITS = ("0", "1", "2", "3", "4", "5", "6", "7", "8", "9")
+
+# Statistik
+pages_sent = 0
+bytes_sent = 0
+bytes_saved = 0
+
+
+def begin(bus, addr=ADDRESS):
+    """Display einschalten; False wenn an der Adresse nichts antwortet"""
+    global i2c, address, dirty, stale
+    address = addr
+    try:
+        bus.writeto(addr, _INIT)
+    except OSError as e:
+        print(f"🖥️ Kein Display an I2C 0x{addr:02x} ({e})")
+        i2c = None
+        return False
+    i2c = bus
+    frame.fill(0)
+    dirty = ALL_PAGES
+    stale = ALL_PAGES   # Display-RAM nach dem Einschalten unbekannt
+    print(f"🖥️ Display an I2C 0x{addr:02x}")
+    return True
+
+
+def line(page, text):
+    """Textzeile in Seite 0-7 zeichnen - nur im RAM (ab 16 Zeichen abgeschnitten)"""
+    global dirty
+    if i2c is None:
+        return
+    y = page * 8
+    frame.fill_rect(0, y, WIDTH, 8, 0)
+    frame.text(text, 0, y, 1)
+    dirty |= 1 << page
+
+
+def number(page, column, value, unit=""):
+    """Zahl >= 0 ab Zeichen column in Seite page zeichnen, danach unit - ohne String"""
+    global dirty
+    if i2c is None:
+        return
+    digits = 1
+    rest = value
+    while rest >= 10:
+        rest //= 10
+        digits += 1
+    y = page * 8
+    x = (column + digits) * 8
+    frame.fill_rect(column * 8, y, WIDTH - column * 8, 8, 0)
+    frame.text(unit, x, y, 1)
+    while digits:
+        x -= 8
+        frame.text(_DIGITS[value % 10], x, y, 1)
+        value //= 10
+        digits -= 1
+    dirty |= 1 << page
+
+
+def pending():
+    """Noch nicht gesendete Änderungen?"""
+    return dirty != 0
+
+
+def flush(max_pages=1):
+    """Bis zu max_pages geänderte Seiten senden; liefert die Zahl gesendeter Seiten"""
+    global dirty, stale, pages_sent, bytes_sent, bytes_saved
+    sent = 0
+    page = 0
+    while dirty and sent < max_pages and page < PAGES:
+        bit = 1 << page
+        if dirty & bit:
+            dirty &= ~bit
+            start = page * WIDTH
+            end = start + WIDTH
+            if stale & bit:
+                stale &= ~bit
+            else:
+                # Nur die Spalten von der ersten bis zur letzten Änderung
+                while start < end and buffer[start] == shadow[start]:
+                    start += 1
+                while end > start and buffer[end - 1] == shadow[end - 1]:
+                    end -= 1
+            bytes_saved += WIDTH - (end - start)
+            if end > start:
+                _window[2] = start - page * WIDTH
+                _window[3] = end - 1 - page * WIDTH
+                _window[5] = page
+                _window[6] = page
+                i2c.writeto(address, _window)
+                i2c.writevto(address, (_DATA, memoryview(buffer)[start:end]))
+                memoryview(shadow)[start:end] = memoryview(buffer)[start:end]
+                pages_sent += 1
+                bytes_sent += end - start
+                sent += 1
+        page += 1
+    return sent
+
+
+def power_off():
+    """Display aus (z.B. vor dem Tiefschlaf); begin() schaltet es wieder ein"""
+    if i2c is not None:
+        i2c.writeto(address, _OFF)
+
+
+def print_statistics():
+    """Gesendete und eingesparte Bytes ausgeben"""
+    if i2c is None:
+        return
+    total = bytes_sent + bytes_saved
+    share = 100 * bytes_saved // total if total else 0
+    print(f"Display: {pages_sent} Seiten gesendet, {bytes_sent} Bytes, "
+          f"eingespart: {bytes_saved} ({share}%)")
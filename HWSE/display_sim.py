@@ -0,0 +1,137 @@
+"""
+OLED-Anzeige im Simulator prüfen (Host-Werkzeug)
+================================================
+
+Spielt step6_complete_game.py (und die Kontext-Variante) mit einem
+simulierten SSD1306 an I2C (Board(display=True), DISPLAY_PINS = (22, 21))
+gegen den Testspieler aus reaction_accuracy.py und prüft display.py:
+
+- Keine I2C-Übertragung in READY oder GO
+- Nach dem Beenden zeigt das Display genau das Bild im RAM (kein Byte
+  verloren oder doppelt) mit dem letzten Ergebnis
+- Kein Tick über LOOP_BUDGET_US, obwohl jede Übertragung virtuelle Zeit
+  kostet (9 Takte pro Byte bei 400kHz)
+- Messfehler der Reaktionszeit mit und ohne Display (zum Vergleich)
+
+Ausgegeben werden gesendete und eingesparte Bytes gegenüber ganzen Seiten
+und das Display-Bild als Text.
+
+Aufruf:
+    python display_sim.py
+    python display_sim.py step6_complete_game --spiele 50
+"""
+
+import argparse
+import random
+import sys
+
+from reaction_accuracy import Result, TestPlayer
+from sim_hardware import Board, run_main
+
+LED_PIN = 2
+DISPLAY_PINS = (22, 21)   # SCL, SDA wie in hardware-setup.md
+STEPS = ("step6_complete_game", "step6_context_game")
+STATE_NAMES = ("WAITING", "READY", "GO", "RESULT")
+
+
+def play(step, games, seed, with_display):
+    """Spiele gegen den Testspieler; liefert (Board, Modul, Zustand, Spieler, Messwerte, Zustände je Übertragung)"""
+    board = Board(seed=seed, display=with_display)
+    player = None
+    measured = []
+    board_log_write = board.log_write
+    board_print = board.print
+
+    def log_write(pin_id, kind, value):
+        board_log_write(pin_id, kind, value)
+        if pin_id == LED_PIN and player is not None:
+            if (kind == "value" and value) or (kind == "duty" and value >= 1023):
+                player.stimulus()
+
+    def print_hook(*args, **kwargs):
+        board_print(*args, **kwargs)
+        line = board.console[-1]
+        if line.startswith("⚡ Reaktionszeit:"):
+            measured.append(int(line.split(":")[1].strip().rstrip("ms")))
+            if player is not None:
+                player.measure(measured[-1])
+
+    board.log_write = log_write
+    board.print = print_hook
+    game = board.load(step)
+    game.recorder.capture_path = None
+    game.histogram.hist_path = None
+    if with_display:
+        game.DISPLAY_PINS = DISPLAY_PINS   # Anzeige ist in der Firmware aus
+    state = getattr(game, "game", game)
+
+    transfer_states = []
+    if with_display:
+        receive = board.display.receive
+
+        def receive_hook(data):
+            transfer_states.append(state.current_state)
+            receive(data)
+
+        board.display.receive = receive_hook
+
+    player = TestPlayer(board, state, random.Random(seed), games)
+    board.set_button_source(player)
+    board.clock.stop_at_ms = board.clock.now_ms() + games * 20000
+    run_main(game)
+    return board, game, state, player, measured, transfer_states
+
+
+def check_step(step, args):
+    print(f"▶ {step}")
+    board, game, state, player, measured, transfer_states = play(step, args.spiele, args.seed, True)
+    display = game.display
+
+    in_measurement = sum(1 for s in transfer_states if s in (1, 2))
+    per_state = {}
+    for s in transfer_states:
+        per_state[STATE_NAMES[s]] = per_state.get(STATE_NAMES[s], 0) + 1
+    listed = ", ".join(f"{name} {count}" for name, count in sorted(per_state.items()))
+    print(f"   I2C-Übertragungen: {len(board.i2c_log)} ({listed}), in READY/GO: {in_measurement}")
+
+    total = display.bytes_sent + display.bytes_saved
+    print(f"   {display.pages_sent} Seiten gesendet: {display.bytes_sent} Bytes statt {total} "
+          f"für ganze Seiten ({100 * display.bytes_saved // max(total, 1)}% eingespart)")
+
+    same = bytes(board.display.ram) == bytes(display.buffer)
+    lines = board.display.text_lines()
+    last = f"{measured[-1]} ms" if measured else None
+    shows_result = last is not None and lines[2] == last
+    print(f"   Display = Bild im RAM: {'✅' if same else '❌'}, "
+          f"letztes Ergebnis sichtbar: {'✅' if shows_result else '❌'} ({last})")
+    print("   +" + "-" * 16 + "+")
+    for line in lines:
+        print(f"   |{line:<16}|")
+    print("   +" + "-" * 16 + "+")
+
+    budget = game.LOOP_BUDGET_US
+    print(f"   Schleife: max {state.loop_max_us}µs, {state.loop_overruns} über {budget}µs")
+
+    plain_player = play(step, args.spiele, args.seed, False)[3]
+    for name, p in (("mit", player), ("ohne", plain_player)):
+        print(Result(step, name, p.offsets_us, p.measured_ms).row())
+
+    return in_measurement == 0 and same and shows_result and state.loop_overruns == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OLED-Anzeige im Simulator prüfen")
+    parser.add_argument("schritte", nargs="*", default=list(STEPS), help="Firmware (Standard: beide Varianten)")
+    parser.add_argument("--spiele", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    ok = True
+    for step in args.schritte:
+        ok = check_step(step, args) and ok
+    print("✅ Display in Ordnung" if ok else "❌ Fehler gefunden")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Bausteine für zwei Kerne: Warteschlangen ohne Sperren und Statistik-Abbild
+==========================================================================
+
+Wenn zwei Kerne (Threads) Daten austauschen, darf keiner auf den anderen
+warten. Deshalb gibt es nur zwei einfache Bausteine:
+
+- SpscQueue: Ringpuffer für genau EINEN Schreiber und EINEN Leser.
+  Der Schreiber ändert nur `tail`, der Leser nur `head`. Ein Eintrag wird
+  erst in den Puffer geschrieben und danach `tail` weitergesetzt - der
+  Leser sieht also nie einen halb geschriebenen Eintrag. Ist der Puffer
+  voll, wird der neue Eintrag verworfen und gezählt (nie blockieren!).
+- Snapshot: doppelt gepuffertes Abbild (z.B. der Statistik). Der Schreiber
+  füllt den hinteren Puffer und schaltet dann um; der Leser kopiert den
+  vorderen Puffer und prüft über eine Versionsnummer, ob er dabei
+  überholt wurde (dann nochmal lesen).
+
+Ein Integer- oder Listen-Element zu setzen ist in MicroPython (und CPython)
+ein einzelner Schreibzugriff; mehr brauchen die beiden Bausteine nicht.
+
+start()/stop() starten den zweiten Kern über _thread. Ohne _thread (oder mit
+threaded=False) ruft der Aufrufer den Schritt des zweiten Kerns selbst in
+seiner Schleife auf - gleiche Logik, ein Kern.
+
+Hinweis: Auf dem RP2040 (Pico) läuft der zweite Thread auf dem zweiten
+Kern. Auf dem ESP32 teilen sich MicroPython-Threads einen Kern (GIL); die
+Aufteilung funktioniert, bringt aber weniger.
+
+Verwendung (siehe step6_dual_core.py):
+    console = dual_core.SpscQueue(32)
+    console.put("Text")            # Kern 0
+    text = console.get()           # Kern 1 (None = leer)
+    stats = dual_core.Snapshot(6)
+    values = stats.back()          # Kern 0: vorbelegten Puffer füllen,
+    values[0] = spiele             # kein neues Tupel pro Tick
+    stats.swap()
+    values = stats.read()          # Kern 1
+"""
+
+import utime
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+running = False     # Zweiter Kern soll laufen
+_alive = False      # Zweiter Kern läuft gerade (Schleife noch nicht verlassen)
+
+
+class SpscQueue:
+    """Ringpuffer für einen Schreiber und einen Leser, ohne Sperren"""
+
+    def __init__(self, size):
+        self.slots = [None] * (size + 1)   # Ein Platz bleibt frei: voll != leer
+        self.head = 0       # Nur der Leser schreibt head
+        self.tail = 0       # Nur der Schreiber schreibt tail
+        self.dropped = 0    # Verworfen, weil voll (zählt der Schreiber)
+        self.max_used = 0   # Höchster Füllstand (zählt der Schreiber)
+
+    def put(self, item):
+        """Eintrag anhängen; False (und verworfen), wenn voll"""
+        tail = self.tail
+        next_tail = tail + 1
+        if next_tail == len(self.slots):
+            next_tail = 0
+        if next_tail == self.head:
+            self.dropped += 1
+            return False
+        self.slots[tail] = item
+        self.tail = next_tail   # Erst jetzt sieht der Leser den Eintrag
+        used = next_tail - self.head
+        if used < 0:
+            used += len(self.slots)
+        if used > self.max_used:
+            self.max_used = used
+        return True
+
+    def get(self):
+        """Ältesten Eintrag holen; None, wenn leer"""
+        head = self.head
+        if head == self.tail:
+            return None
+        item = self.slots[head]
+        self.slots[head] = None
+        head += 1
+        if head == len(self.slots):
+            head = 0
+        self.head = head
+        return item
+
+    def empty(self):
+        return self.head == self.tail
+
+    def space(self):
+        """Freie Plätze (nur für den Schreiber: der Leser kann sie nur vermehren)"""
+        free = self.head - self.tail - 1
+        if free < 0:
+            free += len(self.slots)
+        return free
+
+
+class Snapshot:
+    """Doppelt gepuffertes Abbild fester Länge für einen Schreiber"""
+
+    def __init__(self, size):
+        self.buffers = ([0] * size, [0] * size)
+        self.front = 0      # Index des gültigen Puffers
+        self.version = 0    # Gerade = ruhig, ungerade = Schreiber schaltet um
+        self.retries = 0    # Wie oft der Leser neu lesen musste
+
+    def back(self):
+        """Hinterer Puffer zum Füllen (Schreiber); danach swap()"""
+        return self.buffers[1 - self.front]
+
+    def swap(self):
+        """Gefüllten hinteren Puffer zum vorderen machen"""
+        self.version += 1
+        self.front = 1 - self.front
+        self.version += 1
+
+    def publish(self, values):
+        """Neue Werte in den hinteren Puffer schreiben und umschalten"""
+        buffer = self.back()
+        for i in range(len(buffer)):
+            buffer[i] = values[i]
+        self.swap()
+
+    def read(self):
+        """Kopie des vorderen Puffers (nie halb alt, halb neu)"""
+        values = [0] * len(self.buffers[0])
+        self.read_into(values)
+        return tuple(values)
+
+    def read_into(self, values):
+        """Vorderen Puffer nach values kopieren (nie halb alt, halb neu), ohne Speicheranlage"""
+        while True:
+            version = self.version
+            if not version & 1:
+                buffer = self.buffers[self.front]
+                for i in range(len(buffer)):
+                    values[i] = buffer[i]
+                if version == self.version:
+                    return
+            self.retries += 1
+
+
+def start(loop):
+    """loop() auf dem zweiten Kern starten; False, wenn es kein _thread gibt"""
+    global running, _alive
+    if _thread is None:
+        return False
+    running = True
+    _alive = True       # Schon hier, damit stop() auch vor dem Thread-Start wartet
+    _thread.start_new_thread(_run, (loop,))
+    return True
+
+
+def _run(loop):
+    global _alive
+    try:
+        loop()
+    finally:
+        _alive = False
+
+
+def stop(timeout_ms=1000):
+    """Zweiten Kern bitten aufzuhören und warten, bis seine Schleife endet
+
+    False: er läuft nach timeout_ms noch. Dann gehören ihm die Leser-Seiten
+    der Warteschlangen weiter - der Aufrufer darf sie nicht selbst leeren.
+    """
+    global running
+    running = False
+    start_ms = utime.ticks_ms()
+    while _alive and utime.ticks_diff(utime.ticks_ms(), start_ms) < timeout_ms:
+        utime.sleep_ms(1)
+    return not _alive
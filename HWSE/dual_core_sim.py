@@ -0,0 +1,182 @@
+"""
+Zwei Kerne im Simulator prüfen (Host-Werkzeug)
+==============================================
+
+Prüft dual_core.py und step6_dual_core.py mit echten CPython-Threads:
+
+1. Bausteine: ein Thread schreibt fortlaufende Zahlen in eine SpscQueue,
+   ein zweiter liest sie - keine darf fehlen, doppelt oder vertauscht sein.
+   Genauso für das Statistik-Abbild: ein Leser darf nie ein Abbild sehen,
+   das halb alt und halb neu ist.
+2. Spiel: step6_complete_game.py und step6_dual_core.py (mit und ohne
+   Thread) spielen auf einem Board mit Echtzeit-Uhr gegen den Testspieler
+   aus reaction_accuracy.py. print blockiert wie ein UART (115200 Baud) und
+   update_led() kostet Rechenzeit. Verglichen wird der Messfehler.
+
+Die Spiele laufen in Echtzeit (ein Spiel dauert etwa 8s).
+
+Aufruf:
+    python dual_core_sim.py
+    python dual_core_sim.py --spiele 10 --eintraege 200000
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from reaction_accuracy import Delays, Result, TestPlayer
+from sim_hardware import Board, run_main
+
+LED_PIN = 2
+
+# Name -> (Firmware, THREADED)
+VARIANTS = {
+    "ein Kern (Schritt 6)": ("step6_complete_game", None),
+    "zwei Kerne": ("step6_dual_core", True),
+    "zwei Hälften, ein Kern": ("step6_dual_core", False),
+}
+
+
+def check_queue(dual_core, count, size=16):
+    """Fortlaufende Zahlen durch eine SpscQueue; liefert (Fehler, voll-Versuche)"""
+    queue = dual_core.SpscQueue(size)
+    errors = []
+
+    def producer():
+        i = 0
+        while i < count:
+            if queue.put(i):
+                i += 1
+            else:
+                time.sleep(0)   # Voll: Leser ranlassen
+
+    def consumer():
+        expected = 0
+        while expected < count:
+            item = queue.get()
+            if item is None:
+                time.sleep(0)
+                continue
+            if item != expected:
+                errors.append((expected, item))
+                expected = item
+            expected += 1
+
+    threads = [threading.Thread(target=producer), threading.Thread(target=consumer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors, queue.dropped
+
+
+def check_snapshot(dual_core, count, size=7):
+    """Abbilder (i, i, ..., i) schreiben und lesen; liefert (zerrissen, Lesungen, Wiederholungen)"""
+    snapshot = dual_core.Snapshot(size)
+    done = []
+    torn = []
+    reads = [0]
+
+    def writer():
+        for i in range(1, count + 1):
+            snapshot.publish([i] * size)
+        done.append(True)
+
+    def reader():
+        while not done:
+            values = snapshot.read()
+            reads[0] += 1
+            if min(values) != max(values):
+                torn.append(values)
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(torn), reads[0], snapshot.retries
+
+
+def run_game(step, threaded, games, seed):
+    """Eine Variante in Echtzeit spielen lassen; liefert das Result"""
+    board = Board(seed=seed, realtime=True)
+    delays = Delays(random.Random(seed + 1))
+    player = None
+    board_print = board.print
+
+    def uart_print(*args, **kwargs):
+        board_print(*args, **kwargs)
+        line = board.console[-1]
+        board.clock.advance_us(delays.us_per_char * (len(line) + 2))
+        if "Reaktionszeit: " in line and player is not None:
+            player.measure(int(line.split("Reaktionszeit: ")[1].split("ms")[0]))
+
+    board.print = uart_print
+    board_log_write = board.log_write
+
+    def log_write(pin_id, kind, value):
+        board_log_write(pin_id, kind, value)
+        if pin_id == LED_PIN and player is not None:
+            if (kind == "value" and value) or (kind == "duty" and value >= 1023):
+                player.stimulus()
+
+    board.log_write = log_write
+
+    game = board.load(step)
+    game.recorder.capture_path = None
+    if hasattr(game, "histogram"):
+        game.histogram.hist_path = None
+    if hasattr(game, "SESSION_PATH"):
+        game.SESSION_PATH = None
+    if threaded is not None:
+        game.THREADED = threaded
+
+    update_led = game.update_led
+
+    def slow_update_led():
+        update_led()
+        board.clock.advance_us(delays.led_us)
+
+    game.update_led = slow_update_led
+
+    player = TestPlayer(board, game, random.Random(seed), games)
+    board.set_button_source(player)
+    run_main(game)
+    return Result(step, "", player.offsets_us, player.measured_ms)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Zwei-Kern-Variante im Simulator prüfen")
+    parser.add_argument("--spiele", type=int, default=4, help="Spiele pro Variante (Echtzeit!)")
+    parser.add_argument("--eintraege", type=int, default=100000, help="Einträge für den Warteschlangen-Test")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    dual_core = Board(realtime=True).load("dual_core")
+    ok = True
+
+    print("▶ Bausteine (zwei CPython-Threads)")
+    errors, full = check_queue(dual_core, args.eintraege)
+    ok = ok and not errors
+    print(f"   SpscQueue: {args.eintraege} Einträge, {len(errors)} Fehler, "
+          f"{full}x voll (neu versucht)")
+    torn, reads, retries = check_snapshot(dual_core, args.eintraege)
+    ok = ok and not torn
+    print(f"   Snapshot:  {reads} Lesungen, {torn} zerrissen, {retries} Wiederholungen")
+
+    print(f"\n▶ Spiel in Echtzeit, UART-print und langsame LED-Animation ({args.spiele} Spiele)")
+    for name, (step, threaded) in VARIANTS.items():
+        start = time.perf_counter()
+        result = run_game(step, threaded, args.spiele, args.seed)
+        result.scenario = name
+        print(f"{result.row()}  ({time.perf_counter() - start:.0f}s)")
+        ok = ok and not result.missing
+
+    print("✅ Alles in Ordnung" if ok else "❌ Fehler gefunden")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
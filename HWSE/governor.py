@@ -0,0 +1,180 @@
+"""
+CPU-Takt pro Zustand
+====================
+
+In WAITING wartet das Spiel oft minutenlang auf einen Spieler, in GO zählt
+jede Mikrosekunde. Der ESP32 kann seinen Takt mit machine.freq() umstellen
+(20, 40, 80, 160 oder 240 MHz); bei 80 MHz braucht er grob halb so viel
+Strom wie bei 240 MHz, rechnet aber dreimal so lange.
+
+- begin() bekommt den Takt pro Zustand, z.B. (80, 80, 240, 80)
+- enter() stellt beim Zustandswechsel den Takt des neuen Zustands ein
+- prepare() stellt ihn schon vorher ein: die Firmware ruft es kurz vor
+  dem Ende von READY auf, damit der Wechsel selbst nicht in den GO-Reiz
+  fällt und GO vom ersten Tick an mit vollem Takt läuft
+- tick() nimmt die Rechenzeit jedes Ticks in die Statistik auf
+
+PWM und UART zählen mit dem APB-Takt. Der bleibt ab 80 MHz CPU-Takt bei
+80 MHz; darunter läuft er mit dem CPU-Takt. Wechselt er, werden alle
+PWM-Kanäle aus outputs.py mit ihren Werten neu geschrieben (retune(), der
+Treiber rechnet den Teiler neu) und alle mit add_uart() angemeldeten UARTs
+neu initialisiert. Mit WLAN (stats_http.py) nicht unter 80 MHz gehen.
+
+print_statistics() zeigt pro Zustand die Zeit bei jedem Takt, den
+geschätzten Strom (CURRENT_MA, typische Werte ohne Funk) und die mittlere
+Rechenzeit pro Tick - das ist die Latenz, die ein niedriger Takt kostet:
+so viel später wird ein Druck im Tick verarbeitet. Dazu die Energie
+gegenüber festen 240 MHz.
+
+Zähler stehen in vorab angelegten Arrays, enter()/prepare()/tick() legen
+keinen Speicher an.
+
+Verwendung (siehe step6_complete_game.py, CPU_MHZ):
+    governor.begin((80, 80, 240, 80), STATE_NAMES)
+    governor.enter(new_state)            # bei jedem Zustandswechsel
+    governor.prepare(STATE_GO)           # kurz vor GO
+    governor.tick(duration_us)           # Rechenzeit des Ticks
+    governor.print_statistics()
+"""
+
+import machine
+import utime
+from array import array
+import outputs
+import tracer
+
+FREQS_MHZ = (20, 40, 80, 160, 240)
+CURRENT_MA = (15, 20, 27, 36, 50)   # Typischer Strom ohne Funk (Datenblatt, 20/40 geschätzt)
+APB_MHZ = 80                        # Ab diesem CPU-Takt bleibt der APB-Takt gleich
+VOLTAGE_MV = 3300
+
+enabled = False
+levels = ()             # MHz pro Zustand
+state_names = ()
+current_mhz = 0
+switches = 0
+retunes = 0             # Wechsel des APB-Takts (PWM/UART neu gestellt)
+max_switch_us = 0
+_uarts = []             # (uart, baudrate)
+_state = 0
+_since_ms = 0
+_state_ms = None        # Zustand * len(FREQS_MHZ) + Takt-Index -> ms
+_busy_x8 = None         # Mittlere Rechenzeit pro Tick und Zustand, mal 8
+_busy_max = None
+
+
+def begin(state_mhz, names):
+    """Takt pro Zustand festlegen und den Takt von Zustand 0 einstellen"""
+    global enabled, levels, state_names, current_mhz, switches, retunes, max_switch_us
+    global _state, _since_ms, _state_ms, _busy_x8, _busy_max
+    for mhz in state_mhz:
+        if mhz not in FREQS_MHZ:
+            raise ValueError(f"CPU-Takt {mhz} MHz nicht möglich ({FREQS_MHZ})")
+    levels = state_mhz
+    state_names = names
+    current_mhz = machine.freq() // 1000000
+    switches = 0
+    retunes = 0
+    max_switch_us = 0
+    _state = 0
+    _since_ms = utime.ticks_ms()
+    _state_ms = array("L", [0] * (len(names) * len(FREQS_MHZ)))
+    _busy_x8 = array("L", [0] * len(names))
+    _busy_max = array("L", [0] * len(names))
+    enabled = True
+    _set(levels[0])
+
+
+def add_uart(uart, baudrate):
+    """UART nach jedem Wechsel des APB-Takts neu initialisieren"""
+    _uarts.append((uart, baudrate))
+
+
+def _account():
+    """Zeit seit dem letzten Aufruf dem aktuellen Zustand und Takt zurechnen"""
+    global _since_ms
+    now = utime.ticks_ms()
+    _state_ms[_state * len(FREQS_MHZ) + FREQS_MHZ.index(current_mhz)] += utime.ticks_diff(now, _since_ms)
+    _since_ms = now
+
+
+def _set(mhz):
+    """Takt umstellen, danach PWM und UART neu stellen, falls der APB-Takt wechselt"""
+    global current_mhz, switches, retunes, max_switch_us
+    if mhz == current_mhz:
+        return
+    _account()
+    start_us = utime.ticks_us()
+    machine.freq(mhz * 1000000)
+    if mhz < APB_MHZ or current_mhz < APB_MHZ:
+        outputs.retune()
+        for uart, baudrate in _uarts:
+            uart.init(baudrate=baudrate)
+        retunes += 1
+    duration_us = utime.ticks_diff(utime.ticks_us(), start_us)
+    if duration_us > max_switch_us:
+        max_switch_us = duration_us
+    current_mhz = mhz
+    switches += 1
+    tracer.event(tracer.EV_FREQ, mhz)
+
+
+def enter(state):
+    """Neuer Zustand: dessen Takt einstellen"""
+    global _state
+    if not enabled:
+        return
+    _account()
+    _state = state
+    _set(levels[state])
+
+
+def prepare(state):
+    """Takt eines kommenden Zustands schon jetzt einstellen (z.B. kurz vor GO)"""
+    if enabled:
+        _set(levels[state])
+
+
+def tick(duration_us):
+    """Rechenzeit eines Ticks im aktuellen Zustand aufnehmen"""
+    if not enabled:
+        return
+    _busy_x8[_state] += duration_us - (_busy_x8[_state] >> 3)
+    if duration_us > _busy_max[_state]:
+        _busy_max[_state] = duration_us
+
+
+def charge_mas(state=None):
+    """Geschätzte Ladung in mAs (ein Zustand oder alle), bei den gemessenen Takten"""
+    total = 0
+    n = len(FREQS_MHZ)
+    for s in range(len(state_names)):
+        if state is None or s == state:
+            for i in range(n):
+                total += _state_ms[s * n + i] * CURRENT_MA[i]
+    return total / 1000
+
+
+def print_statistics():
+    """Zeit pro Takt, Strom und Rechenzeit pro Zustand; Energie gegenüber 240 MHz"""
+    if not enabled:
+        return
+    _account()
+    n = len(FREQS_MHZ)
+    total_ms = sum(_state_ms)
+    if not total_ms:
+        return
+    charge = charge_mas()
+    full = total_ms * CURRENT_MA[-1] / 1000
+    print(f"CPU-Takt: jetzt {current_mhz} MHz, {switches} Wechsel (max {max_switch_us}µs, "
+          f"{retunes}x PWM/UART neu), ~{charge * VOLTAGE_MV / 1000000:.2f} J statt "
+          f"{full * VOLTAGE_MV / 1000000:.2f} J bei 240 MHz ({100 - 100 * charge / full:.0f}% gespart)")
+    for s in range(len(state_names)):
+        state_ms = sum(_state_ms[s * n:(s + 1) * n])
+        if not state_ms:
+            continue
+        clocks = ", ".join(f"{FREQS_MHZ[i]} MHz {100 * _state_ms[s * n + i] // state_ms}%"
+                           for i in range(n) if _state_ms[s * n + i])
+        print(f"  {state_names[s]:<8} {100 * state_ms // total_ms:>3}% der Zeit, {clocks}; "
+              f"~{charge_mas(s) * 1000 / state_ms:.0f} mA, Tick Ø {_busy_x8[s] >> 3}µs "
+              f"(max {_busy_max[s]}µs)")
@@ -0,0 +1,227 @@
+"""
+CPU-Takt pro Zustand im Simulator prüfen (Host-Werkzeug)
+========================================================
+
+Spielt step6_complete_game.py mit dem virtuellen Spieler aus replay.py
+dreimal mit denselben Zufallszahlen:
+
+- fester Takt (CPU_MHZ = None wie in der Firmware, 160 MHz wie nach dem Start)
+- mit WLAN: CPU_MHZ = (80, 80, 240, 80), der Vorschlag für die Firmware
+- ohne WLAN: (40, 40, 240, 40) - hier wechselt auch der APB-Takt, PWM
+  und eine angemeldete UART müssen neu gestellt werden
+
+Geprüft wird (governor.py):
+- Jeder GO-Reiz kommt bei vollem Takt, kein Taktwechsel in GO und keiner
+  in den letzten GUARD_US vor dem Reiz
+- Reaktionszeiten und Falschstarts wie mit festem Takt
+- Nach jedem Wechsel des APB-Takts sind LED-PWM und UART neu gestellt
+
+Ausgegeben werden pro Zustand Zeitanteil, Takt und geschätzter Strom
+(governor.CURRENT_MA) und die Energie gegenüber festen 240 MHz. Die
+virtuelle Uhr rechnet unabhängig vom Takt; die Rechenzeit pro Tick wird
+deshalb geschätzt: ausgeführte Firmware-Zeilen (sys.settrace) mal
+LINE_CYCLES Takte, geteilt durch den Takt. Der Unterschied zu 240 MHz ist
+die Latenz, die der niedrigere Takt in diesem Zustand kostet. Auf dem
+Board misst governor.print_statistics() die echte Rechenzeit.
+
+Aufruf:
+    python governor_sim.py
+    python governor_sim.py step6_context_game --minuten 30
+"""
+
+import argparse
+import os
+import random
+import sys
+from collections import Counter
+
+from alloc_check import firmware_files, tick_line
+from replay import VirtualPlayer
+from sim_hardware import Board, run_main
+
+LED_PIN = 2
+STATE_NAMES = ("WAITING", "READY", "GO", "RESULT")
+STATE_GO = 2
+GUARD_US = 5000         # So lange vor dem Reiz kein Taktwechsel
+LINE_CYCLES = 400       # Takte pro Python-Zeile in MicroPython auf dem ESP32 (grob)
+UART_BAUD = 115200
+CONFIGS = (
+    ("mit WLAN", (80, 80, 240, 80)),
+    ("ohne WLAN", (40, 40, 240, 40)),
+)
+
+
+class FakeUart:
+    """UART-Attrappe: merkt sich jedes init()"""
+
+    def __init__(self, board):
+        self.board = board
+        self.inits = []
+
+    def init(self, baudrate):
+        self.inits.append((self.board.clock.now_us, baudrate))
+
+
+class LineCounter:
+    """sys.settrace-Hook: ausgeführte Firmware-Zeilen pro Tick und Zustand"""
+
+    def __init__(self, state, main_path):
+        self.state = state
+        self.paths = firmware_files()
+        self.main_path = main_path
+        self.main_line = tick_line(main_path)
+        self.lines = 0
+        self.tick_state = None
+        self.ticks = Counter()
+        self.state_lines = Counter()
+
+    def global_trace(self, frame, event, arg):
+        path = frame.f_code.co_filename
+        if path not in self.paths:
+            return None
+        is_main = path == self.main_path and frame.f_code.co_name == "main"
+
+        def local_trace(frame, event, arg):
+            if event == "line":
+                if is_main and frame.f_lineno == self.main_line:
+                    if self.tick_state is not None:
+                        self.ticks[self.tick_state] += 1
+                        self.state_lines[self.tick_state] += self.lines
+                    self.tick_state = self.state.current_state
+                    self.lines = 0
+                self.lines += 1
+            return local_trace
+
+        return local_trace
+
+
+def play(step, cpu_mhz, args, count_lines=False):
+    """Ein Lauf; liefert (Board, Modul, Zustand, Reize [(t_us, Hz, Zustand)], Wechsel, UART, Zeilen)"""
+    board = Board(seed=args.seed)
+    stimuli = []
+    switches = []       # (t_us, Hz, Zustand)
+    game = board.load(step)
+    game.recorder.capture_path = None
+    game.histogram.hist_path = None
+    game.latency_cal.cal_path = None
+    game.CPU_MHZ = cpu_mhz
+    state = getattr(game, "game", game)
+
+    board_log_write = board.log_write
+
+    def log_write(pin_id, kind, value):
+        board_log_write(pin_id, kind, value)
+        if pin_id == LED_PIN and kind == "value" and value:
+            stimuli.append((board.clock.now_us, board.cpu_hz, state.current_state))
+
+    machine = board.modules["machine"]
+    machine_freq = machine.freq
+
+    def freq(hz=None):
+        if hz is not None:
+            switches.append((board.clock.now_us, hz, state.current_state))
+        return machine_freq(hz)
+
+    board.log_write = log_write
+    machine.freq = freq
+    uart = FakeUart(board)
+    game.governor.add_uart(uart, UART_BAUD)
+    board.set_button_source(VirtualPlayer(state, random.Random(args.seed)))
+    board.clock.stop_at_ms = board.clock.now_ms() + int(args.minuten * 60000)
+
+    counter = None
+    if count_lines:
+        counter = LineCounter(state, os.path.abspath(game.__file__))
+        sys.settrace(counter.global_trace)
+    try:
+        run_main(game)
+    finally:
+        sys.settrace(None)
+    return board, game, state, stimuli, switches, uart, counter
+
+
+def results(board):
+    """Reaktionszeiten und Falschstarts aus der Konsole"""
+    return [line for line in board.console
+            if line.startswith("⚡ Reaktionszeit:") or line.startswith("Falschstart!")]
+
+
+def check_config(step, name, cpu_mhz, baseline, args):
+    board, game, state, stimuli, switches, uart, counter = play(step, cpu_mhz, args, count_lines=True)
+    governor = game.governor
+    go_hz = cpu_mhz[STATE_GO] * 1000000
+
+    full_clock = all(hz == go_hz for _, hz, _ in stimuli)
+    in_go = sum(1 for _, _, s in switches if s == STATE_GO)
+    too_close = 0
+    for t_us, _, _ in stimuli:
+        too_close += sum(1 for t, _, _ in switches if t_us - GUARD_US < t <= t_us)
+    same = results(board) == results(baseline)
+
+    retunes = 0
+    pwm_ok = 0
+    previous = 160
+    for t_us, hz, _ in switches:
+        mhz = hz // 1000000
+        if min(mhz, previous) < governor.APB_MHZ:
+            retunes += 1
+            pwm_ok += any(t == t_us and pin == LED_PIN and kind == "freq"
+                          for t, pin, kind, _ in board.writes)
+        previous = mhz
+    uart_ok = len(uart.inits) == retunes and all(b == UART_BAUD for _, b in uart.inits)
+    retune_ok = pwm_ok == retunes and uart_ok
+
+    print(f"▶ {name}: CPU_MHZ = {cpu_mhz}, {state.games_played} Spiele, {len(switches)} Taktwechsel")
+    print(f"   GO-Reiz bei {cpu_mhz[STATE_GO]} MHz: {len(stimuli)}/{len(stimuli)} "
+          f"{'✅' if full_clock else '❌'}, Wechsel in GO: {in_go}, "
+          f"< {GUARD_US // 1000}ms vor dem Reiz: {too_close} {'✅' if not in_go and not too_close else '❌'}")
+    print(f"   Reaktionszeiten/Falschstarts wie mit festem Takt: {'✅' if same else '❌'}")
+    print(f"   APB-Wechsel: {retunes}, LED-PWM neu gestellt: {pwm_ok}, "
+          f"UART neu: {len(uart.inits)} {'✅' if retune_ok else '❌'}")
+
+    n = len(governor.FREQS_MHZ)
+    total_ms = sum(governor._state_ms)
+    print(f"   {'Zustand':<8} {'Zeit':>5}  {'Takt':>8}  {'Strom':>6}  Rechenzeit pro Tick (geschätzt)")
+    for s, label in enumerate(STATE_NAMES):
+        state_ms = sum(governor._state_ms[s * n:(s + 1) * n])
+        if not state_ms or not counter.ticks[s]:
+            continue
+        lines = counter.state_lines[s] / counter.ticks[s]
+        mhz = cpu_mhz[s]
+        busy_us = lines * LINE_CYCLES / mhz
+        fastest_us = lines * LINE_CYCLES / governor.FREQS_MHZ[-1]
+        print(f"   {label:<8} {100 * state_ms / total_ms:>4.0f}%  {mhz:>4} MHz  "
+              f"{governor.charge_mas(s) * 1000 / state_ms:>4.0f}mA  "
+              f"{busy_us:>5.0f}µs (+{busy_us - fastest_us:.0f}µs gegenüber 240 MHz)")
+    charge = governor.charge_mas()
+    full = total_ms * governor.CURRENT_MA[-1] / 1000
+    fixed = total_ms * governor.CURRENT_MA[governor.FREQS_MHZ.index(160)] / 1000
+    print(f"   Energie: {charge * governor.VOLTAGE_MV / 1e6:.1f} J statt {full * governor.VOLTAGE_MV / 1e6:.1f} J "
+          f"bei 240 MHz ({100 - 100 * charge / full:.0f}% gespart), "
+          f"{fixed * governor.VOLTAGE_MV / 1e6:.1f} J bei festen 160 MHz")
+    return full_clock and not in_go and not too_close and same and retune_ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CPU-Takt pro Zustand im Simulator prüfen")
+    parser.add_argument("schritte", nargs="*", default=["step6_complete_game"],
+                        help="Firmware (z.B. step6_context_game)")
+    parser.add_argument("--minuten", type=float, default=10.0, help="Simulierte Spielzeit pro Lauf")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    ok = True
+    for step in args.schritte:
+        baseline = play(step, None, args)[0]
+        print(f"▶ {step}, fester Takt: {len(results(baseline))} Ergebnisse, "
+              f"Takt bleibt {baseline.cpu_hz // 1000000} MHz "
+              f"{'✅' if not baseline.freq_log else '❌'}")
+        ok = ok and not baseline.freq_log
+        for name, cpu_mhz in CONFIGS:
+            ok = check_config(step, name, cpu_mhz, baseline, args) and ok
+    print("✅ CPU-Takt in Ordnung" if ok else "❌ Fehler gefunden")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Reaktionszeit-Histogramm mit logarithmischen Fächern
+====================================================
+
+Die Bestzeit ist eine einzige Zahl - ein Glückstreffer verdeckt, wie schnell
+jemand wirklich ist. Das Histogramm zählt jede Reaktionszeit in ein Fach
+fester Größe (wie HdrHistogram):
+
+- 0-63ms: ein Fach pro Millisekunde
+- darüber: 32 Fächer pro Verdopplung (64-127ms in 2ms-Schritten,
+  128-255ms in 4ms-Schritten, ... 2048-4095ms in 128ms-Schritten)
+
+Ein Fach ist damit höchstens 1/32 (3,1%) seines Anfangswerts breit, die
+Fachmitte liegt höchstens 1,6% neben dem echten Wert. 256 Fächer zu je
+2 Bytes (array "H") - 512 Bytes, egal wie viele Spiele. record() kostet
+höchstens 6 Schiebeschritte, keine Speicheranlage. Zähler bleiben bei
+65535 stehen.
+
+Histogramme verschiedener Stationen haben dieselben Fächer und lassen
+sich einfach addieren (merge(), am PC: histogram_merge.py). Gespeichert
+wird in einer Datei (alle SAVE_EVERY Spiele und beim Beenden) und vor dem
+Tiefschlaf im RTC-Speicher (sleep_resume.py):
+
+    b"HG" | Version (u8) | Bits pro Verdopplung (u8) | 256 Zähler (u16)
+
+Verwendung (siehe step6_complete_game.py):
+    histogram.begin("reaction.hist")     # Gespeicherte Zähler laden
+    histogram.record(reaction_ms)
+    histogram.print_statistics()
+    histogram.save()
+"""
+
+from array import array
+import struct
+
+MAGIC = b"HG"
+VERSION = 1
+SUB_BITS = 6                        # Genauigkeit: 2^(SUB_BITS-1) Fächer pro Verdopplung
+SUB_COUNT = 1 << SUB_BITS           # 64: bis hierhin 1ms pro Fach
+HALF_COUNT = SUB_COUNT >> 1
+MAX_VALUE = 4095                    # Größere Werte landen im letzten Fach
+BUCKETS = 256
+HEADER_FORMAT = "<2sBB"
+MAX_COUNT = 0xFFFF
+SAVE_EVERY = 10                     # Datei alle 10 Spiele schreiben
+BAR_WIDTH = 30
+ROWS = 8                            # Zeilen der Textausgabe
+
+counts = array("H", [0] * BUCKETS)
+hist_path = None      # None = nicht speichern (z.B. im Simulator)
+_unsaved = 0
+
+
+def bucket(value):
+    """Fach-Index für einen Wert in ms"""
+    if value < 0:
+        value = 0
+    elif value > MAX_VALUE:
+        value = MAX_VALUE
+    shift = 0
+    while (value >> shift) >= SUB_COUNT:
+        shift += 1
+    return shift * HALF_COUNT + (value >> shift)
+
+
+def bucket_range(index):
+    """Kleinster und größter Wert in ms, die in dieses Fach fallen"""
+    if index < SUB_COUNT:
+        return index, index
+    shift = index // HALF_COUNT - 1
+    low = (index - shift * HALF_COUNT) << shift
+    return low, low + (1 << shift) - 1
+
+
+def record(value):
+    """Eine Reaktionszeit (ms) zählen"""
+    global _unsaved
+    index = bucket(value)
+    if counts[index] < MAX_COUNT:
+        counts[index] += 1
+    _unsaved += 1
+
+
+def total():
+    return sum(counts)
+
+
+def percentile(p):
+    """Fachmitte, unter der p Prozent der Werte liegen (None ohne Werte)"""
+    n = total()
+    if n == 0:
+        return None
+    rank = max((p * n + 99) // 100, 1)
+    seen = 0
+    for index in range(BUCKETS):
+        seen += counts[index]
+        if seen >= rank:
+            low, high = bucket_range(index)
+            return (low + high) // 2
+    return MAX_VALUE
+
+
+def to_bytes():
+    """Kopf und Zähler als Bytes"""
+    return struct.pack(HEADER_FORMAT, MAGIC, VERSION, SUB_BITS) + bytes(counts)
+
+
+def from_bytes(data):
+    """Zähler aus to_bytes() als array; None bei falschem Kopf oder falscher Länge"""
+    size = struct.calcsize(HEADER_FORMAT)
+    if len(data) != size + 2 * BUCKETS:
+        return None
+    magic, version, sub_bits = struct.unpack_from(HEADER_FORMAT, data)
+    if magic != MAGIC or version != VERSION or sub_bits != SUB_BITS:
+        return None
+    return array("H", data[size:])
+
+
+def merge(other):
+    """Zähler eines anderen Histogramms (array oder Bytes aus to_bytes()) addieren"""
+    if not isinstance(other, array):
+        other = from_bytes(other)
+        if other is None:
+            return False
+    for index in range(BUCKETS):
+        if other[index]:
+            counts[index] = min(counts[index] + other[index], MAX_COUNT)
+    return True
+
+
+def restore(saved):
+    """Zähler übernehmen (z.B. aus dem RTC-Speicher)"""
+    global counts, _unsaved
+    counts = saved
+    _unsaved = 0
+
+
+def clear():
+    global _unsaved
+    for index in range(BUCKETS):
+        counts[index] = 0
+    _unsaved = 0
+
+
+def begin(path=None):
+    """Datei festlegen und gespeicherte Zähler laden"""
+    global hist_path
+    hist_path = path
+    if path is not None:
+        load(path)
+
+
+def load(path):
+    try:
+        with open(path, "rb") as f:
+            saved = from_bytes(f.read())
+    except OSError:
+        return False
+    if saved is None:
+        return False
+    restore(saved)
+    return True
+
+
+def save(force=False):
+    """In die Datei schreiben - nur alle SAVE_EVERY neuen Werte (force: immer)"""
+    global _unsaved
+    if hist_path is None or _unsaved == 0 or (_unsaved < SAVE_EVERY and not force):
+        return False
+    with open(hist_path, "wb") as f:
+        f.write(to_bytes())
+    _unsaved = 0
+    return True
+
+
+def print_statistics():
+    """Perzentile und die Verteilung als Balken (höchstens ROWS Zeilen)"""
+    n = total()
+    if n == 0:
+        return
+    print(f"Reaktionszeiten ({n}): P10 {percentile(10)}ms, P50 {percentile(50)}ms, "
+          f"P90 {percentile(90)}ms")
+    first = 0
+    while counts[first] == 0:
+        first += 1
+    last = BUCKETS - 1
+    while counts[last] == 0:
+        last -= 1
+    # Benachbarte Fächer zu Zeilen zusammenfassen
+    per_row = (last - first) // ROWS + 1
+    rows = []
+    for start in range(first, last + 1, per_row):
+        end = min(start + per_row, last + 1)
+        rows.append((bucket_range(start)[0], bucket_range(end - 1)[1], sum(counts[start:end])))
+    peak = max(count for _, _, count in rows)
+    for low, high, count in rows:
+        label = f"{low}-{high}ms"
+        bar = "#" * ((count * BAR_WIDTH + peak - 1) // peak)
+        print(f"  {label:>11} {bar}{' ' * (BAR_WIDTH - len(bar))} {count}")
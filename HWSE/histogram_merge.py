@@ -0,0 +1,129 @@
+"""
+Reaktionszeit-Histogramme mehrerer Stationen zusammenführen (Host-Werkzeug)
+===========================================================================
+
+Jede Station speichert ihr Histogramm (histogram.py) in reaction.hist.
+Alle Stationen haben dieselben Fächer, zusammenführen heißt Zähler
+addieren. Das Werkzeug liest beliebig viele Dateien, gibt die Verteilung
+jeder Station und die gemeinsame aus und schreibt auf Wunsch das
+zusammengeführte Histogramm (gleiches Format, wieder ladbar).
+
+Ohne Board: --sim erzeugt mehrere Stationen mit zufälligen Reaktionszeiten
+(Ex-Gauß wie in population_sim.py) und prüft:
+- Zusammengeführt = Histogramm aller Werte auf einmal
+- Perzentile höchstens 1/64 (Hälfte der Fachbreite) neben den exakten
+- Speichern und Laden ergeben dieselben Zähler
+
+Aufruf:
+    python histogram_merge.py station1.hist station2.hist -o alle.hist
+    python histogram_merge.py --sim 4 --spiele 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+
+from sim_hardware import Board
+
+PERCENTILES = (10, 50, 90, 99)
+
+
+def new_histogram():
+    """Leeres Histogramm: histogram.py im Simulator, Ausgaben auf der Konsole"""
+    return Board(quiet=False).load("histogram")
+
+
+def load_file(path):
+    """Histogramm-Modul (im Simulator) mit den Zählern aus der Datei"""
+    histogram = new_histogram()
+    if not histogram.load(path):
+        raise ValueError(f"{path}: nicht lesbar oder kein Histogramm (HG)")
+    return histogram
+
+
+def show(name, histogram):
+    print(f"▶ {name}")
+    histogram.print_statistics()
+
+
+def exact_percentile(values, p):
+    """Wie histogram.percentile(), aber auf den echten Werten"""
+    ordered = sorted(values)
+    rank = max((p * len(ordered) + 99) // 100, 1)
+    return ordered[rank - 1]
+
+
+def simulate(stations, games, seed):
+    """Zufällige Stationen prüfen; True wenn alles stimmt"""
+    rng = random.Random(seed)
+    merged = new_histogram()
+    everything = new_histogram()
+    values = []
+    for station in range(stations):
+        histogram = new_histogram()
+        mu = rng.gauss(250, 35)
+        for _ in range(games):
+            value = int(max(rng.gauss(mu, 30) + rng.expovariate(1 / 60), 80))
+            histogram.record(value)
+            everything.record(value)
+            values.append(value)
+        show(f"Station {station + 1}", histogram)
+        merged.merge(histogram.to_bytes())
+
+    show(f"Alle {stations} Stationen", merged)
+    ok = merged.to_bytes() == everything.to_bytes()
+    print(f"Zusammengeführt = alle Werte auf einmal: {'✅' if ok else '❌'}")
+
+    for p in PERCENTILES:
+        exact = exact_percentile(values, p)
+        approx = merged.percentile(p)
+        error = abs(approx - exact) / exact
+        good = error <= 1 / 64
+        ok = ok and good
+        print(f"   P{p:<3} exakt {exact:>5}ms, Histogramm {approx:>5}ms, "
+              f"Fehler {error * 100:4.2f}% {'✅' if good else '❌'}")
+
+    copy = new_histogram()
+    same = copy.merge(merged.to_bytes()) and copy.to_bytes() == merged.to_bytes()
+    ok = ok and same
+    print(f"Speichern und Laden: {'✅' if same else '❌'} ({len(merged.to_bytes())} Bytes)")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reaktionszeit-Histogramme zusammenführen")
+    parser.add_argument("dateien", nargs="*", help="reaction.hist der Stationen")
+    parser.add_argument("-o", "--ausgabe", help="Zusammengeführtes Histogramm speichern")
+    parser.add_argument("--sim", type=int, metavar="STATIONEN", help="Stationen im Simulator prüfen")
+    parser.add_argument("--spiele", type=int, default=1000, help="Spiele pro Station für --sim")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.sim:
+        ok = simulate(args.sim, args.spiele, args.seed)
+        print("✅ Histogramme in Ordnung" if ok else "❌ Fehler gefunden")
+        return 0 if ok else 1
+    if not args.dateien:
+        parser.error("Dateien oder --sim angeben")
+
+    merged = new_histogram()
+    for path in args.dateien:
+        try:
+            histogram = load_file(path)
+        except (OSError, ValueError) as error:
+            print(f"❌ {error}")
+            return 1
+        show(os.path.basename(path), histogram)
+        merged.merge(histogram.counts)
+    if len(args.dateien) > 1:
+        show(f"Alle {len(args.dateien)} Stationen", merged)
+    if args.ausgabe:
+        with open(args.ausgabe, "wb") as f:
+            f.write(merged.to_bytes())
+        print(f"✅ {args.ausgabe}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Latenz-Kalibrierung für die Reaktionsmessung
+============================================
+
+Ein Teil jeder gemessenen Reaktionszeit ist gar nicht der Mensch:
+- Abtastung im 10ms-Takt (im Mittel ein halber Takt zu spät)
+- Entprellung bis zur Bestätigung eines Drucks
+
+Die Kalibrierung misst diesen festen Anteil über eine Drahtschleife:
+ein Ausgang (z.B. GPIO 27, über 1kΩ) wird auf den Button-Eingang gelegt
+und zu bekannten Zeitpunkten auf 0 gezogen. Was die Firmware mehr misst,
+ist die Korrektur. Sie wird mit ihrer Streuung in einer Datei gespeichert
+und beim Start wieder geladen.
+
+Verwendung (siehe step6_complete_game.py):
+    latency_cal.begin("latency.cal")     # Korrektur laden (falls vorhanden)
+    latency_cal.reset()
+    latency_cal.add(gemessen_us - echt_us)   # pro Kalibrier-Durchgang
+    latency_cal.finish()                 # Mittelwert/Varianz übernehmen, speichern
+    reaction_ms = latency_cal.correct(roh_us)
+"""
+
+correction_us = 0     # Wird von jeder Messung abgezogen
+variance_us2 = 0      # Streuung der Kalibrier-Messungen (µs²)
+samples = 0           # Anzahl Kalibrier-Messungen
+cal_path = None       # None = nicht speichern (z.B. im Simulator)
+
+_sum = 0
+_sum_sq = 0
+_count = 0
+
+
+def begin(path=None):
+    """Datei festlegen und gespeicherte Korrektur laden"""
+    global cal_path
+    cal_path = path
+    if path is not None:
+        load(path)
+
+
+def load(path):
+    """Korrektur aus der Datei lesen ("korrektur_us varianz_us2 anzahl")"""
+    global correction_us, variance_us2, samples
+    try:
+        with open(path) as f:
+            parts = f.read().split()
+        correction_us, variance_us2, samples = int(parts[0]), int(parts[1]), int(parts[2])
+        return True
+    except (OSError, ValueError, IndexError):
+        return False
+
+
+def save(path):
+    with open(path, "w") as f:
+        f.write(f"{correction_us} {variance_us2} {samples}\n")
+
+
+def reset():
+    """Neue Kalibrierung beginnen"""
+    global _sum, _sum_sq, _count
+    _sum = 0
+    _sum_sq = 0
+    _count = 0
+
+
+def add(offset_us):
+    """Eine Messung: gemessene minus echte Zeit in µs"""
+    global _sum, _sum_sq, _count
+    _sum += offset_us
+    _sum_sq += offset_us * offset_us
+    _count += 1
+
+
+def finish():
+    """Mittelwert und Varianz übernehmen und speichern"""
+    global correction_us, variance_us2, samples
+    if _count == 0:
+        return False
+    mean = _sum // _count
+    correction_us = max(mean, 0)
+    variance_us2 = max(_sum_sq // _count - mean * mean, 0)
+    samples = _count
+    if cal_path is not None:
+        save(cal_path)
+    return True
+
+
+def correct(raw_us):
+    """Rohe Messung (µs) in korrigierte Reaktionszeit (ms) umrechnen"""
+    if raw_us > correction_us:
+        return (raw_us - correction_us) // 1000
+    return 0
+
+
+def print_statistics():
+    """Korrektur und Streuung ausgeben"""
+    if samples == 0:
+        print("Latenz-Korrektur: nicht kalibriert")
+        return
+    print(f"Latenz-Korrektur: {correction_us}µs ± {int(variance_us2 ** 0.5)}µs "
+          f"({samples} Messungen)")
@@ -0,0 +1,156 @@
+"""
+Lastgenerator für den Leaderboard-Dienst (Host-Werkzeug)
+========================================================
+
+Simuliert hunderte Stationen, die ihre Ergebnisse gleichzeitig melden:
+- Jede virtuelle Station spielt simulierte step6-Sitzungen
+  (replay.simulate_sessions) und meldet deren Ergebnisse
+- Die Stationen sind auf mehrere Prozesse verteilt, jeder Prozess
+  bedient seine Stationen mit asyncio
+- Gemessen wird die Zeit vom Senden bis zur Bestätigung ("OK"),
+  also inklusive Batch-Speicherung
+
+Ausgabe: Durchsatz (Ergebnisse/s) und Latenz-Perzentile.
+
+Aufruf:
+    python leaderboard_load.py --server                 # Dienst lokal mitstarten
+    python leaderboard_load.py --stationen 500 --prozesse 8 --sitzungen 40
+    python leaderboard_load.py --host 10.0.0.5 --port 5555
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+
+import leaderboard_server
+from replay import parse_sessions, simulate_sessions
+
+
+def session_results(data):
+    """Ergebnisse (kind, reaction_ms) aus aufgezeichneten step6-Sitzungen ableiten"""
+    results = []
+    for session in parse_sessions(data):
+        states = [s for _, s in session.transitions]
+        if session.reactions:
+            results.extend(("ok", ms) for ms in session.reactions)
+        elif 2 in states:
+            results.append(("timeout", None))       # GO ohne Reaktion
+        elif 1 in states:
+            results.append(("false_start", None))   # READY -> WAITING
+    return results
+
+
+async def run_station(host, port, station, board, results, interval_ms, latencies):
+    """Eine virtuelle Station: Ergebnisse senden, Bestätigungen messen"""
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at = {}
+
+    async def receive():
+        for _ in results:
+            line = await reader.readline()
+            if not line.startswith(b"OK"):
+                raise RuntimeError(f"Station {station}: {line!r}")
+            seq = int(line.split()[1])
+            latencies.append(time.perf_counter() - sent_at.pop(seq))
+
+    receiver = asyncio.ensure_future(receive())
+    for seq, (kind, ms) in enumerate(results, 1):
+        record = {"seq": seq, "station": station, "board": board, "kind": kind}
+        if ms is not None:
+            record["reaction_ms"] = ms
+        sent_at[seq] = time.perf_counter()
+        writer.write(json.dumps(record).encode() + b"\n")
+        if interval_ms:
+            await writer.drain()
+            await asyncio.sleep(interval_ms * random.random() * 2 / 1000)
+    await writer.drain()
+    await receiver
+    writer.close()
+
+
+def worker(args):
+    """Ein Prozess mit mehreren Stationen"""
+    host, port, station_ids, sessions, boards, interval_ms, start_at = args
+
+    # Sitzungen vorab simulieren - das gehört nicht zur gemessenen Last
+    stations = []
+    for sid in station_ids:
+        data = simulate_sessions(sessions, seed=sid)
+        stations.append((f"S{sid:04d}", f"board{sid % boards}", session_results(data)))
+
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    latencies = []
+
+    async def run_all():
+        await asyncio.gather(*(run_station(host, port, name, board, results, interval_ms, latencies)
+                               for name, board, results in stations))
+
+    t0 = time.perf_counter()
+    asyncio.run(run_all())
+    return latencies, time.perf_counter() - t0
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100.0 * len(sorted_values)))]
+
+
+def _serve_local(port, ready):
+    asyncio.run(leaderboard_server.serve("127.0.0.1", port, ":memory:", 500, 20, 10, ready))
+
+
+def start_local_server(port):
+    """Dienst in einem eigenen Prozess starten (für Tests auf localhost)"""
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=_serve_local, args=(port, ready), daemon=True)
+    process.start()
+    ready.wait(10)
+    return process
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lastgenerator für den Leaderboard-Dienst")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=leaderboard_server.DEFAULT_PORT)
+    parser.add_argument("--server", action="store_true", help="Dienst lokal mitstarten")
+    parser.add_argument("--stationen", type=int, default=200)
+    parser.add_argument("--prozesse", type=int, default=4)
+    parser.add_argument("--sitzungen", type=int, default=20, help="Sitzungen pro Station")
+    parser.add_argument("--boards", type=int, default=4, help="Anzahl Leaderboards")
+    parser.add_argument("--intervall", type=float, default=0.0,
+                        help="Mittlere Pause zwischen Ergebnissen einer Station in ms (0 = Volllast)")
+    args = parser.parse_args(argv)
+
+    server = start_local_server(args.port) if args.server else None
+
+    ids = list(range(args.stationen))
+    chunks = [ids[i::args.prozesse] for i in range(args.prozesse)]
+    start_at = time.time() + 1.0 + 0.02 * args.sitzungen * args.stationen / args.prozesse
+    jobs = [(args.host, args.port, chunk, args.sitzungen, args.boards, args.intervall, start_at)
+            for chunk in chunks if chunk]
+
+    with multiprocessing.Pool(len(jobs)) as pool:
+        results = pool.map(worker, jobs)
+
+    latencies = sorted(lat for lats, _ in results for lat in lats)
+    duration = max(d for _, d in results)
+    print(f"{args.stationen} Stationen in {len(jobs)} Prozessen, {len(latencies)} Ergebnisse")
+    print(f"Durchsatz: {len(latencies) / duration:.0f} Ergebnisse/s ({duration:.2f}s)")
+    if latencies:
+        parts = [f"P{q}: {1000 * percentile(latencies, q):.1f}ms" for q in (50, 90, 99, 99.9)]
+        parts.append(f"max: {1000 * latencies[-1]:.1f}ms")
+        print("Latenz bis Bestätigung: " + "  ".join(parts))
+
+    if server is not None:
+        server.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Leaderboard-Dienst für alle Stationen (Host-Werkzeug)
+=====================================================
+
+Sammelt die Ergebnisse aller Stationen in einer Rangliste:
+- asyncio-TCP-Server, ein Ergebnis pro Zeile (JSON)
+- Schreibt gesammelt (Batch) in SQLite statt einzeln
+- Hält pro Leaderboard die besten K Zeiten in einem Heap,
+  Abfragen kosten also fast nichts
+- Bestätigt jedes Ergebnis erst, wenn es gespeichert ist
+
+Protokoll (Zeilen, UTF-8):
+    {"seq": 1, "station": "S01", "board": "halle", "kind": "ok", "reaction_ms": 231}
+        -> "OK 1"
+    kind: "ok", "false_start" oder "timeout" (reaction_ms nur bei "ok")
+    TOP halle 10   -> JSON-Liste der besten 10
+    STATS          -> JSON mit Zählern
+
+Aufruf:
+    python leaderboard_server.py --port 5555 --db leaderboard.sqlite
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import sqlite3
+import time
+
+DEFAULT_PORT = 5555
+KINDS = ("ok", "false_start", "timeout")
+
+
+class Leaderboard:
+    """Beste K Reaktionszeiten eines Leaderboards (Max-Heap der Größe K)"""
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []  # (-reaction_ms, -seq, station) -> schlechteste oben
+        self.games = 0
+        self.false_starts = 0
+        self.timeouts = 0
+
+    def add(self, record):
+        kind = record["kind"]
+        if kind == "false_start":
+            self.false_starts += 1
+            return
+        self.games += 1
+        if kind == "timeout":
+            self.timeouts += 1
+            return
+
+        entry = (-record["reaction_ms"], -record["id"], record["station"])
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def top(self, n=None):
+        best = sorted(self.heap, reverse=True)[:n or self.k]
+        return [{"station": station, "reaction_ms": -neg} for neg, _, station in best]
+
+
+class IngestService:
+    """Nimmt Ergebnisse an, schreibt sie gebündelt und führt die Ranglisten"""
+
+    def __init__(self, db_path=":memory:", batch_size=500, batch_ms=20, top_k=10):
+        self.batch_size = batch_size
+        self.batch_ms = batch_ms
+        self.top_k = top_k
+        self.boards = {}
+        self.queue = []          # (record, writer, seq)
+        self.wakeup = asyncio.Event()
+        self.next_id = 1
+        self.received = 0
+        self.stored = 0
+        self.batches = 0
+        self.server = None
+
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS results (
+            id INTEGER PRIMARY KEY, t REAL, station TEXT, board TEXT,
+            kind TEXT, reaction_ms INTEGER)""")
+        self.db.commit()
+
+    def board(self, name):
+        if name not in self.boards:
+            self.boards[name] = Leaderboard(self.top_k)
+        return self.boards[name]
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.handle, host, port)
+        self.writer_task = asyncio.ensure_future(self.writer_loop())
+        return self.server
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.writer_task.cancel()
+        self.flush_now()
+
+    async def handle(self, reader, writer):
+        """Eine Station-Verbindung bedienen"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if line.startswith(b"{"):
+                    self.accept(line, writer)
+                elif line.startswith(b"TOP"):
+                    parts = line.decode().split()
+                    name = parts[1] if len(parts) > 1 else "default"
+                    n = int(parts[2]) if len(parts) > 2 else None
+                    writer.write(json.dumps(self.board(name).top(n)).encode() + b"\n")
+                elif line == b"STATS":
+                    writer.write(json.dumps(self.stats()).encode() + b"\n")
+                elif line:
+                    writer.write(b"ERR unbekannter Befehl\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def accept(self, line, writer):
+        """Ergebnis prüfen und in die Warteschlange stellen"""
+        try:
+            record = json.loads(line)
+            seq = record.get("seq", 0)
+            if record.get("kind") not in KINDS:
+                raise ValueError("kind")
+            if record["kind"] == "ok":
+                record["reaction_ms"] = int(record["reaction_ms"])
+            record.setdefault("board", "default")
+            record.setdefault("station", "?")
+        except (ValueError, KeyError, TypeError):
+            writer.write(b"ERR ungueltiges Ergebnis\n")
+            return
+
+        record["id"] = self.next_id
+        self.next_id += 1
+        self.received += 1
+        self.queue.append((record, writer, seq))
+        if len(self.queue) >= self.batch_size:
+            self.wakeup.set()
+
+    async def writer_loop(self):
+        """Warteschlange alle batch_ms (oder bei vollem Batch) wegschreiben"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.batch_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            if not self.queue:
+                continue
+
+            batch, self.queue = self.queue, []
+            # SQLite blockiert -> im Thread, die Ereignisschleife läuft weiter
+            await loop.run_in_executor(None, self.store, [r for r, _, _ in batch])
+
+            for record, _, _ in batch:
+                self.board(record["board"]).add(record)
+            for _, writer, seq in batch:
+                if not writer.is_closing():
+                    writer.write(b"OK %d\n" % seq)
+
+    def store(self, records):
+        """Einen Batch in die Datenbank schreiben"""
+        now = time.time()
+        self.db.executemany(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            [(r["id"], now, r["station"], r["board"], r["kind"], r.get("reaction_ms"))
+             for r in records])
+        self.db.commit()
+        self.stored += len(records)
+        self.batches += 1
+
+    def flush_now(self):
+        """Restliche Einträge synchron speichern (beim Beenden)"""
+        if self.queue:
+            batch, self.queue = self.queue, []
+            self.store([r for r, _, _ in batch])
+            for record, _, _ in batch:
+                self.board(record["board"]).add(record)
+
+    def stats(self):
+        return {
+            "received": self.received,
+            "stored": self.stored,
+            "batches": self.batches,
+            "boards": {name: {"games": b.games, "false_starts": b.false_starts,
+                              "timeouts": b.timeouts} for name, b in self.boards.items()},
+        }
+
+
+async def serve(host, port, db_path, batch_size, batch_ms, top_k, ready=None):
+    service = IngestService(db_path, batch_size, batch_ms, top_k)
+    await service.start(host, port)
+    if ready is None:
+        print(f"Leaderboard-Dienst läuft auf {host}:{port}")
+    else:
+        ready.set()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaderboard-Dienst für Reaktionsspiel-Stationen")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default=":memory:", help="SQLite-Datei")
+    parser.add_argument("--batch", type=int, default=500, help="Maximale Batch-Größe")
+    parser.add_argument("--batch-ms", type=int, default=20, help="Maximale Wartezeit pro Batch")
+    parser.add_argument("--top", type=int, default=10, help="Größe der Rangliste")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.db, args.batch, args.batch_ms, args.top))
+    except KeyboardInterrupt:
+        print("\nLeaderboard-Dienst beendet.")
+
+
+if __name__ == "__main__":
+    main()
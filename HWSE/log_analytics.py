@@ -0,0 +1,452 @@
+"""
+Auswertung großer Log-Sammlungen (Host-Werkzeug)
+================================================
+
+Monate an Konsolen-Ausgaben und Sitzungs-Aufzeichnungen von vielen
+Stationen zeilenweise in Python auszuwerten dauert Stunden. Dieses
+Werkzeug liest sie blockweise und rechnet mit NumPy:
+
+1. Einlesen (Strom, begrenzter Speicher):
+   - Konsolen-Logs (.log/.txt): Blöcke zu 16 MB. Ein Regex über den ganzen
+     Block findet "⚡ Reaktionszeit: 123ms" (die Zahlen werden als ein
+     Array umgewandelt), Falschstarts ("Falschstart!", "Zu früh gedrückt!")
+     und Timeouts ("Timeout!") werden mit bytes.count gezählt - keine
+     Python-Schleife pro Zeile
+   - Sitzungs-Aufzeichnungen (.rrc, recorder.py): Sitzung für Sitzung, die
+     Einträge als NumPy-Strukturarray
+2. Spalten: Station, Tag, Ergebnis (Reaktion/Falschstart/Timeout) und
+   Reaktionszeit landen in vorab angelegten Arrays zu CHUNK Zeilen. Ist ein
+   Block voll, wird er in die Summen eingerechnet und neu befüllt.
+3. Summen je Station und je Tag: Anzahl pro Ergebnis und ein Histogramm
+   der Reaktionszeiten in 1ms-Schritten. Daraus kommen Mittelwert,
+   Perzentile und die Bewertungen - für alle Gruppen auf einmal, auch mit
+   anderen Bewertungsgrenzen (--baender, wie population_sim.py).
+
+Station und Tag kommen aus dem Pfad: logs/<station>/<JJJJ-MM-TT>.log.
+Ohne Unterordner ist der Dateiname ohne Datum die Station, ohne Datum im
+Pfad zählt das Änderungsdatum der Datei.
+
+Benötigt NumPy.
+
+Aufruf:
+    python log_analytics.py logs/
+    python log_analytics.py logs/ sessions.rrc --baender 180,250,330,450 --npz summen.npz
+    python log_analytics.py --erzeugen /tmp/logs --stationen 20 --tage 30   # Test-Logs
+    python log_analytics.py /tmp/logs --vergleich      # gegen zeilenweises Parsen
+"""
+
+import argparse
+import datetime
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from population_sim import PRESETS
+
+CHUNK = 1 << 20            # Zeilen pro Spaltenblock
+READ_BYTES = 16 << 20      # Bytes pro Leseblock (Konsolen-Logs)
+MAX_MS = 3000              # Histogramm bis zum GO-Timeout (größere Werte im letzten Fach)
+
+REACTION = 0
+FALSE_START = 1
+TIMEOUT = 2
+OUTCOMES = 3
+
+REACTION_PATTERN = re.compile(rb"Reaktionszeit: (\d+)ms")
+FALSE_START_MARKERS = (b"Falschstart!", "Zu früh gedrückt!".encode())
+TIMEOUT_MARKER = b"Timeout!"
+DATE_PATTERN = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+TEXT_SUFFIXES = (".log", ".txt")
+
+# recorder.py: Sitzungskopf und Einträge (RRC1)
+RRC_MAGIC = b"RRC1"
+RRC_RECORD = np.dtype([("event", "u1"), ("t_ms", "<u4"), ("value", "<u2")])
+EV_STATE = 3
+EV_REACTION = 4
+STATE_READY = 1
+STATE_GO = 2
+
+RATING_NAMES = ("Blitzschnell", "Ausgezeichnet", "Sehr gut", "Ganz okay", "Luft nach oben")
+
+
+class Columns:
+    """Ein Block Spalten, vorab angelegt; flush() rechnet ihn in die Summen ein"""
+
+    def __init__(self, totals, size=CHUNK):
+        self.totals = totals
+        self.station = np.empty(size, dtype=np.int32)
+        self.day = np.empty(size, dtype=np.int32)
+        self.outcome = np.empty(size, dtype=np.int8)
+        self.reaction_ms = np.empty(size, dtype=np.int32)
+        self.used = 0
+        self.rows = 0
+
+    def add(self, station, day, outcome, reaction_ms=None, count=None):
+        """Zeilen einer Station und eines Tages anhängen (Reaktionszeiten als Array)"""
+        n = len(reaction_ms) if reaction_ms is not None else count
+        start = 0
+        while start < n:
+            take = min(n - start, len(self.station) - self.used)
+            end = self.used + take
+            self.station[self.used:end] = station
+            self.day[self.used:end] = day
+            self.outcome[self.used:end] = outcome
+            if reaction_ms is not None:
+                self.reaction_ms[self.used:end] = reaction_ms[start:start + take]
+            else:
+                self.reaction_ms[self.used:end] = -1
+            self.used = end
+            start += take
+            if self.used == len(self.station):
+                self.flush()
+        self.rows += n
+
+    def flush(self):
+        if self.used:
+            n = self.used
+            self.totals.add(self.station[:n], self.day[:n], self.outcome[:n], self.reaction_ms[:n])
+            self.used = 0
+
+
+class Groups:
+    """Summen für eine Gruppierung (Station oder Tag): Ergebnisse + Histogramm"""
+
+    def __init__(self):
+        self.counts = np.zeros((0, OUTCOMES), dtype=np.int64)
+        self.histogram = np.zeros((0, MAX_MS + 1), dtype=np.int64)
+
+    def grow(self, size):
+        if size > len(self.counts):
+            extra = size - len(self.counts)
+            self.counts = np.vstack([self.counts, np.zeros((extra, OUTCOMES), dtype=np.int64)])
+            self.histogram = np.vstack([self.histogram, np.zeros((extra, MAX_MS + 1), dtype=np.int64)])
+
+    def add(self, ids, outcome, reaction_ms, size):
+        self.grow(size)
+        groups = len(self.counts)
+        self.counts += np.bincount(ids.astype(np.int64) * OUTCOMES + outcome,
+                                   minlength=groups * OUTCOMES).reshape(groups, OUTCOMES)
+        scored = outcome == REACTION
+        values = np.clip(reaction_ms[scored], 0, MAX_MS)
+        flat = ids[scored].astype(np.int64) * (MAX_MS + 1) + values
+        self.histogram += np.bincount(flat, minlength=groups * (MAX_MS + 1)).reshape(groups, MAX_MS + 1)
+
+    def percentiles(self, qs):
+        """Perzentile (ms) für alle Gruppen auf einmal; NaN ohne Reaktionen"""
+        cumulative = np.cumsum(self.histogram, axis=1)
+        total = cumulative[:, -1:]
+        result = np.empty((len(self.histogram), len(qs)))
+        for i, q in enumerate(qs):
+            result[:, i] = (cumulative < q / 100.0 * total).sum(axis=1)
+        result[total[:, 0] == 0] = np.nan
+        return result
+
+    def means(self):
+        total = self.histogram.sum(axis=1)
+        weighted = self.histogram @ np.arange(MAX_MS + 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, weighted / total, np.nan)
+
+    def ratings(self, bands):
+        """Anzahl je Bewertung: Reaktionszeit < bands[0], < bands[1], ..., Rest"""
+        cumulative = np.cumsum(self.histogram, axis=1)
+        edges = np.clip(np.asarray(bands) - 1, 0, MAX_MS)
+        below = np.hstack([np.zeros((len(cumulative), 1), dtype=np.int64),
+                           cumulative[:, edges], cumulative[:, -1:]])
+        return np.diff(below, axis=1)
+
+
+class Totals:
+    """Summen je Station und je Tag; Namen werden zu fortlaufenden Nummern"""
+
+    def __init__(self):
+        self.station_names = []
+        self.station_ids = {}
+        self.days = []
+        self.day_ids = {}
+        self.by_station = Groups()
+        self.by_day = Groups()
+
+    def station_id(self, name):
+        if name not in self.station_ids:
+            self.station_ids[name] = len(self.station_names)
+            self.station_names.append(name)
+        return self.station_ids[name]
+
+    def day_id(self, day):
+        if day not in self.day_ids:
+            self.day_ids[day] = len(self.days)
+            self.days.append(day)
+        return self.day_ids[day]
+
+    def add(self, station, day, outcome, reaction_ms):
+        self.by_station.add(station, outcome, reaction_ms, len(self.station_names))
+        self.by_day.add(day, outcome, reaction_ms, len(self.days))
+
+
+def station_and_day(path, root):
+    """Station und Tag (datetime.date) aus dem Pfad"""
+    relative = os.path.relpath(path, root)
+    parts = relative.split(os.sep)
+    stem = os.path.splitext(parts[-1])[0]
+    if len(parts) > 1:
+        station = parts[0]
+    else:
+        station = DATE_PATTERN.sub("", stem).strip("_- ") or stem
+    match = DATE_PATTERN.search(relative)
+    if match:
+        day = datetime.date(*map(int, match.groups()))
+    else:
+        day = datetime.date.fromtimestamp(os.path.getmtime(path))
+    return station, day
+
+
+def input_files(paths):
+    """Dateien und Ordner zu (Datei, Wurzel)-Paaren auflösen"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in os.walk(path):
+                files.extend((os.path.join(folder, n), path) for n in sorted(names)
+                             if n.endswith(TEXT_SUFFIXES + (".rrc",)))
+        else:
+            files.append((path, os.path.dirname(path) or "."))
+    return sorted(files)
+
+
+def read_text(path, columns, station, day):
+    """Konsolen-Log blockweise: Regex und count über ganze Blöcke; liefert gelesene Bytes"""
+    size = 0
+    rest = b""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(READ_BYTES)
+            if not block and not rest:
+                break
+            data = rest + block
+            if block:
+                cut = data.rfind(b"\n") + 1   # Letzte angefangene Zeile in den nächsten Block
+                data, rest = data[:cut], data[cut:]
+            else:
+                rest = b""
+            size += len(data)
+            values = REACTION_PATTERN.findall(data)
+            if values:
+                columns.add(station, day, REACTION, np.array(values).astype(np.int32))
+            false_starts = sum(data.count(marker) for marker in FALSE_START_MARKERS)
+            if false_starts:
+                columns.add(station, day, FALSE_START, count=false_starts)
+            timeouts = data.count(TIMEOUT_MARKER)
+            if timeouts:
+                columns.add(station, day, TIMEOUT, count=timeouts)
+    return size
+
+
+def read_rrc(path, columns, station, day):
+    """Sitzungs-Aufzeichnung Sitzung für Sitzung; liefert gelesene Bytes"""
+    reactions = []
+    false_starts = 0
+    timeouts = 0
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(7)
+            if len(header) < 7:
+                break
+            if header[:4] != RRC_MAGIC:
+                print(f"⚠️ {path}: kein Sitzungsanfang bei Byte {size}, Rest übersprungen")
+                break
+            f.read(header[6])                                  # Firmware-Version
+            count = int.from_bytes(f.read(2), "little")
+            records = np.frombuffer(f.read(count * RRC_RECORD.itemsize), dtype=RRC_RECORD)
+            size += 9 + header[6] + count * RRC_RECORD.itemsize
+
+            reaction = records["value"][records["event"] == EV_REACTION]
+            states = records["value"][records["event"] == EV_STATE]
+            if len(reaction):
+                reactions.append(int(reaction[0]))
+            elif (states == STATE_GO).any():
+                timeouts += 1
+            elif (states == STATE_READY).any():
+                false_starts += 1
+    if reactions:
+        columns.add(station, day, REACTION, np.array(reactions, dtype=np.int32))
+    if false_starts:
+        columns.add(station, day, FALSE_START, count=false_starts)
+    if timeouts:
+        columns.add(station, day, TIMEOUT, count=timeouts)
+    return size
+
+
+def analyse(paths):
+    """Alle Dateien einlesen; liefert (Totals, Zeilen, Bytes)"""
+    totals = Totals()
+    columns = Columns(totals)
+    size = 0
+    for path, root in input_files(paths):
+        station_name, day = station_and_day(path, root)
+        station = totals.station_id(station_name)
+        day = totals.day_id(day)
+        if path.endswith(".rrc"):
+            size += read_rrc(path, columns, station, day)
+        else:
+            size += read_text(path, columns, station, day)
+    columns.flush()
+    return totals, columns.rows, size
+
+
+def table(title, names, groups, bands, labels):
+    """Tabelle: Spiele, Anteile, Mittelwert, Perzentile, Bewertungen"""
+    counts = groups.counts
+    attempts = np.maximum(counts.sum(axis=1), 1)
+    means = groups.means()
+    pct = groups.percentiles((50, 90, 99))
+    ratings = groups.ratings(bands)
+    scored = np.maximum(ratings.sum(axis=1, keepdims=True), 1)
+    shares = 100.0 * ratings / scored
+    width = max(8, max(len(label) for label in labels))
+
+    lines = [f"▶ {title}",
+             f"   {'':<12} {'Spiele':>7} {'Fehlst.':>7} {'Timeout':>7} {'Ø':>6} {'P50':>5} {'P90':>5} {'P99':>5}  "
+             + " ".join(f"{label:>{width}}" for label in labels)]
+    for i in np.argsort(names, kind="stable"):
+        lines.append(f"   {names[i]:<12} {counts[i].sum():>7} "
+                     f"{100.0 * counts[i, FALSE_START] / attempts[i]:>6.1f}% "
+                     f"{100.0 * counts[i, TIMEOUT] / attempts[i]:>6.1f}% "
+                     f"{means[i]:>6.0f} {pct[i, 0]:>5.0f} {pct[i, 1]:>5.0f} {pct[i, 2]:>5.0f}  "
+                     + " ".join(f"{share:>{width - 1}.1f}%" for share in shares[i]))
+    return "\n".join(lines)
+
+
+def rating_labels(bands):
+    if tuple(bands) == PRESETS["schritt6"]:
+        return list(RATING_NAMES)
+    edges = ["0"] + [str(b) for b in bands] + [""]
+    return [f"{edges[i]}-{edges[i + 1]}" for i in range(len(bands) + 1)]
+
+
+def save_npz(path, totals, bands):
+    """Summen als Spalten speichern (z.B. für ein Notebook)"""
+    np.savez_compressed(
+        path,
+        stations=np.array(totals.station_names),
+        days=np.array([d.isoformat() for d in totals.days]),
+        bands=np.asarray(bands),
+        station_counts=totals.by_station.counts, station_histogram=totals.by_station.histogram,
+        station_ratings=totals.by_station.ratings(bands),
+        day_counts=totals.by_day.counts, day_histogram=totals.by_day.histogram,
+        day_ratings=totals.by_day.ratings(bands))
+
+
+def naive_counts(paths):
+    """Zum Vergleich: Zeile für Zeile in Python (so wie die alten Skripte)"""
+    reactions = []
+    false_starts = 0
+    timeouts = 0
+    for path, _ in input_files(paths):
+        if path.endswith(".rrc"):
+            continue
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if "Reaktionszeit: " in line:
+                    reactions.append(int(line.split("Reaktionszeit: ")[1].split("ms")[0]))
+                elif "Falschstart!" in line or "Zu früh gedrückt!" in line:
+                    false_starts += 1
+                elif "Timeout!" in line:
+                    timeouts += 1
+    return reactions, false_starts, timeouts
+
+
+def generate(folder, stations, days, games, seed):
+    """Test-Logs im Format von step6_complete_game.py erzeugen"""
+    rng = np.random.default_rng(seed)
+    start = datetime.date(2026, 1, 1)
+    for s in range(stations):
+        station_dir = os.path.join(folder, f"station{s + 1:02d}")
+        os.makedirs(station_dir, exist_ok=True)
+        mu = rng.normal(260, 30)
+        for d in range(days):
+            reaction = np.maximum(rng.normal(mu, 35, games) + rng.exponential(60, games), 90).astype(int)
+            outcome = rng.choice(OUTCOMES, games, p=(0.9, 0.07, 0.03))
+            lines = []
+            for i in range(games):
+                lines.append("State: WAITING → READY\nBereit machen... (3.2s)\nNICHT zu früh drücken!\n")
+                if outcome[i] == FALSE_START:
+                    lines.append(f"Falschstart! ({i} insgesamt)\n   Das war zu früh. Warte auf das GO-Signal!\n"
+                                 "State: READY → WAITING\n")
+                    continue
+                lines.append("State: READY → GO\nJETZT! So schnell wie möglich!\n")
+                if outcome[i] == TIMEOUT:
+                    lines.append("🐌 Timeout! Zu langsam (>3000ms)\n   Übung macht den Meister!\n")
+                else:
+                    lines.append(f"⚡ Reaktionszeit: {reaction[i]}ms\n   Sehr gut!\n")
+                lines.append("State: GO → RESULT\n" + "=" * 50 + f"\nSpiele gespielt: {i}\n"
+                             "State: RESULT → WAITING\n")
+            day = (start + datetime.timedelta(days=d)).isoformat()
+            with open(os.path.join(station_dir, f"{day}.log"), "w", encoding="utf-8") as f:
+                f.write("".join(lines))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Konsolen-Logs und Sitzungen vieler Stationen auswerten")
+    parser.add_argument("pfade", nargs="*", help="Log-Dateien (.log/.txt), Aufzeichnungen (.rrc) oder Ordner")
+    parser.add_argument("--baender", default=",".join(map(str, PRESETS["schritt6"])),
+                        help="Bewertungsgrenzen in ms, z.B. 180,250,330,450")
+    parser.add_argument("--npz", help="Summen als NumPy-Datei speichern")
+    parser.add_argument("--vergleich", action="store_true", help="Auch zeilenweise parsen und vergleichen")
+    parser.add_argument("--erzeugen", metavar="ORDNER", help="Test-Logs erzeugen statt auswerten")
+    parser.add_argument("--stationen", type=int, default=10)
+    parser.add_argument("--tage", type=int, default=30)
+    parser.add_argument("--spiele", type=int, default=500, help="Spiele pro Station und Tag (--erzeugen)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.erzeugen:
+        generate(args.erzeugen, args.stationen, args.tage, args.spiele, args.seed)
+        print(f"✅ {args.stationen * args.tage} Logs in {args.erzeugen}")
+        return 0
+    if not args.pfade:
+        parser.error("Pfade angeben (oder --erzeugen)")
+
+    bands = tuple(int(x) for x in args.baender.split(","))
+    start = time.perf_counter()
+    totals, rows, size = analyse(args.pfade)
+    seconds = time.perf_counter() - start
+    labels = rating_labels(bands)
+    print(table("Je Station", totals.station_names, totals.by_station, bands, labels))
+    print(table("Je Tag", [d.isoformat() for d in totals.days], totals.by_day, bands, labels))
+    print(f"\n{rows} Ergebnisse aus {size / 1e6:.1f} MB in {seconds:.2f}s "
+          f"({size / 1e6 / max(seconds, 1e-9):.0f} MB/s)")
+    if args.npz:
+        save_npz(args.npz, totals, bands)
+        print(f"Summen gespeichert: {args.npz}")
+
+    if args.vergleich:
+        start = time.perf_counter()
+        reactions, false_starts, timeouts = naive_counts(args.pfade)
+        naive_seconds = time.perf_counter() - start
+        text_only = Totals()    # Nur Konsolen-Logs, alles in einer Gruppe
+        text_columns = Columns(text_only)
+        group = text_only.station_id("alle")
+        text_only.day_id("alle")
+        for path, _ in input_files(args.pfade):
+            if not path.endswith(".rrc"):
+                read_text(path, text_columns, group, group)
+        text_columns.flush()
+        text_only.by_station.grow(1)
+        counts = text_only.by_station.counts[group]
+        expected = np.bincount(np.clip(np.array(reactions, dtype=np.int64), 0, MAX_MS),
+                               minlength=MAX_MS + 1)
+        same = (counts[FALSE_START] == false_starts and counts[TIMEOUT] == timeouts
+                and (text_only.by_station.histogram[group] == expected).all())
+        print(f"Zeilenweise: {naive_seconds:.2f}s ({naive_seconds / max(seconds, 1e-9):.1f}x langsamer) "
+              f"{'✅ gleiche Ergebnisse' if same else '❌ Ergebnisse weichen ab'}")
+        return 0 if same else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Speicherbudgets der Schritt-Dateien prüfen (Host-Werkzeug)
+==========================================================
+
+Lässt jeden Schritt im Simulator mit dem virtuellen Spieler aus replay.py
+laufen und misst mit memprofile.py bei jedem Zustandswechsel den Heap:
+- Laden: was Import und globale Variablen belegen
+- Spitze: belegt vor dem Aufräumen (inkl. Müll aus f-Strings, Floats, ...)
+- Dauerbedarf: belegt nach gc.collect()
+- Kleinster freier Heap und größter freier Block
+
+Gemessen wird mit tracemalloc in CPython-Bytes. Die Zahlen sind größer als
+auf dem Board, eignen sich aber zum Vergleich der Schritte und als
+Regressionsgrenze: Überschreitet ein Schritt sein Budget, endet das
+Programm mit Exit-Code 1. Auf dem Board selbst misst step6 mit
+MEMORY_PROFILE = True in echten MicroPython-Bytes.
+
+Aufruf:
+    python mem_budget.py
+    python mem_budget.py --minuten 30 --details
+    python mem_budget.py --budget step6_complete_game=8000:12000
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from replay import VirtualPlayer
+from sim_hardware import Board, StopSimulation, run_main
+
+# Budgets in CPython-Bytes: (Laden, Dauerbedarf, Spitze). Gemessen mit
+# --minuten 30, dazu ein kleiner Rand. Passt ein neues Feature nicht hinein,
+# spart es an anderer Stelle ein - ein höheres Budget braucht eine eigene
+# Begründung und kommt nicht einfach mit dem Feature
+BUDGETS = {
+    "step1_basic_states": (2750, 1250, 2000),
+    "step2_led_control": (4500, 1250, 2000),
+    "step3_button_debounce": (5000, 1250, 2000),
+    "step3_button_debounce_functional": (5000, 1250, 2000),
+    "step4_random_timing": (5000, 1250, 2000),
+    "step5_buzzer_audio": (6750, 1250, 2000),
+    "step6_complete_game": (58000, 3000, 4000),   # inkl. Trace-Ringpuffer, Histogramm, Display-Bild
+}
+
+
+class StepProfile:
+    """Messergebnis eines Schritts"""
+
+    def __init__(self, step, load_bytes, memprofile, largest_block, top_lines):
+        self.step = step
+        self.load_bytes = load_bytes
+        self.peak = memprofile.peak_alloc
+        self.steady = memprofile.steady_alloc
+        self.min_free = memprofile.min_free
+        self.largest_block = largest_block
+        self.samples = memprofile.samples
+        self.states = {label: tuple(v) for label, v in memprofile.states.items()}
+        self.top_lines = top_lines
+
+    def violations(self, budget):
+        load, steady, peak = budget
+        found = []
+        if self.load_bytes > load:
+            found.append(f"Laden {self.load_bytes} > {load}")
+        if self.steady > steady:
+            found.append(f"Dauerbedarf {self.steady} > {steady}")
+        if self.peak > peak:
+            found.append(f"Spitze {self.peak} > {peak}")
+        return found
+
+
+def profile_step(step, minutes, seed=0, top=0):
+    """Einen Schritt laufen lassen und seinen Speicherbedarf messen"""
+    board = Board(seed=seed)
+    # Ausgaben, Registerzugriffe, alte PWM-Objekte und Taktwechsel nicht
+    # sammeln - sie hielten sonst Objekte der Firmware am Leben
+    board.console = deque(maxlen=1)
+    board.writes = deque(maxlen=1)
+    board.pwms = deque(maxlen=2)
+    board.freq_log = deque(maxlen=1)
+    heap = board.modules["gc"]
+    heap.collect()
+    before = heap.mem_alloc()
+    game = board.load(step)
+    heap.collect()
+    load_bytes = heap.mem_alloc() - before
+
+    recorder = getattr(game, "recorder", None)
+    if recorder is not None:
+        recorder.capture_path = None
+    if hasattr(game, "histogram"):
+        game.histogram.hist_path = None
+    memprofile = board.load("memprofile")
+    board.set_button_source(VirtualPlayer(game, random.Random(seed)))
+
+    if hasattr(game, "MEMORY_PROFILE"):
+        game.MEMORY_PROFILE = True   # Firmware misst selbst (ohne gc.collect() in GO)
+    else:
+        original_change_state = game.change_state
+
+        def change_state(new_state):
+            original_change_state(new_state)
+            memprofile.sample(("WAITING", "READY", "GO", "RESULT")[new_state])
+
+        game.change_state = change_state
+        memprofile.begin()
+
+    board.clock.stop_at_ms = board.clock.now_ms() + int(minutes * 60000)
+    try:
+        run_main(game)
+    except StopSimulation:
+        pass
+
+    largest_block = memprofile.largest_free_block()
+    top_lines = []
+    if top:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, game.__file__)])
+        top_lines = snapshot.statistics("lineno")[:top]
+    tracemalloc.stop()
+    return StepProfile(step, load_bytes, memprofile, largest_block, top_lines)
+
+
+def parse_budget(text):
+    """"schritt=DAUER:SPITZE" oder "schritt=LADEN:DAUER:SPITZE" lesen"""
+    step, _, values = text.partition("=")
+    numbers = [int(v) for v in values.split(":")]
+    if len(numbers) == 2:
+        numbers = [BUDGETS.get(step, (sys.maxsize,))[0]] + numbers
+    if len(numbers) != 3:
+        raise argparse.ArgumentTypeError(f"Budget '{text}': erwartet schritt=DAUER:SPITZE")
+    return step, tuple(numbers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Speicherbudgets der Schritte prüfen")
+    parser.add_argument("schritte", nargs="*", help="Schritt-Dateien (Standard: alle mit Budget)")
+    parser.add_argument("--minuten", type=float, default=5.0, help="Simulierte Spielzeit pro Schritt")
+    parser.add_argument("--budget", type=parse_budget, action="append", default=[],
+                        help="Budget überschreiben, z.B. step6_complete_game=8000:24000")
+    parser.add_argument("--details", action="store_true",
+                        help="Zeilen mit dem größten Dauerbedarf anzeigen")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    budgets = dict(BUDGETS)
+    budgets.update(args.budget)
+    steps = [s[:-3] if s.endswith(".py") else s for s in args.schritte] or list(BUDGETS)
+
+    failed = 0
+    start = time.perf_counter()
+    for step in steps:
+        result = profile_step(step, args.minuten, args.seed, top=5 if args.details else 0)
+        budget = budgets.get(step)
+        problems = result.violations(budget) if budget else []
+        mark = "❌" if problems else "✅"
+        print(f"{mark} {step}: Laden {result.load_bytes} B, Spitze {result.peak} B, "
+              f"Dauerbedarf {result.steady} B, min. frei {result.min_free} B, "
+              f"größter Block {result.largest_block} B ({result.samples} Messungen)")
+        for label, (count, peak, live) in sorted(result.states.items()):
+            live = live if live else "-"  # GO: ohne gc.collect() gemessen
+            print(f"     {label:<8} {count:>5}x  Spitze {peak:>7} B  Dauerbedarf {live:>7} B")
+        for stat in result.top_lines:
+            frame = stat.traceback[0]
+            print(f"     {stat.size:>7} B  Zeile {frame.lineno}")
+        for problem in problems:
+            print(f"     Budget überschritten: {problem}")
+        failed += bool(problems)
+
+    print(f"\n{len(steps) - failed}/{len(steps)} Schritte im Budget "
+          f"({time.perf_counter() - start:.1f}s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Speicherprofil der Firmware
+===========================
+
+Wie viel RAM braucht das Spiel neben anderem Code auf dem Board?
+Bei jedem Zustandswechsel werden gc.mem_alloc()/gc.mem_free() gemessen:
+- Spitze: belegter Heap vor dem Aufräumen (inkl. Müll aus f-Strings usw.)
+- Dauerbedarf: belegter Heap direkt nach gc.collect() (lebende Objekte)
+- Kleinster freier Heap und größter freier Block (Fragmentierung)
+
+Verwendung (siehe step6_complete_game.py, MEMORY_PROFILE = True):
+    memprofile.begin(budget_bytes=20000)
+    memprofile.sample("READY")           # bei jedem Zustandswechsel
+    memprofile.sample("GO", collect=False)  # ohne gc.collect() in zeitkritischen Zuständen
+    memprofile.report()                  # False wenn das Budget überschritten ist
+
+Die Werte sind relativ zum Heap bei begin(), zählen also nur, was das Spiel
+nach dem Start zusätzlich belegt.
+
+Belegung pro Tick (siehe step6_complete_game.py, ALLOC_CHECK = True):
+gc.mem_alloc() am Anfang jedes Ticks. Was seitdem dazukam, hat der Tick
+davor belegt - gezählt pro Zustand und pro Zustandswechsel. Sinkt der Wert,
+lief dazwischen ein Sammellauf (gezählt, Belegung unbekannt). Ohne jede
+Belegung kann der automatische GC in diesen Ticks nie anspringen.
+    memprofile.begin_ticks(STATE_NAMES)
+    memprofile.tick(current_state)       # am Anfang jedes Ticks
+    memprofile.report()
+"""
+
+import gc
+from array import array
+
+enabled = False
+budget_bytes = None   # Erlaubter Dauerbedarf (None = kein Budget)
+peak_budget_bytes = None
+
+baseline = 0
+samples = 0
+peak_alloc = 0
+steady_alloc = 0      # Größter Dauerbedarf
+min_free = None
+states = {}           # label -> [Anzahl, Spitze, Dauerbedarf]
+
+# Belegung pro Tick, Index: Zustand vorher * len(tick_names) + Zustand jetzt
+tick_names = ()
+tick_gc_runs = 0      # Ticks mit Sammellauf (Belegung unbekannt)
+_ticks = None         # Anzahl Ticks
+_alloc_ticks = None   # Davon mit Belegung
+_alloc_bytes = None   # Belegte Bytes
+_last_state = -1
+_last_alloc = 0
+
+
+def begin(budget=None, peak_budget=None):
+    """Profil starten, Grundlinie nach gc.collect() merken"""
+    global enabled, budget_bytes, peak_budget_bytes, baseline
+    global samples, peak_alloc, steady_alloc, min_free
+    gc.collect()
+    enabled = True
+    budget_bytes = budget
+    peak_budget_bytes = peak_budget
+    baseline = gc.mem_alloc()
+    samples = 0
+    peak_alloc = 0
+    steady_alloc = 0
+    min_free = gc.mem_free()
+    states.clear()
+
+
+def sample(label, collect=True):
+    """Heap messen; collect=False in Zuständen, in denen gc.collect() stören würde"""
+    global samples, peak_alloc, steady_alloc, min_free
+    if not enabled:
+        return
+
+    used = gc.mem_alloc() - baseline
+    free = gc.mem_free()
+    if collect:
+        gc.collect()
+        live = gc.mem_alloc() - baseline
+    else:
+        live = None
+
+    samples += 1
+    if used > peak_alloc:
+        peak_alloc = used
+    if live is not None and live > steady_alloc:
+        steady_alloc = live
+    if free < min_free:
+        min_free = free
+
+    entry = states.get(label)
+    if entry is None:
+        entry = [0, 0, 0]
+        states[label] = entry
+    entry[0] += 1
+    if used > entry[1]:
+        entry[1] = used
+    if live is not None and live > entry[2]:
+        entry[2] = live
+
+
+def begin_ticks(names):
+    """Belegung pro Tick zählen; names: Zustandsnamen (Zustände 0..len-1)"""
+    global tick_names, tick_gc_runs, _ticks, _alloc_ticks, _alloc_bytes, _last_state, _last_alloc
+    n = len(names) * len(names)
+    tick_names = names
+    tick_gc_runs = 0
+    _ticks = array("L", [0] * n)
+    _alloc_ticks = array("L", [0] * n)
+    _alloc_bytes = array("L", [0] * n)
+    _last_state = -1
+    _last_alloc = gc.mem_alloc()
+
+
+def tick(state):
+    """Am Anfang jedes Ticks: Belegung seit dem letzten Aufruf dem Tick davor zurechnen"""
+    global tick_gc_runs, _last_state, _last_alloc
+    if _ticks is None:
+        return
+    alloc = gc.mem_alloc()
+    if _last_state >= 0:
+        index = _last_state * len(tick_names) + state
+        _ticks[index] += 1
+        delta = alloc - _last_alloc
+        if delta < 0:
+            tick_gc_runs += 1
+        elif delta > 0:
+            _alloc_ticks[index] += 1
+            _alloc_bytes[index] += delta
+    _last_state = state
+    _last_alloc = alloc
+
+
+def report_ticks():
+    """Belegung pro Zustand und Zustandswechsel ausgeben; liefert die Ticks mit Belegung"""
+    if _ticks is None:
+        return 0
+    n = len(tick_names)
+    total = 0
+    print(f"Belegung pro Tick ({tick_gc_runs} Ticks mit Sammellauf):")
+    for index in range(n * n):
+        if not _ticks[index]:
+            continue
+        before, after = divmod(index, n)
+        label = tick_names[before] if before == after else f"{tick_names[before]}→{tick_names[after]}"
+        print(f"  {label:<16} {_ticks[index]:>6} Ticks, {_alloc_ticks[index]:>4} mit Belegung, "
+              f"{_alloc_bytes[index]:>6} B")
+        total += _alloc_ticks[index]
+    return total
+
+
+def largest_free_block(limit=None):
+    """Größten zusammenhängenden freien Block suchen (Binärsuche mit Test-Allokationen)"""
+    gc.collect()
+    low = 0
+    high = gc.mem_free() if limit is None else min(limit, gc.mem_free())
+    while low < high:
+        size = (low + high + 1) // 2
+        try:
+            block = bytearray(size)
+            del block
+            low = size
+        except MemoryError:
+            high = size - 1
+    gc.collect()
+    return low
+
+
+def within_budget():
+    """True wenn Spitze und Dauerbedarf im Budget liegen"""
+    if budget_bytes is not None and steady_alloc > budget_bytes:
+        return False
+    if peak_budget_bytes is not None and peak_alloc > peak_budget_bytes:
+        return False
+    return True
+
+
+def report():
+    """Profil ausgeben; gibt within_budget() zurück"""
+    report_ticks()
+    if not enabled:
+        return True
+    print(f"Speicher: Spitze {peak_alloc} B, Dauerbedarf {steady_alloc} B, "
+          f"min. frei {min_free} B, größter Block {largest_free_block()} B ({samples} Messungen)")
+    for label in sorted(states):
+        count, peak, live = states[label]
+        live = live if live else "-"  # Nur ohne gc.collect() gemessen
+        print(f"  {label:<8} {count:>5}x  Spitze {peak:>7} B  Dauerbedarf {live:>7} B")
+    ok = within_budget()
+    if not ok:
+        print(f"⚠️ Speicherbudget überschritten (Dauerbedarf {budget_bytes} B, Spitze {peak_budget_bytes} B)")
+    return ok
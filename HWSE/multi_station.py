@@ -0,0 +1,376 @@
+"""
+Mehrere Spielstationen auf einem Mikrocontroller
+================================================
+
+Ein Board hat genug GPIOs für mehrere Stationen (LED, Button, Buzzer).
+Jede Station ist ein eigenes Station-Objekt (__slots__) mit eigenem Zustand,
+eigener Wartezeit und eigener Statistik. Eine gemeinsame Schleife bedient
+alle Stationen im 10ms-Takt.
+
+Damit keine Station die Messung einer anderen verfälscht:
+- Zu Beginn jedes Ticks werden ALLE Buttons abgetastet und mit einem
+  gemeinsamen Zeitstempel versehen - bevor irgendeine Station etwas ausgibt.
+  Die Reaktionszeit wird ab diesem Abtast-Zeitpunkt gerechnet.
+- Textausgaben landen in einer Warteschlange und werden erst geschrieben,
+  wenn keine Station in GO ist (print blockiert auf dem UART!)
+- LED und Buzzer laufen über Schattenregister (outputs.py) und werden
+  einmal pro Tick geschrieben; nur der GO-Reiz einer Station wird sofort
+  geschrieben: die LED als GPIO wie in Schritt 6, der Zeitstempel direkt
+  nach ihrem Pegel, der Buzzer danach
+- Im Takt selbst keine Gleitkommazahlen und keine f-Strings: Pulsieren
+  aus einer Tabelle, Texte vorformatiert oder erst beim Ausgeben
+  zusammengesetzt
+
+Entprellung: Flanke + Sperrfenster wie in Schritt 3 (ein Druck = ein
+Ereignis, auch wenn der Button länger gehalten wird). Jeder Button hat
+sein eigenes Fenster, das sich dem gemessenen Prellen anpasst
+(debounce.py) - ein abgenutzter Taster bremst die anderen nicht.
+
+Nicht enthalten: Aufzeichnung (recorder.py) und HTTP-Statistik, beide
+sind für eine Station pro Board gebaut.
+
+Verwendung:
+    import multi_station
+    multi_station.main()                    # Stationen aus STATION_PINS
+    multi_station.run(multi_station.Engine(((2, 0, 4), (5, 15, 18))))
+"""
+
+import utime
+import urandom
+import math
+from array import array
+from machine import Pin, PWM
+from micropython import const
+import outputs
+import debounce
+
+# (LED, Button, Buzzer) pro Station
+STATION_PINS = (
+    (2, 0, 4),
+    (5, 15, 18),
+    (19, 21, 22),
+    (23, 25, 26),
+)
+
+LOOP_BUDGET_US = 10000
+
+# Textausgaben zurückhalten, solange eine Station misst
+DEFER_OUTPUT = True
+OUTPUT_QUEUE_MAX = 64
+
+# Zustände (wie step6_common; das Modul selbst bringt Aufzeichnung und
+# HTTP mit, die hier nicht gebraucht werden)
+STATE_WAITING = const(0)
+STATE_READY = const(1)
+STATE_GO = const(2)
+STATE_RESULT = const(3)
+STATE_NAMES = ("WAITING", "READY", "GO", "RESULT")
+
+# Zustandswechsel als fertige Texte, Index alt * 4 + neu
+TRANSITION_TEXTS = tuple("State: " + old + " → " + new
+                         for old in STATE_NAMES for new in STATE_NAMES)
+
+LED_OFF = const(0)
+LED_PULSE = const(1)
+LED_ON = const(2)
+LED_BLINK = const(3)
+
+# LED-Pulsieren: eine Periode der Sinuswelle als Tabelle (einmal beim Start)
+PULSE_DUTY = array("H")
+_phase = 0.0
+while _phase <= 2 * math.pi:
+    PULSE_DUTY.append(int(300 + 200 * math.sin(_phase)))
+    _phase += 0.15
+del _phase
+
+GO_BEEP_HZ = 1200
+GO_BEEP_MS = 150
+
+_queue = []       # (Station, Text, Zahl oder None, Einheit)
+dropped = 0       # Wegen voller Warteschlange verworfene Zeilen
+measuring = 0     # Anzahl Stationen in GO
+
+
+def _print_line(station_id, text, value, unit):
+    """Eine Zeile ausgeben; print setzt die Teile zusammen, kein neuer String"""
+    if value is None:
+        print("[S", station_id, "] ", text, sep="")
+    else:
+        print("[S", station_id, "] ", text, value, unit, sep="")
+
+
+def say(station_id, text, value=None, unit=""):
+    """Textausgabe einer Station (sofort oder über die Warteschlange)
+
+    text ist fertig formatiert; eine Zahl kommt getrennt mit ihrer Einheit
+    und wird erst beim Ausgeben angehängt.
+    """
+    global dropped
+    if not DEFER_OUTPUT:
+        _print_line(station_id, text, value, unit)
+        return
+    if len(_queue) >= OUTPUT_QUEUE_MAX:
+        _queue.pop(0)
+        dropped += 1
+    _queue.append((station_id, text, value, unit))
+
+
+def flush_output():
+    """Warteschlange ausgeben - nie während eine Station misst"""
+    if measuring or not _queue:
+        return
+    for station_id, text, value, unit in _queue:
+        _print_line(station_id, text, value, unit)
+    del _queue[:]
+
+
+class Station:
+    """Eine Spielstation mit eigenem Zustand und eigener Hardware"""
+
+    __slots__ = (
+        "id", "current_state", "state_start_time", "ready_duration", "reaction_time",
+        "games_played", "best_time", "false_starts",
+        "led_pin", "led", "led_gpio", "button", "buzzer",
+        "debouncer", "pressed", "pressed_us",
+        "led_mode", "led_phase", "led_blink_timer",
+        "buzzer_stop_time", "buzzer_active", "go_stimulus_us",
+    )
+
+    def __init__(self, station_id, led_pin, button_pin, buzzer_pin):
+        self.id = station_id
+        self.current_state = STATE_WAITING
+        self.state_start_time = utime.ticks_ms()
+        self.ready_duration = 0
+        self.reaction_time = 0
+        self.games_played = 0
+        self.best_time = None
+        self.false_starts = 0
+
+        self.led_pin = Pin(led_pin)
+        self.led = outputs.PwmChannel(PWM(self.led_pin), freq=1000)
+        self.led_gpio = False     # LED gerade als GPIO (GO-Reiz) statt PWM
+        self.button = Pin(button_pin, Pin.IN, Pin.PULL_UP)
+        self.buzzer = outputs.PwmChannel(PWM(Pin(buzzer_pin)))
+
+        self.debouncer = debounce.AdaptiveDebounce(f"S{station_id}")
+        self.pressed = False      # Druck in diesem Tick erkannt
+        self.pressed_us = 0       # Abtast-Zeitpunkt des Drucks
+
+        self.led_mode = LED_OFF
+        self.led_phase = 0
+        self.led_blink_timer = 0
+        self.buzzer_stop_time = 0
+        self.buzzer_active = False
+        self.go_stimulus_us = 0
+
+    def sample(self, now_ms, now_us):
+        """Button abtasten und entprellen (Flanke + eigenes Sperrfenster)"""
+        self.pressed = self.debouncer.update(self.button.value(), now_ms)
+        if self.pressed:
+            self.pressed_us = now_us
+
+    def beep(self, frequency, duration_ms, now_ms):
+        self.buzzer.freq(frequency)
+        self.buzzer.duty(512)
+        self.buzzer_stop_time = utime.ticks_add(now_ms, duration_ms)
+        self.buzzer_active = True
+
+    def show_go_stimulus(self, now_ms):
+        """GO-Reiz sofort auslösen (nur die eigenen Kanäle), Zeitstempel am LED-Pegel"""
+        # LED als GPIO: der Pegel liegt an, sobald init() zurückkehrt
+        self.led.deinit()
+        self.led_pin.init(Pin.OUT, value=1)
+        self.go_stimulus_us = utime.ticks_us()
+        self.led_gpio = True
+        self.led_mode = LED_ON
+
+        # Buzzer erst nach dem Zeitstempel
+        self.beep(GO_BEEP_HZ, GO_BEEP_MS, now_ms)
+        self.buzzer.flush()
+
+    def restore_led_pwm(self):
+        """LED nach GO wieder an die PWM hängen, Pegel bleibt an"""
+        self.led_gpio = False
+        self.led.init()
+        self.led.freq(1000)
+        self.led.duty(1023)
+
+    def set_led_mode(self, mode, now_ms):
+        if self.led_gpio:
+            self.restore_led_pwm()
+
+        self.led_mode = mode
+        if mode == LED_OFF:
+            self.led.duty(0)
+        elif mode == LED_ON:
+            self.led.duty(1023)
+        elif mode == LED_PULSE:
+            self.led_phase = 0
+        elif mode == LED_BLINK:
+            self.led_blink_timer = now_ms
+
+    def update_outputs(self, now_ms):
+        """LED-Animation und Buzzer-Timer"""
+        mode = self.led_mode
+        if mode == LED_PULSE:
+            phase = self.led_phase
+            self.led.duty(PULSE_DUTY[phase])
+            phase += 1
+            if phase == len(PULSE_DUTY):
+                phase = 0
+            self.led_phase = phase
+        elif mode == LED_BLINK:
+            if utime.ticks_diff(now_ms, self.led_blink_timer) >= 300:
+                self.led_blink_timer = now_ms
+                self.led.duty(0 if self.led.duty() > 0 else 1023)
+
+        if self.buzzer_active and utime.ticks_diff(now_ms, self.buzzer_stop_time) >= 0:
+            self.buzzer.duty(0)
+            self.buzzer_active = False
+
+    def change_state(self, new_state, now_ms):
+        """Zustand wechseln"""
+        global measuring
+
+        if new_state == STATE_GO:
+            self.show_go_stimulus(now_ms)
+            measuring += 1
+        elif self.current_state == STATE_GO:
+            measuring -= 1
+
+        say(self.id, TRANSITION_TEXTS[self.current_state * 4 + new_state])
+        self.current_state = new_state
+        self.state_start_time = now_ms
+
+        if new_state == STATE_WAITING:
+            self.set_led_mode(LED_OFF, now_ms)
+            self.debouncer.settle()  # Neues Sperrfenster nur zwischen zwei Spielen
+        elif new_state == STATE_READY:
+            self.ready_duration = 2000 + urandom.getrandbits(12) % 3001
+            say(self.id, "Bereit machen... (", self.ready_duration, "ms)")
+            self.set_led_mode(LED_PULSE, now_ms)
+            self.beep(800, 150, now_ms)
+        elif new_state == STATE_RESULT:
+            self.set_led_mode(LED_BLINK, now_ms)
+
+    def update(self, now_ms):
+        """Zustandslogik eines Ticks"""
+        state = self.current_state
+        elapsed = utime.ticks_diff(now_ms, self.state_start_time)
+
+        if state == STATE_WAITING:
+            if self.pressed:
+                self.change_state(STATE_READY, now_ms)
+
+        elif state == STATE_READY:
+            if self.pressed:
+                self.false_starts += 1
+                say(self.id, "Falschstart! (", self.false_starts, " insgesamt)")
+                self.beep(400, 500, now_ms)
+                self.change_state(STATE_WAITING, now_ms)
+            elif elapsed >= self.ready_duration:
+                self.change_state(STATE_GO, now_ms)
+
+        elif state == STATE_GO:
+            if self.pressed:
+                # Ab dem Abtast-Zeitpunkt, nicht ab dem Ende des Ticks
+                reaction_time = utime.ticks_diff(self.pressed_us, self.go_stimulus_us) // 1000
+                self.reaction_time = reaction_time
+                self.games_played += 1
+                if self.best_time is None or reaction_time < self.best_time:
+                    self.best_time = reaction_time
+                self.beep(1000, 200, now_ms)
+                self.change_state(STATE_RESULT, now_ms)
+                say(self.id, "⚡ Reaktionszeit: ", reaction_time, "ms")
+            elif elapsed >= 3000:
+                self.beep(400, 800, now_ms)
+                self.change_state(STATE_RESULT, now_ms)
+                say(self.id, "🐌 Timeout! Zu langsam (>3000ms)")
+
+        elif elapsed >= 3000:
+            self.change_state(STATE_WAITING, now_ms)
+
+    def print_statistics(self):
+        best = f"{self.best_time}ms" if self.best_time is not None else "-"
+        print(f"[S{self.id}] Spiele: {self.games_played}, Bestzeit: {best}, "
+              f"Falschstarts: {self.false_starts}")
+        self.debouncer.print_statistics()
+
+
+class Engine:
+    """Gemeinsamer Takt für alle Stationen"""
+
+    __slots__ = ("stations", "loop_ticks", "loop_max_us", "loop_overruns")
+
+    def __init__(self, pins=STATION_PINS):
+        self.stations = [Station(i + 1, led, button, buzzer)
+                         for i, (led, button, buzzer) in enumerate(pins)]
+        self.loop_ticks = 0
+        self.loop_max_us = 0
+        self.loop_overruns = 0
+
+    def tick(self):
+        """Ein Tick: abtasten, Logik, Ausgaben"""
+        stations = self.stations
+        now_ms = utime.ticks_ms()
+        now_us = utime.ticks_us()
+
+        # 1. Alle Buttons abtasten, bevor irgendeine Station etwas ausgibt
+        for station in stations:
+            station.sample(now_ms, now_us)
+
+        # 2. Logik und Animationen (Ausgaben nur vorgemerkt)
+        for station in stations:
+            station.update(now_ms)
+            station.update_outputs(now_ms)
+
+        # 3. LED/Buzzer gesammelt schreiben, Text nur ohne laufende Messung
+        outputs.commit()
+        flush_output()
+
+        duration_us = utime.ticks_diff(utime.ticks_us(), now_us)
+        self.loop_ticks += 1
+        if duration_us > self.loop_max_us:
+            self.loop_max_us = duration_us
+        if duration_us > LOOP_BUDGET_US:
+            self.loop_overruns += 1
+
+    def shutdown(self):
+        """Alles ausschalten und Statistik ausgeben"""
+        global measuring
+        for station in self.stations:
+            if station.led_gpio:
+                station.led_pin.off()
+            else:
+                station.led.duty(0)
+            station.buzzer.duty(0)
+        outputs.commit()
+        measuring = 0
+        flush_output()
+        print("\nSpiel beendet!")
+        for station in self.stations:
+            station.print_statistics()
+        print(f"Schleife: {self.loop_ticks} Ticks, max {self.loop_max_us}µs, "
+              f"{self.loop_overruns} über {LOOP_BUDGET_US}µs, "
+              f"{dropped} Ausgaben verworfen")
+
+
+def run(engine):
+    """Hauptschleife für eine Engine"""
+    try:
+        while True:
+            engine.tick()
+            utime.sleep_ms(10)
+    except KeyboardInterrupt:
+        engine.shutdown()
+
+
+def main():
+    """Hauptprogramm"""
+    print(f"🎮 === Reaktionsspiel mit {len(STATION_PINS)} Stationen === 🎮")
+    print("Drücke an einer Station den Button zum Starten! (Strg+C zum Beenden)")
+    run(Engine(STATION_PINS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Mehrere Stationen auf einem Board simulieren (Host-Werkzeug)
+============================================================
+
+Lässt multi_station.py mit 1, 2, 4, ... Stationen im Simulator laufen.
+An jeder Station drückt ein Testspieler (aus reaction_accuracy.py) µs-genau
+in bekanntem Abstand nach ihrem GO-Reiz. print blockiert wie ein UART
+(115200 Baud), damit sichtbar wird, ob eine Station die Messung einer
+anderen verzögert.
+
+Pro Stationszahl und Ausgabe-Modus:
+- Messfehler (gemessen - echt) über alle Stationen
+- Rechenzeit pro Tick im Simulator (ohne eingespeiste Verzögerung)
+
+Modi:
+- gepuffert: Text erst, wenn keine Station in GO ist (DEFER_OUTPUT = True)
+- sofort:    jede Station schreibt sofort (wie step6_complete_game.py)
+
+Aufruf:
+    python multi_station_sim.py
+    python multi_station_sim.py --stationen 1 4 16 --spiele 200
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from reaction_accuracy import Delays, Result, TestPlayer
+from sim_hardware import Board
+
+MODES = {"gepuffert": True, "sofort": False}
+
+
+class StationPlayer(TestPlayer):
+    """Testspieler einer Station, merkt sich die gemessenen Zeiten"""
+
+    def __init__(self, board, station, rng, games):
+        TestPlayer.__init__(self, board, station, rng, games)
+        self.measured = []
+
+    def __call__(self, now_ms):
+        station = self.game
+        if self.last_state == station.STATE_GO and station.current_state == station.STATE_RESULT:
+            if station.games_played > len(self.measured):
+                self.measured.append(station.reaction_time)
+        return TestPlayer.__call__(self, now_ms)
+
+
+def station_pins(count):
+    """Pin-Nummern für den Simulator (keine echten GPIOs nötig)"""
+    return [(100 + i, 200 + i, 300 + i) for i in range(count)]
+
+
+def run(count, defer, games, seed, uart=True):
+    """count Stationen spielen lassen; liefert (Result, Ticks, Sekunden)"""
+    board = Board(seed=seed)
+    delays = Delays(random.Random(seed + 1))
+    board_print = board.print
+
+    def uart_print(*args, **kwargs):
+        board_print(*args, **kwargs)
+        if uart:
+            board.clock.advance_us(delays.us_per_char * (len(board.console[-1]) + 2))
+
+    board.print = uart_print
+    module = board.load("multi_station")
+    module.DEFER_OUTPUT = defer
+    # TestPlayer fragt die Zustände beim Spiel ab, hier also bei der Station
+    for name in ("STATE_WAITING", "STATE_READY", "STATE_GO", "STATE_RESULT"):
+        setattr(module.Station, name, getattr(module, name))
+
+    pins = station_pins(count)
+    engine = module.Engine(pins)
+    rng = random.Random(seed)
+    players = {}
+    for station, (led, button, _) in zip(engine.stations, pins):
+        player = StationPlayer(board, station, random.Random(rng.random()), games)
+        players[led] = player
+        board.set_button_source(player, button)
+
+    board_log_write = board.log_write
+
+    def log_write(pin_id, kind, value):
+        board_log_write(pin_id, kind, value)
+        player = players.get(pin_id)
+        if player is not None and kind == "value" and value:
+            player.stimulus()   # LED als GPIO an = GO-Reiz dieser Station
+
+    board.log_write = log_write
+    board.clock.stop_at_ms = board.clock.now_ms() + games * 20000
+
+    start = time.perf_counter()
+    try:
+        module.run(engine)
+    except KeyboardInterrupt:
+        pass   # Simulation zu Ende (auch während shutdown())
+    seconds = time.perf_counter() - start
+
+    offsets, measured = [], []
+    for player in players.values():
+        n = min(len(player.offsets_us), len(player.measured))
+        offsets.extend(player.offsets_us[:n])
+        measured.extend(player.measured[:n])
+    return Result("multi_station", "", offsets, measured), engine.loop_ticks, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mehrere Stationen auf einem Board simulieren")
+    parser.add_argument("--stationen", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--spiele", type=int, default=100, help="Spiele pro Station")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for count in args.stationen:
+        print(f"\n▶ {count} Station(en)")
+        # Rechenzeit ohne UART-Verzögerung (die wäre sonst Teil der Messung)
+        _, ticks, seconds = run(count, True, args.spiele, args.seed, uart=False)
+        print(f"   Rechenzeit: {1e6 * seconds / ticks:.1f}µs pro Tick "
+              f"({1e6 * seconds / ticks / count:.1f}µs pro Station)")
+        for mode, defer in MODES.items():
+            result, _, _ = run(count, defer, args.spiele, args.seed)
+            result.scenario = mode
+            print(result.row())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Ausgabe-Schicht mit Schattenregistern
+=====================================
+
+Die Firmware schreibt oft Werte in die PWM-Register, die dort schon stehen:
+- update_led() setzt jeden Tick die Helligkeit
+- Blinken liest die Helligkeit aus der Hardware zurück
+- beep() setzt die Frequenz auch wenn sie sich nicht ändert
+
+Ein PwmChannel merkt sich Frequenz und Duty-Cycle (Schattenregister):
+- Lesen kommt aus dem Schatten, nicht aus der Hardware
+- Schreiben wird nur vorgemerkt
+- commit() am Ende jedes Ticks schreibt nur, was sich wirklich geändert hat
+- Gezählt wird, wie viele Schreibzugriffe eingespart wurden
+
+Verwendung:
+    led_pwm = outputs.PwmChannel(PWM(Pin(2)), freq=1000)
+    led_pwm.duty(1023)      # vorgemerkt
+    outputs.commit()        # einmal pro Tick in der Hauptschleife
+"""
+
+UNKNOWN = -1  # Hardware-Wert unbekannt (z.B. nach deinit) -> nächster Wert wird geschrieben
+
+channels = []
+writes = 0   # Tatsächliche Registerzugriffe
+saved = 0    # Eingesparte Registerzugriffe
+
+
+class PwmChannel:
+    """PWM-Kanal mit Schattenregistern für Frequenz und Duty-Cycle"""
+
+    def __init__(self, pwm, freq=None):
+        self.pwm = pwm
+        self.freq_shadow = UNKNOWN
+        self.duty_shadow = UNKNOWN
+        self.freq_pending = UNKNOWN
+        self.duty_pending = UNKNOWN
+        channels.append(self)
+        if freq is not None:
+            self.freq(freq)
+            self.flush()
+
+    def freq(self, value=None):
+        """Frequenz lesen (aus dem Schatten) oder vormerken"""
+        global saved
+        if value is None:
+            return self.freq_pending if self.freq_pending != UNKNOWN else self.freq_shadow
+        if self.freq_pending != UNKNOWN:
+            saved += 1  # Im selben Tick überschrieben
+        self.freq_pending = value
+
+    def duty(self, value=None):
+        """Duty-Cycle lesen (aus dem Schatten) oder vormerken"""
+        global saved
+        if value is None:
+            return self.duty_pending if self.duty_pending != UNKNOWN else max(self.duty_shadow, 0)
+        if self.duty_pending != UNKNOWN:
+            saved += 1
+        self.duty_pending = value
+
+    def flush(self):
+        """Vorgemerkte Änderungen in die Hardware schreiben"""
+        global writes, saved
+
+        # Frequenz zuerst, damit der neue Duty-Cycle schon mit ihr startet
+        value = self.freq_pending
+        if value != UNKNOWN:
+            if value != self.freq_shadow:
+                self.pwm.freq(value)
+                self.freq_shadow = value
+                writes += 1
+            else:
+                saved += 1
+            self.freq_pending = UNKNOWN
+
+        value = self.duty_pending
+        if value != UNKNOWN:
+            if value != self.duty_shadow:
+                self.pwm.duty(value)
+                self.duty_shadow = value
+                writes += 1
+            else:
+                saved += 1
+            self.duty_pending = UNKNOWN
+
+    def init(self):
+        """PWM nach deinit() wieder einschalten - dasselbe Objekt, kein neues anlegen"""
+        self.pwm.init()
+        self.freq_shadow = UNKNOWN
+        self.duty_shadow = UNKNOWN
+
+    def retune(self):
+        """Frequenz und Duty-Cycle sofort neu schreiben (z.B. nach einem Wechsel des APB-Takts)"""
+        if self.freq_pending == UNKNOWN:
+            self.freq_pending = self.freq_shadow
+        if self.duty_pending == UNKNOWN:
+            self.duty_pending = self.duty_shadow
+        self.freq_shadow = UNKNOWN
+        self.duty_shadow = UNKNOWN
+        self.flush()
+
+    def attach(self, pwm):
+        """Neues PWM-Objekt übernehmen (z.B. nach deinit), Schatten verwerfen"""
+        self.pwm = pwm
+        self.freq_shadow = UNKNOWN
+        self.duty_shadow = UNKNOWN
+
+    def deinit(self):
+        """PWM abschalten, vorgemerkte Werte verwerfen"""
+        self.pwm.deinit()
+        self.freq_pending = UNKNOWN
+        self.duty_pending = UNKNOWN
+        self.freq_shadow = UNKNOWN
+        self.duty_shadow = UNKNOWN
+
+
+def commit():
+    """Alle Kanäle schreiben - einmal am Ende jedes Ticks aufrufen"""
+    for channel in channels:
+        channel.flush()
+
+
+def retune():
+    """Alle Kanäle mit ihren Werten neu schreiben - nach einem Wechsel des APB-Takts (governor.py)"""
+    for channel in channels:
+        channel.retune()
+
+
+def print_statistics():
+    """Register-Statistik ausgeben"""
+    total = writes + saved
+    share = 100 * saved // total if total else 0
+    print(f"Register-Schreibzugriffe: {writes}, eingespart: {saved} ({share}%)")
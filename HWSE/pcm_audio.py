@@ -0,0 +1,227 @@
+"""
+Soundeffekte aus Samples (PCM) über PWM oder DAC
+================================================
+
+beep() kann nur einen Rechteckton mit einer Frequenz. Hier werden kurze
+Effekte (Countdown-Tick, Fehler-Brummen, Jingle) als 8-Bit-Samples
+abgespielt: ein Timer-Interrupt gibt mit SAMPLE_RATE Hz je ein Sample aus.
+
+- Samples: bytearray, 8 Bit ohne Vorzeichen (128 = Stille)
+- Ausgabe: PWM-Duty (Trägerfrequenz weit über dem Hörbereich, Sample << 2)
+  oder DAC (ESP32: GPIO 25/26, Sample direkt)
+- Doppelpuffer: der Interrupt spielt einen Block, während service() im
+  Hauptprogramm den nächsten bereitlegt. Die Blöcke sind memoryview-
+  Ausschnitte, die make_effect() EINMAL beim Start anlegt - beim Abspielen
+  wird also weder Speicher angelegt noch kopiert (wichtig im Interrupt!)
+- Rechenzeit: der Interrupt misst sich selbst; print_statistics() zeigt
+  µs pro Sample und den CPU-Anteil (Grenze: CPU_BUDGET_PERCENT)
+
+Verwendung:
+    import pcm_audio
+    pcm_audio.begin(4)                  # PWM an GPIO 4 (oder dac=True, Pin 25)
+    pcm_audio.play(pcm_audio.effects["jingle"])
+    # in der Hauptschleife (10ms-Takt):
+    pcm_audio.service()
+
+Im Simulator prüfen:
+    python pcm_audio_sim.py
+"""
+
+import utime
+import math
+import urandom
+from machine import Pin, PWM, Timer
+try:
+    from machine import DAC   # Nicht jedes Board hat einen DAC
+except ImportError:
+    DAC = None
+
+SAMPLE_RATE = 8000        # Hz (ein Interrupt pro Sample)
+BLOCK_SAMPLES = 256       # Samples pro Puffer (32ms bei 8kHz)
+PWM_CARRIER_HZ = 40000    # Trägerfrequenz der PWM (unhörbar)
+TIMER_ID = 0
+CPU_BUDGET_PERCENT = 20   # Mehr Rechenzeit für Audio wird gemeldet
+
+effects = {}              # Name -> Tupel von memoryview-Blöcken
+
+# Ausgabe (von begin() gesetzt)
+_write = None             # pwm.duty oder dac.write
+_shift = 0                # 2 für PWM (0-1023), 0 für DAC (0-255)
+_timer = None
+
+# Wiedergabe: Interrupt liest _blocks[_front], service() füllt leere Plätze
+_blocks = [None, None]
+_front = 0
+_pos = 0
+_effect = None
+_next_block = 0           # Nächster Block des Effekts für service()
+playing = False
+
+# Statistik (nur vom Interrupt geschrieben)
+samples_played = 0
+underruns = 0             # Sample fällig, aber kein Block bereit
+irq_us = 0                # Summe der Interrupt-Rechenzeit
+irq_max_us = 0
+_play_start_us = 0
+play_us = 0               # Gesamte Abspieldauer
+
+
+def make_effect(samples):
+    """bytearray in Blöcke (memoryview-Ausschnitte) zerlegen - einmal beim Start"""
+    view = memoryview(samples)
+    return tuple(view[i:i + BLOCK_SAMPLES] for i in range(0, len(samples), BLOCK_SAMPLES))
+
+
+def tone(frequency, duration_ms, volume=100, decay_ms=None):
+    """Sinuston als Samples, optional mit Abklingen"""
+    count = SAMPLE_RATE * duration_ms // 1000
+    samples = bytearray(count)
+    step = 2 * math.pi * frequency / SAMPLE_RATE
+    for i in range(count):
+        level = volume
+        if decay_ms is not None:
+            level = volume * math.exp(-1000 * i / (SAMPLE_RATE * decay_ms))
+        samples[i] = 128 + int(level * math.sin(step * i))
+    return samples
+
+
+def buzz(frequency, duration_ms, volume=100):
+    """Rauhes Brummen: Rechteck mit etwas Rauschen"""
+    count = SAMPLE_RATE * duration_ms // 1000
+    samples = bytearray(count)
+    half_period = max(SAMPLE_RATE // (2 * frequency), 1)
+    for i in range(count):
+        level = volume if (i // half_period) & 1 else -volume
+        samples[i] = 128 + level + urandom.getrandbits(4) - 8
+    return samples
+
+
+def make_effects():
+    """Die Standard-Effekte einmal erzeugen"""
+    effects["tick"] = make_effect(tone(2000, 30, decay_ms=8))
+    effects["fail"] = make_effect(buzz(150, 400))
+    jingle = bytearray()
+    for note in (523, 659, 784):              # C5, E5, G5
+        jingle += tone(note, 100, 90, decay_ms=60)
+    effects["jingle"] = make_effect(jingle)
+
+
+def begin(pin=4, dac=False):
+    """Ausgabe festlegen und Effekte erzeugen"""
+    global _write, _shift, _timer
+    if dac:
+        _write = DAC(Pin(pin)).write
+        _shift = 0
+    else:
+        pwm = PWM(Pin(pin))
+        pwm.freq(PWM_CARRIER_HZ)
+        _write = pwm.duty
+        _shift = 2
+    _write(128 << _shift)
+    _timer = Timer(TIMER_ID)
+    if not effects:
+        make_effects()
+
+
+def _on_sample(timer):
+    """Timer-Interrupt: ein Sample ausgeben (keine Speicheranlage!)"""
+    global _front, _pos, samples_played, underruns, irq_us, irq_max_us
+
+    start_us = utime.ticks_us()
+    block = _blocks[_front]
+    if block is None:
+        if _next_block < len(_effect):
+            underruns += 1          # service() kam zu spät
+        return
+    _write(block[_pos] << _shift)
+    _pos += 1
+    if _pos == len(block):
+        _blocks[_front] = None      # Platz frei für service()
+        _front ^= 1
+        _pos = 0
+    samples_played += 1
+    duration_us = utime.ticks_diff(utime.ticks_us(), start_us)
+    irq_us += duration_us
+    if duration_us > irq_max_us:
+        irq_max_us = duration_us
+
+
+def _fill():
+    """Leere Pufferplätze mit den nächsten Blöcken füllen (vorderer zuerst)"""
+    global _next_block
+    front = _front
+    for slot in (front, front ^ 1):
+        if _blocks[slot] is None and _next_block < len(_effect):
+            _blocks[slot] = _effect[_next_block]
+            _next_block += 1
+
+
+def play(effect):
+    """Effekt starten (ein laufender wird abgebrochen)"""
+    global _effect, _next_block, _front, _pos, playing, _play_start_us
+    stop()
+    _effect = effect
+    _next_block = 0
+    _front = 0
+    _pos = 0
+    _fill()
+    playing = True
+    _play_start_us = utime.ticks_us()
+    _timer.init(freq=SAMPLE_RATE, mode=Timer.PERIODIC, callback=_on_sample)
+
+
+def service():
+    """Aus der Hauptschleife: nächsten Block bereitlegen, am Ende stoppen"""
+    if not playing:
+        return
+    _fill()
+    if _next_block >= len(_effect) and _blocks[0] is None and _blocks[1] is None:
+        stop()
+
+
+def stop():
+    """Wiedergabe beenden, Ausgabe auf Ruhepegel"""
+    global playing, play_us
+    if not playing:
+        return
+    _timer.deinit()
+    _blocks[0] = None
+    _blocks[1] = None
+    _write(128 << _shift)
+    playing = False
+    play_us += utime.ticks_diff(utime.ticks_us(), _play_start_us)
+
+
+def cpu_percent():
+    """Anteil der Interrupt-Rechenzeit an der Abspieldauer"""
+    return 100 * irq_us / play_us if play_us else 0
+
+
+def print_statistics():
+    """Rechenzeit und Aussetzer ausgeben"""
+    per_sample = irq_us / samples_played if samples_played else 0
+    share = cpu_percent()
+    print(f"Audio: {samples_played} Samples, {per_sample:.1f}µs pro Sample "
+          f"(max {irq_max_us}µs), {share:.1f}% CPU, {underruns} Aussetzer")
+    if share > CPU_BUDGET_PERCENT:
+        print(f"⚠️ Audio braucht mehr als {CPU_BUDGET_PERCENT}% CPU - SAMPLE_RATE senken")
+
+
+def main():
+    """Alle Effekte nacheinander abspielen"""
+    begin()
+    try:
+        for name in ("tick", "tick", "tick", "jingle", "fail"):
+            print(f"▶ {name}")
+            play(effects[name])
+            while playing:
+                service()
+                utime.sleep_ms(10)
+            utime.sleep_ms(300)
+    except KeyboardInterrupt:
+        stop()
+    print_statistics()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Sample-Wiedergabe im Simulator prüfen (Host-Werkzeug)
+=====================================================
+
+Spielt jeden Effekt aus pcm_audio.py auf einem simulierten Board ab (über
+PWM und über DAC) und vergleicht die mitgeschriebenen Ausgabewerte mit den
+Samples:
+- jedes Sample genau einmal, in der richtigen Reihenfolge
+- Abstand zwischen zwei Samples genau eine Timer-Periode
+- keine Aussetzer (service() im Takt der Hauptschleife)
+- kein Speicher, der während der Wiedergabe angelegt wird (gc.mem_alloc
+  des Simulators, nur Firmware-Dateien)
+
+Mit --takt lässt sich die Hauptschleife verlangsamen; ab etwa zwei
+Blocklängen (64ms bei 8kHz) müssen Aussetzer gemeldet werden.
+
+Die Rechenzeit pro Sample misst die Firmware auf dem Board selbst
+(print_statistics()); hier wird nur die CPython-Zeit gezeigt.
+
+Aufruf:
+    python pcm_audio_sim.py
+    python pcm_audio_sim.py --takt 100
+"""
+
+import argparse
+import sys
+import time
+
+from sim_hardware import Board
+
+OUTPUTS = {"pwm": (4, False, "duty"), "dac": (25, True, "dac")}
+
+# Zähler wie samples_played sind in CPython ab 257 eigene Objekte, in
+# MicroPython direkte Werte (kein Heap) - das ist kein Leck
+ALLOC_TOLERANCE_BYTES = 128
+
+
+def play(board, audio, effect, period_ms):
+    """Effekt abspielen, service() im Takt der Hauptschleife; liefert Sekunden"""
+    audio.play(effect)
+    start = time.perf_counter()
+    while audio.playing:
+        audio.service()
+        board.clock.sleep_ms(period_ms)
+    return time.perf_counter() - start
+
+
+def measure_alloc(effect_name, output, period_ms):
+    """Speicher, der während der Wiedergabe angelegt wird (Bytes)"""
+    pin, dac, _ = OUTPUTS[output]
+    board = Board()
+    # Schreibzugriffe nicht mitschreiben: die Liste hielte die Werte am Leben
+    board.log_write = lambda pin_id, kind, value: None
+    audio = board.load("pcm_audio")
+    audio.begin(pin, dac=dac)
+    gc = board.modules["gc"]
+    gc.mem_alloc()          # Zählung starten
+    gc.collect()
+    before = gc.mem_alloc()
+    play(board, audio, audio.effects[effect_name], period_ms)
+    gc.collect()
+    return gc.mem_alloc() - before
+
+
+def run(effect_name, output, period_ms):
+    """Einen Effekt abspielen; liefert ein dict mit den Prüfergebnissen"""
+    pin, dac, kind = OUTPUTS[output]
+    board = Board()
+    audio = board.load("pcm_audio")
+    audio.begin(pin, dac=dac)
+    effect = audio.effects[effect_name]
+    expected = [s << audio._shift for block in effect for s in block]
+
+    first_write = len(board.writes)
+    seconds = play(board, audio, effect, period_ms)
+
+    # Ohne Ruhepegel beim Stoppen (letzter Schreibzugriff)
+    samples = [(t, v) for t, p, k, v in board.writes[first_write:-1] if p == pin and k == kind]
+    values = [v for _, v in samples]
+    gaps = {b[0] - a[0] for a, b in zip(samples, samples[1:])}
+    return {
+        "samples": len(expected),
+        "match": values == expected,
+        "gaps": gaps,
+        "period_us": 1000000 // audio.SAMPLE_RATE,
+        "underruns": audio.underruns,
+        "alloc": measure_alloc(effect_name, output, period_ms),
+        "host_us": 1e6 * seconds / max(audio.samples_played, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sample-Wiedergabe im Simulator prüfen")
+    parser.add_argument("--takt", type=int, default=10, help="Takt der Hauptschleife in ms")
+    args = parser.parse_args(argv)
+
+    ok = True
+    for output in OUTPUTS:
+        print(f"\n▶ Ausgabe über {output.upper()}")
+        for name in ("tick", "fail", "jingle"):
+            r = run(name, output, args.takt)
+            timing_ok = r["gaps"] <= {r["period_us"]}
+            good = r["match"] and timing_ok and not r["underruns"] and r["alloc"] <= ALLOC_TOLERANCE_BYTES
+            ok = ok and good
+            gaps = ", ".join(f"{g}µs" for g in sorted(r["gaps"]))
+            print(f"   {'✅' if good else '❌'} {name:<7} {r['samples']:5d} Samples  "
+                  f"Werte {'gleich' if r['match'] else 'ABWEICHEND'}  Abstand {gaps}  "
+                  f"{r['underruns']} Aussetzer  Speicher {r['alloc']:+d} Bytes  "
+                  f"(Host {r['host_us']:.1f}µs/Sample)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Spieler-Populationssimulation zum Abstimmen der Spielparameter (Host-Werkzeug)
+==============================================================================
+
+Die Bewertungsstufen in update_go(), das GO-Timeout (3000ms) und das
+READY-Fenster (2-5s) wurden nach Gefühl gewählt. Dieses Werkzeug simuliert
+Millionen Spiele auf einmal und zeigt, wie sich ein Parametersatz auswirkt:
+- Falschstart-Rate
+- Timeout-Rate
+- Verteilung der Bewertungen
+- Gemessene Reaktionszeiten (inklusive Abtastraster der Hauptschleife)
+
+Spielermodell (alles als NumPy-Arrays, keine Python-Schleife pro Spiel):
+- Reaktionszeit: Ex-Gauß-Verteilung (Normal + Exponential) pro Spieler
+- Unaufmerksamkeit: seltene Aussetzer mit 1-4s Zusatzzeit
+- Falschstart: Ungeduld als konstante Drückrate während READY
+
+Alle Parametersätze werden auf denselben Zufallszahlen ausgewertet,
+Unterschiede kommen also nur von den Parametern.
+
+Benötigt NumPy.
+
+Aufruf:
+    python population_sim.py                        # Schritt 4/5 und 6 vergleichen
+    python population_sim.py --timeout 2000 3000 --ready 1000-3000 2000-5000
+    python population_sim.py --baender 180,250,330,450 --spiele 5000000
+"""
+
+import argparse
+import itertools
+import sys
+import time
+
+import numpy as np
+
+# Bewertungsstufen der Schritt-Dateien (obere Grenzen in ms, Bewertung darunter)
+PRESETS = {
+    "schritt4/5": (150, 200, 250, 350, 500),
+    "schritt6": (200, 300, 450, 600),
+}
+
+DEFAULT_TIMEOUT_MS = 3000
+DEFAULT_READY_MS = (2000, 5000)
+DEFAULT_LOOP_MS = 10  # step6: utime.sleep_ms(10)
+CHUNK = 1000000       # Spiele pro Block (begrenzt den Speicherbedarf)
+
+
+class Population:
+    """Modellparameter der Spielerpopulation"""
+
+    def __init__(self, mu_ms=250.0, mu_spread_ms=35.0, sigma_ms=30.0,
+                 tau_ms=60.0, tau_spread=0.5, lapse_rate=0.02,
+                 impatience_per_s=0.03, impatience_spread=1.0):
+        self.mu_ms = mu_ms                      # Mittlere Gauß-Komponente
+        self.mu_spread_ms = mu_spread_ms        # Streuung von mu zwischen Spielern
+        self.sigma_ms = sigma_ms                # Streuung innerhalb eines Spielers
+        self.tau_ms = tau_ms                    # Exponential-Anteil (langsamer Schwanz)
+        self.tau_spread = tau_spread            # Lognormal-Streuung von tau
+        self.lapse_rate = lapse_rate            # Anteil Aussetzer
+        self.impatience_per_s = impatience_per_s  # Mittlere Drückrate während READY
+        self.impatience_spread = impatience_spread  # Gamma-Form (kleiner = ungleicher)
+
+    def sample(self, rng, n):
+        """Zufallsgrößen für n Spiele ziehen (unabhängig von den Spielparametern)"""
+        mu = rng.normal(self.mu_ms, self.mu_spread_ms, n)
+        tau = self.tau_ms * rng.lognormal(0.0, self.tau_spread, n)
+        rt = mu + rng.normal(0.0, self.sigma_ms, n) + rng.exponential(1.0, n) * tau
+        lapse = rng.random(n) < self.lapse_rate
+        rt = np.where(lapse, rt + rng.uniform(1000.0, 4000.0, n), rt)
+        rt = np.maximum(rt, 80.0)  # Physiologische Untergrenze
+
+        # Ungeduld: Zeitpunkt des ersten voreiligen Drückens nach READY-Beginn
+        k = self.impatience_spread
+        rate = rng.gamma(k, self.impatience_per_s / k, n) / 1000.0  # pro ms
+        premature = rng.exponential(1.0, n) / np.maximum(rate, 1e-12)
+
+        return {
+            "rt": rt,
+            "premature": premature,
+            "ready_u": rng.random(n),      # Lage im READY-Fenster
+            "go_phase": rng.random(n),     # Lage des GO-Wechsels im Abtastraster
+        }
+
+
+class GameParams:
+    """Ein zu bewertender Parametersatz"""
+
+    def __init__(self, bands, timeout_ms=DEFAULT_TIMEOUT_MS,
+                 ready_ms=DEFAULT_READY_MS, loop_ms=DEFAULT_LOOP_MS, name=None):
+        self.bands = np.asarray(sorted(bands), dtype=np.float64)
+        self.timeout_ms = timeout_ms
+        self.ready_ms = ready_ms
+        self.loop_ms = loop_ms
+        self.name = name or f"{list(map(int, self.bands))} T={timeout_ms} R={ready_ms[0]}-{ready_ms[1]}"
+
+
+class Evaluation:
+    """Aufsummierte Ergebnisse eines Parametersatzes"""
+
+    def __init__(self, params):
+        self.params = params
+        self.games = 0
+        self.false_starts = 0
+        self.timeouts = 0
+        self.rating_counts = np.zeros(len(params.bands) + 1, dtype=np.int64)
+        self.histogram = np.zeros(params.timeout_ms // 10 + 1, dtype=np.int64)
+
+    def percentile(self, q):
+        """Perzentil der gemessenen Reaktionszeiten (10ms-Raster)"""
+        cumulative = np.cumsum(self.histogram)
+        if cumulative[-1] == 0:
+            return float("nan")
+        return float(np.searchsorted(cumulative, q / 100.0 * cumulative[-1]) * 10)
+
+    def add(self, draws):
+        p = self.params
+        n = len(draws["rt"])
+        lo, hi = p.ready_ms
+        ready = lo + draws["ready_u"] * (hi - lo)
+
+        false_start = draws["premature"] < ready
+        valid = ~false_start
+
+        # Gemessen wird ab der Abtastung, in der GO erkannt wurde, bis zur
+        # ersten Abtastung nach dem Drücken -> Aufrunden auf das Schleifenraster
+        loop = p.loop_ms
+        go_delay = draws["go_phase"] * loop
+        measured = np.ceil((draws["rt"] + go_delay) / loop) * loop - go_delay
+        measured = np.round(measured)
+
+        timeout = valid & (measured >= p.timeout_ms)
+        scored = valid & ~timeout
+        m = measured[scored]
+
+        self.games += n
+        self.false_starts += int(false_start.sum())
+        self.timeouts += int(timeout.sum())
+        self.rating_counts += np.bincount(np.searchsorted(p.bands, m, side="right"),
+                                          minlength=len(p.bands) + 1)
+        self.histogram += np.bincount((m // 10).astype(np.int64),
+                                      minlength=len(self.histogram))[:len(self.histogram)]
+
+    def report(self):
+        p = self.params
+        games = max(self.games, 1)
+        scored = max(int(self.rating_counts.sum()), 1)
+        lines = [f"▶ {p.name}",
+                 f"   Falschstarts: {100.0 * self.false_starts / games:5.2f}%   "
+                 f"Timeouts: {100.0 * self.timeouts / games:5.2f}%   "
+                 f"Median: {self.percentile(50):.0f}ms   P90: {self.percentile(90):.0f}ms"]
+        edges = ["0"] + [str(int(b)) for b in p.bands] + [str(p.timeout_ms)]
+        for i, count in enumerate(self.rating_counts):
+            share = 100.0 * count / scored
+            bar = "█" * int(share / 2)
+            lines.append(f"   {edges[i]:>5}-{edges[i + 1]:<5}ms {share:5.1f}% {bar}")
+        return "\n".join(lines)
+
+
+def evaluate(param_sets, games=1000000, population=None, seed=0):
+    """Alle Parametersätze auf denselben simulierten Spielen auswerten"""
+    population = population or Population()
+    rng = np.random.default_rng(seed)
+    evaluations = [Evaluation(p) for p in param_sets]
+
+    remaining = games
+    while remaining > 0:
+        n = min(remaining, CHUNK)
+        draws = population.sample(rng, n)
+        for evaluation in evaluations:
+            evaluation.add(draws)
+        remaining -= n
+    return evaluations
+
+
+def parse_ready(text):
+    lo, hi = text.split("-")
+    return int(lo), int(hi)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Spielparameter an simulierten Spielern bewerten")
+    parser.add_argument("--spiele", type=int, default=1000000, help="Anzahl simulierter Spiele")
+    parser.add_argument("--baender", action="append",
+                        help="Bewertungsgrenzen, z.B. 200,300,450,600 (mehrfach möglich)")
+    parser.add_argument("--timeout", type=int, nargs="+", default=[DEFAULT_TIMEOUT_MS])
+    parser.add_argument("--ready", type=parse_ready, nargs="+", default=[DEFAULT_READY_MS],
+                        help="READY-Fenster, z.B. 2000-5000")
+    parser.add_argument("--schleife", type=int, default=DEFAULT_LOOP_MS, help="Schleifenperiode in ms")
+    parser.add_argument("--mu", type=float, default=250.0, help="Mittlere Reaktionszeit (Gauß-Anteil)")
+    parser.add_argument("--tau", type=float, default=60.0, help="Exponential-Anteil in ms")
+    parser.add_argument("--ungeduld", type=float, default=0.03, help="Voreiliges Drücken pro Sekunde")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.baender:
+        bands = {b: tuple(int(x) for x in b.split(",")) for b in args.baender}
+    else:
+        bands = {name: b for name, b in PRESETS.items()}
+
+    param_sets = []
+    for (label, band), timeout, ready in itertools.product(bands.items(), args.timeout, args.ready):
+        name = f"{label} | Timeout {timeout}ms | READY {ready[0]}-{ready[1]}ms"
+        param_sets.append(GameParams(band, timeout, ready, args.schleife, name))
+
+    population = Population(mu_ms=args.mu, tau_ms=args.tau, impatience_per_s=args.ungeduld)
+    start = time.perf_counter()
+    evaluations = evaluate(param_sets, args.spiele, population, args.seed)
+    duration = time.perf_counter() - start
+
+    for evaluation in evaluations:
+        print(evaluation.report())
+    print(f"\n{args.spiele} Spiele x {len(param_sets)} Parametersätze in {duration:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Genauigkeit der Reaktionszeitmessung prüfen (Host-Werkzeug)
+===========================================================
+
+Wie genau ist die gemessene Reaktionszeit wirklich? Jeder Schritt läuft im
+Simulator; ein Testspieler drückt den Button in exakt bekannten Abständen
+(µs-genau) nach dem GO-Reiz. Verglichen wird mit der ausgegebenen
+"Reaktionszeit: ...ms".
+
+Der GO-Reiz ist der Moment, in dem die LED (GPIO 2) voll angeht
+(Pin-Wert 1 oder duty 1023). In Schritt 1 leuchtet die LED schon in READY,
+dort ist der Reiz die Ausgabe "JETZT".
+
+Eingespeiste Verzögerungen (Szenarien):
+- print:  UART-Ausgabe blockiert (Standard 115200 Baud, ~87µs pro Zeichen)
+- gc:     gelegentliche Pausen der Speicherbereinigung
+- led:    Rechenzeit von update_led() (Sinus, Floats); Schritte ohne
+          update_led() melden das Szenario als nicht geprüft
+- alle:   alles zusammen
+
+Ausgabe pro Schritt und Szenario: Verteilung des Fehlers (gemessen - echt).
+Mit --kalibrieren misst der Schritt vorher seine feste Latenz über die
+Drahtschleife (nur Schritte mit calibrate(), siehe latency_cal.py); der
+Mittelwert des Fehlers sollte dann bei 0 liegen.
+
+Mit --max-fehler endet das Programm mit Exit-Code 1, wenn ein Fehler
+(P99 des Betrags) größer ist.
+
+Aufruf:
+    python reaction_accuracy.py
+    python reaction_accuracy.py step6_complete_game --spiele 500
+    python reaction_accuracy.py --szenario ideal alle --max-fehler 15
+    python reaction_accuracy.py step6_complete_game --kalibrieren
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+from sim_hardware import Board, StopSimulation, run_main, wrap_firmware
+
+STEPS = (
+    "step1_basic_states",
+    "step2_led_control",
+    "step3_button_debounce",
+    "step3_button_debounce_functional",
+    "step4_random_timing",
+    "step5_buzzer_audio",
+    "step6_complete_game",
+)
+
+# Szenario -> eingespeiste Verzögerungen
+SCENARIOS = {
+    "ideal": {},
+    "print": {"print": True},
+    "gc": {"gc": True},
+    "led": {"led": True},
+    "alle": {"print": True, "gc": True, "led": True},
+}
+
+LED_PIN = 2
+PRINT_STIMULUS_STEPS = ("step1_basic_states",)
+REACTION_PATTERN = re.compile(r"Reaktionszeit: (-?\d+)ms")
+
+
+class Delays:
+    """Verzögerungen, die in die Firmware eingespeist werden"""
+
+    def __init__(self, rng, baud=115200, gc_rate=0.02, gc_pause_us=(2000, 8000), led_us=400):
+        self.rng = rng
+        self.us_per_char = 10 * 1000000 // baud   # Start + 8 Daten + Stopp
+        self.gc_rate = gc_rate
+        self.gc_pause_us = gc_pause_us
+        self.led_us = led_us
+
+
+class TestPlayer:
+    """Drückt den Button genau offset_us nach dem GO-Reiz"""
+
+    def __init__(self, board, game, rng, games, offsets_ms=(150, 800)):
+        self.board = board
+        self.game = game
+        self.rng = rng
+        self.games = games
+        self.offsets_ms = offsets_ms
+        self.armed = False          # Spiel gestartet, Reiz steht bevor
+        self.stimulus_us = None
+        self.press_us = None
+        self.release_us = None
+        self.start_at_ms = None
+        self.last_state = None
+        self.offsets_us = []        # Echte Reaktionszeiten in µs, in Spiel-Reihenfolge
+        self.measured_ms = []       # Ausgegebene Reaktionszeit pro Reiz (None = keine)
+
+    def stimulus(self):
+        """GO-Reiz gesehen: Drücken planen"""
+        if not self.armed:
+            return
+        self.armed = False
+        self.stimulus_us = self.board.clock.now_us
+        offset = self.rng.randint(self.offsets_ms[0] * 1000, self.offsets_ms[1] * 1000)
+        self.offsets_us.append(offset)
+        self.measured_ms.append(None)
+        self.press_us = self.stimulus_us + offset
+        self.release_us = self.press_us + 100000
+
+    def measure(self, ms):
+        """Ausgegebene Reaktionszeit dem letzten Reiz zuordnen"""
+        if self.measured_ms and self.measured_ms[-1] is None:
+            self.measured_ms[-1] = ms
+
+    def __call__(self, now_ms):
+        now_us = self.board.clock.now_us
+        state = self.game.current_state
+        if state != self.last_state:
+            self.last_state = state
+            if state == self.game.STATE_WAITING:
+                if len(self.offsets_us) >= self.games:
+                    raise StopSimulation()
+                self.start_at_ms = now_ms + 300
+                # Nicht erst in READY: Schritt 1 liest dort den Button nicht
+                self.armed = True
+
+        # Start: in WAITING kurz drücken
+        if self.start_at_ms is not None and state == self.game.STATE_WAITING:
+            if now_ms >= self.start_at_ms + 100:
+                self.start_at_ms = None
+            elif now_ms >= self.start_at_ms:
+                return 0
+
+        if self.press_us is not None and now_us >= self.press_us:
+            if now_us < self.release_us:
+                return 0
+            self.press_us = None
+        return 1
+
+
+class Result:
+    """Fehlerverteilung eines Schritts in einem Szenario
+
+    measured_ms gehört Eintrag für Eintrag zu offsets_us (None = Spiel ohne
+    Messung). skipped: Verzögerung, die der Schritt nicht zulässt (mit Grund);
+    ist sonst nichts eingespeist, gilt das Szenario als nicht geprüft.
+    """
+
+    def __init__(self, step, scenario, offsets_us, measured_ms, skipped=None):
+        self.step = step
+        self.scenario = scenario
+        self.skipped = skipped
+        self.unsupported = skipped is not None and not offsets_us
+        pairs = [(o, m) for o, m in zip(offsets_us, measured_ms) if m is not None]
+        self.errors = sorted(m - o / 1000.0 for o, m in pairs)
+        self.missing = len(offsets_us) - len(pairs)
+
+    def percentile(self, q):
+        values = self.errors
+        return values[min(len(values) - 1, int(q / 100.0 * len(values)))]
+
+    def abs_p99(self):
+        if not self.errors:
+            return float("inf")
+        absolute = sorted(abs(e) for e in self.errors)
+        return absolute[min(len(absolute) - 1, int(0.99 * len(absolute)))]
+
+    def row(self):
+        if self.unsupported:
+            return f"   {self.scenario:<6} nicht geprüft ({self.skipped})"
+        if not self.errors:
+            return f"   {self.scenario:<6} keine Messungen"
+        n = len(self.errors)
+        mean = sum(self.errors) / n
+        std = (sum((e - mean) ** 2 for e in self.errors) / n) ** 0.5
+        row = (f"   {self.scenario:<6} n={n:<4} Ø {mean:+6.2f}ms  σ {std:5.2f}ms  "
+               f"min {self.errors[0]:+6.2f}  P50 {self.percentile(50):+6.2f}  "
+               f"P99 {self.percentile(99):+6.2f}  max {self.errors[-1]:+6.2f}ms")
+        if self.missing:
+            row += f"  ({self.missing} ohne Messung)"
+        if self.skipped:
+            row += f"  (ohne {self.skipped})"
+        return row
+
+
+def run(step, scenario, games, seed, calibrate=False):
+    """Einen Schritt in einem Szenario spielen lassen"""
+    rng = random.Random(seed)
+    inject = SCENARIOS[scenario]
+    delays = Delays(random.Random(seed + 1))
+    board = Board(seed=seed)
+    player = None
+    board_print = board.print
+
+    def print_hook(*args, **kwargs):
+        board_print(*args, **kwargs)
+        line = board.console[-1]
+        if inject.get("print"):
+            board.clock.advance_us(delays.us_per_char * (len(line) + 2))
+        match = REACTION_PATTERN.search(line)
+        if match and player is not None:
+            player.measure(int(match.group(1)))
+        if step in PRINT_STIMULUS_STEPS and "JETZT" in line and player is not None:
+            player.stimulus()
+
+    board.print = print_hook   # vor load(): jedes Modul bekommt board.print
+
+    board_log_write = board.log_write
+
+    def log_write_hook(pin_id, kind, value):
+        board_log_write(pin_id, kind, value)
+        if pin_id == LED_PIN and step not in PRINT_STIMULUS_STEPS and player is not None:
+            if (kind == "value" and value) or (kind == "duty" and value >= 1023):
+                player.stimulus()
+
+    board.log_write = log_write_hook
+
+    game = board.load(step)
+    recorder = getattr(game, "recorder", None)
+    if recorder is not None:
+        recorder.capture_path = None
+    if hasattr(game, "histogram"):
+        game.histogram.hist_path = None
+
+    state = getattr(game, "game", game)   # Kontext-Objekt oder Modul
+    skipped = None
+    if inject.get("led") and not hasattr(state, "update_led"):
+        skipped = "led: kein update_led()"
+        if len(inject) == 1:
+            return Result(step, scenario, [], [], skipped)
+    elif inject.get("led"):
+        def wrap_update_led(update_led):
+            def slow_update_led():
+                update_led()
+                board.clock.advance_us(delays.led_us)
+            return slow_update_led
+
+        # Vor main(): die Kontext-Variante bindet update_led dort lokal
+        wrap_firmware(game, "update_led", wrap_update_led)
+
+    if inject.get("gc"):
+        def gc_pauses(clock, ms):
+            if delays.rng.random() < delays.gc_rate:
+                clock.advance_us(delays.rng.randint(*delays.gc_pause_us))
+            clock.advance_us(ms * 1000)
+
+        board.clock.sleep_hook = gc_pauses
+
+    if calibrate and hasattr(state, "calibrate"):
+        game.latency_cal.cal_path = None
+        board.set_button_source(
+            lambda now: board.pins[game.CAL_OUTPUT_PIN].level if game.CAL_OUTPUT_PIN in board.pins else 1)
+        state.calibrate()
+
+    player = TestPlayer(board, state, rng, games)
+    board.set_button_source(player)
+    board.clock.stop_at_ms = board.clock.now_ms() + games * 20000
+    run_main(game)
+
+    return Result(step, scenario, player.offsets_us, player.measured_ms, skipped)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genauigkeit der Reaktionszeitmessung prüfen")
+    parser.add_argument("schritte", nargs="*", help="Schritt-Dateien (Standard: alle)")
+    parser.add_argument("--szenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--spiele", type=int, default=200, help="Spiele pro Schritt und Szenario")
+    parser.add_argument("--max-fehler", type=float, help="Grenze für P99 |Fehler| in ms")
+    parser.add_argument("--kalibrieren", action="store_true", help="Vorher Latenz-Kalibrierung laufen lassen")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    steps = [s[:-3] if s.endswith(".py") else s for s in args.schritte] or list(STEPS)
+    failed = []
+    start = time.perf_counter()
+    for step in steps:
+        print(f"\n▶ {step}")
+        for scenario in args.szenario:
+            result = run(step, scenario, args.spiele, args.seed, args.kalibrieren)
+            print(result.row())
+            if args.max_fehler is not None and not result.unsupported \
+                    and result.abs_p99() > args.max_fehler:
+                failed.append(f"{step}/{scenario}")
+
+    print(f"\nFertig in {time.perf_counter() - start:.1f}s")
+    if failed:
+        print(f"❌ P99 |Fehler| über {args.max_fehler}ms: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Sitzungs-Recorder für Record & Replay
+=====================================
+
+Zeichnet auf dem Board alles auf, was man braucht, um ein Spiel später
+am PC exakt nachzuspielen (siehe replay.py):
+- Button-Flanken mit Zeitstempel (so wie die Firmware sie abgetastet hat)
+- Die verwendeten Zufallszahlen (also die READY-Wartezeiten)
+- Zustandswechsel und gemessene Reaktionszeiten (zum Vergleich)
+- Die aktive Latenz-Korrektur (latency_cal.py), falls eine gesetzt ist
+- Das Sperrfenster der Entprellung (debounce.py), falls es vom Start abweicht
+- Die Firmware-Version
+
+Jede Sitzung geht vom ersten Ereignis bis zur Rückkehr nach WAITING
+und wird dann als kompakter Binärblock an die Datei angehängt.
+
+Dateiformat pro Sitzung:
+    b"RRC1" | flags (u8) | Startpegel (u8) | Versionslänge (u8) | Version
+    | Anzahl Einträge (u16) | Einträge
+Eintrag (7 Bytes, little endian): Ereignis (u8) | Zeit in ms seit Sitzungsstart (u32) | Wert (u16)
+"""
+
+import utime
+import urandom
+import struct
+
+MAGIC = b"RRC1"
+RECORD_FORMAT = "<BIH"
+RECORD_SIZE = 7
+MAX_RECORDS = 256
+
+# Ereignis-Typen
+EV_EDGE = 1       # Wert: neuer Button-Pegel
+EV_RANDOM = 2     # Wert: Rückgabe von urandom.getrandbits()
+EV_STATE = 3      # Wert: neuer Zustand
+EV_REACTION = 4   # Wert: gemessene Reaktionszeit in ms
+EV_CALIBRATION = 5  # Wert: abgezogene Latenz-Korrektur in µs
+EV_DEBOUNCE = 6     # Wert: Sperrfenster der Entprellung in ms
+
+# Flags
+FLAG_OVERFLOW = 1  # Puffer war voll, Sitzung unvollständig
+
+# Vorab reservierter Puffer - keine Speicheranforderung während des Spiels
+_buffer = bytearray(MAX_RECORDS * RECORD_SIZE)
+_count = 0
+_flags = 0
+_session_start = 0
+_start_level = 1
+_last_level = 1
+
+firmware_version = "?"
+capture_path = None   # None = nur im RAM behalten (z.B. im Simulator)
+last_session = b""    # Zuletzt abgeschlossene Sitzung
+
+
+def begin(version, path=None):
+    """Recorder konfigurieren (macht noch keinen Dateizugriff)"""
+    global firmware_version, capture_path
+    firmware_version = version
+    capture_path = path
+
+
+def log(event, value, t_ms=None):
+    """Ein Ereignis in den Puffer schreiben"""
+    global _count, _flags, _session_start, _start_level
+
+    if t_ms is None:
+        t_ms = utime.ticks_ms()
+
+    if _count == 0:
+        _session_start = t_ms
+        _start_level = _last_level
+
+    if _count >= MAX_RECORDS:
+        _flags |= FLAG_OVERFLOW
+        return
+
+    struct.pack_into(RECORD_FORMAT, _buffer, _count * RECORD_SIZE,
+                     event, utime.ticks_diff(t_ms, _session_start), value & 0xFFFF)
+    _count += 1
+
+
+class RecordingPin:
+    """Hülle um einen Eingangs-Pin, die jede beobachtete Flanke mitschreibt"""
+
+    def __init__(self, pin):
+        self.pin = pin
+
+    def value(self, *args):
+        global _last_level
+        if args:
+            return self.pin.value(*args)
+
+        level = self.pin.value()
+        if level != _last_level:
+            log(EV_EDGE, level)
+            _last_level = level
+        return level
+
+    def irq(self, *args, **kwargs):
+        return self.pin.irq(*args, **kwargs)
+
+
+def random_bits(bits):
+    """urandom.getrandbits() mit Aufzeichnung"""
+    value = urandom.getrandbits(bits)
+    log(EV_RANDOM, value)
+    return value
+
+
+def log_state(new_state, t_ms):
+    """Zustandswechsel aufzeichnen"""
+    log(EV_STATE, new_state, t_ms)
+
+
+def log_reaction(reaction_ms):
+    """Gemessene Reaktionszeit aufzeichnen"""
+    log(EV_REACTION, reaction_ms)
+
+
+def log_calibration(correction_us):
+    """Aktive Latenz-Korrektur aufzeichnen (für ein exaktes Replay)"""
+    log(EV_CALIBRATION, min(correction_us, 0xFFFF))
+
+
+def log_debounce(window_ms):
+    """Aktives Sperrfenster der Entprellung aufzeichnen (für ein exaktes Replay)"""
+    log(EV_DEBOUNCE, window_ms)
+
+
+def discard():
+    """Angefangene Sitzung verwerfen (z.B. Flanken aus der Kalibrierung)"""
+    global _count, _flags
+    _count = 0
+    _flags = 0
+
+
+def end_session():
+    """Sitzung abschließen und (falls konfiguriert) an die Datei anhängen"""
+    global _count, _flags, last_session
+
+    if _count == 0:
+        return
+
+    version = firmware_version.encode()
+    header = MAGIC + bytes((_flags, _start_level, len(version))) + version
+    header += struct.pack("<H", _count)
+    last_session = header + bytes(_buffer[:_count * RECORD_SIZE])
+
+    if capture_path is not None:
+        with open(capture_path, "ab") as f:
+            f.write(last_session)
+
+    _count = 0
+    _flags = 0
@@ -0,0 +1,361 @@
+"""
+Replay aufgezeichneter Sitzungen (Host-Werkzeug)
+================================================
+
+Spielt die mit recorder.py aufgezeichneten Sitzungen am PC nach:
+- Button-Flanken und Zufallszahlen kommen aus der Aufzeichnung
+- Die unveränderten update_*-Funktionen der Firmware laufen im Simulator
+- Die virtuelle Uhr springt von Ereignis zu Ereignis (viel schneller als Echtzeit)
+- Zustandswechsel und Reaktionszeiten werden mit der Aufzeichnung verglichen
+- Aufzeichnungen von Firmware vor 6.5 laufen mit der damaligen Entprellung
+  (feste Sperre von 50ms ab dem letzten Druck, LockoutDebounce)
+
+So lassen sich Streitfälle ("Ich war zuerst!") nachvollziehen und
+tausende Sitzungen als Regressionstest gegen eine neue Firmware prüfen.
+
+Aufruf:
+    python replay.py sessions.rrc               # eine Datei prüfen
+    python replay.py korpus/                    # Regressionstest
+    python replay.py --erzeugen korpus/sim.rrc 1000   # Simulierte Sitzungen
+"""
+
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+
+from sim_hardware import Board, StopSimulation, run_main, wrap_firmware
+
+# Formatkonstanten direkt aus der Firmware (im Simulator geladen)
+recorder = Board().load("recorder")
+
+DEFAULT_STEP = "step6_complete_game"
+BASE_MS = 10000  # Sitzungsstart auf der virtuellen Uhr
+ADAPTIVE_DEBOUNCE_VERSION = (6, 5)  # Ab hier Flanke + Sperrfenster (debounce.py)
+
+
+class Session:
+    """Eine aufgezeichnete Sitzung"""
+
+    def __init__(self, version, flags, start_level, records):
+        self.version = version
+        self.flags = flags
+        self.start_level = start_level
+        self.records = records  # [(ereignis, t_ms, wert), ...]
+
+    def values(self, event):
+        return [(t, v) for ev, t, v in self.records if ev == event]
+
+    @property
+    def edges(self):
+        return self.values(recorder.EV_EDGE)
+
+    @property
+    def random_values(self):
+        return [v for _, v in self.values(recorder.EV_RANDOM)]
+
+    @property
+    def transitions(self):
+        return self.values(recorder.EV_STATE)
+
+    @property
+    def reactions(self):
+        return [v for _, v in self.values(recorder.EV_REACTION)]
+
+    @property
+    def calibration(self):
+        """Latenz-Korrektur in µs, die auf dem Board aktiv war (0 = keine)"""
+        values = self.values(recorder.EV_CALIBRATION)
+        return values[-1][1] if values else 0
+
+    @property
+    def debounce_ms(self):
+        """Sperrfenster der Entprellung in ms, das auf dem Board aktiv war (None = Startwert)"""
+        values = self.values(recorder.EV_DEBOUNCE)
+        return values[-1][1] if values else None
+
+    def to_bytes(self):
+        version = self.version.encode()
+        data = recorder.MAGIC + bytes((self.flags, self.start_level, len(version)))
+        data += version + struct.pack("<H", len(self.records))
+        for record in self.records:
+            data += struct.pack(recorder.RECORD_FORMAT, *record)
+        return data
+
+
+def parse_sessions(data):
+    """Alle Sitzungen aus einem Aufzeichnungs-Puffer lesen"""
+    sessions = []
+    pos = 0
+    while pos < len(data):
+        if data[pos:pos + 4] != recorder.MAGIC:
+            raise ValueError(f"Kein Sitzungsanfang bei Byte {pos}")
+        flags, start_level, version_len = data[pos + 4], data[pos + 5], data[pos + 6]
+        pos += 7
+        version = data[pos:pos + version_len].decode()
+        pos += version_len
+        (count,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        records = list(struct.iter_unpack(
+            recorder.RECORD_FORMAT, data[pos:pos + count * recorder.RECORD_SIZE]))
+        pos += count * recorder.RECORD_SIZE
+        sessions.append(Session(version, flags, start_level, records))
+    return sessions
+
+
+def read_sessions(path):
+    """Alle Sitzungen einer .rrc-Datei lesen"""
+    with open(path, "rb") as f:
+        return parse_sessions(f.read())
+
+
+def corpus_files(paths):
+    """Dateien und Ordner zu einer Liste von .rrc-Dateien auflösen"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.endswith(".rrc"))
+        else:
+            files.append(path)
+    return files
+
+
+class LockoutDebounce:
+    """Entprellung der Firmware vor 6.5: gedrückt und mehr als window_ms seit dem letzten Druck
+
+    Hält der Spieler den Button, zählt nach window_ms ein weiterer Druck.
+    Gleiche Schnittstelle wie debounce.AdaptiveDebounce, damit ältere
+    Aufzeichnungen mit der heutigen Firmware nachgespielt werden können.
+    """
+
+    def __init__(self, window_ms=50):
+        self.window_ms = self.estimate_ms = window_ms
+        self.pressed_ms = 0
+
+    def update(self, level, now_ms):
+        if not level and now_ms - self.pressed_ms > self.window_ms:
+            self.pressed_ms = now_ms
+            return True
+        return False
+
+    def settle(self):
+        return False
+
+    def print_statistics(self):
+        pass  # Ältere Firmware gab keine Entprell-Statistik aus
+
+
+def older_than(version, reference):
+    """Firmware-Version ("6.1") älter als reference ((6, 5))? Unlesbare Versionen gelten als neu"""
+    try:
+        return tuple(int(part) for part in version.split(".")) < reference
+    except ValueError:
+        return False
+
+
+class ReplayResult:
+    """Ergebnis eines Replays"""
+
+    def __init__(self, session):
+        self.session = session
+        self.transitions = []
+        self.reactions = []
+        self.errors = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def replay_session(session, step=DEFAULT_STEP, tolerance_ms=1):
+    """Sitzung durch die Firmware schicken und mit der Aufzeichnung vergleichen"""
+    result = ReplayResult(session)
+
+    # Erste Abtastung genau beim ersten aufgezeichneten Ereignis (t=0)
+    board = Board(start_ms=BASE_MS, random_values=session.random_values)
+    board.set_button_timeline(session.start_level,
+                              [(BASE_MS + t, level) for t, level in session.edges])
+
+    # Ereignisgesteuerte Uhr: nur die aufgezeichneten Zeitpunkte werden besucht.
+    # Die Firmware wechselt den Zustand nur bei einer Abtastung, und jede
+    # relevante Abtastung steckt als Flanke oder Zustandswechsel in der Aufzeichnung.
+    waypoints = iter(sorted({BASE_MS + t for _, t, _ in session.records}))
+
+    def sleep_hook(clock, ms):
+        for t in waypoints:
+            if t * 1000 > clock.now_us:
+                clock.jump_to_ms(t)
+                return
+        raise StopSimulation()
+
+    board.clock.sleep_hook = sleep_hook
+    game = board.load(step)
+    state = getattr(game, "game", game)   # Kontext-Objekt oder Modul
+    if hasattr(game, "recorder"):
+        game.recorder.capture_path = None
+    if hasattr(game, "histogram"):
+        game.histogram.hist_path = None
+    if hasattr(game, "latency_cal"):
+        game.latency_cal.correction_us = session.calibration
+    if hasattr(state, "debouncer"):
+        if older_than(session.version, ADAPTIVE_DEBOUNCE_VERSION):
+            state.debouncer = LockoutDebounce()
+        elif session.debounce_ms is not None:
+            state.debouncer.window_ms = state.debouncer.estimate_ms = session.debounce_ms
+
+    def wrap_change_state(original_change_state):
+        def change_state(new_state):
+            came_from = state.current_state
+            original_change_state(new_state)
+            if came_from == new_state:
+                return  # Startzustand setzen (Schritt 2-5) ist kein Wechsel
+            result.transitions.append((board.clock.now_ms() - BASE_MS, new_state))
+            if new_state == state.STATE_GO:
+                state.reaction_time = None
+            elif came_from == state.STATE_GO and state.reaction_time is not None:
+                result.reactions.append(state.reaction_time)
+        return change_state
+
+    wrap_firmware(game, "change_state", wrap_change_state)
+    run_main(game)
+
+    compare(session, result, tolerance_ms)
+    return result
+
+
+def compare(session, result, tolerance_ms):
+    """Abweichungen zwischen Aufzeichnung und Replay sammeln"""
+    expected = session.transitions
+    actual = result.transitions
+    if [s for _, s in expected] != [s for _, s in actual]:
+        result.errors.append(f"Zustandsfolge {[s for _, s in expected]} != {[s for _, s in actual]}")
+    else:
+        for (t_exp, state), (t_act, _) in zip(expected, actual):
+            if abs(t_exp - t_act) > tolerance_ms:
+                result.errors.append(f"Zustand {state} bei {t_act}ms statt {t_exp}ms")
+
+    if len(session.reactions) != len(result.reactions):
+        result.errors.append(f"Reaktionen {session.reactions} != {result.reactions}")
+    else:
+        for exp, act in zip(session.reactions, result.reactions):
+            if abs(exp - act) > tolerance_ms:
+                result.errors.append(f"Reaktionszeit {act}ms statt {exp}ms")
+
+
+class VirtualPlayer:
+    """Einfaches Spielermodell für simulierte Sitzungen"""
+
+    def __init__(self, game, rng):
+        self.game = game
+        self.rng = rng
+        self.last_state = None
+        self.press_at = None
+        self.release_at = None
+
+    def __call__(self, now):
+        state = self.game.current_state
+        if state != self.last_state:
+            self.last_state = state
+            self.plan(state, now)
+
+        if self.press_at is not None and now >= self.press_at:
+            self.press_at = None
+            self.release_at = now + self.rng.randint(30, 150)
+        if self.release_at is not None:
+            if now < self.release_at:
+                return 0
+            self.release_at = None
+        return 1
+
+    def plan(self, state, now):
+        rng = self.rng
+        if state == self.game.STATE_WAITING:
+            self.press_at = now + rng.randint(300, 1500)
+        elif state == self.game.STATE_READY:
+            # Ab und zu ungeduldig
+            self.press_at = now + rng.randint(300, 2500) if rng.random() < 0.1 else None
+        elif state == self.game.STATE_GO:
+            # Selten gar keine Reaktion (Timeout)
+            self.press_at = None if rng.random() < 0.03 else now + max(100, int(rng.gauss(280, 60)))
+        else:
+            self.press_at = None
+
+
+def simulate_sessions(count, seed=0, step=DEFAULT_STEP):
+    """Sitzungen mit virtuellem Spieler im Simulator aufzeichnen"""
+    board = Board(start_ms=0, seed=seed)
+    game = board.load(step)
+    board.set_button_source(VirtualPlayer(game, random.Random(seed)))
+
+    captured = []
+    rec = game.recorder
+    rec.capture_path = None
+    if hasattr(game, "histogram"):
+        game.histogram.hist_path = None
+    original_end_session = rec.end_session
+
+    def end_session():
+        original_end_session()
+        captured.append(rec.last_session)
+        if len(captured) >= count:
+            raise StopSimulation()
+
+    rec.end_session = end_session
+    run_main(game)
+    return b"".join(captured)
+
+
+def replay_corpus(paths, step=DEFAULT_STEP, tolerance_ms=1, verbose=False):
+    """Alle Sitzungen eines Korpus nachspielen, Anzahl der Abweichungen zurückgeben"""
+    sessions = 0
+    failures = 0
+    start = time.perf_counter()
+
+    for path in corpus_files(paths):
+        for index, session in enumerate(read_sessions(path)):
+            result = replay_session(session, step, tolerance_ms)
+            sessions += 1
+            if not result.ok:
+                failures += 1
+                print(f"❌ {path}#{index} (Firmware {session.version}):")
+                for error in result.errors:
+                    print(f"   {error}")
+            elif verbose:
+                print(f"✅ {path}#{index}: {result.reactions}")
+
+    duration = time.perf_counter() - start
+    rate = sessions / duration if duration > 0 else 0
+    print(f"{sessions} Sitzungen nachgespielt, {failures} Abweichungen "
+          f"({duration:.2f}s, {rate:.0f} Sitzungen/s)")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aufgezeichnete Sitzungen nachspielen")
+    parser.add_argument("paths", nargs="*", help=".rrc-Dateien oder Ordner")
+    parser.add_argument("--step", default=DEFAULT_STEP, help="Firmware-Modul")
+    parser.add_argument("--toleranz", type=int, default=1, help="Erlaubte Abweichung in ms")
+    parser.add_argument("--erzeugen", nargs=2, metavar=("DATEI", "ANZAHL"),
+                        help="Simulierte Sitzungen aufzeichnen")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.erzeugen:
+        path, count = args.erzeugen[0], int(args.erzeugen[1])
+        data = simulate_sessions(count, args.seed, args.step)
+        with open(path, "wb") as f:
+            f.write(data)
+        print(f"{count} Sitzungen ({len(data)} Bytes) nach {path} geschrieben")
+        return 0
+
+    if not args.paths:
+        parser.error("Keine Aufzeichnung angegeben")
+    return 1 if replay_corpus(args.paths, args.step, args.toleranz, args.verbose) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,806 @@
+"""
+Host-Simulator für das Reaktionsspiel
+=====================================
+
+Damit laufen die Schritt-Dateien unverändert auf dem PC (CPython):
+- `utime` mit virtueller Uhr (läuft schneller als Echtzeit)
+- `urandom` mit vorgegebenen oder reproduzierbaren Zufallszahlen
+- `machine.Pin` / `machine.PWM` / `machine.DAC` als Attrappen, die jeden
+  Schreibzugriff mitschreiben
+- `machine.Timer`: periodische Rückrufe, wenn die Uhr über ihren Termin läuft
+- `machine.freq()`: CPU-Takt wie beim ESP32 (20/40/80/160/240 MHz, Start
+  160 MHz); jeder Wechsel steht in `board.freq_log`. Die virtuelle Uhr
+  rechnet nicht schneller oder langsamer
+- Tiefschlaf: `machine.deepsleep()` beendet die Simulation, der RTC-Speicher
+  bleibt erhalten; `board.wake()` liefert das aufgewachte Board
+- Dateizugriffe der Firmware (`open`) werden mitgeschrieben
+- `micropython.const()` gibt den Wert unverändert zurück
+- `framebuf` (nur MONO_VLSB) und `machine.I2C`; mit display=True hängt ein
+  SSD1306 an Adresse 0x3C, der sein Bild im RAM hält (`board.display`).
+  I2C-Übertragungen kosten virtuelle Zeit (9 Takte pro Byte) und werden
+  mitgeschrieben (`board.i2c_log`). Die Schrift ist ein Platzhalter, der
+  sich zurücklesen lässt (`board.display.text_lines()`)
+- Button-Pegel aus einer Zeitleiste oder einer Funktion
+- `wrap_firmware()`: Funktion der Firmware für eine Messung umhüllen, als
+  Modul-Funktion oder als Methode des Spielkontexts
+- `socket` ohne Netzwerk, außer das Board wird mit network=True erzeugt
+- Optional eine Echtzeit-Uhr (realtime=True), z.B. für Lasttests
+- Oder eine eigene Uhr (clock=...), z.B. desktop.py: Echtzeit, sleep wartet
+  auf die Tastatur
+- `gc.mem_alloc()` / `gc.mem_free()` über tracemalloc (CPython-Bytes,
+  nicht MicroPython-Bytes; gut für Vergleiche und Budgets, nicht absolut)
+
+Jedes Board lädt seine eigene Kopie der Firmware-Module, mehrere
+simulierte Boards stören sich also nicht gegenseitig.
+
+Beispiel:
+    board = Board()
+    board.set_button_timeline(1, [(1200, 0), (1320, 1)])
+    game = board.load("step6_complete_game")
+"""
+
+import gc
+import importlib.util
+import os
+import sys
+import random
+import socket
+import threading
+import time
+import tracemalloc
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_code_cache = {}
+_install_lock = threading.RLock()
+
+
+class StopSimulation(KeyboardInterrupt):
+    """Beendet die Hauptschleife wie Strg+C auf dem Board"""
+
+
+class DeepSleep(BaseException):
+    """machine.deepsleep(): die Firmware läuft nicht weiter (kein KeyboardInterrupt!)"""
+
+
+# machine.reset_cause() wie beim ESP32
+PWRON_RESET = 1
+HARD_RESET = 2
+WDT_RESET = 3
+DEEPSLEEP_RESET = 4
+SOFT_RESET = 5
+
+CPU_FREQS_HZ = (20000000, 40000000, 80000000, 160000000, 240000000)
+
+
+class VirtualClock:
+    """Virtuelle Uhr in Mikrosekunden"""
+
+    def __init__(self, start_ms=0):
+        self.now_us = start_ms * 1000
+        self.stop_at_ms = None      # Simulation endet ab diesem Zeitpunkt
+        self.sleep_hook = None      # Optional: eigene Logik für sleep_ms
+        self.timers = []            # Laufende SimTimer
+
+    def now_ms(self):
+        return self.now_us // 1000
+
+    def run_timers(self, target_us):
+        """Fällige Timer-Rückrufe bis target_us ausführen (Uhr steht dabei auf dem Termin)"""
+        while self.timers:
+            timer = min(self.timers, key=lambda t: t.due_us)
+            if timer.due_us > target_us:
+                break
+            if timer.due_us > self.now_us:
+                self.now_us = timer.due_us
+            timer.fire()
+
+    def advance_us(self, us):
+        target_us = self.now_us + us
+        if self.timers:
+            self.run_timers(target_us)
+        self.now_us = target_us
+        if self.stop_at_ms is not None and self.now_us >= self.stop_at_ms * 1000:
+            raise StopSimulation()
+
+    def jump_to_ms(self, t_ms):
+        """Uhr auf einen Zeitpunkt setzen (nie rückwärts)"""
+        if t_ms * 1000 > self.now_us:
+            self.now_us = t_ms * 1000
+
+    # --- utime-Schnittstelle ---
+    def ticks_ms(self):
+        return self.now_us // 1000
+
+    def ticks_us(self):
+        return self.now_us
+
+    def ticks_cpu(self):
+        return self.now_us
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+    def ticks_add(self, a, b):
+        return a + b
+
+    def sleep_ms(self, ms):
+        if self.sleep_hook is not None:
+            self.sleep_hook(self, ms)
+        else:
+            self.advance_us(ms * 1000)
+
+    def sleep_us(self, us):
+        self.advance_us(us)
+
+    def sleep(self, seconds):
+        self.sleep_ms(int(seconds * 1000))
+
+    def time(self):
+        return self.now_us // 1000000
+
+
+class RealtimeClock(VirtualClock):
+    """Uhr, die der echten Zeit folgt (Rechenzeit zählt mit, sleep schläft wirklich)"""
+
+    def __init__(self, start_ms=0):
+        VirtualClock.__init__(self, start_ms)
+        self._offset_ns = time.perf_counter_ns() - start_ms * 1000000
+
+    @property
+    def now_us(self):
+        return (time.perf_counter_ns() - self._offset_ns) // 1000
+
+    @now_us.setter
+    def now_us(self, value):
+        self._offset_ns = time.perf_counter_ns() - value * 1000
+
+    def run_timers(self, target_us):
+        """Überfällige Timer nachholen (echte Zeit lässt sich nicht anhalten)"""
+        while self.timers:
+            timer = min(self.timers, key=lambda t: t.due_us)
+            if timer.due_us > target_us:
+                break
+            timer.fire()
+
+    def advance_us(self, us):
+        time.sleep(us / 1000000)
+        if self.timers:
+            self.run_timers(self.now_us)
+        if self.stop_at_ms is not None and self.now_us >= self.stop_at_ms * 1000:
+            raise StopSimulation()
+
+
+class RandomSource:
+    """Ersatz für urandom: erst vorgegebene Werte, dann reproduzierbarer Zufall"""
+
+    def __init__(self, values=None, seed=0):
+        self.values = list(values or [])
+        self._rng = random.Random(seed)
+
+    def getrandbits(self, bits):
+        if self.values:
+            return self.values.pop(0) & ((1 << bits) - 1)
+        return self._rng.getrandbits(bits)
+
+    def randint(self, a, b):
+        return a + self.getrandbits(16) % (b - a + 1)
+
+    def seed(self, value):
+        self._rng.seed(value)
+
+
+class SimPin:
+    """Attrappe für machine.Pin"""
+
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 1
+    IRQ_RISING = 2
+
+    def __init__(self, board, pin_id, mode=-1, pull=-1, value=None):
+        self.board = board
+        self.id = pin_id
+        self.mode = mode
+        self.level = 1 if pull == SimPin.PULL_UP else 0
+        if value is not None:
+            self.level = 1 if value else 0
+            board.log_write(pin_id, "value", self.level)
+        self.source = None          # Funktion now_ms -> Pegel (für Eingänge)
+        self.irq_handler = None
+        self.irq_trigger = 0
+        board.pins[pin_id] = self
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.mode = mode
+        if value is not None:
+            self.level = 1 if value else 0
+            self.board.log_write(self.id, "value", self.level)
+
+    def value(self, v=None):
+        if v is None:
+            if self.source is not None:
+                return self.source(self.board.clock.ticks_ms())
+            return self.level
+        self.level = 1 if v else 0
+        self.board.log_write(self.id, "value", self.level)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING):
+        self.irq_handler = handler
+        self.irq_trigger = trigger
+
+
+class SimPWM:
+    """Attrappe für machine.PWM (ESP32-Schnittstelle mit duty 0-1023)"""
+
+    def __init__(self, pin, freq=None, duty=None):
+        self.board = pin.board
+        self.pin = pin
+        self._freq = 0
+        self._duty = 0
+        self.board.pwms.append(self)
+        if freq is not None:
+            self.freq(freq)
+        if duty is not None:
+            self.duty(duty)
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        self._freq = value
+        self.board.log_write(self.pin.id, "freq", value)
+
+    def duty(self, value=None):
+        if value is None:
+            return self._duty
+        self._duty = value
+        self.board.log_write(self.pin.id, "duty", value)
+
+    def init(self, freq=None, duty=None):
+        self.pin.level = 0          # Pin gehört wieder der PWM (wie ein neues PWM(Pin(n)))
+        if freq is not None:
+            self.freq(freq)
+        if duty is not None:
+            self.duty(duty)
+
+    def deinit(self):
+        self._duty = 0
+
+
+class SimDAC:
+    """Attrappe für machine.DAC (8 Bit)"""
+
+    def __init__(self, pin, bits=8):
+        self.board = pin.board
+        self.pin = pin
+        self._value = 0
+
+    def write(self, value):
+        self._value = value
+        self.board.log_write(self.pin.id, "dac", value)
+
+
+class SimTimer:
+    """Attrappe für machine.Timer: Rückruf läuft, sobald die Uhr den Termin erreicht"""
+
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, board, timer_id=-1, **kwargs):
+        self.board = board
+        self.id = timer_id
+        self.period_us = 0
+        self.due_us = 0
+        self.mode = SimTimer.PERIODIC
+        self.callback = None
+        self.fired = 0
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, freq=None, period=None, callback=None):
+        """freq in Hz oder period in ms (ganze µs, wie beim ESP32-Timer)"""
+        clock = self.board.clock
+        self.deinit()
+        self.mode = mode
+        self.period_us = 1000000 // freq if freq is not None else period * 1000
+        self.callback = callback
+        self.due_us = clock.now_us + self.period_us
+        clock.timers.append(self)
+
+    def fire(self):
+        self.fired += 1
+        if self.mode == SimTimer.PERIODIC:
+            self.due_us += self.period_us
+        else:
+            self.deinit()
+        if self.callback is not None:
+            self.callback(self)
+
+    def deinit(self):
+        timers = self.board.clock.timers
+        if self in timers:
+            timers.remove(self)
+
+
+class SimFrameBuffer:
+    """Attrappe für framebuf.FrameBuffer (nur MONO_VLSB: ein Byte = 8 Pixel senkrecht)
+
+    text() zeichnet statt der 8x8-Schrift ein Platzhalter-Muster pro Zeichen
+    (Spalte 1, 3 und 5 = Zeichencode), das SimSSD1306.text_lines() zurückliest.
+    """
+
+    def __init__(self, buffer, width, height, fmt):
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        index = (y >> 3) * self.width + x
+        bit = 1 << (y & 7)
+        if c is None:
+            return 1 if self.buffer[index] & bit else 0
+        if c:
+            self.buffer[index] |= bit
+        else:
+            self.buffer[index] &= ~bit & 0xFF
+
+    def fill(self, c):
+        value = 0xFF if c else 0
+        for i in range(len(self.buffer)):
+            self.buffer[i] = value
+
+    def fill_rect(self, x, y, w, h, c):
+        for yy in range(max(y, 0), min(y + h, self.height)):
+            for xx in range(max(x, 0), min(x + w, self.width)):
+                self.pixel(xx, yy, c)
+
+    def text(self, string, x, y, c=1):
+        for n, char in enumerate(string):
+            code = ord(char) if 32 < ord(char) < 127 else (0 if char == " " else ord("?"))
+            for col, bits in enumerate(SimSSD1306.glyph(code)):
+                for row in range(8):
+                    if bits >> row & 1:
+                        self.pixel(x + n * 8 + col, y + row, c)
+
+
+class SimSSD1306:
+    """SSD1306 an I2C: wertet Befehle und Daten aus, hält das Bild im RAM"""
+
+    WIDTH = 128
+    PAGES = 8
+    ARGS = {0x20: 1, 0x21: 2, 0x22: 2, 0x81: 1, 0x8D: 1, 0xA8: 1, 0xD3: 1, 0xD5: 1,
+            0xD9: 1, 0xDA: 1, 0xDB: 1}
+
+    def __init__(self):
+        self.ram = bytearray(self.WIDTH * self.PAGES)
+        self.on = False
+        self.columns = (0, self.WIDTH - 1)
+        self.pages = (0, self.PAGES - 1)
+        self.column = 0
+        self.page = 0
+
+    @staticmethod
+    def glyph(code):
+        """Platzhalter-Zeichen: 8 Spalten, Zeichencode in Spalte 1, 3 und 5"""
+        if code == 0:
+            return (0,) * 8
+        return (0, code, 0x7F, code, 0x7F, code, 0, 0)
+
+    def receive(self, data):
+        """Eine I2C-Übertragung: Steuerbyte 0x00 = Befehle, 0x40 = Bilddaten"""
+        if not data:
+            return
+        if data[0] == 0x40:
+            for value in data[1:]:
+                self.ram[self.page * self.WIDTH + self.column] = value
+                self.column += 1
+                if self.column > self.columns[1]:
+                    self.column = self.columns[0]
+                    self.page = self.page + 1 if self.page < self.pages[1] else self.pages[0]
+            return
+        i = 1
+        while i < len(data):
+            command = data[i]
+            args = data[i + 1:i + 1 + self.ARGS.get(command, 0)]
+            i += 1 + len(args)
+            if command == 0xAE:
+                self.on = False
+            elif command == 0xAF:
+                self.on = True
+            elif command == 0x21:
+                self.columns = (args[0], args[1])
+                self.column = args[0]
+            elif command == 0x22:
+                self.pages = (args[0], args[1])
+                self.page = args[0]
+
+    def text_lines(self):
+        """Bild als Text zurücklesen (eine Zeile pro Seite, ? = kein Zeichen)"""
+        lines = []
+        for page in range(self.PAGES):
+            chars = []
+            for x in range(0, self.WIDTH, 8):
+                cell = tuple(self.ram[page * self.WIDTH + x:page * self.WIDTH + x + 8])
+                code = cell[1]
+                chars.append(" " if not any(cell) else
+                             chr(code) if cell == self.glyph(code) else "?")
+            lines.append("".join(chars).rstrip())
+        return lines
+
+
+class SimI2C:
+    """Attrappe für machine.I2C: Geräte nach Adresse, jede Übertragung kostet Zeit"""
+
+    def __init__(self, board, bus_id=0, scl=None, sda=None, freq=400000):
+        self.board = board
+        self.freq = freq
+
+    def _transfer(self, addr, data):
+        board = self.board
+        device = board.i2c_devices.get(addr)
+        # Adresse + Daten, je 8 Bit + ACK
+        board.clock.advance_us((len(data) + 1) * 9 * 1000000 // self.freq)
+        if device is None:
+            raise OSError(19, "ENODEV")
+        board.i2c_log.append((board.clock.now_us, addr, len(data)))
+        device.receive(bytes(data))
+
+    def writeto(self, addr, buf, stop=True):
+        self._transfer(addr, buf)
+        return len(buf)
+
+    def writevto(self, addr, vector, stop=True):
+        self._transfer(addr, b"".join(bytes(part) for part in vector))
+        return len(vector)
+
+
+class Board:
+    """Ein simuliertes ESP32-Board mit eigener Uhr, Hardware und Firmware-Kopie"""
+
+    def __init__(self, start_ms=0, random_values=None, seed=0, quiet=True,
+                 realtime=False, network=False, heap_bytes=111168, display=False, clock=None):
+        if clock is None:
+            clock = RealtimeClock(start_ms) if realtime else VirtualClock(start_ms)
+        self.clock = clock          # Eigene Uhr möglich, z.B. desktop.py
+        self.seed = seed
+        self.network = network
+        self.heap_bytes = heap_bytes    # Heap-Größe für gc.mem_free()
+        self.random = RandomSource(random_values, seed)
+        self.pins = {}
+        self.pwms = []
+        self.cpu_hz = 160000000     # machine.freq() nach dem Start
+        self.freq_log = []          # (t_us, Hz) bei jedem Wechsel
+        self.writes = []            # (t_us, pin, art, wert)
+        self.console = []           # Ausgaben der Firmware
+        self.quiet = quiet
+        self.loaded = {}
+        self.input_sources = {}     # pin_id -> Funktion now_ms -> Pegel
+        self.files_opened = []      # (Pfad, Modus) jedes open() der Firmware
+        self.reset_cause = PWRON_RESET
+        self.rtc_memory = b""       # Überlebt den Tiefschlaf
+        self.wake_pin = None        # (Pin, Pegel) aus esp32.wake_on_ext0
+        self.sleep_ms = None        # Gesetzt, sobald das Board schläft
+        self.display = SimSSD1306() if display else None
+        self.i2c_devices = {0x3C: self.display} if display else {}
+        self.i2c_log = []           # (t_us, Adresse, Bytes) jeder I2C-Übertragung
+        self.modules = self._make_modules()
+
+    # --- Hilfen für Tests und Werkzeuge ---
+    def log_write(self, pin_id, kind, value):
+        self.writes.append((self.clock.now_us, pin_id, kind, value))
+
+    def print(self, *args, sep=" ", end="\n", **kwargs):
+        line = sep.join(str(a) for a in args)
+        self.console.append(line)
+        if not self.quiet:
+            print(line, end=end)
+
+    def open(self, path, mode="r", *args, **kwargs):
+        self.files_opened.append((path, mode))
+        return open(path, mode, *args, **kwargs)
+
+    def pin(self, pin_id):
+        return self.pins[pin_id]
+
+    def wake(self, after_ms=0):
+        """Neues Board nach dem Tiefschlaf: gleicher RTC-Speicher, Reset-Grund DEEPSLEEP"""
+        board = Board(start_ms=self.clock.now_ms() + after_ms, seed=self.seed + 1,
+                      quiet=self.quiet, network=self.network, heap_bytes=self.heap_bytes)
+        if self.display is not None:
+            # Das Display hängt weiter an der Versorgung und behält sein Bild
+            board.display = self.display
+            board.i2c_devices = {0x3C: self.display}
+        board.rtc_memory = self.rtc_memory
+        board.reset_cause = DEEPSLEEP_RESET
+        return board
+
+    def set_button_timeline(self, start_level, edges, pin_id=0):
+        """Button-Pegel aus einer Liste [(t_ms, pegel), ...] erzeugen"""
+        edges = sorted(edges)
+        times = [t for t, _ in edges]
+        levels = [lv for _, lv in edges]
+
+        def source(now_ms):
+            # Binäre Suche nach der letzten Flanke <= now_ms
+            lo, hi = 0, len(times)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if times[mid] <= now_ms:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return levels[lo - 1] if lo else start_level
+
+        self.set_button_source(source, pin_id)
+
+    def set_button_source(self, source, pin_id=0):
+        """Button-Pegel aus einer Funktion now_ms -> Pegel"""
+        self.input_sources[pin_id] = source
+        if pin_id in self.pins:
+            self.pins[pin_id].source = source
+
+    # --- Module ---
+    def _make_modules(self):
+        board = self
+        clock = self.clock
+
+        utime = types.ModuleType("utime")
+        for name in ("ticks_ms", "ticks_us", "ticks_cpu", "ticks_diff", "ticks_add",
+                     "sleep_ms", "sleep_us", "sleep", "time"):
+            setattr(utime, name, getattr(clock, name))
+
+        urandom = types.ModuleType("urandom")
+        urandom.getrandbits = self.random.getrandbits
+        urandom.randint = self.random.randint
+        urandom.seed = self.random.seed
+
+        machine = types.ModuleType("machine")
+
+        class Pin(SimPin):
+            def __init__(self, pin_id, mode=-1, pull=-1, value=None):
+                SimPin.__init__(self, board, pin_id, mode, pull, value)
+                self.source = board.input_sources.get(pin_id)
+
+        class Timer(SimTimer):
+            def __init__(self, timer_id=-1, **kwargs):
+                SimTimer.__init__(self, board, timer_id, **kwargs)
+
+        class I2C(SimI2C):
+            def __init__(self, bus_id=0, scl=None, sda=None, freq=400000):
+                SimI2C.__init__(self, board, bus_id, scl, sda, freq)
+
+        class RTC:
+            def memory(self, data=None):
+                if data is None:
+                    return board.rtc_memory
+                board.rtc_memory = bytes(data)
+
+        def deepsleep(ms=0):
+            board.sleep_ms = ms
+            raise DeepSleep()
+
+        def freq(hz=None):
+            if hz is None:
+                return board.cpu_hz
+            if hz not in CPU_FREQS_HZ:
+                raise ValueError("frequency must be 20MHz, 40MHz, 80Mhz, 160MHz or 240MHz")
+            board.cpu_hz = hz
+            board.freq_log.append((clock.now_us, hz))
+
+        machine.Pin = Pin
+        machine.PWM = SimPWM
+        machine.DAC = SimDAC
+        machine.Timer = Timer
+        machine.I2C = I2C
+        machine.RTC = RTC
+        machine.deepsleep = deepsleep
+        machine.freq = freq
+        machine.reset_cause = lambda: board.reset_cause
+        for name in ("PWRON_RESET", "HARD_RESET", "WDT_RESET", "DEEPSLEEP_RESET", "SOFT_RESET"):
+            setattr(machine, name, globals()[name])
+
+        esp32 = types.ModuleType("esp32")
+        esp32.WAKEUP_ALL_LOW = False
+        esp32.WAKEUP_ANY_HIGH = True
+
+        def wake_on_ext0(pin, level):
+            board.wake_pin = (pin.id, level)
+
+        esp32.wake_on_ext0 = wake_on_ext0
+
+        micropython = types.ModuleType("micropython")
+        micropython.const = lambda value: value
+
+        framebuf = types.ModuleType("framebuf")
+        framebuf.MONO_VLSB = 0
+        framebuf.FrameBuffer = SimFrameBuffer
+
+        modules = {"utime": utime, "urandom": urandom, "machine": machine, "esp32": esp32,
+                   "micropython": micropython, "framebuf": framebuf,
+                   "gc": _heap_module(self.heap_bytes)}
+        if not self.network:
+            modules["socket"] = _offline_socket_module()
+        return modules
+
+    def load(self, name, path=None):
+        """Firmware-Modul (z.B. "step6_complete_game") für dieses Board laden
+
+        path: andere Quelldatei für dieses Modul (z.B. aus build_profiles.py)
+        """
+        if name.endswith(".py"):
+            name = name[:-3]
+        name = os.path.basename(name)
+        if name in self.loaded:
+            return self.loaded[name]
+
+        if path is None:
+            path = os.path.join(HERE, name + ".py")
+        code = _code_cache.get(path)
+        if code is None:
+            with open(path, encoding="utf-8") as f:
+                code = compile(f.read(), path, "exec")
+            _code_cache[path] = code
+
+        module = types.ModuleType(name)
+        module.__file__ = path
+        module.print = self.print
+        module.open = self.open
+        self.loaded[name] = module
+
+        with _install_lock:
+            saved = {}
+            local_names = set(self.modules) | set(self.loaded) | _firmware_names()
+            for mod_name in local_names:
+                if mod_name in sys.modules:
+                    saved[mod_name] = sys.modules.pop(mod_name)
+            sys.modules.update(self.modules)
+            for mod_name, mod in self.loaded.items():
+                if mod is not module:
+                    sys.modules[mod_name] = mod
+            finder = _BoardFinder(self)
+            sys.meta_path.insert(0, finder)
+            try:
+                exec(code, module.__dict__)
+            finally:
+                sys.meta_path.remove(finder)
+                for mod_name in local_names | set(self.loaded):
+                    sys.modules.pop(mod_name, None)
+                sys.modules.update(saved)
+        return module
+
+
+_filters = None  # tracemalloc-Filter für gc.mem_alloc(), einmal erzeugt
+_garbage = 0     # Geschätzter Müll seit dem letzten collect()
+
+
+def _heap_module(heap_bytes):
+    """gc-Modul mit mem_alloc/mem_free
+
+    Gezählt wird ab dem ersten Aufruf und nur, was in Firmware-Dateien
+    angelegt wurde - nicht die Buchführung des Simulators (console, writes).
+    Dazu kommt die Spitze kurzlebiger Objekte seit dem letzten collect().
+    """
+    module = types.ModuleType("gc")
+    module.enable = gc.enable
+    module.disable = gc.disable
+    module.isenabled = gc.isenabled
+
+    def mem_alloc():
+        global _filters, _garbage
+        if _filters is None:
+            _filters = _firmware_filters()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        # CPython gibt Müll sofort frei; was MicroPython bis zum nächsten
+        # collect() liegen ließe, schätzt die tracemalloc-Spitze seitdem.
+        # Vor der Momentaufnahme lesen und danach zurücksetzen: deren
+        # eigene Hilfsobjekte (je nach Zahl der Einträge mehrere kB) sind
+        # kein Müll der Firmware
+        current, peak = tracemalloc.get_traced_memory()
+        _garbage = max(_garbage, peak - current)
+        snapshot = tracemalloc.take_snapshot().filter_traces(_filters)
+        live = sum(stat.size for stat in snapshot.statistics("filename"))
+        del snapshot
+        tracemalloc.reset_peak()
+        return live + _garbage
+
+    def collect():
+        global _garbage
+        gc.collect()
+        _garbage = 0
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    def mem_free():
+        return max(heap_bytes - mem_alloc(), 0)
+
+    module.collect = collect
+    module.mem_alloc = mem_alloc
+    module.mem_free = mem_free
+    return module
+
+
+def _offline_socket_module():
+    """socket-Modul eines Boards ohne WLAN: jeder Socket-Aufbau schlägt fehl"""
+    module = types.ModuleType("socket")
+    for name in ("AF_INET", "SOCK_STREAM", "SOCK_DGRAM", "SOL_SOCKET", "SO_REUSEADDR"):
+        setattr(module, name, getattr(socket, name))
+
+    def offline_socket(*args, **kwargs):
+        raise OSError("kein Netzwerk im Simulator")
+
+    module.socket = offline_socket
+    module.getaddrinfo = offline_socket
+    return module
+
+
+def _firmware_filters():
+    """tracemalloc-Filter: nur Firmware-Dateien, ohne Host-Werkzeuge"""
+    filters = []
+    for name in _firmware_names():
+        path = os.path.join(HERE, name + ".py")
+        with open(path, encoding="utf-8") as f:
+            # Host-Werkzeuge erkennt man an der Überschrift
+            if "(Host-Werkzeug)" in f.read(400) or name == "sim_hardware":
+                continue
+        filters.append(tracemalloc.Filter(True, path))
+    return filters
+
+
+def _firmware_names():
+    return {f[:-3] for f in os.listdir(HERE) if f.endswith(".py")}
+
+
+class _BoardFinder:
+    """Lädt Firmware-Module aus diesem Ordner pro Board statt global"""
+
+    def __init__(self, board):
+        self.board = board
+
+    def find_spec(self, name, path=None, target=None):
+        if "." in name or not os.path.exists(os.path.join(HERE, name + ".py")):
+            return None
+        return importlib.util.spec_from_loader(name, self)
+
+    def create_module(self, spec):
+        return self.board.load(spec.name)
+
+    def exec_module(self, module):
+        pass
+
+
+def wrap_firmware(module, name, make):
+    """Firmware-Funktion `name` ersetzen, egal wo die Variante sie hält
+
+    make(original) liefert den Ersatz mit derselben Signatur. Ersetzt wird
+    die Modul-Funktion oder, bei der Kontext-Variante (module.game), die
+    Methode der Klasse - dort bindet main() sie erst beim Start, und die
+    Methoden rufen einander über die Klasse auf. Jedes Board lädt seine
+    eigene Klasse, andere Boards merken davon nichts.
+    """
+    state = getattr(module, "game", module)
+    replacement = make(getattr(state, name))
+    if state is module:
+        setattr(module, name, replacement)
+    else:
+        setattr(type(state), name, lambda self, *args: replacement(*args))
+
+
+def run_main(module):
+    """main() der Firmware ausführen, bis die Simulation endet"""
+    try:
+        module.main()
+    except (KeyboardInterrupt, DeepSleep):
+        pass
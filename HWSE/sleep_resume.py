@@ -0,0 +1,114 @@
+"""
+Tiefschlaf zwischen Sitzungen, Statistik im RTC-Speicher
+========================================================
+
+Stundenlang ohne Spieler läuft die Schleife sonst mit vollem Takt weiter,
+PWM für LED und Buzzer bleibt an. Nach einer Pause ohne Spieler:
+
+1. Statistik kompakt packen (struct, 35 Bytes plus 516 Bytes Histogramm)
+   und in den RTC-Speicher schreiben - der überlebt den Tiefschlaf, der normale RAM nicht
+2. Tiefschlaf, aufwecken mit dem Button (GPIO 0 ist ein RTC-Pin, low = wach)
+3. Beim Aufwachen startet das Board neu. restore() erkennt den Warmstart am
+   Reset-Grund und liefert die Statistik zurück - ohne Dateien zu lesen,
+   auch die Latenz-Korrektur kommt aus dem RTC-Speicher
+
+Gespeichert wird, was step6_complete_game.py sonst beim Neustart verliert:
+Spiele, Bestzeit, Falschstarts, Schleifen-Statistik, größter Buzzer-Versatz,
+die Latenz-Korrektur (latency_cal.py) und das Reaktionszeit-Histogramm
+(histogram.py). Eine Prüfsumme schützt vor
+zufälligem Inhalt (z.B. nach Stromausfall).
+
+Verwendung (siehe step6_complete_game.py):
+    values = sleep_resume.restore()      # None = Kaltstart
+    sleep_resume.save(spiele, bestzeit, ...)
+    sleep_resume.deep_sleep(button_pin)  # kehrt nicht zurück
+"""
+
+import struct
+import machine
+import latency_cal
+import histogram
+
+try:
+    import esp32
+except ImportError:
+    esp32 = None  # Anderes Board: Aufwecken per Pin anders einstellen
+
+MAGIC = b"RS"
+VERSION = 3
+# Magie, Version, Spiele, Bestzeit, Falschstarts, Ticks, max µs, Überläufe,
+# max Buzzer-Versatz, Latenz-Korrektur, Varianz, Messungen;
+# danach histogram.to_bytes()
+FORMAT = "<2sBHHHIIIHIIH"
+NO_BEST = 0xFFFF   # Noch keine Bestzeit
+
+
+def _fit(value, limit):
+    return min(max(value, 0), limit)
+
+
+def _checksum(data):
+    return sum(data) & 0xFFFF
+
+
+def pack(games_played, best_time, false_starts, loop_ticks, loop_max_us, loop_overruns,
+         max_buzzer_skew_us):
+    """Statistik, Latenz-Korrektur und Histogramm in Bytes packen (mit Prüfsumme)"""
+    data = struct.pack(
+        FORMAT, MAGIC, VERSION,
+        _fit(games_played, 0xFFFF),
+        NO_BEST if best_time is None else _fit(best_time, NO_BEST - 1),
+        _fit(false_starts, 0xFFFF),
+        _fit(loop_ticks, 0xFFFFFFFF), _fit(loop_max_us, 0xFFFFFFFF), _fit(loop_overruns, 0xFFFFFFFF),
+        _fit(max_buzzer_skew_us, 0xFFFF),
+        _fit(latency_cal.correction_us, 0xFFFFFFFF), _fit(latency_cal.variance_us2, 0xFFFFFFFF),
+        _fit(latency_cal.samples, 0xFFFF)) + histogram.to_bytes()
+    return data + struct.pack("<H", _checksum(data))
+
+
+def unpack(data):
+    """Bytes aus pack() zurückverwandeln; None bei falscher Länge, Version oder Prüfsumme
+
+    Liefert die Werte wie pack() ohne die Magie und Version, danach die
+    Zähler des Histogramms (array).
+    """
+    size = struct.calcsize(FORMAT)
+    end = len(data) - 2
+    if end < size or struct.unpack("<H", data[end:])[0] != _checksum(data[:end]):
+        return None
+    values = struct.unpack(FORMAT, data[:size])
+    if values[0] != MAGIC or values[1] != VERSION:
+        return None
+    counts = histogram.from_bytes(data[size:end])
+    if counts is None:
+        return None
+    best_time = None if values[3] == NO_BEST else values[3]
+    return (values[2], best_time) + values[4:] + (counts,)
+
+
+def save(*stats):
+    """Statistik in den RTC-Speicher schreiben (Argumente wie pack())"""
+    machine.RTC().memory(pack(*stats))
+
+
+def restore():
+    """Nach dem Tiefschlaf: die 7 Statistik-Werte aus save(), sonst None
+
+    Setzt auch Latenz-Korrektur und Histogramm, die Dateien müssen dann
+    nicht gelesen werden.
+    """
+    if machine.reset_cause() != machine.DEEPSLEEP_RESET:
+        return None
+    values = unpack(machine.RTC().memory())
+    if values is None:
+        return None
+    latency_cal.correction_us, latency_cal.variance_us2, latency_cal.samples = values[7:10]
+    histogram.restore(values[10])
+    return values[:7]
+
+
+def deep_sleep(button_pin):
+    """Tiefschlaf, bis der Button gedrückt wird (low) - kehrt nicht zurück"""
+    if esp32 is not None:
+        esp32.wake_on_ext0(pin=button_pin, level=esp32.WAKEUP_ALL_LOW)
+    machine.deepsleep()
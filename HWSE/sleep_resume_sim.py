@@ -0,0 +1,188 @@
+"""
+Tiefschlaf und Warmstart prüfen (Host-Werkzeug)
+===============================================
+
+Prüft sleep_resume.py mit step6_complete_game.py (und der Kontext-Variante)
+im Simulator:
+
+1. Kaltstart: Latenz-Kalibrierung über die Drahtschleife, ein paar Spiele
+   gegen den Testspieler aus reaction_accuracy.py, dann keine Eingabe mehr.
+   Nach SLEEP_AFTER_MS muss die Firmware schlafen: Aufwecken per Button
+   (GPIO 0, low), LED- und Buzzer-PWM aus, Statistik im RTC-Speicher.
+2. Aufwachen: board.wake() liefert ein neues Board mit demselben
+   RTC-Speicher. Die Firmware startet neu und muss dieselbe Statistik,
+   Latenz-Korrektur und dasselbe Histogramm (histogram.py) haben - ohne eine Datei zu öffnen und mit weniger
+   Ausgaben als beim Kaltstart.
+3. Zufälliger RTC-Inhalt (Prüfsumme falsch) oder ein normaler Einschalt-
+   Reset dürfen nichts wiederherstellen.
+
+Aufruf:
+    python sleep_resume_sim.py
+    python sleep_resume_sim.py step6_complete_game --spiele 5 --pause 2
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from reaction_accuracy import TestPlayer
+from sim_hardware import Board, StopSimulation, DEEPSLEEP_RESET, run_main
+
+LED_PIN = 2
+BUTTON_PIN = 0
+STEPS = ("step6_complete_game", "step6_context_game")
+STATS = ("games_played", "best_time", "false_starts", "loop_ticks", "loop_max_us",
+         "loop_overruns", "max_buzzer_skew_us")
+CAL = ("correction_us", "variance_us2", "samples")
+
+
+def load(board, step, pause_ms, files=False):
+    """Firmware laden, Aufnahme aus, Pause bis zum Tiefschlaf setzen; liefert (Modul, Zustand, Sekunden)
+
+    Mit files lädt die Firmware beim Start ihre Dateien (in der Firmware
+    aus), damit der Vergleich kalt/warm geöffnete Dateien zeigt. Nur für
+    Läufe ohne Spiele, sonst würden sie geschrieben.
+    """
+    start = time.perf_counter()
+    game = board.load(step)
+    seconds = time.perf_counter() - start
+    game.recorder.capture_path = None
+    game.histogram.hist_path = None
+    game.SLEEP_AFTER_MS = pause_ms
+    if files:
+        game.CAL_PATH = "latency.cal"
+        game.HIST_PATH = "reaction.hist"
+    return game, getattr(game, "game", game), seconds
+
+
+def play_until_sleep(step, games, pause_ms, seed):
+    """Kaltstart, kalibrieren, spielen, warten bis zum Tiefschlaf; liefert (Board, Modul, Zustand)"""
+    board = Board(seed=seed)
+    player = None
+    board_log_write = board.log_write
+
+    def log_write(pin_id, kind, value):
+        board_log_write(pin_id, kind, value)
+        if pin_id == LED_PIN and player is not None:
+            if (kind == "value" and value) or (kind == "duty" and value >= 1023):
+                player.stimulus()
+
+    board.log_write = log_write
+    game, state, _ = load(board, step, pause_ms)
+
+    game.latency_cal.cal_path = None     # Messung nicht in die Datei schreiben
+    board.set_button_source(
+        lambda now: board.pins[game.CAL_OUTPUT_PIN].level if game.CAL_OUTPUT_PIN in board.pins else 1)
+    state.calibrate()
+
+    player = TestPlayer(board, state, random.Random(seed), games)
+
+    def idle_after_games(now_ms):
+        try:
+            return player(now_ms)
+        except StopSimulation:
+            return 1        # Alle Spiele gespielt: niemand drückt mehr
+
+    board.set_button_source(idle_after_games)
+    board.clock.stop_at_ms = board.clock.now_ms() + games * 20000 + pause_ms + 5000
+    run_main(game)
+    return board, game, state
+
+
+def first_waiting_tick(board, game, state):
+    """main() bis zum ersten Tick in WAITING laufen lassen; liefert (Sekunden, Ausgaben)
+
+    Gezählt werden die Ausgaben bis dahin, ohne die Schluss-Statistik beim Beenden.
+    """
+    console_before = len(board.console)
+
+    def source(now_ms):
+        if state.current_state == state.STATE_WAITING:
+            raise StopSimulation()
+        return 1
+
+    board.set_button_source(source)
+    start = time.perf_counter()
+    run_main(game)
+    seconds = time.perf_counter() - start
+    lines = board.console[console_before:]
+    if "\n\nSpiel beendet!" in lines:
+        lines = lines[:lines.index("\n\nSpiel beendet!")]
+    return seconds, len(lines)
+
+
+def check_step(step, args):
+    print(f"▶ {step}")
+    pause_ms = int(args.pause * 60000)
+    board, game, state = play_until_sleep(step, args.spiele, pause_ms, args.seed)
+    stats = tuple(getattr(state, name) for name in STATS)
+    cal = tuple(getattr(game.latency_cal, name) for name in CAL)
+    hist = bytes(game.histogram.counts)
+    asleep = board.sleep_ms is not None
+    pwm_off = all(pwm._duty == 0 for pwm in board.pwms) and board.pins[LED_PIN].level == 0
+    wake_ok = board.wake_pin == (BUTTON_PIN, False)
+    print(f"   Kaltstart: {stats[0]} Spiele, Bestzeit {stats[1]}ms, Korrektur {cal[0]}µs, "
+          f"Histogramm {game.histogram.total()} Werte")
+    print(f"   Tiefschlaf: {'ja' if asleep else 'nein'}, Button weckt: {'ja' if wake_ok else 'nein'}, "
+          f"PWM aus: {'ja' if pwm_off else 'nein'}, RTC-Speicher {len(board.rtc_memory)} Bytes")
+    ok = asleep and pwm_off and wake_ok
+
+    # Kaltstart zum Vergleich (gleiche Firmware, ohne Spiele)
+    cold = Board(seed=args.seed)
+    cold_game, cold_state, cold_load = load(cold, step, pause_ms, files=True)
+    cold_run, cold_lines = first_waiting_tick(cold, cold_game, cold_state)
+
+    woken = board.wake(after_ms=int(args.schlaf * 60000))
+    warm_game, warm_state, warm_load = load(woken, step, pause_ms, files=True)
+    warm_run, warm_lines = first_waiting_tick(woken, warm_game, warm_state)
+    warm_stats = tuple(getattr(warm_state, name) for name in STATS)
+    warm_cal = tuple(getattr(warm_game.latency_cal, name) for name in CAL)
+    warm_hist = bytes(warm_game.histogram.counts)
+
+    same = warm_stats == stats and warm_cal == cal and warm_hist == hist
+    ok = ok and same and not woken.files_opened and warm_lines < cold_lines
+    print(f"   Warmstart: Statistik {'gleich ✅' if warm_stats == stats else '❌ ' + str(warm_stats)}, "
+          f"Korrektur {'gleich ✅' if warm_cal == cal else '❌ ' + str(warm_cal)}, "
+          f"Histogramm {'gleich ✅' if warm_hist == hist else '❌'}")
+    print(f"   Dateien geöffnet: kalt {len(cold.files_opened)} {[p for p, _ in cold.files_opened]}, "
+          f"warm {len(woken.files_opened)}")
+    print(f"   Bis WAITING: kalt {(cold_load + cold_run) * 1000:.1f}ms / {cold_lines} Ausgaben, "
+          f"warm {(warm_load + warm_run) * 1000:.1f}ms / {warm_lines} Ausgaben (Host-Zeit)")
+
+    # Falscher Inhalt oder kein Tiefschlaf: nichts wiederherstellen
+    garbage = bytearray(board.rtc_memory)
+    garbage[5] ^= 0xFF
+    rejected = 0
+    for memory, cause in ((bytes(garbage), DEEPSLEEP_RESET), (board.rtc_memory, None),
+                          (bytes(random.Random(args.seed).getrandbits(8) for _ in range(len(garbage))),
+                           DEEPSLEEP_RESET)):
+        test = Board()
+        test.rtc_memory = memory
+        if cause is not None:
+            test.reset_cause = cause
+        if test.load("sleep_resume").restore() is None:
+            rejected += 1
+    ok = ok and rejected == 3
+    print(f"   Kaputter RTC-Speicher / Einschalt-Reset: {rejected}/3 abgelehnt")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiefschlaf und Warmstart im Simulator prüfen")
+    parser.add_argument("schritte", nargs="*", default=list(STEPS), help="Firmware (Standard: beide Varianten)")
+    parser.add_argument("--spiele", type=int, default=3, help="Spiele vor der Pause")
+    parser.add_argument("--pause", type=float, default=15.0, help="Minuten ohne Spiel bis zum Tiefschlaf")
+    parser.add_argument("--schlaf", type=float, default=60.0, help="Minuten im Tiefschlaf")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    ok = True
+    for step in args.schritte:
+        ok = check_step(step, args) and ok
+    print("✅ Tiefschlaf und Warmstart in Ordnung" if ok else "❌ Fehler gefunden")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+HTTP/JSON-Statistik auf dem Board
+=================================
+
+Statt per USB-Kabel print_statistics() zu lesen, liefert die Station ihre
+Zahlen über WLAN: GET /stats -> JSON mit games_played, best_time,
+false_starts und Schleifen-Gesundheit.
+
+Damit die Reaktionsmessung nicht gestört wird:
+- Nur nicht-blockierende Sockets, nie ein Warten auf den Client
+- poll()/respond() ruft die Firmware nur in WAITING/RESULT auf, nie in READY/GO
+- Pro Aufruf höchstens ein kleiner Arbeitsschritt
+- Die Antwort steht fertig in einem wiederverwendeten Puffer; update()
+  schreibt nur die Ziffern hinein (Felder mit fester Breite), es entstehen
+  keine neuen Strings
+- Lesen und Senden arbeiten mit festen Puffern und Offsets (readinto mit
+  Länge, write(buf, off, sz)), ohne Ausschnitte (memoryview/bytes) pro
+  Aufruf. Neu angelegt wird nur beim accept() das Socket-Objekt des Clients
+
+Verwendung (siehe step6_complete_game.py):
+    stats_http.start(8080)
+    ...
+    if stats_http.poll():
+        stats_http.update(games_played, best_ms, false_starts, ticks, max_us, overruns)
+        stats_http.respond()
+"""
+
+import socket
+import utime
+
+FIELD_WIDTH = 10
+CLIENT_TIMEOUT_MS = 1000
+# Wartende Verbindungen: bedient wird immer nur eine, und in READY/GO gar
+# keine. Passt ein Client nicht mehr in die Warteschlange, verwirft der
+# Stack sein SYN, und er kann bei Dauerlast beliebig lange verhungern.
+BACKLOG = 4
+
+_FIELDS = ("games_played", "best_time", "false_starts",
+           "loop_ticks", "loop_max_us", "loop_overruns", "requests")
+
+
+def _build():
+    """Antwort-Vorlage und Feld-Positionen einmalig beim Import erzeugen"""
+    body = b"{"
+    offsets = []
+    for i, name in enumerate(_FIELDS):
+        if i:
+            body += b","
+        body += b'"' + name.encode() + b'":'
+        offsets.append(len(body))
+        body += b" " * (FIELD_WIDTH - 1) + b"0"
+    body += b"}\n"
+    header = (b"HTTP/1.0 200 OK\r\nContent-Type: application/json\r\n"
+              b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+              b"Connection: close\r\n\r\n")
+    return bytearray(header + body), [len(header) + o for o in offsets]
+
+
+_response, _offsets = _build()
+_NOT_FOUND = b"HTTP/1.0 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+_request = bytearray(256)
+_request_len = 0
+_chunk = bytearray(64)   # Empfangspuffer, wird nach _request kopiert
+
+_server = None
+_client = None
+_client_since = 0
+_sent = 0
+requests = 0
+
+
+def start(port=8080):
+    """Nicht-blockierenden Server-Socket öffnen (ohne Netzwerk: abgeschaltet)"""
+    global _server
+    try:
+        _server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        _server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        _server.bind(("0.0.0.0", port))
+        _server.listen(BACKLOG)
+        _server.setblocking(False)
+        print(f"📡 Statistik unter http://<board-ip>:{port}/stats")
+    except OSError as e:
+        print(f"📡 Keine HTTP-Statistik ({e})")
+        _server = None
+
+
+def stop():
+    """Server und offene Verbindung schließen"""
+    global _server
+    if _client is not None:
+        _close_client()
+    if _server is not None:
+        _server.close()
+        _server = None
+
+
+def _put_int(offset, value):
+    """Zahl rechtsbündig in ein Feld fester Breite schreiben (ohne Allokation)"""
+    negative = value < 0
+    if negative:
+        value = -value
+    pos = offset + FIELD_WIDTH - 1
+    while pos >= offset:
+        _response[pos] = 48 + value % 10  # ASCII '0'
+        value //= 10
+        pos -= 1
+        if value == 0:
+            break
+    if negative and pos >= offset:
+        _response[pos] = 45  # '-'
+        pos -= 1
+    while pos >= offset:
+        _response[pos] = 32  # ' '
+        pos -= 1
+
+
+def update(games_played, best_time, false_starts, loop_ticks, loop_max_us, loop_overruns):
+    """Zahlen in die vorbereitete Antwort schreiben (best_time -1 = noch keine)"""
+    _put_int(_offsets[0], games_played)
+    _put_int(_offsets[1], best_time)
+    _put_int(_offsets[2], false_starts)
+    _put_int(_offsets[3], loop_ticks)
+    _put_int(_offsets[4], loop_max_us)
+    _put_int(_offsets[5], loop_overruns)
+    _put_int(_offsets[6], requests)
+
+
+def _close_client():
+    global _client, _request_len, _sent
+    try:
+        _client.close()
+    except OSError:
+        pass
+    _client = None
+    _request_len = 0
+    _sent = 0
+
+
+def _read_into(buf, nbytes):
+    # MicroPython: readinto(), CPython: recv_into()
+    if hasattr(_client, "readinto"):
+        return _client.readinto(buf, nbytes)
+    return _client.recv_into(buf, nbytes)
+
+
+def _write(data, offset, size):
+    # MicroPython: write(buf, off, sz) sendet ab offset ohne Kopie (None =
+    # Sendepuffer voll), CPython: send() mit Ausschnitt (nur im Simulator)
+    if hasattr(_client, "write"):
+        return _client.write(data, offset, size)
+    return _client.send(memoryview(data)[offset:offset + size])
+
+
+def _request_starts_with(prefix):
+    if _request_len < len(prefix):
+        return False
+    for i in range(len(prefix)):
+        if _request[i] != prefix[i]:
+            return False
+    return True
+
+
+def _request_line_complete():
+    for i in range(1, _request_len):
+        if _request[i - 1] == 13 and _request[i] == 10:  # "\r\n"
+            return True
+    return False
+
+
+def poll():
+    """Einen Schritt arbeiten; True wenn eine vollständige Anfrage wartet"""
+    global _client, _client_since, _request_len
+
+    if _server is None:
+        return False
+
+    if _client is None:
+        try:
+            _client, _ = _server.accept()
+        except OSError:
+            return False  # Niemand da
+        _client.setblocking(False)
+        _client_since = utime.ticks_ms()
+        _request_len = 0
+
+    if _request_len < len(_request):
+        try:
+            n = _read_into(_chunk, min(len(_chunk), len(_request) - _request_len))
+        except OSError:
+            n = None  # Noch keine Daten
+        if n == 0:
+            _close_client()
+            return False
+        if n:
+            for i in range(n):
+                _request[_request_len + i] = _chunk[i]
+            _request_len += n
+
+    # Nur die erste Zeile wird gebraucht
+    if _request_line_complete():
+        return True
+    if utime.ticks_diff(utime.ticks_ms(), _client_since) > CLIENT_TIMEOUT_MS:
+        _close_client()  # Client sendet nichts -> nicht ewig festhalten
+    return False
+
+
+def respond():
+    """Antwort aus dem vorbereiteten Puffer senden (ggf. in mehreren Schritten)"""
+    global requests, _sent
+
+    if _client is None:
+        return
+    if _request_starts_with(b"GET /stats") or _request_starts_with(b"GET / "):
+        data = _response
+        if _sent == 0:
+            requests += 1
+    else:
+        data = _NOT_FOUND
+
+    try:
+        n = _write(data, _sent, len(data) - _sent)
+    except OSError:
+        n = None
+    if n is None:
+        return  # Sendepuffer voll -> beim nächsten Aufruf weiter
+    _sent += n
+    if _sent >= len(data):
+        _close_client()
@@ -0,0 +1,226 @@
+"""
+Lasttest für die HTTP-Statistik (Host-Werkzeug)
+===============================================
+
+Prüft, dass GET /stats die Reaktionsmessung nicht stört:
+- step6_complete_game läuft auf einem simulierten Board in Echtzeit
+  (Board(realtime=True, network=True)) mit dem virtuellen Spieler aus replay.py
+- Mehrere Client-Prozesse fragen http://127.0.0.1:<port>/stats ab, bis die
+  Firmware genug Spiele gemessen hat
+- Verglichen wird der Messfehler der Reaktionszeit (gemessen - tatsächlich)
+  einmal ohne und einmal mit Abfragen, jeweils über --spiele Spiele
+
+Ausgabe: Anfragen/s, Antwortzeiten, Schleifen-Gesundheit der Firmware und
+Messfehler ohne/mit Last. Rückgabe 1, wenn eine Anfrage fehlschlägt, ein
+Tick das Budget von 10ms überschreitet oder ein Spiel unter Last um mehr
+als LOAD_TOLERANCE_MS über dem größten Messfehler ohne Last liegt.
+
+Aufruf:
+    python stats_http_sim.py
+    python stats_http_sim.py --spiele 40 --clients 8 --port 8081
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import threading
+import time
+import urllib.request
+
+from replay import VirtualPlayer
+from sim_hardware import Board, StopSimulation, run_main
+
+STEP = "step6_complete_game"
+
+# Erlaubter Zuwachs des größten Messfehlers unter Last (ms). Der Mittelwert
+# schwankt schon durch die Abtastung im 10ms-Takt; ein Tick Verzögerung durch
+# den Server zeigt sich dagegen sicher im Maximum.
+LOAD_TOLERANCE_MS = 2
+
+# Obergrenze pro Spiel in Echtzeit, falls die Firmware hängen bleibt
+GAME_LIMIT_MS = 20000
+
+# Geduld eines Clients: in READY und GO bedient die Firmware nicht (bis 8s)
+CLIENT_TIMEOUT_S = 15
+
+
+class MeasuringPlayer(VirtualPlayer):
+    """Virtueller Spieler, der sich die tatsächliche Reaktionszeit merkt"""
+
+    def __init__(self, game, rng):
+        VirtualPlayer.__init__(self, game, rng)
+        self.planned = []   # (tatsächliche Reaktionszeit, Spiel-Nummer)
+
+    def plan(self, state, now):
+        VirtualPlayer.plan(self, state, now)
+        if state == self.game.STATE_GO and self.press_at is not None:
+            self.planned.append((self.press_at - now, self.game.games_played + 1))
+
+
+def run_game(port, games, seed, enough=None, shared=None):
+    """Firmware in Echtzeit laufen lassen, Messfehler pro Spiel liefern
+
+    Nach games gemessenen Spielen endet die Simulation. Mit enough läuft
+    sie stattdessen weiter, bis der Aufrufer board.clock.stop_at_ms setzt
+    (das Board steht in shared["board"]), damit keine Anfrage ins Leere geht.
+    """
+    board = Board(seed=seed, realtime=True, network=True)
+    game = board.load(STEP)
+    game.recorder.capture_path = None
+    game.histogram.hist_path = None
+    game.latency_cal.cal_path = None
+    player = MeasuringPlayer(game, random.Random(seed))
+    board.set_button_source(player)
+    if shared is not None:
+        shared["board"] = board
+
+    measured = {}
+    original_log_reaction = game.recorder.log_reaction
+
+    def log_reaction(ms):
+        original_log_reaction(ms)
+        measured[game.games_played] = ms
+        if len(measured) == games:
+            if enough is None:
+                raise StopSimulation()
+            enough.set()
+
+    game.recorder.log_reaction = log_reaction
+
+    game.STATS_HTTP_PORT = port   # In der Firmware aus (None)
+
+    board.clock.stop_at_ms = board.clock.now_ms() + games * GAME_LIMIT_MS
+    run_main(game)
+
+    errors = [measured[n] - planned for planned, n in player.planned if n in measured]
+    return game, errors
+
+
+def client(args):
+    """Ein Client-Prozess: /stats so oft wie möglich abfragen, bis stop gesetzt ist"""
+    port, stop = args
+    url = f"http://127.0.0.1:{port}/stats"
+    latencies = []
+    failures = 0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=CLIENT_TIMEOUT_S) as response:
+                response.read()
+            latencies.append(time.perf_counter() - t0)
+        except OSError:
+            failures += 1
+            time.sleep(0.01)
+    return latencies, failures
+
+
+def wait_for_server(port, seconds=10.0):
+    """Warten, bis der Server antwortet (Laden und Start zählen nicht als Fehler)"""
+    url = f"http://127.0.0.1:{port}/stats"
+    until = time.time() + seconds
+    while time.time() < until:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                response.read()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100.0 * len(sorted_values)))]
+
+
+def report_errors(title, errors):
+    """Messfehler ausgeben; liefert den größten (None ohne Spiele)"""
+    errors = sorted(errors)
+    if not errors:
+        print(f"{title}: keine Spiele")
+        return None
+    mean = sum(errors) / len(errors)
+    print(f"{title}: {len(errors)} Spiele, Messfehler Ø {mean:+.1f}ms, "
+          f"P99 {percentile(errors, 99):+d}ms, max {errors[-1]:+d}ms")
+    return errors[-1]
+
+
+def report_loop(title, game):
+    """Schleifen-Gesundheit ausgeben; liefert False bei Überschreitungen"""
+    print(f"{title}: Schleife {game.loop_ticks} Ticks, max {game.loop_max_us}µs, "
+          f"{game.loop_overruns} über {game.LOOP_BUDGET_US}µs")
+    return game.loop_overruns == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lasttest für die HTTP-Statistik")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--spiele", type=int, default=20, help="Spiele pro Durchlauf (Echtzeit!)")
+    parser.add_argument("--clients", type=int, default=4,
+                        help="Client-Prozesse (mehr als stats_http.BACKLOG können verhungern)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    ok = True
+
+    print(f"Ohne Abfragen ({args.spiele} Spiele)...")
+    game, errors = run_game(args.port, args.spiele, args.seed)
+    idle_max = report_errors("Ohne Last", errors)
+    ok = report_loop("Ohne Last", game) and ok
+
+    print(f"\nMit {args.clients} Clients ({args.spiele} Spiele)...")
+    result = {}
+    enough = threading.Event()
+
+    def target():
+        result["game"], result["errors"] = run_game(args.port, args.spiele, args.seed,
+                                                    enough, result)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    if not wait_for_server(args.port):
+        print("❌ Server antwortet nicht")
+        result["board"].clock.stop_at_ms = 0
+        thread.join()
+        return 1
+
+    with multiprocessing.Manager() as manager:
+        stop = manager.Event()
+        with multiprocessing.Pool(args.clients) as pool:
+            start = time.perf_counter()
+            pending = pool.map_async(client, [(args.port, stop)] * args.clients)
+            # Bis die Spiele gemessen sind (oder die Firmware vorher endet)
+            while not enough.wait(0.5) and thread.is_alive():
+                pass
+            stop.set()
+            answers = pending.get()
+            seconds = time.perf_counter() - start
+    # Erst nach der letzten Anfrage beenden
+    result["board"].clock.stop_at_ms = 0
+    thread.join()
+
+    latencies = sorted(lat for lats, _ in answers for lat in lats)
+    failures = sum(f for _, f in answers)
+    ok = ok and failures == 0 and bool(latencies)
+    print(f"Anfragen: {len(latencies)} beantwortet ({len(latencies) / seconds:.0f}/s), "
+          f"{failures} fehlgeschlagen, von der Firmware gezählt: {result['game'].stats_http.requests}")
+    if latencies:
+        parts = [f"P{q}: {1000 * percentile(latencies, q):.1f}ms" for q in (50, 90, 99)]
+        print("Antwortzeit: " + "  ".join(parts))
+    load_max = report_errors("Mit Last", result["errors"])
+    ok = report_loop("Mit Last", result["game"]) and ok
+
+    if idle_max is None or load_max is None or len(result["errors"]) < args.spiele:
+        ok = False
+    else:
+        print(f"Größter Messfehler unter Last: {load_max - idle_max:+d}ms "
+              f"(erlaubt +{LOAD_TOLERANCE_MS}ms)")
+        ok = ok and load_max - idle_max <= LOAD_TOLERANCE_MS
+
+    print("✅ Alles in Ordnung" if ok else "❌ Fehler gefunden")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,7 @@ Hardware:
 import utime
 import math
 from machine import Pin, PWM
+from micropython import const
 
 # Zustände
 STATE_WAITING = 0
@@ -23,6 +24,11 @@ STATE_READY = 1
 STATE_GO = 2
 STATE_RESULT = 3
 
+# Build-Profile (build_profiles.py): const-Schalter, der Compiler entfernt
+# abgeschaltete Zweige samt ihren Strings. Im Quelltext gilt "debug".
+_DEBUG = const(1)       # Debug-Ausgaben pro Tick (Button, LED-Modus)
+_BENCHMARK = const(0)   # Rechenzeit pro Tick messen und ausgeben
+
 # Globale Zustandsvariablen
 current_state = STATE_WAITING
 state_start_time = 0
@@ -36,19 +42,25 @@ button = Pin(0, Pin.IN, Pin.PULL_UP)
 
 # Button-Entprellung
 last_button_time = 0
-debounce_ms = 50
+_DEBOUNCE_MS = const(50)
 
 # LED-Steuerung Variablen
 led_phase = 0  # Für Sinuswellen-Pulsieren
 led_mode = "off"  # "off", "pulse", "on", "blink"
 led_blink_timer = 0
 
+# Tick-Statistik (nur Profil benchmark)
+bench_ticks = 0
+bench_total_us = 0
+bench_max_us = 0
+
 def set_led_mode(mode):
     """LED-Modus setzen"""
     global led_mode, led_phase, led_blink_timer
     
     led_mode = mode
-    print(f"LED-Modus: {mode}")
+    if _DEBUG:
+        print(f"LED-Modus: {mode}")
     
     if mode == "off":
         led_pwm.duty(0)  # Komplett aus
@@ -110,7 +122,7 @@ def button_pressed():
     global last_button_time
     
     current_time = utime.ticks_ms()
-    if not button.value() and utime.ticks_diff(current_time, last_button_time) > debounce_ms:
+    if not button.value() and utime.ticks_diff(current_time, last_button_time) > _DEBOUNCE_MS:
         last_button_time = current_time
         return True
     return False
@@ -161,9 +173,27 @@ def update_result():
         print("Drücke den Button zum Starten!")
         change_state(STATE_WAITING)
 
+def record_tick(start_us):
+    """Nur im Profil benchmark: Dauer eines Ticks messen, alle 500 Ticks ausgeben"""
+    global bench_ticks, bench_total_us, bench_max_us
+    
+    duration_us = utime.ticks_diff(utime.ticks_us(), start_us)
+    bench_ticks += 1
+    bench_total_us += duration_us
+    if duration_us > bench_max_us:
+        bench_max_us = duration_us
+    if bench_ticks == 500:
+        print(f"Tick: Ø {bench_total_us // bench_ticks}µs, max {bench_max_us}µs")
+        bench_ticks = 0
+        bench_total_us = 0
+        bench_max_us = 0
+
 def main_loop():
     """Hauptschleife"""
     while True:
+        if _BENCHMARK:
+            tick_start_us = utime.ticks_us()
+        
         # LED immer updaten für Animationen
         update_led()
         
@@ -177,20 +207,26 @@ def main_loop():
         elif current_state == STATE_RESULT:
             update_result()
         
+        if _BENCHMARK:
+            record_tick(tick_start_us)
         utime.sleep_ms(20)  # Etwas mehr Zeit für PWM-Updates
 
-# Hauptprogramm
-print("=== Reaktionsspiel Schritt 2: LED-Steuerung ===")
-print("Hardware initialisiert")
-print("Drücke den Button zum Starten!")
-print("Beobachte die verschiedenen LED-Modi!")
-print("\nSpiel läuft... (Strg+C zum Beenden)")
-
-# Startzustand setzen
-change_state(STATE_WAITING)
-
-try:
-    main_loop()
-except KeyboardInterrupt:
-    print("\nSpiel beendet.")
-    led_pwm.deinit()
+def main():
+    """Hauptprogramm"""
+    print("=== Reaktionsspiel Schritt 2: LED-Steuerung ===")
+    print("Hardware initialisiert")
+    print("Drücke den Button zum Starten!")
+    print("Beobachte die verschiedenen LED-Modi!")
+    print("\nSpiel läuft... (Strg+C zum Beenden)")
+    
+    # Startzustand setzen
+    change_state(STATE_WAITING)
+    
+    try:
+        main_loop()
+    except KeyboardInterrupt:
+        print("\nSpiel beendet.")
+        led_pwm.deinit()
+
+if __name__ == "__main__":
+    main()
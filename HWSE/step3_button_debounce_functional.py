@@ -17,6 +17,7 @@ import utime
 import urandom
 import math
 from machine import Pin, PWM
+from micropython import const
 
 # Zustände
 STATE_WAITING = 0
@@ -24,6 +25,11 @@ STATE_READY = 1
 STATE_GO = 2
 STATE_RESULT = 3
 
+# Build-Profile (build_profiles.py): const-Schalter, der Compiler entfernt
+# abgeschaltete Zweige samt ihren Strings. Im Quelltext gilt "debug".
+_DEBUG = const(1)       # Debug-Ausgaben pro Tick (Button, LED-Modus)
+_BENCHMARK = const(0)   # Rechenzeit pro Tick messen und ausgeben
+
 # Globale Zustandsvariablen
 current_state = STATE_WAITING
 state_start_time = 0
@@ -38,7 +44,7 @@ button = Pin(0, Pin.IN, Pin.PULL_UP)
 # Button-Entprellung (verbesserte Version)
 last_button_state = 1  # Pull-up: 1 = nicht gedrückt
 last_button_change_time = 0
-debounce_ms = 50
+_DEBOUNCE_MS = const(50)
 button_pressed_event = False
 
 # LED-Steuerung
@@ -46,6 +52,11 @@ led_phase = 0
 led_mode = "off"
 led_blink_timer = 0
 
+# Tick-Statistik (nur Profil benchmark)
+bench_ticks = 0
+bench_total_us = 0
+bench_max_us = 0
+
 def update_button_debounced():
     """Button-Zustand prüfen und entprellen - in Hauptschleife aufrufen"""
     global last_button_state, last_button_change_time, button_pressed_event
@@ -59,14 +70,15 @@ def update_button_debounced():
     # Hat sich der Zustand geändert?
     if current_button_state != last_button_state:
         # Ist genug Zeit seit der letzten Änderung vergangen?
-        if utime.ticks_diff(current_time, last_button_change_time) > debounce_ms:
+        if utime.ticks_diff(current_time, last_button_change_time) > _DEBOUNCE_MS:
             last_button_change_time = current_time
             last_button_state = current_button_state
             
             # Button wurde gedrückt (von 1 auf 0 wegen Pull-up)
             if current_button_state == 0:
                 button_pressed_event = True
-                print("Button gedrückt (entprellt)")
+                if _DEBUG:
+                    print("Button gedrückt (entprellt)")
 
 def was_button_pressed():
     """Gibt True zurück wenn Button seit letztem update_button_debounced() gedrückt wurde"""
@@ -81,7 +93,8 @@ def set_led_mode(mode):
     global led_mode, led_phase, led_blink_timer
     
     led_mode = mode
-    print(f"LED-Modus: {mode}")
+    if _DEBUG:
+        print(f"LED-Modus: {mode}")
     
     if mode == "off":
         led_pwm.duty(0)
@@ -191,9 +204,27 @@ def update_result():
         print("Drücke den Button zum Starten!")
         change_state(STATE_WAITING)
 
+def record_tick(start_us):
+    """Nur im Profil benchmark: Dauer eines Ticks messen, alle 500 Ticks ausgeben"""
+    global bench_ticks, bench_total_us, bench_max_us
+    
+    duration_us = utime.ticks_diff(utime.ticks_us(), start_us)
+    bench_ticks += 1
+    bench_total_us += duration_us
+    if duration_us > bench_max_us:
+        bench_max_us = duration_us
+    if bench_ticks == 500:
+        print(f"Tick: Ø {bench_total_us // bench_ticks}µs, max {bench_max_us}µs")
+        bench_ticks = 0
+        bench_total_us = 0
+        bench_max_us = 0
+
 def main_loop():
     """Hauptschleife"""
     while True:
+        if _BENCHMARK:
+            tick_start_us = utime.ticks_us()
+        
         # Button immer entprellen
         update_button_debounced()
         
@@ -210,22 +241,28 @@ def main_loop():
         elif current_state == STATE_RESULT:
             update_result()
         
+        if _BENCHMARK:
+            record_tick(tick_start_us)
         utime.sleep_ms(20)
 
-# Hauptprogramm
-print("=== Reaktionsspiel Schritt 3: Button-Entprellung ===")
-print("Verbesserungen:")
-print("- Ordentliche Button-Entprellung")
-print("- Zufällige Wartezeiten (2-5 Sekunden)")
-print("- 'Zu früh gedrückt' Erkennung")
-print("\nDrücke den Button zum Starten!")
-print("Spiel läuft... (Strg+C zum Beenden)")
-
-# Startzustand setzen
-change_state(STATE_WAITING)
-
-try:
-    main_loop()
-except KeyboardInterrupt:
-    print("\nSpiel beendet.")
-    led_pwm.deinit()
+def main():
+    """Hauptprogramm"""
+    print("=== Reaktionsspiel Schritt 3: Button-Entprellung ===")
+    print("Verbesserungen:")
+    print("- Ordentliche Button-Entprellung")
+    print("- Zufällige Wartezeiten (2-5 Sekunden)")
+    print("- 'Zu früh gedrückt' Erkennung")
+    print("\nDrücke den Button zum Starten!")
+    print("Spiel läuft... (Strg+C zum Beenden)")
+    
+    # Startzustand setzen
+    change_state(STATE_WAITING)
+    
+    try:
+        main_loop()
+    except KeyboardInterrupt:
+        print("\nSpiel beendet.")
+        led_pwm.deinit()
+
+if __name__ == "__main__":
+    main()
@@ -244,20 +244,24 @@ def main_loop():
         
         utime.sleep_ms(20)
 
-# Hauptprogramm
-print("=== Reaktionsspiel Schritt 4: Erweiterte Features ===")
-print("Neue Features:")
-print("- Bessere Zufallszeiten mit urandom")
-print("- Statistiken (beste Zeit, Fehlstarts)")
-print("- Detaillierte Bewertungen")
-print("- Erweiterte Benutzerführung")
-print("\nDrücke den Button zum Starten!")
-
-change_state(STATE_WAITING)
+def main():
+    """Hauptprogramm"""
+    print("=== Reaktionsspiel Schritt 4: Erweiterte Features ===")
+    print("Neue Features:")
+    print("- Bessere Zufallszeiten mit urandom")
+    print("- Statistiken (beste Zeit, Fehlstarts)")
+    print("- Detaillierte Bewertungen")
+    print("- Erweiterte Benutzerführung")
+    print("\nDrücke den Button zum Starten!")
+    
+    change_state(STATE_WAITING)
+    
+    try:
+        main_loop()
+    except KeyboardInterrupt:
+        print("\n\n=== Spiel beendet ===")
+        print_statistics()
+        led_pwm.deinit()
 
-try:
-    main_loop()
-except KeyboardInterrupt:
-    print("\n\n=== Spiel beendet ===")
-    print_statistics()
-    led_pwm.deinit()
+if __name__ == "__main__":
+    main()
@@ -288,23 +288,27 @@ def main_loop():
         
         utime.sleep_ms(20)
 
-# Hauptprogramm
-print("=== Reaktionsspiel Schritt 5: Audio-Feedback ===")
-print("Neue Features:")
-print("- Buzzer an GPIO 4")
-print("- Audio-Feedback für alle Ereignisse")
-print("- Start-Ton, Erfolgs-/Fehler-Töne")
-print("- Spezial-Sound für neue Bestzeit")
-print("\nVerbinde einen Buzzer an GPIO 4!")
-print("Drücke den Button zum Starten!")
-
-change_state(STATE_WAITING)
-
-try:
-    main_loop()
-except KeyboardInterrupt:
-    print("\n\n=== Spiel beendet ===")
-    print_statistics()
-    stop_buzzer()
-    led_pwm.deinit()
-    buzzer.deinit()
+def main():
+    """Hauptprogramm"""
+    print("=== Reaktionsspiel Schritt 5: Audio-Feedback ===")
+    print("Neue Features:")
+    print("- Buzzer an GPIO 4")
+    print("- Audio-Feedback für alle Ereignisse")
+    print("- Start-Ton, Erfolgs-/Fehler-Töne")
+    print("- Spezial-Sound für neue Bestzeit")
+    print("\nVerbinde einen Buzzer an GPIO 4!")
+    print("Drücke den Button zum Starten!")
+    
+    change_state(STATE_WAITING)
+    
+    try:
+        main_loop()
+    except KeyboardInterrupt:
+        print("\n\n=== Spiel beendet ===")
+        print_statistics()
+        stop_buzzer()
+        led_pwm.deinit()
+        buzzer.deinit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Schritt 6: Gemeinsame Teile beider Spielvarianten
+=================================================
+
+step6_complete_game.py hält den Spielzustand in Modul-Globals,
+step6_context_game.py in einem GameContext. Alles, was nicht davon abhängt,
+wo der Zustand liegt, steht hier genau einmal: Konstanten, Ablauf beim
+Zustandswechsel, Bewertung, Statistik, Anzeige, Kalibrierung, Start und
+Ende. Zustandswerte kommen als Argumente herein, Ergebnisse als Rückgabe
+(kleine Ganzzahlen, damit im Spielablauf nichts angelegt wird).
+
+Wer das Spiel ändert, ändert es hier; in den Varianten bleibt nur das
+Lesen und Schreiben des Zustands.
+"""
+
+import utime
+import urandom
+import math
+from array import array
+from machine import Pin
+from micropython import const
+import recorder
+import outputs
+import stats_http
+import memprofile
+import latency_cal
+import sleep_resume
+import tracer
+import histogram
+import display
+import debounce
+import governor
+
+# Zustände
+STATE_WAITING = const(0)
+STATE_READY = const(1)
+STATE_GO = const(2)
+STATE_RESULT = const(3)
+STATE_NAMES = ("WAITING", "READY", "GO", "RESULT")
+
+# LED-Modi
+LED_OFF = const(0)
+LED_PULSE = const(1)
+LED_ON = const(2)
+LED_BLINK = const(3)
+
+# LED-Pulsieren: eine Periode der Sinuswelle als Tabelle (einmal beim Start),
+# update_led() rechnet dann nur mit Ganzzahlen
+PULSE_DUTY = array("H")
+_phase = 0.0
+while _phase <= 2 * math.pi:
+    PULSE_DUTY.append(int(300 + 200 * math.sin(_phase)))
+    _phase += 0.15
+del _phase
+
+# GO-Ton: Frequenz und Dauer (die Frequenz bestimmt auch die PWM-Periode,
+# um die der Ton später einsetzen kann)
+GO_BEEP_HZ = 1200
+GO_BEEP_MS = 150
+
+# Reaktionsfenster in GO, gezählt ab dem Zeitstempel des Reizes wie die
+# Reaktionszeit (nicht ab dem Zustandswechsel, der erst nach dem print kommt)
+REACTION_TIMEOUT_US = const(3000000)
+
+# Bewertung: Obergrenze in ms, Text und Ton pro Stufe (die letzte ohne Grenze)
+RATING_LIMITS_MS = (200, 300, 450, 600)
+RATING_TEXTS = ("   Blitzschnell! Übermenschlich!", "   Ausgezeichnet!", "   Sehr gut!",
+                "   Ganz okay...", "   Da ist noch Luft nach oben!")
+RATING_BEEP_HZ = (1500, 1200, 1000, 800, 600)
+RATING_BEEP_MS = (300, 250, 200, 200, 300)
+
+
+def boot(cal_path, hist_path):
+    """Nach dem Tiefschlaf gesicherte Statistik liefern, sonst Dateien laden
+
+    Warmstart: Histogramm und Latenz-Korrektur kommen aus dem RTC-Speicher,
+    die Dateien werden nur für spätere Sicherungen gemerkt. Kaltstart:
+    Latenz-Korrektur und Histogramm aus den Dateien, Rückgabe None.
+    Pfad None: Korrektur bzw. Histogramm nur im RAM, keine Datei.
+    """
+    warm_boot = sleep_resume.restore()
+    if warm_boot is not None:
+        latency_cal.cal_path = cal_path
+        histogram.hist_path = hist_path
+    else:
+        latency_cal.begin(cal_path)
+        histogram.begin(hist_path)
+    return warm_boot
+
+
+def print_welcome(warm_boot, games_played):
+    """Begrüßung; beim Warmstart kurz, damit es schnell zurück in WAITING geht"""
+    if warm_boot is not None:
+        print(f"⏰ Aufgewacht - {games_played} Spiele bisher. Drücke den Button!")
+    else:
+        print("🎮 === Vollständiges Reaktionsspiel === 🎮")
+        print("Features: LED-Effekte, Audio-Feedback, Statistiken")
+        print("Hardware initialisiert")
+        print("Drücke den Button zum Starten!")
+        print("\n🎮 Spiel gestartet! (Strg+C zum Beenden)\n")
+
+
+def enter_state(old_state, new_state):
+    """Gemeinsamer Teil jedes Zustandswechsels; liefert die Startzeit in ms
+
+    Der GO-Reiz muss vorher ausgelöst sein, damit kein print (UART
+    blockiert!) in die Messung fällt.
+    """
+    print("State:", STATE_NAMES[old_state], "→", STATE_NAMES[new_state])
+
+    start_ms = utime.ticks_ms()
+    recorder.log_state(new_state, start_ms)
+    tracer.event(tracer.EV_STATE, new_state)
+    governor.enter(new_state)  # Nach dem Reiz: ein Taktwechsel verzögert ihn nie
+    # In GO kein gc.collect(): würde die Erkennung des Drückens verzögern
+    memprofile.sample(STATE_NAMES[new_state], collect=new_state != STATE_GO)
+    return start_ms
+
+
+def enter_waiting(debouncer):
+    """Runde abschließen: Sitzung speichern, Entprellung nachführen, aufräumen"""
+    display.line(0, "Button = Start")
+    recorder.end_session()  # Sitzung abgeschlossen -> speichern
+    debouncer.settle()  # Neues Sperrfenster nur zwischen zwei Spielen
+    # Jetzt aufräumen, damit der automatische GC nicht in READY/GO fällt
+    tracer.collect()
+
+
+def enter_ready(debouncer):
+    """Zufällige Wartezeit 2-5 Sekunden ziehen und ansagen; liefert sie in ms"""
+    ready_duration = 2000 + recorder.random_bits(12) % 3001
+    if latency_cal.correction_us:
+        recorder.log_calibration(latency_cal.correction_us)
+    if debouncer.window_ms != debounce.START_MS:
+        recorder.log_debounce(debouncer.window_ms)
+    tenths = (ready_duration + 50) // 100
+    print("Bereit machen... (", tenths // 10, ".", tenths % 10, "s)", sep="")
+    print("NICHT zu früh drücken!")
+    return ready_duration
+
+
+def record_reaction(reaction_time):
+    """Reaktionszeit aufzeichnen und bewerten; liefert die Stufe für RATING_BEEP_*"""
+    recorder.log_reaction(reaction_time)
+    histogram.record(reaction_time)
+
+    print("⚡ Reaktionszeit: ", reaction_time, "ms", sep="")
+
+    rating = 0
+    while rating < len(RATING_LIMITS_MS) and reaction_time >= RATING_LIMITS_MS[rating]:
+        rating += 1
+    print(RATING_TEXTS[rating])
+    return rating
+
+
+def show_display(headline, detail, games_played, best_time, false_starts):
+    """Ergebnis und Statistik ins Display-Bild zeichnen (gesendet wird in WAITING/RESULT)"""
+    display.line(2, headline)
+    display.line(3, detail)
+    display.line(5, "Spiele:")
+    display.number(5, 8, games_played)
+    if best_time is not None:
+        display.line(6, "Beste:")
+        display.number(6, 7, best_time, "ms")
+    else:
+        display.line(6, "Beste: -")
+    display.line(7, "Fehlstarts:")
+    display.number(7, 12, false_starts)
+
+
+def print_round(games_played, best_time, false_starts, debouncer,
+                buzzer_skew_us, max_buzzer_skew_us, buzzer_period_us):
+    """Statistik nach einer Runde ausgeben, Histogramm ab und zu sichern"""
+    print("\n" + "="*50)
+    print(f"Spiele gespielt: {games_played}")
+    if best_time:
+        print(f"Beste Zeit: {best_time}ms")
+    if false_starts > 0:
+        print(f"Falschstarts: {false_starts}")
+    histogram.print_statistics()
+    # Gemessener Zeitversatz Reiz ↔ Zeitstempel (0 = nicht gemessen)
+    if buzzer_period_us:
+        print(f"Reiz-Versatz: Buzzer {buzzer_skew_us}µs (max {max_buzzer_skew_us}µs) "
+              f"+ bis zu {buzzer_period_us}µs PWM-Periode")
+    latency_cal.print_statistics()
+    debouncer.print_statistics()
+    outputs.print_statistics()
+    display.print_statistics()
+    governor.print_statistics()
+    memprofile.report()
+    print("="*50)
+    print("Drücke den Button für neues Spiel!")
+    histogram.save()   # Datei nur alle histogram.SAVE_EVERY Spiele
+
+
+def calibrate(output_pin, trials, show_go_stimulus, update_buzzer, button_pressed,
+              set_led_mode, button, debouncer):
+    """Feste Latenz über die Drahtschleife output_pin -> Button messen
+
+    show_go_stimulus() löst den Reiz aus und liefert seinen Zeitstempel in µs;
+    die übrigen Funktionen sind die der Spielvariante. Die Flanken der
+    Drahtschleife prellen nicht und bleiben aus der Schätzung des
+    Entprell-Fensters heraus.
+    """
+    if output_pin is None:
+        print("Keine Kalibrierschleife verdrahtet (CAL_OUTPUT_PIN)")
+        return False
+
+    print(f"Kalibrierung: {trials} Durchgänge über GPIO {output_pin}...")
+    loopback = Pin(output_pin, Pin.OUT, value=1)
+    latency_cal.reset()
+    debouncer.pause()
+
+    for _ in range(trials):
+        go_stimulus_us = show_go_stimulus()
+        outputs.commit()
+
+        # "Drücken" 100-116ms nach dem Reiz: beliebige Lage zum 10ms-Takt
+        fire_us = utime.ticks_add(go_stimulus_us, 100000 + urandom.getrandbits(14))
+        fired = False
+        while True:
+            update_buzzer()
+            if fired and button_pressed():
+                # Wie update_go(): direkt nach der Erkennung
+                measured_us = utime.ticks_diff(utime.ticks_us(), fire_us)
+                break
+            outputs.commit()
+
+            # Schlafen wie die Hauptschleife, die Flanke fällt mitten hinein
+            wake_us = utime.ticks_add(utime.ticks_us(), 10000)
+            if not fired and utime.ticks_diff(wake_us, fire_us) > 0:
+                utime.sleep_us(max(utime.ticks_diff(fire_us, utime.ticks_us()), 0))
+                loopback.value(0)
+                fired = True
+                utime.sleep_us(max(utime.ticks_diff(wake_us, utime.ticks_us()), 0))
+            else:
+                utime.sleep_ms(10)
+
+        latency_cal.add(measured_us)
+        loopback.value(1)
+        set_led_mode(LED_OFF)
+        for _ in range(20):  # Loslassen und Button-Sperre abwarten
+            update_buzzer()
+            button_pressed()  # Entprellung muss das Loslassen sehen
+            outputs.commit()
+            utime.sleep_ms(10)
+
+    button.value()       # Pegel nach dem Loslassen übernehmen
+    debouncer.resume()
+    recorder.discard()   # Kalibrier-Flanken gehören zu keiner Sitzung
+    latency_cal.finish()
+    latency_cal.print_statistics()
+    return True
+
+
+def power_down(sleep_after_ms, led_gpio, led_pwm, buzzer, trace_path):
+    """Vor dem Tiefschlaf: PWM-Peripherie abschalten, Netzwerk schließen"""
+    print(f"💤 {sleep_after_ms // 60000} Minuten kein Spiel - Tiefschlaf, Button weckt")
+
+    if led_gpio is not None:
+        led_gpio.off()
+    led_pwm.deinit()
+    buzzer.deinit()
+    stats_http.stop()
+    display.power_off()
+    if trace_path is not None:
+        tracer.dump(trace_path)
+
+
+def shutdown(games_played, best_time, false_starts, led_gpio, led_pwm, buzzer, debouncer,
+             trace_path):
+    """Nach Strg+C: Statistik ausgeben und Hardware ausschalten"""
+    print("\n\nSpiel beendet!")
+    print(f"Statistiken:")
+    print(f"  Spiele gespielt: {games_played}")
+    if best_time:
+        print(f"  Beste Zeit: {best_time}ms")
+    if false_starts > 0:
+        print(f"  Falschstarts: {false_starts}")
+
+    # Hardware ausschalten
+    if led_gpio is not None:
+        led_gpio.off()
+    else:
+        led_pwm.duty(0)
+    buzzer.duty(0)
+    outputs.commit()
+    stats_http.stop()
+    display.line(0, "Spiel beendet")
+    display.flush(display.PAGES)
+    histogram.print_statistics()
+    histogram.save(force=True)
+    latency_cal.print_statistics()
+    debouncer.print_statistics()
+    outputs.print_statistics()
+    display.print_statistics()
+    governor.print_statistics()
+    memprofile.report()
+    if trace_path is not None:
+        tracer.dump(trace_path)
+        print(f"Trace: {trace_path} (am PC: python trace_chrome.py {trace_path})")
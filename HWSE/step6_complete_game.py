@@ -5,28 +5,129 @@ Schritt 6: Vollständiges Reaktionsspiel
 Dies ist die finale Version mit allen Features:
 - Zustandsautomat mit 4 Zuständen (funktional, ohne Klassen)
 - PWM LED-Steuerung mit verschiedenen Modi
-- Button-Entprellung (einfache Variante)
+- Button-Entprellung: Flanke + Sperrfenster, das Fenster passt sich dem
+  gemessenen Prellen des Tasters an (debounce.py)
 - Präzise Zeitmessung mit utime
 - Buzzer für Audio-Feedback
 - Zufällige Wartezeiten
 - Fehlerbehandlung und Benutzerführung
+- Sitzungsaufzeichnung für Record & Replay (recorder.py, in die Datei
+  SESSION_PATH)
+- Reaktionszeit ab dem tatsächlichen GO-Reiz (nicht ab dem print)
+- Schattenregister für LED und Buzzer (outputs.py): nur Änderungen schreiben
+- Statistik per WLAN unter http://<board-ip>:8080/stats (stats_http.py,
+  STATS_HTTP_PORT), bedient nur in WAITING/RESULT, damit keine Messung
+  gestört wird
+- Speicherprofil pro Zustand (memprofile.py, MEMORY_PROFILE = True)
+- Latenz-Korrektur (latency_cal.py): calibrate() misst über eine
+  Drahtschleife GPIO 27 -> GPIO 0, was Abtastung und Entprellung zur
+  Reaktionszeit beitragen; update_go() zieht das ab
+- Tiefschlaf nach SLEEP_AFTER_MS ohne Spieler (sleep_resume.py, nur wenn
+  gesetzt): Statistik im RTC-Speicher, der Button weckt, Warmstart ohne
+  Dateizugriff
+- Binärer Ereignis-Trace im Ringpuffer (tracer.py): Zustände, Button-Flanken,
+  LED-Modus, Buzzer, GC und zu lange Ticks; am PC als Chrome-Trace ansehen
+  (trace_chrome.py)
+- Histogramm der Reaktionszeiten (histogram.py): 256 logarithmische Fächer,
+  nach jedem Spiel als Balken ausgegeben, in der Datei HIST_PATH und vor
+  dem Tiefschlaf im RTC-Speicher gesichert
+- OLED-Anzeige (display.py, SSD1306 an I2C, DISPLAY_PINS): Ergebnis und
+  Statistik ohne Laptop; nur geänderte Seiten, gesendet nur in WAITING/RESULT
+- Keine Speicheranlage im Spielablauf: LED-Pulsieren aus einer Tabelle,
+  Ausgaben ohne f-Strings, Zahlen direkt ins Display-Bild. Nur der Wechsel
+  nach WAITING (Sitzung speichern, Statistik) belegt etwas und räumt danach
+  selbst auf - so kann der GC nie in READY/GO anspringen (alloc_check.py,
+  auf dem Board: ALLOC_CHECK = True)
+- CPU-Takt pro Zustand (governor.py, CPU_MHZ): z.B. 240 MHz in GO, schon
+  kurz vor dem Reiz eingestellt, 80 MHz beim Warten; Energie und Rechenzeit
+  pro Tick stehen in der Statistik
+
+Ohne Änderung läuft nur das Grundspiel: Display, CPU-Takt, HTTP-Statistik,
+Tiefschlaf und Dateien im Flash sind aus, bis sie unten eingeschaltet
+werden (DISPLAY_PINS, CPU_MHZ, STATS_HTTP_PORT, SLEEP_AFTER_MS,
+SESSION_PATH, CAL_PATH, HIST_PATH, TRACE_PATH; Übersicht in
+step-by-step-implementation.md). Die Module bleiben importiert und tun
+dann nichts.
+
+Was nicht vom Ort des Spielzustands abhängt (Bewertung, Statistik, Anzeige,
+Kalibrierung, Start und Ende), teilt sich diese Datei mit der
+Kontext-Variante step6_context_game.py: step6_common.py.
 
 Hardware:
 - LED an GPIO 2
 - Button an GPIO 0 (mit Pull-up)
 - Buzzer an GPIO 4
+- Optional: SSD1306-Display 128x64 an I2C (SCL GPIO 22, SDA GPIO 21,
+  einschalten mit DISPLAY_PINS = (22, 21))
+- Optional: GPIO 27 über 1kΩ auf GPIO 0 (nur für die Kalibrierung)
 """
 
 import utime  # WICHTIG: utime statt time für Mikrocontroller!
-import urandom
-import math
-from machine import Pin, PWM
+from machine import Pin, PWM, I2C
+import recorder
+import outputs
+import stats_http
+import memprofile
+import latency_cal
+import sleep_resume
+import tracer
+import histogram
+import display
+import debounce
+import governor
+import step6_common
+from step6_common import (STATE_WAITING, STATE_READY, STATE_GO, STATE_RESULT, STATE_NAMES,
+                          LED_OFF, LED_PULSE, LED_ON, LED_BLINK, PULSE_DUTY,
+                          GO_BEEP_HZ, GO_BEEP_MS, RATING_BEEP_HZ, RATING_BEEP_MS,
+                          REACTION_TIMEOUT_US)
+
+FIRMWARE_VERSION = "6.5"
+
+# Speicherprofil: Heap bei jedem Zustandswechsel messen (kostet Zeit durch
+# gc.collect(), daher nur zum Ausmessen einschalten)
+MEMORY_PROFILE = False
+MEMORY_BUDGET_BYTES = None
+
+# Belegung pro Tick und Zustandswechsel zählen (gc.mem_alloc() jeden Tick)
+ALLOC_CHECK = False
+
+# CPU-Takt in MHz pro Zustand (governor.py; None = Takt nie umstellen, z.B.
+# (80, 80, 240, 80)). Mit WLAN nicht unter 80 MHz. CPU_BOOST_LEAD_MS vor GO
+# gilt schon der GO-Takt
+CPU_MHZ = None
+CPU_BOOST_LEAD_MS = 50
+
+# Latenz-Kalibrierung über Drahtschleife (None = keine Schleife verdrahtet).
+# Die Korrektur im Flash: CAL_PATH (None = nur im RAM, z.B. "latency.cal")
+CAL_OUTPUT_PIN = 27
+CAL_TRIALS = 40
+CALIBRATE_AT_BOOT = False
+CAL_PATH = None
 
-# Zustände
-STATE_WAITING = 0
-STATE_READY = 1
-STATE_GO = 2
-STATE_RESULT = 3
+# HTTP-Statistik über WLAN (stats_http.py; None = kein Server, z.B. 8080)
+STATS_HTTP_PORT = None
+
+# Tiefschlaf nach so langer Pause in WAITING (None = nie schlafen, z.B.
+# 15 * 60 * 1000). Der Button an GPIO 0 weckt das Board
+SLEEP_AFTER_MS = None
+
+# Sitzungsaufzeichnung in den Flash (recorder.py; None = nur im RAM, z.B.
+# "sessions.rrc" für replay.py)
+SESSION_PATH = None
+
+# Ereignis-Trace: Einträge im Ringpuffer, Datei beim Beenden/Tiefschlaf
+# (None = nur im RAM, z.B. "trace.bin")
+TRACE_RECORDS = 512
+TRACE_PATH = None
+
+# Reaktionszeit-Histogramm im Flash, über Neustarts hinweg (None = nur im
+# RAM und vor dem Tiefschlaf im RTC-Speicher, z.B. "reaction.hist")
+HIST_PATH = None
+
+# OLED-Anzeige an I2C (SCL, SDA; None = keine Anzeige, z.B. (22, 21)). Pro
+# Tick höchstens DISPLAY_PAGES_PER_TICK Seiten (je bis 128 Bytes, ~3ms bei 400kHz)
+DISPLAY_PINS = None
+DISPLAY_PAGES_PER_TICK = 1
 
 # Globale Zustandsvariablen
 current_state = STATE_WAITING
@@ -39,64 +140,102 @@ games_played = 0
 best_time = None
 false_starts = 0
 
+# Schleifen-Gesundheit (Dauer eines Ticks ohne sleep)
+LOOP_BUDGET_US = 10000
+loop_ticks = 0
+loop_max_us = 0
+loop_overruns = 0
+
 # Hardware initialisieren
-led_pwm = PWM(Pin(2))
-led_pwm.freq(1000)
-button = Pin(0, Pin.IN, Pin.PULL_UP)
-buzzer = PWM(Pin(4))
-
-# Button-Entprellung (einfache Variante)
-last_button_time = 0
-debounce_ms = 50
-
-# LED-Pulsieren Variablen
-led_phase = 0
-led_mode = "off"  # "off", "pulse", "on", "blink"
+led_pin = Pin(2)
+led_pwm = outputs.PwmChannel(PWM(led_pin), freq=1000)
+button = recorder.RecordingPin(Pin(0, Pin.IN, Pin.PULL_UP))
+buzzer = outputs.PwmChannel(PWM(Pin(4)))
+
+# Sitzungen aufzeichnen (am PC nachspielen mit replay.py)
+recorder.begin(FIRMWARE_VERSION, SESSION_PATH)
+tracer.begin(TRACE_RECORDS)
+
+# Button-Entprellung (Fenster passt sich dem Taster an)
+debouncer = debounce.AdaptiveDebounce("Button")
+last_button_level = 1
+
+# LED-Animation (Tabelle PULSE_DUTY aus step6_common.py)
+led_phase = 0     # Index in PULSE_DUTY
+led_mode = LED_OFF
 led_blink_timer = 0
 
 # Buzzer-Timer
 buzzer_stop_time = 0
 buzzer_active = False
 
+# GO-Reiz: LED läuft in GO als einfacher GPIO (wirkt sofort, PWM erst ab
+# der nächsten Periode). Der Zeitstempel in µs ist der Moment, in dem der
+# LED-Pegel gesetzt ist; der Buzzer startet danach.
+led_gpio = None
+go_stimulus_us = 0
+buzzer_skew_us = 0       # Buzzer-Befehl fertig - Zeitstempel
+buzzer_period_us = 0     # Ton startet erst mit der nächsten PWM-Periode
+max_buzzer_skew_us = 0
+
+# Statistik aus dem RTC-Speicher nach dem Tiefschlaf (None = Kaltstart),
+# gesetzt von boot() in main()
+warm_boot = None
+
 def button_pressed():
     """Prüft ob Button gedrückt wurde (mit Entprellung)"""
-    global last_button_time
+    global last_button_level
     
     current_time = utime.ticks_ms()
+    level = button.value()
+    if level != last_button_level:
+        last_button_level = level
+        tracer.event(tracer.EV_BUTTON, level)
+    
+    # Neuer Druck (Flanke) außerhalb des Sperrfensters?
+    return debouncer.update(level, current_time)
+
+def restore_led_pwm():
+    """LED nach GO wieder an die PWM hängen"""
+    global led_gpio
     
-    # Button gedrückt UND genug Zeit seit letztem Druck vergangen?
-    if not button.value() and utime.ticks_diff(current_time, last_button_time) > debounce_ms:
-        last_button_time = current_time
-        return True
-    return False
+    led_gpio = None
+    led_pwm.init()  # Dasselbe PWM-Objekt wieder an den Pin, kein neues anlegen
+    led_pwm.freq(1000)
+    # Die LED war an: init() vergisst den Pegel, ohne diese Zeile begänne das
+    # Blinken in RESULT mit dem Einschalten statt wie bisher mit dem Ausschalten
+    led_pwm.duty(1023)
 
 def set_led_mode(mode):
     """LED-Modus setzen"""
     global led_mode, led_phase, led_blink_timer
     
+    if led_gpio is not None:
+        restore_led_pwm()
+    
     led_mode = mode
-    if mode == "off":
+    tracer.event(tracer.EV_LED, mode)
+    if mode == LED_OFF:
         led_pwm.duty(0)
-    elif mode == "on":
+    elif mode == LED_ON:
         led_pwm.duty(1023)
-    elif mode == "pulse":
+    elif mode == LED_PULSE:
         led_phase = 0
-    elif mode == "blink":
+    elif mode == LED_BLINK:
         led_blink_timer = utime.ticks_ms()
 
 def update_led():
     """LED updaten (für Animationen)"""
     global led_phase, led_blink_timer
     
-    if led_mode == "pulse":
-        # Sanftes Pulsieren mit Sinuswelle
-        brightness = int(300 + 200 * math.sin(led_phase))
-        led_pwm.duty(brightness)
-        led_phase += 0.15
-        if led_phase > 2 * math.pi:
+    if led_mode == LED_PULSE:
+        # Sanftes Pulsieren mit Sinuswelle (Tabelle statt math.sin: keine Floats)
+        led_pwm.duty(PULSE_DUTY[led_phase])
+        led_phase += 1
+        if led_phase == len(PULSE_DUTY):
             led_phase = 0
     
-    elif led_mode == "blink":
+    elif led_mode == LED_BLINK:
         # Blinken alle 300ms
         current_time = utime.ticks_ms()
         if utime.ticks_diff(current_time, led_blink_timer) >= 300:
@@ -114,6 +253,7 @@ def beep(frequency=1000, duration_ms=200):
     buzzer.duty(512)  # 50% Duty Cycle
     buzzer_stop_time = utime.ticks_ms() + duration_ms
     buzzer_active = True
+    tracer.event(tracer.EV_BUZZER_ON, frequency)
 
 def update_buzzer():
     """Buzzer updaten (für Timer)"""
@@ -122,44 +262,70 @@ def update_buzzer():
     if buzzer_active and utime.ticks_ms() >= buzzer_stop_time:
         buzzer.duty(0)
         buzzer_active = False
+        tracer.event(tracer.EV_BUZZER_OFF)
+
+def show_go_stimulus():
+    """GO-Reiz (LED + Buzzer) auslösen; liefert den Zeitstempel direkt am Reiz"""
+    global led_gpio, led_mode, go_stimulus_us, buzzer_skew_us
+    global buzzer_period_us, max_buzzer_skew_us
+    
+    # LED als GPIO: Pegel wird sofort gesetzt (value=1 schon beim Umschalten)
+    led_pwm.deinit()
+    led_pin.init(Pin.OUT, value=1)
+    
+    # Zeitstempel für die Reaktionszeit: der Pegel liegt an, sobald init() zurückkehrt
+    go_stimulus_us = utime.ticks_us()
+    led_gpio = led_pin
+    led_mode = LED_ON
+    
+    # 3 kurze Beeps für GO-Signal (vereinfacht: nur einer)
+    beep(GO_BEEP_HZ, GO_BEEP_MS)
+    buzzer.flush()  # Sofort schreiben, nicht erst am Ende des Ticks
+    
+    # Der Buzzer kommt nach dem Zeitstempel und dann noch bis zu einer PWM-Periode später
+    buzzer_skew_us = utime.ticks_diff(utime.ticks_us(), go_stimulus_us)
+    buzzer_period_us = 1000000 // GO_BEEP_HZ
+    max_buzzer_skew_us = max(max_buzzer_skew_us, buzzer_skew_us)
+    tracer.event(tracer.EV_LED, LED_ON)  # Nach den Zeitstempeln
+    return go_stimulus_us
 
 def change_state(new_state):
     """Zustand wechseln"""
     global current_state, state_start_time, ready_duration
     
-    state_names = ["WAITING", "READY", "GO", "RESULT"]
-    print(f"State: {state_names[current_state]} → {state_names[new_state]}")
+    # GO: Reiz zuerst, damit kein print (UART blockiert!) in die Messung fällt
+    if new_state == STATE_GO:
+        show_go_stimulus()
     
+    old_state = current_state
     current_state = new_state
-    state_start_time = utime.ticks_ms()
+    state_start_time = step6_common.enter_state(old_state, new_state)
     
     # Zustandsspezifische Initialisierung
     if new_state == STATE_WAITING:
-        set_led_mode("off")
+        set_led_mode(LED_OFF)
+        step6_common.enter_waiting(debouncer)
         
     elif new_state == STATE_READY:
-        # Zufällige Wartezeit 2-5 Sekunden
-        ready_duration = 2000 + urandom.getrandbits(12) % 3001
-        print(f"Bereit machen... ({ready_duration/1000:.1f}s)")
-        print("NICHT zu früh drücken!")
-        
-        set_led_mode("pulse")
+        ready_duration = step6_common.enter_ready(debouncer)
+        set_led_mode(LED_PULSE)
         beep(800, 150)  # Kurzer Beep
         
     elif new_state == STATE_GO:
+        # LED und Buzzer laufen schon (show_go_stimulus)
         print("JETZT! So schnell wie möglich!")
-        set_led_mode("on")
-        
-        # 3 kurze Beeps für GO-Signal (vereinfacht: nur einer)
-        beep(1200, 150)
         
     elif new_state == STATE_RESULT:
-        set_led_mode("blink")
+        set_led_mode(LED_BLINK)
+        display.line(0, "Ergebnis")
 
 def update_waiting():
     """WAITING Zustand"""
     if button_pressed():
         change_state(STATE_READY)
+    elif SLEEP_AFTER_MS is not None and \
+            utime.ticks_diff(utime.ticks_ms(), state_start_time) >= SLEEP_AFTER_MS:
+        go_to_sleep()
 
 def update_ready():
     """READY Zustand"""
@@ -168,8 +334,9 @@ def update_ready():
     # Zu früh gedrückt?
     if button_pressed():
         false_starts += 1
-        print(f"Falschstart! ({false_starts} insgesamt)")
+        print("Falschstart! (", false_starts, " insgesamt)", sep="")
         print("   Das war zu früh. Warte auf das GO-Signal!")
+        show_display("Falschstart!", "Zu frueh")
         
         # Buzz-Sound für Fehler
         beep(400, 500)
@@ -180,49 +347,41 @@ def update_ready():
     elapsed = utime.ticks_diff(utime.ticks_ms(), state_start_time)
     if elapsed >= ready_duration:
         change_state(STATE_GO)
+    elif elapsed >= ready_duration - CPU_BOOST_LEAD_MS:
+        governor.prepare(STATE_GO)  # Voller Takt schon vor dem Reiz
 
 def update_go():
     """GO Zustand"""
     global reaction_time, games_played, best_time
     
     if button_pressed():
-        reaction_time = utime.ticks_diff(utime.ticks_ms(), state_start_time)
+        # Gemessen ab dem Reiz, nicht ab dem Zustandswechsel, ohne die
+        # feste Latenz von Abtastung und Entprellung
+        reaction_time = latency_cal.correct(utime.ticks_diff(utime.ticks_us(), go_stimulus_us))
         games_played += 1
         
-        print(f"⚡ Reaktionszeit: {reaction_time}ms")
-        
-        # Bewertung
-        if reaction_time < 200:
-            print("   Blitzschnell! Übermenschlich!")
-            beep(1500, 300)
-        elif reaction_time < 300:
-            print("   Ausgezeichnet!")
-            beep(1200, 250)
-        elif reaction_time < 450:
-            print("   Sehr gut!")
-            beep(1000, 200)
-        elif reaction_time < 600:
-            print("   Ganz okay...")
-            beep(800, 200)
-        else:
-            print("   Da ist noch Luft nach oben!")
-            beep(600, 300)
+        # Aufzeichnen, bewerten, Ton zur Bewertung
+        rating = step6_common.record_reaction(reaction_time)
+        beep(RATING_BEEP_HZ[rating], RATING_BEEP_MS[rating])
         
         # Neue Bestzeit?
         if best_time is None or reaction_time < best_time:
             if best_time is not None:
                 print("   NEUE BESTZEIT!")
             best_time = reaction_time
+        show_display("", "Bestzeit!" if reaction_time == best_time else "")
+        display.number(2, 0, reaction_time, " ms")
         
         change_state(STATE_RESULT)
         return
     
-    # Timeout nach 3 Sekunden
-    elapsed = utime.ticks_diff(utime.ticks_ms(), state_start_time)
-    if elapsed >= 3000:
+    # Timeout 3 Sekunden nach dem Reiz
+    elapsed_us = utime.ticks_diff(utime.ticks_us(), go_stimulus_us)
+    if elapsed_us >= REACTION_TIMEOUT_US:
         print("🐌 Timeout! Zu langsam (>3000ms)")
         print("   Übung macht den Meister!")
         beep(400, 800)  # Tiefer, langer Ton
+        show_display("Zu langsam!", "> 3000 ms")
         change_state(STATE_RESULT)
 
 def update_result():
@@ -231,28 +390,94 @@ def update_result():
     
     # Nach 3 Sekunden zurück zu WAITING
     if elapsed >= 3000:
-        # Statistiken anzeigen
-        print("\n" + "="*50)
-        print(f"Spiele gespielt: {games_played}")
-        if best_time:
-            print(f"Beste Zeit: {best_time}ms")
-        if false_starts > 0:
-            print(f"Falschstarts: {false_starts}")
-        print("="*50)
-        print("Drücke den Button für neues Spiel!")
-        
+        step6_common.print_round(games_played, best_time, false_starts, debouncer,
+                                 buzzer_skew_us, max_buzzer_skew_us, buzzer_period_us)
         change_state(STATE_WAITING)
 
+def calibrate(trials=CAL_TRIALS):
+    """Feste Latenz über die Drahtschleife CAL_OUTPUT_PIN -> Button messen"""
+    return step6_common.calibrate(CAL_OUTPUT_PIN, trials, show_go_stimulus, update_buzzer,
+                                  button_pressed, set_led_mode, button, debouncer)
+
+def boot():
+    """Start: Statistik nach dem Tiefschlaf übernehmen oder Dateien laden"""
+    global warm_boot, games_played, best_time, false_starts
+    global loop_ticks, loop_max_us, loop_overruns, max_buzzer_skew_us
+    
+    # Nach dem Tiefschlaf: Statistik, Histogramm und Latenz-Korrektur aus dem
+    # RTC-Speicher, sonst Latenz-Korrektur und Histogramm aus den Dateien laden
+    # (neu messen: calibrate()). Erst in main(), damit die Dateinamen oben bis
+    # dahin noch geändert werden können
+    warm_boot = step6_common.boot(CAL_PATH, HIST_PATH)
+    if warm_boot is not None:
+        (games_played, best_time, false_starts, loop_ticks, loop_max_us, loop_overruns,
+         max_buzzer_skew_us) = warm_boot
+
+def go_to_sleep():
+    """Lange kein Spieler: Statistik in den RTC-Speicher, Tiefschlaf bis zum Druck"""
+    step6_common.power_down(SLEEP_AFTER_MS, led_gpio, led_pwm, buzzer, TRACE_PATH)
+    sleep_resume.save(games_played, best_time, false_starts, loop_ticks, loop_max_us,
+                      loop_overruns, max_buzzer_skew_us)
+    sleep_resume.deep_sleep(button.pin)
+
+def show_display(headline, detail=""):
+    """Ergebnis und Statistik ins Display-Bild zeichnen (gesendet wird in WAITING/RESULT)"""
+    step6_common.show_display(headline, detail, games_played, best_time, false_starts)
+
+def service_display():
+    """Geänderte Display-Seiten senden - nur in WAITING/RESULT, nie während einer Messung"""
+    if current_state != STATE_WAITING and current_state != STATE_RESULT:
+        return
+    display.flush(DISPLAY_PAGES_PER_TICK)
+
+def service_stats_http():
+    """HTTP-Statistik bedienen - nur in WAITING/RESULT, nie während einer Messung"""
+    if current_state != STATE_WAITING and current_state != STATE_RESULT:
+        return
+    if stats_http.poll():
+        stats_http.update(games_played, best_time if best_time is not None else -1,
+                          false_starts, loop_ticks, loop_max_us, loop_overruns)
+        stats_http.respond()
+
+def record_loop_time(start_us):
+    """Dauer eines Ticks in die Schleifen-Statistik aufnehmen"""
+    global loop_ticks, loop_max_us, loop_overruns
+    
+    duration_us = utime.ticks_diff(utime.ticks_us(), start_us)
+    loop_ticks += 1
+    if duration_us > loop_max_us:
+        loop_max_us = duration_us
+    if duration_us > LOOP_BUDGET_US:
+        loop_overruns += 1
+        tracer.event(tracer.EV_OVERRUN, duration_us)
+    governor.tick(duration_us)
+
 def main():
     """Hauptprogramm"""
-    print("🎮 === Vollständiges Reaktionsspiel === 🎮")
-    print("Features: LED-Effekte, Audio-Feedback, Statistiken")
-    print("Hardware initialisiert")
-    print("Drücke den Button zum Starten!")
-    print("\n🎮 Spiel gestartet! (Strg+C zum Beenden)\n")
+    boot()
+    step6_common.print_welcome(warm_boot, games_played)
+    
+    if STATS_HTTP_PORT is not None:
+        stats_http.start(STATS_HTTP_PORT)
+    if DISPLAY_PINS is not None and display.begin(
+            I2C(0, scl=Pin(DISPLAY_PINS[0]), sda=Pin(DISPLAY_PINS[1]), freq=400000)):
+        display.line(0, "Button = Start")
+        show_display("Reaktionsspiel")
+    if CALIBRATE_AT_BOOT and warm_boot is None:
+        calibrate()
+    if MEMORY_PROFILE:
+        memprofile.begin(MEMORY_BUDGET_BYTES)
+    if ALLOC_CHECK:
+        memprofile.begin_ticks(STATE_NAMES)
+    if CPU_MHZ is not None:
+        governor.begin(CPU_MHZ, STATE_NAMES)
     
     try:
         while True:
+            tick_start_us = utime.ticks_us()
+            if ALLOC_CHECK:
+                memprofile.tick(current_state)
+            
             # Hardware-Updates
             update_led()
             update_buzzer()
@@ -267,20 +492,21 @@ def main():
             elif current_state == STATE_RESULT:
                 update_result()
             
+            # Geänderte LED-/Buzzer-Werte gesammelt schreiben
+            outputs.commit()
+            
+            # Netzwerk und Display erst nach der Spiellogik, nur außerhalb von READY/GO
+            service_stats_http()
+            service_display()
+            
+            record_loop_time(tick_start_us)
             utime.sleep_ms(10)  # 10ms Update-Rate
     
     except KeyboardInterrupt:
-        print("\n\nSpiel beendet!")
-        print(f"Statistiken:")
-        print(f"  Spiele gespielt: {games_played}")
-        if best_time:
-            print(f"  Beste Zeit: {best_time}ms")
-        if false_starts > 0:
-            print(f"  Falschstarts: {false_starts}")
-        
-        # Hardware ausschalten
-        led_pwm.duty(0)
-        buzzer.duty(0)
+        step6_common.shutdown(games_played, best_time, false_starts, led_gpio, led_pwm, buzzer,
+                              debouncer, TRACE_PATH)
+        print(f"Schleife: {loop_ticks} Ticks, max {loop_max_us}µs, "
+              f"{loop_overruns} über {LOOP_BUDGET_US}µs")
         print("Danke fürs Spielen!")
 
 if __name__ == "__main__":
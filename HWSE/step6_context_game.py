@@ -0,0 +1,442 @@
+"""
+Schritt 6 (Variante): Reaktionsspiel mit Spielkontext-Objekt
+===========================================================
+
+Gleiches Spiel wie step6_complete_game.py, aber ohne Modul-Globals:
+- Der ganze Spielzustand steckt in einem GameContext mit __slots__
+  (feste Attribut-Plätze statt Dictionary, kein `global` mehr)
+- Die Hauptschleife bindet heiße Methoden und Hardware-Objekte einmal an
+  lokale Variablen; lokale Zugriffe sind in MicroPython am schnellsten
+- Verhalten, Ausgaben und Aufzeichnung (recorder.py) sind identisch, auch
+  ohne Speicheranlage im Spielablauf (alloc_check.py)
+- Bewertung, Statistik, Anzeige, Kalibrierung, Start und Ende stehen in
+  step6_common.py und gelten für beide Varianten; hier steht nur, was den
+  Zustand liest oder schreibt
+
+Vergleich mit der Globals-Version (Gleichheit und Geschwindigkeit):
+    python context_bench.py
+
+Hardware:
+- LED an GPIO 2
+- Button an GPIO 0 (mit Pull-up)
+- Buzzer an GPIO 4
+- Optional: SSD1306-Display 128x64 an I2C (SCL GPIO 22, SDA GPIO 21,
+  einschalten mit DISPLAY_PINS = (22, 21))
+- Optional: GPIO 27 über 1kΩ auf GPIO 0 (nur für die Kalibrierung)
+"""
+
+import utime  # WICHTIG: utime statt time für Mikrocontroller!
+from machine import Pin, PWM, I2C
+import recorder
+import outputs
+import stats_http
+import memprofile
+import latency_cal
+import sleep_resume
+import tracer
+import histogram
+import display
+import debounce
+import governor
+import step6_common
+from step6_common import (STATE_WAITING, STATE_READY, STATE_GO, STATE_RESULT, STATE_NAMES,
+                          LED_OFF, LED_PULSE, LED_ON, LED_BLINK, PULSE_DUTY,
+                          GO_BEEP_HZ, GO_BEEP_MS, RATING_BEEP_HZ, RATING_BEEP_MS,
+                          REACTION_TIMEOUT_US)
+
+FIRMWARE_VERSION = "6.5"
+
+MEMORY_PROFILE = False
+MEMORY_BUDGET_BYTES = None
+ALLOC_CHECK = False
+
+CPU_MHZ = None                # Takt pro Zustand (governor.py; None = nie umstellen,
+                              # z.B. (80, 80, 240, 80))
+CPU_BOOST_LEAD_MS = 50
+
+CAL_OUTPUT_PIN = 27
+CAL_TRIALS = 40
+CALIBRATE_AT_BOOT = False
+CAL_PATH = None               # Korrektur im Flash (None = nur im RAM, z.B. "latency.cal")
+
+STATS_HTTP_PORT = None        # HTTP-Statistik (stats_http.py; None = kein Server, z.B. 8080)
+
+SLEEP_AFTER_MS = None         # Tiefschlaf nach Pause (None = nie, z.B. 15 * 60 * 1000)
+
+SESSION_PATH = None           # Sitzungen in den Flash (None = nur im RAM, z.B. "sessions.rrc")
+
+TRACE_RECORDS = 512
+TRACE_PATH = None
+HIST_PATH = None              # Histogramm im Flash (None = nur im RAM, z.B. "reaction.hist")
+
+DISPLAY_PINS = None           # SCL, SDA (None = keine Anzeige, z.B. (22, 21))
+DISPLAY_PAGES_PER_TICK = 1
+
+LOOP_BUDGET_US = 10000
+
+
+class GameContext:
+    """Kompletter Spielzustand mit festen Attribut-Plätzen"""
+
+    # Zustände auch am Objekt: Werkzeuge lesen state.STATE_GO bei beiden Varianten
+    STATE_WAITING = STATE_WAITING
+    STATE_READY = STATE_READY
+    STATE_GO = STATE_GO
+    STATE_RESULT = STATE_RESULT
+
+    __slots__ = (
+        # Zustand
+        "current_state", "state_start_time", "ready_duration", "reaction_time",
+        # Statistiken
+        "games_played", "best_time", "false_starts",
+        # Schleifen-Gesundheit
+        "loop_ticks", "loop_max_us", "loop_overruns",
+        # Hardware
+        "led_pin", "led_pwm", "button", "buzzer", "led_gpio", "display_bus",
+        # Entprellung, LED, Buzzer
+        "debouncer", "last_button_level", "led_phase", "led_mode", "led_blink_timer",
+        "buzzer_stop_time", "buzzer_active",
+        # GO-Reiz
+        "go_stimulus_us", "buzzer_skew_us", "buzzer_period_us", "max_buzzer_skew_us",
+    )
+
+    def __init__(self):
+        self.current_state = STATE_WAITING
+        self.state_start_time = 0
+        self.ready_duration = 0
+        self.reaction_time = 0
+
+        self.games_played = 0
+        self.best_time = None
+        self.false_starts = 0
+
+        self.loop_ticks = 0
+        self.loop_max_us = 0
+        self.loop_overruns = 0
+
+        self.led_pin = Pin(2)
+        self.led_pwm = outputs.PwmChannel(PWM(self.led_pin), freq=1000)
+        self.button = recorder.RecordingPin(Pin(0, Pin.IN, Pin.PULL_UP))
+        self.buzzer = outputs.PwmChannel(PWM(Pin(4)))
+        self.display_bus = None   # I2C erst in main(): DISPLAY_PINS lässt sich bis dahin setzen
+        self.led_gpio = None
+
+        self.debouncer = debounce.AdaptiveDebounce("Button")
+        self.last_button_level = 1
+        self.led_phase = 0
+        self.led_mode = LED_OFF
+        self.led_blink_timer = 0
+        self.buzzer_stop_time = 0
+        self.buzzer_active = False
+
+        self.go_stimulus_us = 0
+        self.buzzer_skew_us = 0
+        self.buzzer_period_us = 0
+        self.max_buzzer_skew_us = 0
+
+    def button_pressed(self):
+        """Prüft ob Button gedrückt wurde (mit Entprellung)"""
+        current_time = utime.ticks_ms()
+        level = self.button.value()
+        if level != self.last_button_level:
+            self.last_button_level = level
+            tracer.event(tracer.EV_BUTTON, level)
+        return self.debouncer.update(level, current_time)
+
+    def restore_led_pwm(self):
+        """LED nach GO wieder an die PWM hängen"""
+        self.led_gpio = None
+        self.led_pwm.init()
+        self.led_pwm.freq(1000)
+        # Die LED war an: init() vergisst den Pegel, ohne diese Zeile begänne das
+        # Blinken in RESULT mit dem Einschalten statt wie bisher mit dem Ausschalten
+        self.led_pwm.duty(1023)
+
+    def set_led_mode(self, mode):
+        """LED-Modus setzen"""
+        if self.led_gpio is not None:
+            self.restore_led_pwm()
+
+        self.led_mode = mode
+        tracer.event(tracer.EV_LED, mode)
+        if mode == LED_OFF:
+            self.led_pwm.duty(0)
+        elif mode == LED_ON:
+            self.led_pwm.duty(1023)
+        elif mode == LED_PULSE:
+            self.led_phase = 0
+        elif mode == LED_BLINK:
+            self.led_blink_timer = utime.ticks_ms()
+
+    def update_led(self):
+        """LED updaten (für Animationen)"""
+        mode = self.led_mode
+        if mode == LED_PULSE:
+            phase = self.led_phase
+            self.led_pwm.duty(PULSE_DUTY[phase])
+            phase += 1
+            if phase == len(PULSE_DUTY):
+                phase = 0
+            self.led_phase = phase
+
+        elif mode == LED_BLINK:
+            current_time = utime.ticks_ms()
+            if utime.ticks_diff(current_time, self.led_blink_timer) >= 300:
+                self.led_blink_timer = current_time
+                led_pwm = self.led_pwm
+                if led_pwm.duty() > 0:
+                    led_pwm.duty(0)
+                else:
+                    led_pwm.duty(1023)
+
+    def beep(self, frequency=1000, duration_ms=200):
+        """Kurzen Piep abspielen"""
+        self.buzzer.freq(frequency)
+        self.buzzer.duty(512)
+        self.buzzer_stop_time = utime.ticks_ms() + duration_ms
+        self.buzzer_active = True
+        tracer.event(tracer.EV_BUZZER_ON, frequency)
+
+    def update_buzzer(self):
+        """Buzzer updaten (für Timer)"""
+        if self.buzzer_active and utime.ticks_ms() >= self.buzzer_stop_time:
+            self.buzzer.duty(0)
+            self.buzzer_active = False
+            tracer.event(tracer.EV_BUZZER_OFF)
+
+    def show_go_stimulus(self):
+        """GO-Reiz (LED + Buzzer) auslösen; liefert den Zeitstempel direkt am Reiz"""
+        self.led_pwm.deinit()
+        self.led_pin.init(Pin.OUT, value=1)
+        self.go_stimulus_us = utime.ticks_us()
+        self.led_gpio = self.led_pin
+        self.led_mode = LED_ON
+
+        self.beep(GO_BEEP_HZ, GO_BEEP_MS)
+        self.buzzer.flush()
+
+        self.buzzer_skew_us = utime.ticks_diff(utime.ticks_us(), self.go_stimulus_us)
+        self.buzzer_period_us = 1000000 // GO_BEEP_HZ
+        self.max_buzzer_skew_us = max(self.max_buzzer_skew_us, self.buzzer_skew_us)
+        tracer.event(tracer.EV_LED, LED_ON)
+        return self.go_stimulus_us
+
+    def change_state(self, new_state):
+        """Zustand wechseln"""
+        if new_state == STATE_GO:
+            self.show_go_stimulus()
+
+        old_state = self.current_state
+        self.current_state = new_state
+        self.state_start_time = step6_common.enter_state(old_state, new_state)
+
+        if new_state == STATE_WAITING:
+            self.set_led_mode(LED_OFF)
+            step6_common.enter_waiting(self.debouncer)
+
+        elif new_state == STATE_READY:
+            self.ready_duration = step6_common.enter_ready(self.debouncer)
+            self.set_led_mode(LED_PULSE)
+            self.beep(800, 150)
+
+        elif new_state == STATE_GO:
+            print("JETZT! So schnell wie möglich!")
+
+        elif new_state == STATE_RESULT:
+            self.set_led_mode(LED_BLINK)
+            display.line(0, "Ergebnis")
+
+    def update_waiting(self):
+        """WAITING Zustand"""
+        if self.button_pressed():
+            self.change_state(STATE_READY)
+        elif SLEEP_AFTER_MS is not None and \
+                utime.ticks_diff(utime.ticks_ms(), self.state_start_time) >= SLEEP_AFTER_MS:
+            self.go_to_sleep()
+
+    def update_ready(self):
+        """READY Zustand"""
+        if self.button_pressed():
+            self.false_starts += 1
+            print("Falschstart! (", self.false_starts, " insgesamt)", sep="")
+            print("   Das war zu früh. Warte auf das GO-Signal!")
+            self.show_display("Falschstart!", "Zu frueh")
+            self.beep(400, 500)
+            self.change_state(STATE_WAITING)
+            return
+
+        elapsed = utime.ticks_diff(utime.ticks_ms(), self.state_start_time)
+        if elapsed >= self.ready_duration:
+            self.change_state(STATE_GO)
+        elif elapsed >= self.ready_duration - CPU_BOOST_LEAD_MS:
+            governor.prepare(STATE_GO)
+
+    def update_go(self):
+        """GO Zustand"""
+        if self.button_pressed():
+            reaction_time = latency_cal.correct(utime.ticks_diff(utime.ticks_us(), self.go_stimulus_us))
+            self.reaction_time = reaction_time
+            self.games_played += 1
+            rating = step6_common.record_reaction(reaction_time)
+            self.beep(RATING_BEEP_HZ[rating], RATING_BEEP_MS[rating])
+
+            if self.best_time is None or reaction_time < self.best_time:
+                if self.best_time is not None:
+                    print("   NEUE BESTZEIT!")
+                self.best_time = reaction_time
+            self.show_display("", "Bestzeit!" if reaction_time == self.best_time else "")
+            display.number(2, 0, reaction_time, " ms")
+
+            self.change_state(STATE_RESULT)
+            return
+
+        if utime.ticks_diff(utime.ticks_us(), self.go_stimulus_us) >= REACTION_TIMEOUT_US:
+            print("🐌 Timeout! Zu langsam (>3000ms)")
+            print("   Übung macht den Meister!")
+            self.beep(400, 800)
+            self.show_display("Zu langsam!", "> 3000 ms")
+            self.change_state(STATE_RESULT)
+
+    def update_result(self):
+        """RESULT Zustand"""
+        if utime.ticks_diff(utime.ticks_ms(), self.state_start_time) >= 3000:
+            step6_common.print_round(self.games_played, self.best_time, self.false_starts,
+                                     self.debouncer, self.buzzer_skew_us, self.max_buzzer_skew_us,
+                                     self.buzzer_period_us)
+            self.change_state(STATE_WAITING)
+
+    def calibrate(self, trials=CAL_TRIALS):
+        """Feste Latenz über die Drahtschleife CAL_OUTPUT_PIN -> Button messen"""
+        return step6_common.calibrate(CAL_OUTPUT_PIN, trials, self.show_go_stimulus,
+                                      self.update_buzzer, self.button_pressed,
+                                      self.set_led_mode, self.button, self.debouncer)
+
+    def go_to_sleep(self):
+        """Lange kein Spieler: Statistik in den RTC-Speicher, Tiefschlaf bis zum Druck"""
+        step6_common.power_down(SLEEP_AFTER_MS, self.led_gpio, self.led_pwm, self.buzzer, TRACE_PATH)
+        sleep_resume.save(self.games_played, self.best_time, self.false_starts, self.loop_ticks,
+                          self.loop_max_us, self.loop_overruns, self.max_buzzer_skew_us)
+        sleep_resume.deep_sleep(self.button.pin)
+
+    def show_display(self, headline, detail=""):
+        """Ergebnis und Statistik ins Display-Bild zeichnen (gesendet wird in WAITING/RESULT)"""
+        step6_common.show_display(headline, detail, self.games_played, self.best_time,
+                                  self.false_starts)
+
+    def service_display(self):
+        """Geänderte Display-Seiten senden - nur in WAITING/RESULT, nie während einer Messung"""
+        display.flush(DISPLAY_PAGES_PER_TICK)
+
+    def service_stats_http(self):
+        """HTTP-Statistik bedienen - nur in WAITING/RESULT, nie während einer Messung"""
+        if stats_http.poll():
+            stats_http.update(self.games_played, self.best_time if self.best_time is not None else -1,
+                              self.false_starts, self.loop_ticks, self.loop_max_us, self.loop_overruns)
+            stats_http.respond()
+
+    def shutdown(self):
+        """Statistik ausgeben und Hardware ausschalten"""
+        step6_common.shutdown(self.games_played, self.best_time, self.false_starts, self.led_gpio,
+                              self.led_pwm, self.buzzer, self.debouncer, TRACE_PATH)
+        print(f"Schleife: {self.loop_ticks} Ticks, max {self.loop_max_us}µs, "
+              f"{self.loop_overruns} über {LOOP_BUDGET_US}µs")
+        print("Danke fürs Spielen!")
+
+
+# Hardware initialisieren
+game = GameContext()
+
+# Sitzungen aufzeichnen (am PC nachspielen mit replay.py)
+recorder.begin(FIRMWARE_VERSION, SESSION_PATH)
+tracer.begin(TRACE_RECORDS)
+
+
+def main():
+    """Hauptprogramm"""
+    # Nach dem Tiefschlaf: Statistik, Histogramm und Latenz-Korrektur aus dem
+    # RTC-Speicher, sonst Latenz-Korrektur und Histogramm aus den Dateien laden
+    # (neu messen: game.calibrate()). Erst hier, nicht beim Import, damit die
+    # Dateinamen oben bis dahin noch geändert werden können
+    warm_boot = step6_common.boot(CAL_PATH, HIST_PATH)
+    if warm_boot is not None:
+        (game.games_played, game.best_time, game.false_starts, game.loop_ticks,
+         game.loop_max_us, game.loop_overruns, game.max_buzzer_skew_us) = warm_boot
+    step6_common.print_welcome(warm_boot, game.games_played)
+
+    if STATS_HTTP_PORT is not None:
+        stats_http.start(STATS_HTTP_PORT)
+    if DISPLAY_PINS is not None:
+        game.display_bus = I2C(0, scl=Pin(DISPLAY_PINS[0]), sda=Pin(DISPLAY_PINS[1]), freq=400000)
+    if game.display_bus is not None and display.begin(game.display_bus):
+        display.line(0, "Button = Start")
+        game.show_display("Reaktionsspiel")
+    if CALIBRATE_AT_BOOT and warm_boot is None:
+        game.calibrate()
+    if MEMORY_PROFILE:
+        memprofile.begin(MEMORY_BUDGET_BYTES)
+    if ALLOC_CHECK:
+        memprofile.begin_ticks(STATE_NAMES)
+    if CPU_MHZ is not None:
+        governor.begin(CPU_MHZ, STATE_NAMES)
+
+    # Alles, was jeden Tick gebraucht wird, einmal lokal binden
+    g = game
+    update_led = g.update_led
+    update_buzzer = g.update_buzzer
+    update_waiting = g.update_waiting
+    update_ready = g.update_ready
+    update_go = g.update_go
+    update_result = g.update_result
+    service_stats_http = g.service_stats_http
+    service_display = g.service_display
+    commit = outputs.commit
+    governor_tick = governor.tick
+    ticks_us = utime.ticks_us
+    ticks_diff = utime.ticks_diff
+    sleep_ms = utime.sleep_ms
+    budget_us = LOOP_BUDGET_US
+    alloc_tick = memprofile.tick if ALLOC_CHECK else None
+
+    try:
+        while True:
+            tick_start_us = ticks_us()
+            if alloc_tick is not None:
+                alloc_tick(g.current_state)
+
+            update_led()
+            update_buzzer()
+
+            state = g.current_state
+            if state == STATE_WAITING:
+                update_waiting()
+            elif state == STATE_READY:
+                update_ready()
+            elif state == STATE_GO:
+                update_go()
+            else:
+                update_result()
+
+            commit()
+
+            # Netzwerk und Display nur außerhalb von READY/GO (Zustand nach der Logik)
+            state = g.current_state
+            if state == STATE_WAITING or state == STATE_RESULT:
+                service_stats_http()
+                service_display()
+
+            duration_us = ticks_diff(ticks_us(), tick_start_us)
+            g.loop_ticks += 1
+            if duration_us > g.loop_max_us:
+                g.loop_max_us = duration_us
+            if duration_us > budget_us:
+                g.loop_overruns += 1
+                tracer.event(tracer.EV_OVERRUN, duration_us)
+            governor_tick(duration_us)
+            sleep_ms(10)
+
+    except KeyboardInterrupt:
+        g.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,517 @@
+"""
+Schritt 6 (Variante): Reaktionsspiel auf zwei Kernen
+====================================================
+
+Gleiches Spiel wie step6_complete_game.py, aber aufgeteilt auf zwei Kerne
+(_thread), damit nichts Langsames die Messung stört:
+
+Kern 0 (Hauptprogramm, main):
+- Button abtasten und entprellen (debounce.py)
+- Zustandsautomat, Zufalls-Wartezeit, Reaktionszeit
+- Aufzeichnung der Ereignisse (recorder.py, nur im RAM)
+
+Kern 1 (io_core):
+- LED-Animation, Buzzer-Timer, GO-Reiz
+- Konsolenausgabe (print blockiert auf dem UART!)
+- Sitzungen in die Datei SESSION_PATH schreiben, HTTP-Statistik (stats_http.py,
+  STATS_HTTP_PORT)
+
+Die Kerne teilen sich keine Variablen, sondern reden nur über
+dual_core.py: Warteschlangen für Befehle und Text (Kern 0 -> Kern 1),
+eine für den GO-Zeitstempel (Kern 1 -> Kern 0) und ein doppelt
+gepuffertes Statistik-Abbild. Keine Sperren: kein Kern wartet je auf den
+anderen.
+
+Zustandswechsel, Bewertung und Statistik kommen wie bei den anderen
+Varianten aus step6_common.py. Deren Ausgaben laufen hier über Kern 1:
+say() ersetzt print in step6_common und den Statistik-Modulen.
+
+Kern 0 legt im Spielablauf keinen Speicher an (wie step6_complete_game.py):
+Befehle sind beim Start angelegte Tupel, Text geht als Teile (Konstanten
+und Zahlen) in die Warteschlange, die Statistik wird in den vorbelegten
+Puffer des Abbilds geschrieben. Nur Kern 1 setzt Zeilen zusammen und
+schreibt Dateien - ohne _thread also auch auf dem einen Kern.
+
+Die Reaktionszeit zählt ab dem Zeitstempel, den Kern 1 direkt beim
+Einschalten der LED nimmt. Bis er da ist, wertet Kern 0 in GO nichts aus.
+Weil Kern 0 nur noch abtastet, läuft er im 1ms-Takt statt im 10ms-Takt:
+der Druck wird im Mittel ~4,5ms früher erkannt.
+
+Ohne _thread (oder THREADED = False) ruft Kern 0 io_step() selbst in
+seiner Schleife auf: gleiche Aufteilung, ein Kern.
+
+Nicht enthalten: Latenz-Kalibrierung, Speicherprofil, Tiefschlaf, Display
+und CPU-Takt (siehe step6_complete_game.py). Das Histogramm bleibt im RAM.
+
+Im Simulator prüfen:
+    python dual_core_sim.py
+
+Hardware:
+- LED an GPIO 2
+- Button an GPIO 0 (mit Pull-up)
+- Buzzer an GPIO 4
+"""
+
+import utime  # WICHTIG: utime statt time für Mikrocontroller!
+from machine import Pin, PWM
+from micropython import const
+import recorder
+import outputs
+import stats_http
+import latency_cal
+import histogram
+import debounce
+import display
+import governor
+import memprofile
+import dual_core
+import step6_common
+from step6_common import (STATE_WAITING, STATE_READY, STATE_GO, STATE_RESULT,
+                          LED_OFF, LED_PULSE, LED_ON, LED_BLINK, PULSE_DUTY,
+                          GO_BEEP_HZ, GO_BEEP_MS, RATING_BEEP_HZ, RATING_BEEP_MS,
+                          REACTION_TIMEOUT_US)
+
+FIRMWARE_VERSION = "6.5"
+
+THREADED = True           # False: beide Hälften nacheinander auf einem Kern
+INPUT_PERIOD_MS = 1       # Takt von Kern 0 (Abtastung), Kern 0 hat sonst nichts zu tun
+SINGLE_CORE_PERIOD_MS = 10  # Takt ohne Thread (wie Schritt 6)
+IO_PERIOD_MS = 1          # Takt von Kern 1 (Befehle schnell übernehmen)
+ANIMATION_PERIOD_MS = 10  # LED-Animation unabhängig vom Takt
+SESSION_PATH = None       # Eigene Datei (None = nicht speichern, z.B. "sessions_dual.rrc")
+STATS_HTTP_PORT = None    # HTTP-Statistik (stats_http.py; None = kein Server, z.B. 8080)
+
+# Befehle Kern 0 -> Kern 1: (Befehl, a, b)
+CMD_LED = const(0)   # a = LED-Modus
+CMD_BEEP = const(1)  # a = Frequenz, b = Dauer in ms
+CMD_GO = const(2)    # GO-Reiz zeigen, Zeitstempel zurückmelden
+CMD_SAVE = const(3)  # a = Sitzung (bytes) an SESSION_PATH anhängen
+
+# Alle Befehle des Spielablaufs einmal beim Start anlegen (Index = LED-Modus
+# bzw. Bewertung aus step6_common.record_reaction())
+LED_COMMANDS = ((CMD_LED, LED_OFF, 0), (CMD_LED, LED_PULSE, 0),
+                (CMD_LED, LED_ON, 0), (CMD_LED, LED_BLINK, 0))
+RATING_COMMANDS = tuple((CMD_BEEP, RATING_BEEP_HZ[i], RATING_BEEP_MS[i])
+                        for i in range(len(RATING_BEEP_HZ)))
+GO_COMMAND = (CMD_GO, 0, 0)
+READY_BEEP = (CMD_BEEP, 800, 150)
+FALSE_START_BEEP = (CMD_BEEP, 400, 500)
+TIMEOUT_BEEP = (CMD_BEEP, 400, 800)
+
+# Text Kern 0 -> Kern 1: Teile einer Zeile, dann LINE_END
+LINE_END = object()
+
+# Verbindungen zwischen den Kernen (je ein Schreiber, ein Leser)
+commands = dual_core.SpscQueue(16)
+console = dual_core.SpscQueue(128)  # Statistik nach einer Runde: ~50 Teile
+go_events = dual_core.SpscQueue(2)
+# Spielzustand, Spiele, Bestzeit (-1 = keine), Falschstarts, Ticks, max µs, Überläufe
+stats = dual_core.Snapshot(7)
+
+# --- Kern 0: Zustand ---
+current_state = STATE_WAITING
+state_start_time = 0
+ready_duration = 0
+reaction_time = 0
+go_stimulus_us = None     # None = Kern 1 hat den Reiz noch nicht gemeldet
+
+games_played = 0
+best_time = None
+false_starts = 0
+
+LOOP_BUDGET_US = 10000
+loop_ticks = 0
+loop_max_us = 0
+loop_overruns = 0
+
+button = recorder.RecordingPin(Pin(0, Pin.IN, Pin.PULL_UP))
+debouncer = debounce.AdaptiveDebounce("Button")
+
+# --- Kern 1: Ausgaben ---
+led_pin = Pin(2)
+led_pwm = outputs.PwmChannel(PWM(led_pin), freq=1000)
+buzzer = outputs.PwmChannel(PWM(Pin(4)))
+led_gpio = None
+led_phase = 0     # Index in PULSE_DUTY
+led_mode = LED_OFF
+led_blink_timer = 0
+last_animation_ms = 0
+buzzer_stop_time = 0
+buzzer_active = False
+io_max_us = 0
+http_values = [0] * 7     # Kopie des Statistik-Abbilds für stats_http
+line_parts = []           # Teile der Zeile, die gerade ankommt
+
+# Sitzungen nur im RAM sammeln; Kern 1 schreibt sie in die Datei
+recorder.begin(FIRMWARE_VERSION)
+
+
+# ========== Kern 0: Eingabe und Zustandsautomat ==========
+
+def say(a="", b=LINE_END, c=LINE_END, d=LINE_END, e=LINE_END, sep=" "):
+    """print() für Kern 0: die Teile gehen an Kern 1 (print würde hier blockieren)
+
+    Höchstens fünf Teile, sep wie bei print. Passt die Zeile nicht mehr
+    ganz in die Warteschlange, wird sie verworfen und gezählt.
+    """
+    parts = 1 + (b is not LINE_END) + (c is not LINE_END) + (d is not LINE_END) + \
+        (e is not LINE_END)
+    if console.space() < 2 * parts:
+        console.dropped += 1
+        return
+    console.put(a)
+    if b is not LINE_END:
+        console.put(sep)
+        console.put(b)
+    if c is not LINE_END:
+        console.put(sep)
+        console.put(c)
+    if d is not LINE_END:
+        console.put(sep)
+        console.put(d)
+    if e is not LINE_END:
+        console.put(sep)
+        console.put(e)
+    console.put(LINE_END)
+
+# Ausgaben der gemeinsamen Teile laufen ebenfalls über Kern 1
+SHARED_MODULES = (step6_common, histogram, latency_cal, debounce, outputs, display,
+                  governor, memprofile)
+
+def route_print(target):
+    """print der gemeinsamen Module umlenken (say oder wieder print)"""
+    for module in SHARED_MODULES:
+        module.print = target
+
+route_print(say)
+
+def button_pressed():
+    """Prüft ob Button gedrückt wurde (Flanke außerhalb des Sperrfensters)"""
+    return debouncer.update(button.value(), utime.ticks_ms())
+
+def change_state(new_state):
+    """Zustand wechseln"""
+    global current_state, state_start_time, ready_duration, go_stimulus_us
+
+    # GO: Reiz zuerst anfordern, Text danach
+    if new_state == STATE_GO:
+        go_stimulus_us = None
+        commands.put(GO_COMMAND)
+
+    old_state = current_state
+    current_state = new_state
+    state_start_time = step6_common.enter_state(old_state, new_state)
+
+    if new_state == STATE_WAITING:
+        commands.put(LED_COMMANDS[LED_OFF])
+        step6_common.enter_waiting(debouncer)
+        if recorder.last_session and SESSION_PATH is not None:
+            commands.put((CMD_SAVE, recorder.last_session, 0))
+
+    elif new_state == STATE_READY:
+        ready_duration = step6_common.enter_ready(debouncer)
+        commands.put(LED_COMMANDS[LED_PULSE])
+        commands.put(READY_BEEP)
+
+    elif new_state == STATE_GO:
+        say("JETZT! So schnell wie möglich!")
+
+    elif new_state == STATE_RESULT:
+        commands.put(LED_COMMANDS[LED_BLINK])
+
+def update_waiting():
+    """WAITING Zustand"""
+    if button_pressed():
+        change_state(STATE_READY)
+
+def update_ready():
+    """READY Zustand"""
+    global false_starts
+
+    if button_pressed():
+        false_starts += 1
+        say("Falschstart! (", false_starts, " insgesamt)", sep="")
+        say("   Das war zu früh. Warte auf das GO-Signal!")
+        commands.put(FALSE_START_BEEP)
+        change_state(STATE_WAITING)
+        return
+
+    elapsed = utime.ticks_diff(utime.ticks_ms(), state_start_time)
+    if elapsed >= ready_duration:
+        change_state(STATE_GO)
+
+def update_go():
+    """GO Zustand"""
+    global reaction_time, games_played, best_time, go_stimulus_us
+
+    # Zeitstempel des Reizes von Kern 1 abholen
+    if go_stimulus_us is None:
+        go_stimulus_us = go_events.get()
+        if go_stimulus_us is None:
+            return
+
+    if button_pressed():
+        reaction_time = latency_cal.correct(utime.ticks_diff(utime.ticks_us(), go_stimulus_us))
+        games_played += 1
+
+        rating = step6_common.record_reaction(reaction_time)
+        commands.put(RATING_COMMANDS[rating])
+
+        if best_time is None or reaction_time < best_time:
+            if best_time is not None:
+                say("   NEUE BESTZEIT!")
+            best_time = reaction_time
+
+        change_state(STATE_RESULT)
+        return
+
+    elapsed_us = utime.ticks_diff(utime.ticks_us(), go_stimulus_us)
+    if elapsed_us >= REACTION_TIMEOUT_US:
+        say("🐌 Timeout! Zu langsam (>3000ms)")
+        say("   Übung macht den Meister!")
+        commands.put(TIMEOUT_BEEP)
+        change_state(STATE_RESULT)
+
+def update_result():
+    """RESULT Zustand"""
+    elapsed = utime.ticks_diff(utime.ticks_ms(), state_start_time)
+
+    if elapsed >= 3000:
+        # Der Buzzer-Versatz entsteht auf Kern 1 und wird hier nicht gemessen
+        step6_common.print_round(games_played, best_time, false_starts, debouncer, 0, 0, 0)
+        change_state(STATE_WAITING)
+
+def record_loop_time(start_us):
+    """Dauer eines Ticks in die Schleifen-Statistik aufnehmen"""
+    global loop_ticks, loop_max_us, loop_overruns
+
+    duration_us = utime.ticks_diff(utime.ticks_us(), start_us)
+    loop_ticks += 1
+    if duration_us > loop_max_us:
+        loop_max_us = duration_us
+    if duration_us > LOOP_BUDGET_US:
+        loop_overruns += 1
+
+def publish_stats():
+    """Statistik-Abbild für Kern 1 (HTTP) erneuern - im vorbelegten Puffer"""
+    values = stats.back()
+    values[0] = current_state
+    values[1] = games_played
+    values[2] = best_time if best_time is not None else -1
+    values[3] = false_starts
+    values[4] = loop_ticks
+    values[5] = loop_max_us
+    values[6] = loop_overruns
+    stats.swap()
+
+
+# ========== Kern 1: LED, Buzzer, Text, Dateien, Netzwerk ==========
+
+def restore_led_pwm():
+    """LED nach GO wieder an die PWM hängen"""
+    global led_gpio
+
+    led_gpio = None
+    led_pwm.init()  # Dasselbe PWM-Objekt wieder an den Pin, kein neues anlegen
+    led_pwm.freq(1000)
+    # Die LED war an: init() vergisst den Pegel, ohne diese Zeile begänne das
+    # Blinken in RESULT mit dem Einschalten statt wie bisher mit dem Ausschalten
+    led_pwm.duty(1023)
+
+def set_led_mode(mode):
+    """LED-Modus setzen"""
+    global led_mode, led_phase, led_blink_timer
+
+    if led_gpio is not None:
+        restore_led_pwm()
+
+    led_mode = mode
+    if mode == LED_OFF:
+        led_pwm.duty(0)
+    elif mode == LED_ON:
+        led_pwm.duty(1023)
+    elif mode == LED_PULSE:
+        led_phase = 0
+    elif mode == LED_BLINK:
+        led_blink_timer = utime.ticks_ms()
+
+def update_led():
+    """LED updaten (für Animationen)"""
+    global led_phase, led_blink_timer
+
+    if led_mode == LED_PULSE:
+        led_pwm.duty(PULSE_DUTY[led_phase])
+        led_phase += 1
+        if led_phase == len(PULSE_DUTY):
+            led_phase = 0
+
+    elif led_mode == LED_BLINK:
+        current_time = utime.ticks_ms()
+        if utime.ticks_diff(current_time, led_blink_timer) >= 300:
+            led_blink_timer = current_time
+            if led_pwm.duty() > 0:
+                led_pwm.duty(0)
+            else:
+                led_pwm.duty(1023)
+
+def beep(frequency=1000, duration_ms=200):
+    """Kurzen Piep abspielen"""
+    global buzzer_stop_time, buzzer_active
+
+    buzzer.freq(frequency)
+    buzzer.duty(512)
+    buzzer_stop_time = utime.ticks_ms() + duration_ms
+    buzzer_active = True
+
+def update_buzzer():
+    """Buzzer updaten (für Timer)"""
+    global buzzer_active
+
+    if buzzer_active and utime.ticks_ms() >= buzzer_stop_time:
+        buzzer.duty(0)
+        buzzer_active = False
+
+def show_go_stimulus():
+    """GO-Reiz zeigen und den Zeitstempel an Kern 0 melden"""
+    global led_gpio, led_mode
+
+    # LED als GPIO: Pegel wird sofort gesetzt (wie step6_complete_game.py)
+    led_pwm.deinit()
+    led_pin.init(Pin.OUT, value=1)
+    go_events.put(utime.ticks_us())
+    led_gpio = led_pin
+    led_mode = LED_ON
+
+    beep(GO_BEEP_HZ, GO_BEEP_MS)
+    buzzer.flush()
+
+def save_session(data):
+    """Sitzung an die Aufzeichnungs-Datei anhängen"""
+    with open(SESSION_PATH, "ab") as f:
+        f.write(data)
+
+def print_console():
+    """Höchstens eine Zeile aus der Text-Warteschlange ausgeben"""
+    while True:
+        part = console.get()
+        if part is None:
+            return      # Rest der Zeile kommt noch
+        if part is LINE_END:
+            print(*line_parts, sep="")
+            line_parts.clear()
+            return
+        line_parts.append(part)
+
+def service_stats_http():
+    """HTTP-Statistik bedienen - nur in WAITING/RESULT, nie während einer Messung"""
+    if stats.version == 0:
+        return
+    values = http_values
+    stats.read_into(values)
+    if values[0] != STATE_WAITING and values[0] != STATE_RESULT:
+        return
+    if stats_http.poll():
+        stats_http.update(values[1], values[2], values[3], values[4], values[5], values[6])
+        stats_http.respond()
+
+def io_step():
+    """Ein Durchgang von Kern 1"""
+    global last_animation_ms, io_max_us
+
+    start_us = utime.ticks_us()
+
+    # Befehle zuerst: der GO-Reiz darf nicht hinter Text warten
+    while True:
+        command = commands.get()
+        if command is None:
+            break
+        op, a, b = command
+        if op == CMD_GO:
+            show_go_stimulus()
+        elif op == CMD_LED:
+            set_led_mode(a)
+        elif op == CMD_BEEP:
+            beep(a, b)
+        elif op == CMD_SAVE:
+            save_session(a)
+
+    now = utime.ticks_ms()
+    if utime.ticks_diff(now, last_animation_ms) >= ANIMATION_PERIOD_MS:
+        last_animation_ms = now
+        update_led()
+    update_buzzer()
+    outputs.commit()
+
+    # Höchstens eine Zeile pro Durchgang, danach wieder Befehle prüfen
+    print_console()
+
+    service_stats_http()
+
+    duration_us = utime.ticks_diff(utime.ticks_us(), start_us)
+    if duration_us > io_max_us:
+        io_max_us = duration_us
+
+def io_core():
+    """Schleife von Kern 1"""
+    while dual_core.running:
+        io_step()
+        utime.sleep_ms(IO_PERIOD_MS)
+
+
+def main():
+    """Hauptprogramm (Kern 0)"""
+    say("🎮 === Reaktionsspiel auf zwei Kernen === 🎮")
+    say("Drücke den Button zum Starten!")
+    say("\n🎮 Spiel gestartet! (Strg+C zum Beenden)\n")
+
+    if STATS_HTTP_PORT is not None:
+        stats_http.start(STATS_HTTP_PORT)
+    threaded = THREADED and dual_core.start(io_core)
+    period_ms = INPUT_PERIOD_MS if threaded else SINGLE_CORE_PERIOD_MS
+    if not threaded:
+        say("(ohne _thread: beide Hälften auf einem Kern)")
+
+    try:
+        while True:
+            tick_start_us = utime.ticks_us()
+
+            if current_state == STATE_WAITING:
+                update_waiting()
+            elif current_state == STATE_READY:
+                update_ready()
+            elif current_state == STATE_GO:
+                update_go()
+            elif current_state == STATE_RESULT:
+                update_result()
+
+            publish_stats()
+            record_loop_time(tick_start_us)
+
+            if not threaded:
+                io_step()
+            utime.sleep_ms(period_ms)
+
+    except KeyboardInterrupt:
+        # Kern 1 anhalten. Erst wenn seine Schleife sicher beendet ist, darf
+        # Kern 0 die Warteschlangen selbst leeren - sonst gäbe es zwei Leser.
+        stopped = not threaded or dual_core.stop()
+        route_print(print)
+        if stopped:
+            while not commands.empty() or not console.empty():
+                io_step()
+        else:
+            print("Kern 1 reagiert nicht - Warteschlangen nicht geleert, "
+                  "letzte Ausgaben und Befehle fehlen")
+
+        step6_common.shutdown(games_played, best_time, false_starts, led_gpio, led_pwm, buzzer,
+                              debouncer, None)
+        print(f"Kern 0: {loop_ticks} Ticks, max {loop_max_us}µs, "
+              f"{loop_overruns} über {LOOP_BUDGET_US}µs")
+        print(f"Kern 1: max {io_max_us}µs pro Durchgang, "
+              f"{console.dropped} Zeilen und {commands.dropped} Befehle verworfen, "
+              f"Warteschlangen max {console.max_used} Textteile/{commands.max_used} Befehle, "
+              f"Statistik {stats.retries}x neu gelesen")
+        print("Danke fürs Spielen!")
+
+if __name__ == "__main__":
+    main()
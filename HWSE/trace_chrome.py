@@ -0,0 +1,188 @@
+"""
+Ereignis-Trace als Chrome-Trace anzeigen (Host-Werkzeug)
+========================================================
+
+Wandelt einen Trace aus tracer.py (trace.bin, TRC1) in das JSON-Format von
+Chrome-Tracing um. Ansehen in ui.perfetto.dev oder chrome://tracing
+(Datei hineinziehen). Eine Spur pro Thema:
+
+- Zustand: WAITING/READY/GO/RESULT als Balken
+- LED: Modus als Balken (aus = Lücke)
+- Buzzer: Ton mit Frequenz als Balken
+- Button: gedrückt als Balken (so wie die Firmware abtastet: in RESULT
+  liest sie den Button nicht, das Loslassen erscheint erst in WAITING)
+- Schleife: zu lange Ticks und gc.collect() mit ihrer Dauer
+- Takt: CPU-Takt als Balken (governor.py)
+
+ticks_us läuft auf dem ESP32 alle 2^30 µs (knapp 18 Minuten) über; die
+Zeitachse wird fortlaufend zusammengesetzt. Liegen mehr als 18 Minuten
+ohne Eintrag zwischen zwei Ereignissen, ist der Abstand zu kurz.
+
+Ohne Board: --sim spielt ein paar Spiele im Simulator (Testspieler aus
+reaction_accuracy.py) und wandelt deren Trace um.
+
+Aufruf:
+    python trace_chrome.py trace.bin                  # -> trace.json
+    python trace_chrome.py trace.bin -o spiel.json
+    python trace_chrome.py --sim 5 -o sim_trace.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+from reaction_accuracy import TestPlayer
+from sim_hardware import Board, run_main
+
+# Formatkonstanten direkt aus der Firmware (im Simulator geladen)
+tracer = Board().load("tracer")
+
+STATE_NAMES = ("WAITING", "READY", "GO", "RESULT")
+LED_PIN = 2
+PID = 1
+TRACKS = {"Zustand": 1, "LED": 2, "Buzzer": 3, "Button": 4, "Schleife": 5, "Takt": 6}
+
+
+def unwrap(records):
+    """ticks_us (mit Überlauf) in fortlaufende µs ab dem ersten Eintrag umrechnen"""
+    result = []
+    now = 0
+    previous = None
+    for kind, ticks, value in records:
+        if previous is not None:
+            now += (ticks - previous) & tracer.TICKS_MASK
+        previous = ticks
+        result.append((kind, now, value))
+    return result
+
+
+def span(track, name, start, end, args=None):
+    event = {"name": name, "ph": "X", "pid": PID, "tid": TRACKS[track],
+             "ts": start, "dur": max(end - start, 0)}
+    if args:
+        event["args"] = args
+    return event
+
+
+def convert(records, lost=0):
+    """Einträge [(Ereignis, ticks_us, Wert)] in eine Chrome-Trace-Struktur umwandeln"""
+    records = unwrap(records)
+    end = records[-1][1] if records else 0
+    events = [{"name": "process_name", "ph": "M", "pid": PID, "args": {"name": "Reaktionsspiel"}}]
+    for name, tid in TRACKS.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": PID, "tid": tid, "args": {"name": name}})
+        events.append({"name": "thread_sort_index", "ph": "M", "pid": PID, "tid": tid,
+                       "args": {"sort_index": tid}})
+
+    # Offene Balken je Spur: (Name, Start, args)
+    open_spans = {}
+
+    def close(track, t):
+        current = open_spans.pop(track, None)
+        if current is not None:
+            events.append(span(track, current[0], current[1], t, current[2]))
+
+    for kind, t, value in records:
+        if kind == tracer.EV_STATE:
+            close("Zustand", t)
+            name = STATE_NAMES[value] if 0 <= value < len(STATE_NAMES) else str(value)
+            open_spans["Zustand"] = (name, t, None)
+        elif kind == tracer.EV_LED:
+            close("LED", t)
+            mode = tracer.LED_MODES[value] if 0 <= value < len(tracer.LED_MODES) else str(value)
+            if mode != "off":
+                open_spans["LED"] = (mode, t, None)
+        elif kind == tracer.EV_BUZZER_ON:
+            close("Buzzer", t)
+            open_spans["Buzzer"] = (f"{value} Hz", t, {"Frequenz": value})
+        elif kind == tracer.EV_BUZZER_OFF:
+            close("Buzzer", t)
+        elif kind == tracer.EV_BUTTON:
+            if value == 0:
+                open_spans["Button"] = ("gedrückt", t, None)
+            else:
+                close("Button", t)
+        elif kind == tracer.EV_GC:
+            events.append(span("Schleife", "gc.collect", t - value, t, {"µs": value}))
+        elif kind == tracer.EV_OVERRUN:
+            events.append(span("Schleife", "Tick zu lang", t - value, t, {"µs": value}))
+        elif kind == tracer.EV_FREQ:
+            close("Takt", t)
+            open_spans["Takt"] = (f"{value} MHz", t, {"MHz": value})
+        else:
+            events.append({"name": f"Ereignis {kind}", "ph": "i", "s": "p", "pid": PID,
+                           "tid": TRACKS["Schleife"], "ts": t, "args": {"Wert": value}})
+
+    for track in list(open_spans):
+        close(track, end)
+    return {"traceEvents": events, "displayTimeUnit": "ms",
+            "otherData": {"Einträge": len(records), "überschrieben": lost}}
+
+
+def simulate(step, games, seed):
+    """Spiele im Simulator spielen lassen; liefert die Bytes aus tracer.dump()"""
+    board = Board(seed=seed)
+    player = None
+    board_log_write = board.log_write
+
+    def log_write(pin_id, kind, value):
+        board_log_write(pin_id, kind, value)
+        if pin_id == LED_PIN and player is not None:
+            if (kind == "value" and value) or (kind == "duty" and value >= 1023):
+                player.stimulus()
+
+    board.log_write = log_write
+    game = board.load(step)
+    game.recorder.capture_path = None
+    game.histogram.hist_path = None
+    player = TestPlayer(board, getattr(game, "game", game), random.Random(seed), games)
+    board.set_button_source(player)
+    board.clock.stop_at_ms = board.clock.now_ms() + games * 20000
+    run_main(game)
+    return game.tracer.dump()
+
+
+def summary(records, lost):
+    counts = {}
+    for kind, _, _ in records:
+        name = tracer.EVENT_NAMES.get(kind, str(kind))
+        counts[name] = counts.get(name, 0) + 1
+    listed = ", ".join(f"{name} {count}" for name, count in sorted(counts.items()))
+    return f"{len(records)} Einträge ({listed}), {lost} überschrieben"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ereignis-Trace in Chrome-Trace-JSON umwandeln")
+    parser.add_argument("datei", nargs="?", help="Trace vom Board (trace.bin)")
+    parser.add_argument("-o", "--ausgabe", help="JSON-Datei (Standard: Name der Eingabe mit .json)")
+    parser.add_argument("--sim", type=int, metavar="SPIELE", help="Statt einer Datei: Spiele im Simulator")
+    parser.add_argument("--step", default="step6_complete_game", help="Firmware für --sim")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.sim:
+        data = simulate(args.step, args.sim, args.seed)
+        output = args.ausgabe or "sim_trace.json"
+    elif args.datei:
+        with open(args.datei, "rb") as f:
+            data = f.read()
+        output = args.ausgabe or os.path.splitext(args.datei)[0] + ".json"
+    else:
+        parser.error("Trace-Datei oder --sim angeben")
+
+    try:
+        records, lost = tracer.parse(data)
+    except ValueError as error:
+        print(f"❌ {error}")
+        return 1
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(convert(records, lost), f, ensure_ascii=False)
+    print(summary(records, lost))
+    print(f"✅ {output} - ansehen in ui.perfetto.dev oder chrome://tracing")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Binärer Ereignis-Tracer im Ringpuffer
+=====================================
+
+print() als Trace ist langsam (UART blockiert) und schwer auszuwerten.
+Der Tracer schreibt stattdessen Einträge fester Größe in einen Ringpuffer,
+der einmal beim Start angelegt wird:
+
+    Eintrag (9 Bytes, little endian): Ereignis (u8) | ticks_us (u32) | Wert (i32)
+
+Ein Eintrag kostet ein struct.pack_into - keine Speicheranlage, kein print.
+Ist der Puffer voll, überschreiben neue Einträge die ältesten (lost zählt
+sie). dump() schreibt den Puffer in zeitlicher Reihenfolge:
+
+    b"TRC1" | Anzahl Einträge (u16) | überschrieben (u32) | Einträge
+
+Am PC wird daraus ein Chrome-Trace (chrome://tracing, ui.perfetto.dev):
+    python trace_chrome.py trace.bin -o trace.json
+
+GC: MicroPython meldet automatische Sammelläufe nicht. collect() ruft
+gc.collect() selbst auf, misst die Dauer und trägt sie ein.
+
+Verwendung (siehe step6_complete_game.py):
+    tracer.begin(512)
+    tracer.event(tracer.EV_STATE, neuer_zustand)
+    tracer.dump("trace.bin")
+"""
+
+import utime
+import struct
+import gc
+
+MAGIC = b"TRC1"
+RECORD_FORMAT = "<BIi"
+RECORD_SIZE = 9
+TICKS_MASK = (1 << 30) - 1   # ticks_us läuft auf dem ESP32 bei 2^30 über
+
+# Ereignis-Typen
+EV_STATE = 1        # Wert: neuer Zustand
+EV_BUTTON = 2       # Wert: neuer Button-Pegel
+EV_LED = 3          # Wert: Index in LED_MODES
+EV_BUZZER_ON = 4    # Wert: Frequenz in Hz
+EV_BUZZER_OFF = 5   # Wert: 0
+EV_GC = 6           # Wert: Dauer von gc.collect() in µs
+EV_OVERRUN = 7      # Wert: Dauer des zu langen Ticks in µs
+EV_FREQ = 8         # Wert: neuer CPU-Takt in MHz (governor.py)
+
+EVENT_NAMES = {EV_STATE: "state", EV_BUTTON: "button", EV_LED: "led",
+               EV_BUZZER_ON: "buzzer_on", EV_BUZZER_OFF: "buzzer_off",
+               EV_GC: "gc", EV_OVERRUN: "overrun", EV_FREQ: "freq"}
+LED_MODES = ("off", "pulse", "on", "blink")   # Wie LED_* in den step6-Dateien
+
+enabled = False
+capacity = 0
+lost = 0            # Überschriebene Einträge
+_buffer = None
+_head = 0           # Nächster Schreibplatz
+_count = 0
+
+
+def begin(records=512):
+    """Ringpuffer anlegen (einmal beim Start) und Tracer einschalten"""
+    global enabled, capacity, _buffer
+    capacity = records
+    _buffer = bytearray(records * RECORD_SIZE)
+    enabled = True
+    clear()
+
+
+def clear():
+    """Puffer leeren"""
+    global _head, _count, lost
+    _head = 0
+    _count = 0
+    lost = 0
+
+
+def event(kind, value=0):
+    """Ein Ereignis mit aktuellem ticks_us eintragen"""
+    global _head, _count, lost
+    if not enabled:
+        return
+    struct.pack_into(RECORD_FORMAT, _buffer, _head * RECORD_SIZE,
+                     kind, utime.ticks_us() & TICKS_MASK, value)
+    _head += 1
+    if _head == capacity:
+        _head = 0
+    if _count < capacity:
+        _count += 1
+    else:
+        lost += 1
+
+
+def collect():
+    """gc.collect() mit Zeitmessung und Trace-Eintrag"""
+    start_us = utime.ticks_us()
+    gc.collect()
+    event(EV_GC, utime.ticks_diff(utime.ticks_us(), start_us))
+
+
+def dump(path=None):
+    """Puffer in zeitlicher Reihenfolge als Bytes; mit path auch in die Datei"""
+    start = (_head - _count) % capacity if capacity else 0
+    if start + _count <= capacity:
+        records = bytes(_buffer[start * RECORD_SIZE:(start + _count) * RECORD_SIZE])
+    else:
+        records = bytes(_buffer[start * RECORD_SIZE:]) + bytes(_buffer[:_head * RECORD_SIZE])
+    data = MAGIC + struct.pack("<HI", _count, lost) + records
+    if path is not None:
+        with open(path, "wb") as f:
+            f.write(data)
+    return data
+
+
+def parse(data):
+    """Bytes aus dump() lesen; liefert (Einträge [(Ereignis, ticks_us, Wert)], überschrieben)"""
+    if data[:4] != MAGIC:
+        raise ValueError("Kein Trace (TRC1) erkannt")
+    count, overwritten = struct.unpack_from("<HI", data, 4)
+    offset = 4 + struct.calcsize("<HI")
+    records = [struct.unpack_from(RECORD_FORMAT, data, offset + i * RECORD_SIZE)
+               for i in range(count)]
+    return records, overwritten